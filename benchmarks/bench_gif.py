@@ -0,0 +1,107 @@
+"""
+GIF conversion: the old "gif" format vs the GIF pipeline.
+
+Generates a --seconds long test video in the two sizes the format keys fetch
+and makes a GIF of [--start, --end] each way:
+
+  baseline  the old behaviour: the whole video up to 720p, converted by
+            yt-dlp's FFmpegVideoConvertor (full length, full frame rate and
+            size, ffmpeg's generic palette)
+  pipeline  logic/gif.py: only the section is fetched (stream-copied the way
+            yt-dlp's download_ranges does it) from the smaller source
+            source_height() picks, then scaled, fps-limited and
+            palette-mapped in one graph, within the --max-mb budget
+
+The network is left out; "fetched MB" is what each way would download.
+Reported per way: conversion seconds, GIF MB, fetched MB and the final
+width/fps. Needs ffmpeg and ffprobe.
+
+    python -m benchmarks.bench_gif --seconds 120 --start 31.3 --end 39.3 --max-mb 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_trim import have_ffmpeg
+from logic.gif import make_gif, gif_width, source_height, GIF_WIDTH, GIF_FPS, GIF_MAX_MB
+from logic.postprocess import ffmpeg_command, run_ffmpeg
+
+MODES = ("baseline", "pipeline")
+BASELINE_HEIGHT = 720  # What 'bestvideo[height<=720]' got
+
+
+def make_source(ff, path, seconds, height):
+    """A synthetic video-only download (H.264, 30 fps, keyframe every 2 s)."""
+    width = height * 16 // 9 // 2 * 2
+    subprocess.run([ff.path, "-y", "-loglevel", "error", "-nostdin",
+                    "-f", "lavfi", "-i", f"testsrc2=size={width}x{height}:rate=30:duration={seconds}",
+                    "-c:v", "libx264", "-preset", "superfast", "-pix_fmt", "yuv420p", "-g", "60", path], check=True)
+
+
+def fetch_section(ff, source, output, start, end):
+    """The stream copy yt-dlp makes for download_ranges without force_keyframes_at_cuts."""
+    subprocess.run([ff.path, "-y", "-loglevel", "error", "-nostdin", "-ss", str(start), "-t", str(end - start),
+                    "-i", source, "-c", "copy", output], check=True)
+
+
+def baseline(ff, tmp, seconds, start, end):
+    source = os.path.join(tmp, "full.mp4")
+    make_source(ff, source, seconds, BASELINE_HEIGHT)
+    began = time.perf_counter()
+    cmd, output = ffmpeg_command(ff.path, source, {'key': 'FFmpegVideoConvertor', 'preferedformat': 'gif'})
+    run_ffmpeg(cmd, output, None)
+    elapsed = time.perf_counter() - began
+    return {"mode": "baseline", "seconds": elapsed, "bytes": os.path.getsize(output), "fetched": os.path.getsize(source),
+            "width": gif_width(output), "fps": 30}
+
+
+def pipeline(ff, tmp, seconds, start, end, width, fps, max_mb):
+    source = os.path.join(tmp, "full.mp4")
+    make_source(ff, source, seconds, source_height(width))
+    section = os.path.join(tmp, "section.mp4")
+    fetch_section(ff, source, section, start, end)
+    report = make_gif(ff, section, os.path.join(tmp, "section.gif"), width, fps,
+                      int(max_mb * 1024 * 1024) if max_mb else None, (start, end))
+    return {"mode": "pipeline", "seconds": report["seconds"], "bytes": report["bytes"],
+            "fetched": os.path.getsize(section), "width": report["width"], "fps": report["fps"],
+            "attempts": report["attempts"]}
+
+
+def run(ff, seconds=60, start=12.3, end=20.3, width=GIF_WIDTH, fps=GIF_FPS, max_mb=GIF_MAX_MB, modes=MODES):
+    results = []
+    for mode in modes:
+        with tempfile.TemporaryDirectory() as tmp:
+            if mode == "baseline":
+                results.append(baseline(ff, tmp, seconds, start, end))
+            else:
+                results.append(pipeline(ff, tmp, seconds, start, end, width, fps, max_mb))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=int, default=60, help="length of the generated source video")
+    parser.add_argument('--start', type=float, default=12.3)
+    parser.add_argument('--end', type=float, default=20.3)
+    parser.add_argument('--width', type=int, default=GIF_WIDTH)
+    parser.add_argument('--fps', type=int, default=GIF_FPS)
+    parser.add_argument('--max-mb', type=float, default=GIF_MAX_MB, help="size budget (0 = no limit)")
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    args = parser.parse_args(argv)
+
+    ff = have_ffmpeg()
+    if not ff:
+        parser.exit(1, "ffmpeg and ffprobe are needed for this benchmark\n")
+    print(f"{'mode':>9} {'seconds':>8} {'GIF MB':>7} {'fetched MB':>10}  size")
+    for r in run(ff, args.seconds, args.start, args.end, args.width, args.fps, args.max_mb, args.modes):
+        print(f"{r['mode']:>9} {r['seconds']:>8.2f} {r['bytes'] / 1e6:>7.1f} {r['fetched'] / 1e6:>10.1f}  "
+              f"{r['width']}px @ {r['fps']} fps")
+
+
+if __name__ == '__main__':
+    main()
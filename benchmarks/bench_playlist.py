@@ -0,0 +1,55 @@
+"""
+Wall-clock scaling of the parallel playlist engine.
+
+Runs the same synthetic playlist through PlaylistEngine at increasing
+concurrency against the local stand-in media server, using the real
+download_worker (yt-dlp generic extractor on direct links).
+
+    python -m benchmarks.bench_playlist --items 24 --size-mb 4 --bandwidth-mb 2
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.media_server import MediaServer
+from logic.downloader import build_ydl_opts
+from logic.playlist import PlaylistEngine
+
+
+def run_once(server, items, size, concurrency):
+    entries = [{'url': server.url(f"item{i}", size), 'title': f"item{i}"} for i in range(items)]
+    with tempfile.TemporaryDirectory() as tmp:
+        opts = build_ydl_opts(tmp, 'best')
+        opts['quiet'] = True
+        opts['no_warnings'] = True
+        start = time.perf_counter()
+        succeeded, failed = PlaylistEngine(entries, opts, concurrency=concurrency).run()
+        elapsed = time.perf_counter() - start
+    return elapsed, succeeded, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=24)
+    parser.add_argument('--size-mb', type=float, default=4)
+    parser.add_argument('--bandwidth-mb', type=float, default=2, help="per-connection MB/s")
+    parser.add_argument('--latency', type=float, default=0.2, help="first-byte latency (s)")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args(argv)
+
+    size = int(args.size_mb * 1024 * 1024)
+    with MediaServer(bandwidth=int(args.bandwidth_mb * 1024 * 1024), latency=args.latency) as server:
+        baseline = None
+        print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'ok':>4} {'failed':>6}")
+        for n in args.concurrency:
+            elapsed, ok, failed = run_once(server, args.items, size, n)
+            baseline = baseline or elapsed
+            print(f"{n:>8} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x {ok:>4} {failed:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Cold-start regression check for the GUI.
+
+Launches main.py in fresh interpreters with YIKES_STARTUP_PROFILE set, so the
+app writes its startup profile (see logic/profiling.py) and exits once every
+tab is built. Prints per-phase timings of the median run and exits non-zero
+when first paint exceeds the budget. Needs a display (use xvfb-run in CI).
+
+    python -m benchmarks.bench_startup --runs 5 --budget 3.0
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.profiling import STARTUP_BUDGET, check_budget
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_once(timeout):
+    with tempfile.TemporaryDirectory() as tmp:
+        profile = os.path.join(tmp, "startup.json")
+        env = {**os.environ, "YIKES_STARTUP_PROFILE": profile, "YIKES_EXIT_AFTER_STARTUP": "1"}
+        subprocess.run([sys.executable, "main.py"], cwd=ROOT, env=env, timeout=timeout,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if not os.path.exists(profile):
+            return None
+        with open(profile, encoding='utf-8') as f:
+            return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET, help="seconds to first paint")
+    parser.add_argument('--timeout', type=float, default=60)
+    args = parser.parse_args(argv)
+
+    reports = [r for r in (run_once(args.timeout) for _ in range(args.runs)) if r]
+    paints = [r["first_paint"] for r in reports if r["first_paint"] is not None]
+    if not paints:
+        print("App never reached first paint (no display? try xvfb-run)")
+        return 1
+    reports.sort(key=lambda r: r["first_paint"] if r["first_paint"] is not None else float('inf'))
+    median = reports[len(reports) // 2]
+
+    print(f"{'phase':<24} {'start':>8} {'ms':>8}")
+    for p in median["phases"]:
+        print(f"{p['name']:<24} {p['start']:>8.3f} {p['seconds'] * 1000:>8.0f}")
+    print(f"first paint: median {statistics.median(paints):.3f}s, max {max(paints):.3f}s over {len(paints)} runs")
+
+    problems = check_budget(median, args.budget)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
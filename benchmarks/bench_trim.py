@@ -0,0 +1,97 @@
+"""
+Wall time of cutting a clip: the current behaviour vs the trim modes.
+
+Generates a --seconds long test video (--height p, keyframe every --gop
+seconds, H.264 + AAC) and cuts [--start, --end] out of it with:
+
+  baseline  what yt-dlp runs with force_keyframes_at_cuts (the "exact" mode):
+            ffmpeg re-encodes the whole clip with its default encoder settings
+  fast      logic/trim.py stream copy from the keyframe at or before --start
+  precise   logic/trim.py stream copy with the partial GOPs at each end re-encoded
+
+The download itself is left out: every mode fetches the same section, so
+only the local cutting differs. Reported per mode: seconds, seconds of video
+re-encoded and the achieved cut points. Needs ffmpeg and ffprobe.
+
+    python -m benchmarks.bench_trim --height 1080 --seconds 120 --start 31.3 --end 75.7
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.ffmpeg import find_ffmpeg
+from logic.trim import cut_file, probe_media, TRIM_FAST, TRIM_PRECISE, TRIM_EXACT
+
+MODES = ("baseline", TRIM_FAST, TRIM_PRECISE)
+
+
+def have_ffmpeg():
+    """The resolved FFmpeg if it and ffprobe are usable, else None."""
+    ff = find_ffmpeg()
+    return ff if ff.path and ff.ffprobe and ff.runnable else None
+
+
+def make_source(ff, path, seconds, height, gop):
+    """A synthetic test video shaped like a YouTube download (H.264 High + AAC, fixed GOP)."""
+    width = height * 16 // 9 // 2 * 2
+    subprocess.run([ff.path, "-y", "-loglevel", "error", "-nostdin",
+                    "-f", "lavfi", "-i", f"testsrc2=size={width}x{height}:rate=30:duration={seconds}",
+                    "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+                    "-c:v", "libx264", "-preset", "superfast", "-profile:v", "high", "-pix_fmt", "yuv420p", "-g", str(int(gop * 30)),
+                    "-c:a", "aac", "-shortest", path], check=True)
+
+
+def baseline(ff, source, output, start, end):
+    """The cut yt-dlp's ffmpeg downloader makes with force_keyframes_at_cuts: a full re-encode."""
+    subprocess.run([ff.path, "-y", "-loglevel", "error", "-nostdin", "-ss", str(start), "-t", str(end - start),
+                    "-i", source, "-force_key_frames", f"{start},{end}", output], check=True)
+    return {"mode": TRIM_EXACT, "achieved": [start, end], "encoded": round(end - start, 3)}
+
+
+def measure(mode, ff, source, start, end, media):
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "clip.mp4")
+        began = time.perf_counter()
+        if mode == "baseline":
+            report = baseline(ff, source, output, start, end)
+        else:
+            report = cut_file(ff, source, output, start, end, mode, media=media)
+        elapsed = time.perf_counter() - began
+        size = os.path.getsize(output)
+    return {"mode": mode, "seconds": elapsed, "bytes": size, **{k: report[k] for k in ("achieved", "encoded")}}
+
+
+def run(ff, seconds=60, height=1080, gop=5.0, start=12.3, end=41.7, modes=MODES):
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source.mp4")
+        make_source(ff, source, seconds, height, gop)
+        media = probe_media(ff.ffprobe, source)
+        return [measure(mode, ff, source, start, end, media) for mode in modes]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=int, default=60, help="length of the generated source video")
+    parser.add_argument('--height', type=int, default=1080)
+    parser.add_argument('--gop', type=float, default=5.0, help="seconds between keyframes")
+    parser.add_argument('--start', type=float, default=12.3)
+    parser.add_argument('--end', type=float, default=41.7)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    args = parser.parse_args(argv)
+
+    ff = have_ffmpeg()
+    if not ff:
+        parser.exit(1, "ffmpeg and ffprobe are needed for this benchmark\n")
+    print(f"{'mode':>9} {'seconds':>8} {'encoded s':>9} {'MB':>7}  achieved cut")
+    for r in run(ff, args.seconds, args.height, args.gop, args.start, args.end, args.modes):
+        print(f"{r['mode']:>9} {r['seconds']:>8.2f} {r['encoded']:>9.2f} {r['bytes'] / 1e6:>7.1f}  "
+              f"{r['achieved'][0]:.3f} - {r['achieved'][1]:.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Main-loop latency and aggregate throughput: thread mode vs process mode.
+
+Runs --jobs downloads from the local stand-in media server through
+PlaylistEngine, once with download_worker on threads of this process and once
+with process_download_worker (one child process per job). Meanwhile the main
+thread plays the Tk loop: a timer tick every --tick-ms that applies the
+progress updates queued since the last one. Reported per mode: how late the
+ticks ran (p50/p99/max in ms) and MB/s across all jobs.
+
+Downloads go through yt-dlp when it is installed. --synthetic (the default
+without yt-dlp) swaps in a worker that fetches with urllib and burns
+--cpu-us of Python time per 64 KiB chunk, standing in for yt-dlp's per-chunk
+bookkeeping, so GIL contention can be measured anywhere.
+
+    python -m benchmarks.bench_workers --jobs 8 --concurrency 4 --size-mb 16
+"""
+import argparse
+import collections
+import functools
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.media_server import MediaServer, CHUNK
+from logic.downloader import build_ydl_opts, download_worker
+from logic.playlist import PlaylistEngine, format_row_progress
+from logic.process_worker import process_download_worker
+
+MODES = ("thread", "process")
+
+
+def have_ytdlp() -> bool:
+    try:
+        import yt_dlp  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def synthetic_worker(url, opts, progress_callback, complete_callback, error_callback, cancel_callback=None,
+                     cpu_us=300, **kwargs):
+    """Fetch url into the outtmpl directory, spending cpu_us of pure-Python work per chunk (GIL held)."""
+    path = os.path.join(os.path.dirname(opts['outtmpl']), url.rstrip('/').rsplit('/', 1)[-1])
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response, open(path, 'wb') as f:
+            total = int(response.headers.get('Content-Length') or 0)
+            done, start = 0, time.perf_counter()
+            while True:
+                chunk = response.read(CHUNK)
+                if not chunk:
+                    break
+                f.write(chunk)
+                done += len(chunk)
+                until = time.perf_counter() + cpu_us / 1e6
+                while time.perf_counter() < until:
+                    pass
+                if cancel_callback and cancel_callback():
+                    raise RuntimeError("Download Cancelled")
+                elapsed = time.perf_counter() - start
+                speed = done / elapsed if elapsed > 0 else None
+                if progress_callback:
+                    progress_callback({'status': 'downloading', 'downloaded_bytes': done, 'total_bytes': total,
+                                       'speed': speed, 'eta': (total - done) / speed if speed else None,
+                                       '_percent_str': f"{done / total * 100:.1f}%" if total else None,
+                                       '_content_type': 'Video', 'info_dict': {'url': url}})
+        if progress_callback:
+            progress_callback({'status': 'finished', 'filename': path, 'total_bytes': done})
+        if complete_callback:
+            complete_callback()
+    except Exception as e:
+        if error_callback:
+            error_callback("Cancelled" if "Cancelled" in str(e) else f"Download Failed: {e}")
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def measure(mode, server, jobs, size, concurrency, tick_ms=10.0, synthetic=True, cpu_us=300):
+    """Run one mode; returns its latency and throughput figures."""
+    target = functools.partial(synthetic_worker, cpu_us=cpu_us) if synthetic else download_worker
+    worker = functools.partial(process_download_worker, target=target) if mode == "process" else target
+    pending = collections.deque()
+    outcome = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        opts = build_ydl_opts(tmp, 'best')
+        opts.update({'quiet': True, 'no_warnings': True, 'noprogress': True})
+        entries = [{'url': server.url(f"{mode}{i}", size), 'title': f"{mode}{i}"} for i in range(jobs)]
+        engine = PlaylistEngine(entries, opts, concurrency=concurrency, worker=worker,
+                                row_status=lambda index, text, state: pending.append((index, text, state)))
+        runner = threading.Thread(target=lambda: outcome.update(zip(("ok", "failed"), engine.run())), daemon=True)
+
+        tick = tick_ms / 1000.0
+        lateness, rows = [], {}
+        start = time.perf_counter()
+        runner.start()
+        next_tick = start + tick
+        while runner.is_alive():
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            now = time.perf_counter()
+            lateness.append((now - next_tick) * 1000)
+            while pending:  # The "redraw": what the Tk loop does with each update
+                index, text, state = pending.popleft()
+                rows[index] = (text[:80], state, format_row_progress({'downloaded_bytes': index, 'total_bytes': 100}))
+            next_tick = now + tick  # Like after(): rescheduled from when the tick actually ran
+        elapsed = time.perf_counter() - start
+        written = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(tmp) for name in names)
+
+    return {"mode": mode, "seconds": elapsed, "mbps": written / elapsed / (1024 * 1024), "ticks": len(lateness),
+            "p50_ms": statistics.median(lateness) if lateness else 0.0, "p99_ms": percentile(lateness, 0.99),
+            "max_ms": max(lateness, default=0.0), **outcome}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=8)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--size-mb', type=float, default=16)
+    parser.add_argument('--bandwidth-mb', type=float, default=0, help="per-connection MB/s (0 = unlimited)")
+    parser.add_argument('--tick-ms', type=float, default=10.0, help="simulated UI timer period")
+    parser.add_argument('--synthetic', action='store_true', default=not have_ytdlp(),
+                        help="stand-in worker instead of yt-dlp (default when yt-dlp is missing)")
+    parser.add_argument('--cpu-us', type=int, default=300, help="synthetic worker's CPU time per chunk")
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    args = parser.parse_args(argv)
+
+    size = int(args.size_mb * 1024 * 1024)
+    print(f"{'mode':>8} {'seconds':>8} {'MB/s':>8} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} {'ok':>4} {'failed':>6}")
+    with MediaServer(bandwidth=int(args.bandwidth_mb * 1024 * 1024)) as server:
+        for mode in args.modes:
+            r = measure(mode, server, args.jobs, size, args.concurrency, args.tick_ms, args.synthetic, args.cpu_us)
+            print(f"{mode:>8} {r['seconds']:>8.2f} {r['mbps']:>8.1f} {r['p50_ms']:>7.2f} {r['p99_ms']:>7.2f} "
+                  f"{r['max_ms']:>7.2f} {r.get('ok', 0):>4} {r.get('failed', 0):>6}")
+
+
+if __name__ == '__main__':
+    main()
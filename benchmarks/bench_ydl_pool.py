@@ -0,0 +1,67 @@
+"""
+Per-call YoutubeDL setup overhead: fresh instance vs. pooled instance.
+
+Each iteration extracts info for a direct link served by the local stand-in
+media server, so the network cost is near zero and the difference between
+the two columns is construction/teardown of YoutubeDL (extractor registry,
+cookie jar, HTTP handlers).
+
+    python -m benchmarks.bench_ydl_pool --iterations 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.media_server import MediaServer
+from logic.downloader import YDLPool, INFO_OPTS
+
+
+def time_calls(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    from yt_dlp import YoutubeDL
+
+    opts = {**INFO_OPTS, 'no_warnings': True}
+    with MediaServer() as server:
+        url = server.url("clip", 1024 * 1024)
+
+        def fresh():
+            with YoutubeDL(opts) as ydl:
+                ydl.extract_info(url, download=False)
+
+        pool = YDLPool()
+
+        def pooled():
+            with pool.checkout(opts) as ydl:
+                ydl.extract_info(url, download=False)
+
+        fresh()  # Warm imports / extractor module loading for both sides
+        fresh_s = time_calls(fresh, args.iterations)
+        pooled_s = time_calls(pooled, args.iterations)
+        pool.close_all()
+
+    print(f"{'mode':>8} {'median ms':>10} {'p95 ms':>8}")
+    for name, samples in (("fresh", fresh_s), ("pooled", pooled_s)):
+        samples.sort()
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(f"{name:>8} {statistics.median(samples) * 1000:>10.2f} {p95 * 1000:>8.2f}")
+    print(f"pool stats: {pool.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Diff two benchmark result files from benchmarks/run.py.
+
+Prints every metric present in both runs with its relative change and flags
+regressions beyond --threshold (in the metric's own "better" direction).
+Exits 1 when anything regressed, so it can gate CI.
+
+    python -m benchmarks.compare base.json head.json --threshold 0.15
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Any, List, Tuple
+
+
+def load(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path, encoding='utf-8') as f:
+        report = json.load(f)
+    return {r["name"]: r for r in report.get("results", []) if "value" in r}
+
+
+def compare(base: Dict[str, Dict[str, Any]], head: Dict[str, Dict[str, Any]],
+            threshold: float) -> List[Tuple[str, float, float, float, bool]]:
+    """(name, base value, head value, relative change, regressed) for metrics in both runs."""
+    rows = []
+    for name in sorted(set(base) & set(head)):
+        old, new = base[name]["value"], head[name]["value"]
+        change = (new - old) / old if old else 0.0
+        worse = -change if head[name].get("better") == "higher" else change
+        rows.append((name, old, new, change, worse > threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument('--threshold', type=float, default=0.10, help="relative change counted as a regression")
+    args = parser.parse_args(argv)
+
+    base, head = load(args.base), load(args.head)
+    rows = compare(base, head, args.threshold)
+    print(f"{'metric':<44} {'base':>12} {'head':>12} {'change':>8}")
+    for name, old, new, change, regressed in rows:
+        unit = head[name].get("unit", "")
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<44} {old:>12.3f} {new:>12.3f} {change:>+7.1%} {unit}{flag}")
+    for name in sorted(set(base) ^ set(head)):
+        print(f"{name:<44} only in {'base' if name in base else 'head'}")
+
+    regressions = sum(1 for row in rows if row[4])
+    if regressions:
+        print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""
+Local stand-in media server for benchmarks.
+
+Serves synthetic progressive media at /media/<size>/<name>.mp4 with support for
+HEAD and Range requests, so yt-dlp's generic extractor treats each URL as a
+direct video link. Segmented streams of the same total size are served as HLS
+(/hls/<size>/<segments>/<name>.m3u8) and DASH (/dash/<size>/<segments>/<name>.mpd)
+so fragment downloads can be measured too. Per-connection bandwidth and
+first-byte latency are configurable to emulate a real CDN without touching the
+network. A shared link bandwidth and a concurrent-connection limit (answered
+with 429) emulate a throttling origin; fail_rate and drop_rate inject 503s and
+connections cut mid-body.
+"""
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+CHUNK = 64 * 1024
+# Nominal playback length of one HLS/DASH segment
+SEGMENT_SECONDS = 4
+
+PROGRESSIVE = "progressive"
+HLS = "hls"
+DASH = "dash"
+
+
+def synthetic_bytes(start: int, length: int) -> bytes:
+    """Deterministic payload so repeated/ranged reads return identical data."""
+    pattern = bytes(range(256))
+    offset = start % 256
+    reps = (offset + length) // 256 + 1
+    return (pattern * reps)[offset:offset + length]
+
+
+def segment_span(size: int, segments: int, index: int):
+    """(offset, length) of segment index when size bytes are split into segments parts."""
+    base = size // segments
+    length = base if index < segments - 1 else size - base * (segments - 1)
+    return index * base, length
+
+
+def hls_playlist(segments: int) -> str:
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3", f"#EXT-X-TARGETDURATION:{SEGMENT_SECONDS}",
+             "#EXT-X-MEDIA-SEQUENCE:0", "#EXT-X-PLAYLIST-TYPE:VOD"]
+    for i in range(segments):
+        lines += [f"#EXTINF:{SEGMENT_SECONDS}.0,", f"seg{i}.ts"]
+    lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
+
+
+def dash_manifest(size: int, segments: int) -> str:
+    duration = segments * SEGMENT_SECONDS
+    bandwidth = size * 8 // duration
+    segment_urls = "".join(f'<SegmentURL media="seg{i}.m4s"/>' for i in range(segments))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="static" minBufferTime="PT2S" '
+        f'mediaPresentationDuration="PT{duration}S" profiles="urn:mpeg:dash:profile:isoff-live:2011">'
+        '<Period><AdaptationSet mimeType="video/mp4" segmentAlignment="true">'
+        f'<Representation id="v0" bandwidth="{bandwidth}" width="1280" height="720" codecs="avc1.64001f">'
+        f'<SegmentList timescale="1" duration="{SEGMENT_SECONDS}"><Initialization sourceURL="init.mp4"/>'
+        f'{segment_urls}</SegmentList></Representation></AdaptationSet></Period></MPD>\n'
+    )
+
+
+class _MediaHandler(BaseHTTPRequestHandler):
+    server_version = "YikesMediaStandIn/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    def _parse_path(self):
+        """
+        Resolve the request to (content_type, body_offset, length) for media, or
+        (content_type, text) for manifests; None if unknown.
+        """
+        parts = self.path.split('?')[0].strip('/').split('/')
+        try:
+            if len(parts) == 3 and parts[0] == 'media':
+                # /media/<size>/<name>.mp4
+                return 'video/mp4', 0, int(parts[1])
+            if len(parts) == 4 and parts[0] in (HLS, DASH):
+                # /<kind>/<size>/<segments>/<name>.m3u8|.mpd|seg<i>.ts|seg<i>.m4s|init.mp4
+                size, segments, leaf = int(parts[1]), int(parts[2]), parts[3]
+                if segments < 1:
+                    return None
+                if leaf.endswith('.m3u8'):
+                    return 'application/vnd.apple.mpegurl', hls_playlist(segments)
+                if leaf.endswith('.mpd'):
+                    return 'application/dash+xml', dash_manifest(size, segments)
+                if leaf == 'init.mp4':
+                    return 'video/mp4', 0, 1024
+                if leaf.startswith('seg'):
+                    index = int(leaf[3:].split('.')[0])
+                    if 0 <= index < segments:
+                        offset, length = segment_span(size, segments, index)
+                        return ('video/mp2t' if parts[0] == HLS else 'video/iso.segment'), offset, length
+        except ValueError:
+            pass
+        return None
+
+    def _parse_range(self, size):
+        header = self.headers.get('Range')
+        if not header or not header.startswith('bytes='):
+            return 0, size - 1, False
+        start_s, _, end_s = header[len('bytes='):].partition('-')
+        start = int(start_s) if start_s else 0
+        end = int(end_s) if end_s else size - 1
+        return start, min(end, size - 1), True
+
+    def _send_headers(self, size, content_type='video/mp4'):
+        start, end, partial = self._parse_range(size)
+        if start >= size:
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{size}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return None
+        self.send_response(206 if partial else 200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(end - start + 1))
+        if partial:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.end_headers()
+        return start, end
+
+    def _send_text(self, content_type, text, head=False):
+        body = text.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _send_empty(self, code, **headers):
+        self.send_response(code)
+        for name, value in headers.items():
+            self.send_header(name.replace('_', '-'), value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_HEAD(self):
+        resource = self._parse_path()
+        if resource is None:
+            self.send_error(404)
+        elif len(resource) == 2:
+            self._send_text(*resource, head=True)
+        else:
+            self._send_headers(resource[2], resource[0])
+
+    def do_GET(self):
+        resource = self._parse_path()
+        if resource is None:
+            self.send_error(404)
+            return
+        if len(resource) == 2:
+            # Manifests are never throttled or failed: extraction has no retries to exercise
+            self._send_text(*resource)
+            return
+        content_type, offset, size = resource
+
+        server = self.server
+        with server.conn_lock:
+            if server.max_connections and server.active >= server.max_connections:
+                server.rejected += 1
+                throttled = True
+            else:
+                server.active += 1
+                throttled = False
+            fail = server.fail_rate and server.rng.random() < server.fail_rate
+            drop = server.drop_rate and server.rng.random() < server.drop_rate
+            if fail:
+                server.failed += 1
+        if throttled:
+            self._send_empty(429, Retry_After='1')
+            return
+        if fail:
+            with server.conn_lock:
+                server.active -= 1
+            self._send_empty(503)
+            return
+
+        try:
+            if server.latency:
+                time.sleep(server.latency)
+
+            span = self._send_headers(size, content_type)
+            if span is None:
+                return
+            start, end = span
+            length = end - start + 1
+            if drop:
+                # Send half the body, then cut the connection
+                self._write_throttled(offset + start, length // 2)
+                with server.conn_lock:
+                    server.dropped += 1
+                self.close_connection = True
+                return
+            self._write_throttled(offset + start, length)
+        finally:
+            with server.conn_lock:
+                server.active -= 1
+
+    def _rate(self):
+        """Current per-connection budget: own cap, or a fair share of the link, whichever is lower."""
+        server = self.server
+        rates = []
+        if server.bandwidth:
+            rates.append(server.bandwidth)
+        if server.link_bandwidth:
+            rates.append(server.link_bandwidth / max(1, server.active))
+        return min(rates) if rates else 0
+
+    def _write_throttled(self, start, length):
+        sent = 0
+        while sent < length:
+            n = min(CHUNK, length - sent)
+            rate = self._rate()
+            if rate:
+                # Pace before writing so the client sees the budget even on short responses
+                time.sleep(n / rate)
+            try:
+                self.wfile.write(synthetic_bytes(start + sent, n))
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            sent += n
+
+
+class MediaServer:
+    """
+    Threaded localhost media server.
+
+    bandwidth:       bytes/sec per connection (0 = unlimited)
+    latency:         seconds before the first byte of every GET
+    link_bandwidth:  bytes/sec shared by all connections (0 = unlimited)
+    max_connections: concurrent GETs allowed before answering 429 (0 = unlimited)
+    fail_rate:       fraction of media/segment GETs answered with 503
+    drop_rate:       fraction of media/segment GETs cut off after half the body
+    seed:            seed for the failure injection (runs are reproducible)
+    """
+
+    def __init__(self, bandwidth: int = 0, latency: float = 0.0, host: str = '127.0.0.1', port: int = 0,
+                 link_bandwidth: int = 0, max_connections: int = 0,
+                 fail_rate: float = 0.0, drop_rate: float = 0.0, seed: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), _MediaHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.bandwidth = bandwidth
+        self.httpd.latency = latency
+        self.httpd.link_bandwidth = link_bandwidth
+        self.httpd.max_connections = max_connections
+        self.httpd.fail_rate = fail_rate
+        self.httpd.drop_rate = drop_rate
+        self.httpd.rng = random.Random(seed)
+        self.httpd.active = 0
+        self.httpd.rejected = 0
+        self.httpd.failed = 0
+        self.httpd.dropped = 0
+        self.httpd.conn_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, name: str, size: int, kind: str = PROGRESSIVE, segments: int = 10) -> str:
+        if kind == HLS:
+            return f"{self.base_url}/hls/{size}/{segments}/{name}.m3u8"
+        if kind == DASH:
+            return f"{self.base_url}/dash/{size}/{segments}/{name}.mpd"
+        return f"{self.base_url}/media/{size}/{name}.mp4"
+
+    def stats(self):
+        with self.httpd.conn_lock:
+            return {"rejected": self.httpd.rejected, "failed": self.httpd.failed, "dropped": self.httpd.dropped}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
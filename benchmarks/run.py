@@ -0,0 +1,280 @@
+"""
+Logic-layer benchmark suite with JSON results.
+
+Groups (select with --only):
+  micro     build_ydl_opts / get_max_resolution per-call cost
+  storage   queue and history operations at --scale rows (SQLite, temp dir)
+  download  download_worker throughput for progressive, HLS and DASH media from
+            the local stand-in server, clean and with injected failures
+            (needs yt-dlp; recorded as skipped otherwise)
+  workers   main-loop tick lateness and aggregate MB/s with downloads on
+            threads vs child processes (benchmarks/bench_workers.py; the
+            synthetic worker stands in when yt-dlp is missing)
+  trim      wall time of cutting a clip from a generated 1080p video: yt-dlp's
+            full re-encode vs the fast and precise trim modes
+            (benchmarks/bench_trim.py; needs ffmpeg and ffprobe)
+  gif       conversion seconds and GIF size for a clip of a generated video:
+            the old whole-video convert vs the GIF pipeline
+            (benchmarks/bench_gif.py; needs ffmpeg and ffprobe)
+
+Every result has a name, value, unit and which direction is better, so two
+runs can be diffed with benchmarks/compare.py:
+
+    python -m benchmarks.run --output bench-$(git rev-parse --short HEAD).json
+    python -m benchmarks.compare bench-old.json bench-new.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Dict, Any, Callable
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.media_server import MediaServer, PROGRESSIVE, HLS, DASH
+
+GROUPS = ("micro", "storage", "download", "workers", "trim", "gif")
+LOWER = "lower"
+HIGHER = "higher"
+
+
+def result(name: str, value: float, unit: str, better: str = LOWER, **extra) -> Dict[str, Any]:
+    return {"name": name, "value": round(value, 6), "unit": unit, "better": better, **extra}
+
+
+def per_call_us(fn: Callable, calls: int, repeat: int = 5) -> float:
+    """Median over repeat batches of the per-call time in microseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        samples.append((time.perf_counter() - start) / calls * 1e6)
+    return statistics.median(samples)
+
+
+def timed(fn: Callable) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+# --- micro ---
+def synthetic_info(formats: int = 60) -> Dict[str, Any]:
+    heights = [144, 240, 360, 480, 720, 1080, 1440, 2160, None]
+    return {"id": "bench", "height": 1080,
+            "formats": [{"format_id": str(i), "height": heights[i % len(heights)], "ext": "mp4"} for i in range(formats)]}
+
+
+def bench_micro(args) -> List[Dict[str, Any]]:
+    from logic.downloader import build_ydl_opts, get_max_resolution, FORMAT_KEYS
+
+    results = []
+    calls = 200 if args.quick else 2000
+    with tempfile.TemporaryDirectory() as tmp:
+        for key in ("1080p", "mp3_320", "gif"):
+            results.append(result(f"micro.build_ydl_opts.{key}", per_call_us(lambda: build_ydl_opts(tmp, key), calls), "us"))
+        results.append(result("micro.build_ydl_opts.trim", per_call_us(
+            lambda: build_ydl_opts(tmp, "720p", trim_range=(10, 20)), calls), "us"))
+        results.append(result("micro.build_ydl_opts.all_keys", per_call_us(
+            lambda: [build_ydl_opts(tmp, k) for k in FORMAT_KEYS], calls // 10), "us"))
+
+    for n in (20, 200):
+        info = synthetic_info(n)
+        results.append(result(f"micro.get_max_resolution.{n}_formats", per_call_us(lambda: get_max_resolution(info), calls * 5), "us"))
+    return results
+
+
+# --- storage ---
+def bench_storage(args) -> List[Dict[str, Any]]:
+    from logic.queue_store import QueueStore
+    from logic.history_store import HistoryStore
+
+    scale = args.scale
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = QueueStore(os.path.join(tmp, "bench.db"), legacy_file=None)
+        items = [{"url": f"https://www.youtube.com/watch?v={i:011d}", "title": f"Item {i}", "format": "1080p",
+                  "path": tmp} for i in range(scale)]
+        results.append(result("storage.queue.enqueue_many", timed(lambda: queue.enqueue_many(items)), "s", scale=scale))
+        results.append(result("storage.queue.items_page", per_call_us(lambda: queue.items(limit=50), 50), "us", scale=scale))
+        results.append(result("storage.queue.count", per_call_us(queue.count, 200), "us", scale=scale))
+        claims = min(1000, scale)
+        results.append(result("storage.queue.dequeue", timed(lambda: [queue.dequeue() for _ in range(claims)]) / claims * 1e6,
+                              "us", scale=scale))
+        queue.close()
+
+        history = HistoryStore(os.path.join(tmp, "bench.db"), legacy_file=None)
+        entries = [{"title": f"Video {i} {'music live' if i % 7 == 0 else 'tutorial'}",
+                    "url": f"https://www.youtube.com/watch?v={i:011d}", "format": "1080p",
+                    "path": tmp, "status": "Completed"} for i in range(scale)]
+        results.append(result("storage.history.append_many", timed(lambda: history.append_many(entries)), "s", scale=scale))
+        results.append(result("storage.history.append_one", per_call_us(
+            lambda: history.append({"title": "One", "url": "https://youtu.be/x", "status": "Completed"}), 20, 3), "us"))
+
+        def walk_pages(pages=20):
+            before = None
+            for _ in range(pages):
+                page = history.page(before_id=before)
+                if not page:
+                    break
+                before = page[-1]["id"]
+
+        results.append(result("storage.history.page_walk_20", timed(walk_pages) * 1e3, "ms", scale=scale))
+        results.append(result("storage.history.search", per_call_us(lambda: history.search("music live"), 20), "us", scale=scale))
+        results.append(result("storage.history.by_url", per_call_us(
+            lambda: history.by_url(f"https://www.youtube.com/watch?v={scale // 2:011d}"), 200), "us", scale=scale))
+        history.close()
+    return results
+
+
+# --- download ---
+def bench_download(args) -> List[Dict[str, Any]]:
+    try:
+        import yt_dlp  # noqa: F401
+    except ImportError:
+        return [{"name": "download", "skipped": "yt-dlp not installed"}]
+    from logic.downloader import build_ydl_opts, download_worker
+
+    size = int(args.size_mb * 1024 * 1024)
+    scenarios = [
+        ("clean", {}),
+        ("faulty", {"fail_rate": 0.05, "drop_rate": 0.02}),
+    ]
+    results = []
+    for label, faults in scenarios:
+        with MediaServer(bandwidth=int(args.bandwidth_mb * 1024 * 1024), latency=args.latency, **faults) as server:
+            for kind in (PROGRESSIVE, HLS, DASH):
+                samples, failures = [], 0
+                for run in range(args.runs):
+                    with tempfile.TemporaryDirectory() as tmp:
+                        opts = build_ydl_opts(tmp, 'best')
+                        opts.update({'quiet': True, 'no_warnings': True, 'noprogress': True})
+                        errors = []
+                        url = server.url(f"{kind}{run}", size, kind=kind, segments=args.segments)
+                        elapsed = timed(lambda: download_worker(url, opts, None, None, errors.append))
+                    if errors:
+                        failures += 1
+                    else:
+                        samples.append(size / elapsed / (1024 * 1024))
+                name = f"download.{kind}.{label}"
+                if samples:
+                    results.append(result(name, statistics.median(samples), "MB/s", HIGHER,
+                                          runs=args.runs, failures=failures, size=size, **server.stats()))
+                else:
+                    results.append({"name": name, "skipped": f"all {args.runs} runs failed"})
+    return results
+
+
+# --- workers ---
+def bench_workers(args) -> List[Dict[str, Any]]:
+    from benchmarks.bench_workers import measure, have_ytdlp, MODES
+
+    size = int(args.size_mb * 1024 * 1024)
+    jobs = 4 if args.quick else 8
+    synthetic = not have_ytdlp()
+    results = []
+    with MediaServer(bandwidth=int(args.bandwidth_mb * 1024 * 1024), latency=args.latency) as server:
+        for mode in MODES:
+            r = measure(mode, server, jobs, size, concurrency=4, synthetic=synthetic)
+            extra = {"jobs": jobs, "size": size, "synthetic": synthetic, "failed": r.get("failed", 0)}
+            results.append(result(f"workers.{mode}.loop_p99", r["p99_ms"], "ms", **extra))
+            results.append(result(f"workers.{mode}.loop_max", r["max_ms"], "ms", **extra))
+            results.append(result(f"workers.{mode}.throughput", r["mbps"], "MB/s", HIGHER, **extra))
+    return results
+
+
+# --- trim ---
+def bench_trim(args) -> List[Dict[str, Any]]:
+    from benchmarks.bench_trim import run, have_ffmpeg
+
+    ff = have_ffmpeg()
+    if not ff:
+        return [{"name": "trim", "skipped": "ffmpeg/ffprobe not found"}]
+    seconds = 30 if args.quick else 60
+    results = []
+    for r in run(ff, seconds=seconds, start=seconds * 0.2 + 0.3, end=seconds * 0.7 - 0.3):
+        results.append(result(f"trim.{r['mode']}.wall", r["seconds"], "s", encoded=r["encoded"],
+                              achieved=r["achieved"], source_seconds=seconds))
+    return results
+
+
+# --- gif ---
+def bench_gif(args) -> List[Dict[str, Any]]:
+    from benchmarks.bench_gif import run, have_ffmpeg
+
+    ff = have_ffmpeg()
+    if not ff:
+        return [{"name": "gif", "skipped": "ffmpeg/ffprobe not found"}]
+    seconds = 30 if args.quick else 60
+    results = []
+    for r in run(ff, seconds=seconds, start=seconds * 0.2 + 0.3, end=seconds * 0.2 + 8.3):
+        results.append(result(f"gif.{r['mode']}.wall", r["seconds"], "s", width=r["width"], fps=r["fps"],
+                              source_seconds=seconds))
+        results.append(result(f"gif.{r['mode']}.size", r["bytes"] / 1e6, "MB", fetched_mb=round(r["fetched"] / 1e6, 3)))
+    return results
+
+
+BENCHES = {"micro": bench_micro, "storage": bench_storage, "download": bench_download, "workers": bench_workers,
+           "trim": bench_trim, "gif": bench_gif}
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10,
+                             cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return out.stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', default=",".join(GROUPS), help="comma-separated groups to run")
+    parser.add_argument('--output', '-o', help="write results JSON here (default: stdout only)")
+    parser.add_argument('--quick', action='store_true', help="fewer iterations, smaller scale")
+    parser.add_argument('--scale', type=int, default=10000, help="rows for storage benchmarks")
+    parser.add_argument('--size-mb', type=float, default=8, help="media size for download benchmarks")
+    parser.add_argument('--segments', type=int, default=16, help="HLS/DASH segment count")
+    parser.add_argument('--bandwidth-mb', type=float, default=0, help="per-connection MB/s (0 = unlimited)")
+    parser.add_argument('--latency', type=float, default=0.0, help="first-byte latency (s)")
+    parser.add_argument('--runs', type=int, default=3, help="download runs per scenario")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.scale = min(args.scale, 2000)
+        args.runs = 1
+
+    groups = [g.strip() for g in args.only.split(',') if g.strip()]
+    unknown = [g for g in groups if g not in BENCHES]
+    if unknown:
+        parser.error(f"unknown group(s): {', '.join(unknown)}")
+
+    report = {
+        "meta": {"revision": git_revision(), "timestamp": round(time.time()), "python": platform.python_version(),
+                 "platform": platform.platform(), "args": vars(args)},
+        "results": [],
+    }
+    for group in groups:
+        for r in BENCHES[group](args):
+            report["results"].append(r)
+            if "skipped" in r:
+                print(f"{r['name']:<44} skipped: {r['skipped']}", file=sys.stderr)
+            else:
+                print(f"{r['name']:<44} {r['value']:>12.3f} {r['unit']}", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -3,14 +3,10 @@ from tkinter import messagebox, PhotoImage, filedialog
 import threading
 import os
 import tkinter as tk
-import webbrowser
-import requests
-from PIL import Image, ImageTk
-from io import BytesIO
+from PIL import Image, ImageTk  # customtkinter imports PIL itself, so there is nothing to defer here
 import subprocess
 import sys
 import platform
-import copy
 import time
 import concurrent.futures
 import re
@@ -20,21 +16,45 @@ import logging
 logging.basicConfig(filename="yikes_debug.log", level=logging.DEBUG, 
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
-# Import Logic Modules
-from logic.settings import current_settings, save_settings, add_to_queue, remove_from_queue, get_queue, pop_queue, save_history, load_history, clear_queue
-from logic.utils import parse_time_to_seconds, format_eta, get_free_disk_space_gb
-from logic.downloader import fetch_video_info, fetch_playlist_info, start_download_thread, build_ydl_opts, get_max_resolution
-
-def resource_path(relative_path):
-    """ Get absolute path to resource, works for dev and for PyInstaller bundle """
-    try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-
-    return os.path.join(base_path, relative_path)
-
+# Import Logic Modules (yt_dlp and requests are imported on first use / preloaded after first paint)
+from logic.profiling import startup_profiler, preload
+from logic.settings import current_settings, save_settings, add_to_queue, remove_from_queue, get_queue, pop_queue, finish_queue_item, save_history, load_history, clear_history, clear_queue
+from logic.utils import parse_time_to_seconds, format_eta, get_free_disk_space_gb, resource_path, safe_folder_name, parse_bytes, format_bytes, format_timestamp
+from logic.downloader import fetch_video_info, fetch_playlist_info, start_download_thread, build_ydl_opts, get_max_resolution, ydl_pool
+from logic.playlist import PlaylistEngine, PlaylistRows, MAX_CONCURRENCY, entry_url
+from logic.cache import metadata_cache
+from logic.thumbnails import thumbnail_cache
+from logic.progress import ProgressAggregator, TransferStats, PROGRESS_HZ
+from logic.history_store import PAGE_SIZE as HISTORY_PAGE_SIZE
+from logic.journal import job_journal, CANCELLED as JOB_CANCELLED
+from logic.bandwidth import bandwidth_scheduler
+from logic.postprocess import postprocess_pool
+from logic.prefetch import Prefetcher
+from logic.archive import archive_scope
+from logic.probe import format_prober, availability_warning, RES_NAMES, FORMAT_HEIGHTS
+from logic.service import ServiceClient, progress_info
+from logic.process_worker import selected_worker
+from logic.ffmpeg import ffmpeg_locator
+from logic.trim import TRIM_MODES, TRIM_EXACT, TRIM_FAST
+from logic.gif import GIF_MAX_MB
+from gui.virtual_list import VirtualList
+
+# Fixed height of a playlist row; the virtual list positions rows by index * height
+PLAYLIST_ROW_HEIGHT = 66
+
+# "gif_max_mb" choices in Settings (0 = no limit)
+GIF_SIZE_CHOICES = (0, 2, 5, 8, 15, 25)
+
+# How often a download handed to the service checks the Cancel button (its event stream can be quiet for HEARTBEAT)
+SERVICE_CANCEL_POLL = 0.2
+
+# Built before the window is shown; the other tabs are built right after first paint
+FIRST_FRAMES = ("Home",)
+FRAME_NAMES = ("Home", "Download", "Queue", "History", "Settings", "Help", "About", "Feedback")
+
+def open_url(url):
+    import webbrowser  # Deferred: only needed when a link is clicked
+    webbrowser.open(url)
 
 class SplashScreen(ctk.CTkToplevel):
     def __init__(self, parent):
@@ -121,7 +141,8 @@ class YikesApp(ctk.CTk):
         try:
             logging.info("Starting load_app...")
             # Theme Setup
-            self.setup_theme()
+            with startup_profiler.phase("theme"):
+                self.setup_theme()
             logging.info("Theme setup complete")
             
             # State
@@ -132,44 +153,67 @@ class YikesApp(ctk.CTk):
             self.current_video_info = None  # Prevent AttributeError on direct download
             self.current_playlist_info = None
             self.current_playlist_folder = None
-            self.playlist_widgets = []  # For playlist row UI references
+            self.playlist_rows = PlaylistRows([])  # Row state model (widgets are recycled by VirtualList)
             self.is_cancelled = False
+            self.is_closing = False
+            self.current_job = None  # JobRecorder of the running single-video download
             self.is_processing_queue = False
+            self.queue_prefetch = Prefetcher(current_settings.get("prefetch_lookahead", 2))  # Next queue items' info
             self.is_fetching = False  # Debounce for rapid clicks
             
             # Async Executor
             self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
             
+            # Progress coalescing (yt-dlp ticks -> fixed-rate UI updates)
+            self.progress_agg = ProgressAggregator()
+            self.last_progress_raw = None
+            self.last_transfer = TransferStats()  # Size for the history entry (later events carry none)
+            self.trim_report = None  # Achieved cut points of the last trimmed download (logic/trim.py)
+            self.gif_report = None  # Size and conversion time of the last GIF (logic/gif.py)
+            
             # Layout Config
             self.grid_columnconfigure(1, weight=1)
             self.grid_rowconfigure(0, weight=1)
             
             # Create UI
             logging.info("Loading icons...")
-            self.load_icons()
+            with startup_profiler.phase("icons"):
+                self.load_icons()
             logging.info("Creating sidebar...")
-            self.create_sidebar()
+            with startup_profiler.phase("sidebar"):
+                self.create_sidebar()
             logging.info("Creating content area...")
-            self.create_content_area()
-            
-            # Start background tasks
+            with startup_profiler.phase("content"):
+                self.create_content_area()
             
             # Start background tasks
             # self.check_clipboard_loop() # Removed non-functional loop
 
-            # Build Frames
+            # Build Frames (only what the first screen needs; the rest follow first paint)
             logging.info("Building frames...")
             self.frames = {}
-            self.build_frames()
+            self.build_frames(FIRST_FRAMES)
             
             # Show Start
             self.select_frame("Home")
             
+            # Start fixed-rate progress publishing
+            self.after(int(1000 / PROGRESS_HZ), self._pump_progress)
+
+            # Offer to resume downloads interrupted by the last exit/crash
+            self.after(1500, self._check_interrupted_jobs)
+            
             # Finish Loading: Close Splash and Show Main Window
             logging.info("Destroying splash...")
             self.splash.destroy()
             self.deiconify()
+            self.update_idletasks()
+            startup_profiler.mark("first_paint")
             logging.info("App loaded successfully")
+
+            # Warm the download stack and build the remaining tabs while the user reads the home screen
+            preload()
+            self.after_idle(self._build_deferred_frames)
             
         except Exception as e:
             logging.critical(f"Failed to load app: {e}", exc_info=True)
@@ -201,9 +245,6 @@ class YikesApp(ctk.CTk):
         self.separator_color = ("gray70", "gray40")  # Dividers
         
         self.configure(fg_color=self.bg_color)
-        
-        # Load Sidebar Icons
-        self.load_icons()
     
     def apply_theme_instant(self):
         """Apply theme changes instantly without restart"""
@@ -353,15 +394,33 @@ class YikesApp(ctk.CTk):
         self.content_frame.grid_rowconfigure(0, weight=1)
         self.content_frame.grid_columnconfigure(0, weight=1)
 
-    def build_frames(self):
-        # Create all frame instances
-        for name in ["Home", "Download", "Queue", "History", "Settings", "Help", "About", "Feedback"]:
-            frame = ctk.CTkFrame(self.content_frame, corner_radius=10, fg_color=self.sidebar_color)
-            frame.grid(row=0, column=0, sticky="nsew")
-            self.frames[name] = frame
-            
-            # Call builder
-            getattr(self, f"build_{name.lower()}_tab")(frame)
+    def build_frames(self, names=FRAME_NAMES):
+        # Create frame instances (skipping ones already built)
+        for name in names:
+            if name in self.frames:
+                continue
+            with startup_profiler.phase(f"frame {name}"):
+                frame = ctk.CTkFrame(self.content_frame, corner_radius=10, fg_color=self.sidebar_color)
+                frame.grid(row=0, column=0, sticky="nsew")
+                frame.lower()  # Built in the background: don't cover the visible tab
+                self.frames[name] = frame
+                
+                # Call builder
+                getattr(self, f"build_{name.lower()}_tab")(frame)
+
+    def _build_deferred_frames(self):
+        """Build the remaining tabs one per idle slot so the window stays responsive, then report startup."""
+        missing = [name for name in FRAME_NAMES if name not in self.frames]
+        if missing:
+            self.build_frames(missing[:1])
+            self.after_idle(self._build_deferred_frames)
+            return
+        startup_profiler.mark("frames_ready")
+        startup_profiler.log()
+        if os.environ.get("YIKES_STARTUP_PROFILE"):
+            startup_profiler.save(os.environ["YIKES_STARTUP_PROFILE"])
+        if os.environ.get("YIKES_EXIT_AFTER_STARTUP"):
+            self.after(100, self.destroy)
 
     def select_frame(self, name):
         # Update Buttons
@@ -371,7 +430,8 @@ class YikesApp(ctk.CTk):
             else:
                 btn.configure(fg_color="transparent", text_color=self.text_color)
         
-        # Show Frame
+        # Show Frame (building it now if the user got here before the background build did)
+        self.build_frames([name])
         frame = self.frames[name]
         frame.tkraise()
         self.current_frame = name
@@ -442,7 +502,7 @@ class YikesApp(ctk.CTk):
                                             values=["4K (2160p)", "1440p (2K)", "1080p", "720p", "480p", 
                                                     "Audio (MP3 - 320kbps)", "Audio (MP3 - 192kbps)", "Audio (MP3 - 128kbps)", 
                                                     "Audio (WAV)", "Audio (M4A)", "GIF (Animated)"], 
-                                            width=160, height=35,
+                                            width=160, height=35, command=self.on_format_changed,
                                             fg_color=self.card_color, text_color=self.text_color,
                                             border_color=self.accent_color, button_color=self.accent_color, button_hover_color=self.hover_color,
                                             dropdown_fg_color=self.card_color, dropdown_text_color=self.text_color)
@@ -558,17 +618,11 @@ class YikesApp(ctk.CTk):
         self.playlist_info_frame = ctk.CTkFrame(self.info_frame_container, fg_color="transparent")
         self.playlist_label = ctk.CTkLabel(self.playlist_info_frame, text="Playlist Content", font=("Comfortaa", 16, "bold"), text_color=self.text_color)
         self.playlist_label.pack(pady=5, anchor="w")
-        self.playlist_scroll = ctk.CTkScrollableFrame(self.playlist_info_frame, height=200, fg_color=self.card_color)
+        # Virtualized: only the visible rows exist as widgets, recycled while scrolling
+        self.playlist_scroll = VirtualList(self.playlist_info_frame, row_height=PLAYLIST_ROW_HEIGHT,
+                                           make_row=self._make_playlist_row, bind_row=self._bind_playlist_row,
+                                           height=200, fg_color=self.card_color)
         self.playlist_scroll.pack(fill="both", expand=True, pady=5)
-        # Enable smooth pixel-based scrolling
-        # Enable smooth pixel-based scrolling
-        self.playlist_scroll._parent_canvas.configure(yscrollincrement=1)
-        
-        try:
-             # Hide scrollbar initially (Auto-hide logic)
-             self.playlist_scroll._scrollbar.grid_remove()
-        except:
-             pass
         
         # Shared Status (Kept in parent for global messages / playlist status)
         self.status_label = ctk.CTkLabel(self.info_frame_container, text="", font=("Comfortaa", 14), text_color=self.text_color)
@@ -612,26 +666,6 @@ class YikesApp(ctk.CTk):
         if wrap_w > 200:
              self.video_title_label.configure(wraplength=wrap_w)
 
-    def _check_playlist_scroll(self):
-        # Auto-hide scrollbar if content fits
-        try:
-             # Need to force update to get accurate requirements
-             self.playlist_scroll.update_idletasks()
-             
-             # Height of the canvas (visible area)
-             visible_h = self.playlist_scroll._parent_canvas.winfo_height()
-             
-             # Height of the content (interior frame)
-             interior = self.playlist_scroll.winfo_children()[0] 
-             content_h = interior.winfo_reqheight()
-             
-             if content_h > visible_h:
-                  self.playlist_scroll._scrollbar.grid()
-             else:
-                  self.playlist_scroll._scrollbar.grid_remove()
-        except:
-             pass
-
     def toggle_trim(self):
         state = "normal" if self.trim_var.get() else "disabled"
         self.start_trim.configure(state=state)
@@ -681,7 +715,13 @@ class YikesApp(ctk.CTk):
         ctk.CTkButton(header, text="Clear History", width=120, height=35, 
                       fg_color=self.accent_color, hover_color=self.hover_color, text_color="white",
                       command=self.clear_history_action).pack(side="right")
-        
+
+        # Search (title / uploader, full-text)
+        self.history_search = ctk.CTkEntry(parent, height=35, font=("Comfortaa", 13), placeholder_text="Search history...")
+        self.history_search.pack(fill="x", padx=45)
+        self.history_search.bind("<KeyRelease>", self._on_history_search)
+        self._history_search_job = None
+
         self.history_frame = ctk.CTkScrollableFrame(parent, width=600, height=400, fg_color="transparent")
         self.history_frame.pack(fill="both", expand=True, padx=40, pady=10)
         self.update_history_ui()
@@ -798,6 +838,38 @@ class YikesApp(ctk.CTk):
         self.notif_var = ctk.BooleanVar(value=current_settings.get("notifications", True))
         add_check("Show Desktop Notifications", self.notif_var)
         
+        self.skip_downloaded_var = ctk.BooleanVar(value=current_settings.get("skip_downloaded", True))
+        add_check("Skip Videos Already Downloaded", self.skip_downloaded_var)
+        self.use_service_var = ctk.BooleanVar(value=current_settings.get("use_download_service", True))
+        add_check("Send Downloads to the Background Service (when running)", self.use_service_var)
+        self.process_workers_var = ctk.BooleanVar(value=current_settings.get("process_workers", False))
+        add_check("Run Each Download in Its Own Process (smoother UI)", self.process_workers_var)
+        
+        # Parallel Playlist Downloads
+        ctk.CTkLabel(s_frame, text="Parallel Playlist Downloads", text_color=self.text_color).pack(anchor="w", pady=(10, 2))
+        self.concurrency_var = ctk.StringVar(value=str(current_settings.get("playlist_concurrency", 3)))
+        ctk.CTkOptionMenu(s_frame, values=[str(n) for n in range(1, MAX_CONCURRENCY + 1)], variable=self.concurrency_var,
+                          fg_color=self.accent_color, button_color=self.hover_color, button_hover_color=self.hover_color, text_color="white").pack(anchor="w", pady=5)
+        
+        # How "Trim Video" cuts clips (logic/trim.py)
+        ctk.CTkLabel(s_frame, text="Trim Mode (Fast = keyframe cuts, Precise = re-encode cut edges only, Exact = re-encode all)",
+                     text_color=self.text_color).pack(anchor="w", pady=(10, 2))
+        self.trim_mode_var = ctk.StringVar(value=current_settings.get("trim_mode", TRIM_EXACT).title())
+        ctk.CTkOptionMenu(s_frame, values=[m.title() for m in TRIM_MODES], variable=self.trim_mode_var,
+                          fg_color=self.accent_color, button_color=self.hover_color, button_hover_color=self.hover_color, text_color="white").pack(anchor="w", pady=5)
+        
+        # GIF size budget (logic/gif.py redoes bigger GIFs smaller)
+        ctk.CTkLabel(s_frame, text="GIF Size Limit (MB, 0 = no limit)", text_color=self.text_color).pack(anchor="w", pady=(10, 2))
+        self.gif_max_mb_var = ctk.StringVar(value=str(current_settings.get("gif_max_mb", GIF_MAX_MB)))
+        ctk.CTkOptionMenu(s_frame, values=[str(n) for n in GIF_SIZE_CHOICES], variable=self.gif_max_mb_var,
+                          fg_color=self.accent_color, button_color=self.hover_color, button_hover_color=self.hover_color, text_color="white").pack(anchor="w", pady=5)
+        
+        # Total Speed Limit (shared by all running downloads)
+        ctk.CTkLabel(s_frame, text="Total Speed Limit (e.g. 5M, empty = unlimited)", text_color=self.text_color).pack(anchor="w", pady=(10, 2))
+        self.speed_limit_entry = ctk.CTkEntry(s_frame, width=150)
+        self.speed_limit_entry.pack(anchor="w", pady=5)
+        self.speed_limit_entry.insert(0, current_settings.get("speed_limit", ""))
+        
         # -- Danger Zone --
         ctk.CTkFrame(s_frame, height=1, fg_color="gray50").pack(fill="x", pady=20)
         ctk.CTkButton(s_frame, text="Reset to Defaults", fg_color="transparent", border_width=1, border_color=self.accent_color, text_color=self.accent_color,
@@ -829,7 +901,9 @@ class YikesApp(ctk.CTk):
             row = ctk.CTkFrame(p, fg_color="transparent")
             row.pack(fill="x", pady=2)
             ctk.CTkLabel(row, text=label, font=("Comfortaa", 12, "bold"), width=150, anchor="w", text_color=self.text_color).pack(side="left")
-            ctk.CTkLabel(row, text=value, font=("Comfortaa", 12), text_color="gray70", anchor="w").pack(side="left")
+            value_label = ctk.CTkLabel(row, text=value, font=("Comfortaa", 12), text_color="gray70", anchor="w")
+            value_label.pack(side="left")
+            return value_label
 
         add_info_row(info_grid, "App Version", "2.1 (Modern Edition)")
         add_info_row(info_grid, "Python Version", platform.python_version())
@@ -841,6 +915,20 @@ class YikesApp(ctk.CTk):
         except:
             pass
         add_info_row(info_grid, "backend (yt-dlp)", yt_ver)
+        ffmpeg_label = add_info_row(info_grid, "FFmpeg", "Checking...")
+
+        def show_ffmpeg():
+            # Off the Tk thread: the first probe of a new binary spawns ffmpeg (cached afterwards)
+            found = ffmpeg_locator.get()
+            if not found:
+                text = "Not found - merging and conversion will fail"
+            elif not found.runnable:
+                text = f"Found at {found.path} but cannot run"
+            else:
+                text = f"{found.version or 'Unknown version'} ({found.source}, {len(found.encoders)} encoders)"
+            self.after(0, lambda: ffmpeg_label.configure(text=text))
+
+        self.executor.submit(show_ffmpeg)
         
         # --- Troubleshooting ---
         add_section("Troubleshooting")
@@ -850,6 +938,7 @@ class YikesApp(ctk.CTk):
         
         def test_net():
             try:
+                import requests
                 requests.get("https://www.google.com", timeout=3)
                 self.show_notification("Connection Successful!", type="success")
             except:
@@ -865,6 +954,16 @@ class YikesApp(ctk.CTk):
             
         ctk.CTkButton(t_row, text="Open App Folder", height=30, fg_color=self.accent_color, hover_color=self.hover_color, text_color="white", command=open_conf).pack(side="left")
 
+        def clear_cache():
+            stats = metadata_cache.stats()
+            thumbs = thumbnail_cache.stats()
+            metadata_cache.clear()
+            thumbnail_cache.clear()
+            self.show_notification(f"Cleared {stats['entries']} cached items (hit rate {stats['hit_rate']:.0%}) "
+                                   f"and {thumbs['disk_items']} thumbnails (hit rate {thumbs['hit_rate']:.0%}).", type="success")
+
+        ctk.CTkButton(t_row, text="Clear Cache", height=30, fg_color=self.accent_color, hover_color=self.hover_color, text_color="white", command=clear_cache).pack(side="left", padx=(10, 0))
+
         # --- Shortcuts ---
         add_section("Keyboard Shortcuts")
         shortcuts = [
@@ -926,7 +1025,7 @@ class YikesApp(ctk.CTk):
         connect_row = ctk.CTkFrame(s_frame, fg_color="transparent")
         connect_row.pack(fill="x")
         
-        def open_site(u): webbrowser.open(u)
+        def open_site(u): open_url(u)
         
         ctk.CTkButton(connect_row, text="GitHub Repository", fg_color=self.accent_color, hover_color=self.hover_color, text_color="white",
                       command=lambda: open_site("https://github.com/WinterJackson/Yikes-YTD")).pack(side="left", padx=(0, 10))
@@ -964,6 +1063,7 @@ class YikesApp(ctk.CTk):
             def check():
                 try:
                     # Real GitHub Check
+                    import requests
                     r = requests.get("https://api.github.com/repos/WinterJackson/Yikes-YTD/releases/latest", timeout=5)
                     if r.status_code == 200:
                         data = r.json()
@@ -1006,7 +1106,7 @@ class YikesApp(ctk.CTk):
         ctk.CTkLabel(contact_card, text="Our support team is ready to assist you.", font=("Comfortaa", 12), text_color="gray60").pack(anchor="w", padx=20, pady=(0, 15))
         
         ctk.CTkButton(contact_card, text="Email Support", fg_color=self.accent_color, hover_color=self.hover_color,
-                      command=lambda: webbrowser.open("mailto:support@yikes.com")).pack(anchor="w", padx=20, pady=(0, 20))
+                      command=lambda: open_url("mailto:support@yikes.com")).pack(anchor="w", padx=20, pady=(0, 20))
 
         # --- Report & Request ---
         add_section("Report & Request")
@@ -1017,7 +1117,7 @@ class YikesApp(ctk.CTk):
         def open_issue(kind="bug"):
              url = "https://github.com/WinterJackson/Yikes-YTD/issues/new"
              if kind == "feature": url += "?labels=enhancement"
-             webbrowser.open(url)
+             open_url(url)
         
         ctk.CTkButton(action_row, text="Report a Bug", fg_color=self.accent_color, hover_color=self.hover_color,
                       command=lambda: open_issue("bug")).pack(side="left", padx=(0, 10))
@@ -1193,128 +1293,111 @@ class YikesApp(ctk.CTk):
         self.current_playlist_info = info
         self.current_video_info = None # Clear single info
         
-        # Populate List
-        for w in self.playlist_scroll.winfo_children(): w.destroy()
-        
-        self.playlist_widgets = [] # Reset widgets store
-        
-        # Configure Grid Columns for the Scroll Frame
-        self.playlist_scroll.grid_columnconfigure(1, weight=1) # Title takes space
-        
-        # Performance: Limit initial render to 100 items, batch the rest
-        initial_batch_size = 100
-        entries_to_render = self.playlist_entries[:initial_batch_size]
-        remaining_entries = self.playlist_entries[initial_batch_size:]
-        
-        for i, entry in enumerate(entries_to_render):
-            self._render_playlist_row(i, entry)
-        
-        # If there are more, add a "Load More" indicator and continue in background
-        if remaining_entries:
-            self._load_more_label = ctk.CTkLabel(
-                self.playlist_scroll, 
-                text=f"Loading {len(remaining_entries)} more videos...", 
-                font=("Comfortaa", 12), 
-                text_color=self.accent_color
-            )
-            self._load_more_label.pack(pady=10)
-            # Start batched background render (10 at a time, non-blocking)
-            self.after(100, lambda: self._render_playlist_batch(initial_batch_size, remaining_entries, 0))
-            
-        # Check scroll visibility
-        self.after(200, self._check_playlist_scroll)
+        # Populate List (rows are materialized on demand by the virtual list)
+        self.playlist_rows = PlaylistRows(self.playlist_entries)
+        self.playlist_scroll.set_count(len(self.playlist_rows))
 
-    def _render_playlist_row(self, index, entry):
-        """Render a single playlist row widget."""
-        # Row Container
-        row = ctk.CTkFrame(self.playlist_scroll, fg_color="transparent")
-        row.pack(fill="x", pady=5, padx=5)
+        # STRICTLY DISABLE TRIM for Playlists
+        self.trim_var.set(False)
+        self.toggle_trim()
+        self.trim_btn.configure(state="disabled", text="Trim (Video Only)")
+
+        # Per-row resolution warnings and a size estimate before anything is downloaded
+        self.start_playlist_probe()
+
+    def _make_playlist_row(self, parent):
+        """Build one recyclable playlist row; _bind_playlist_row fills it in."""
+        # Row Container (fixed height so the virtual list can position it)
+        row = ctk.CTkFrame(parent, fg_color="transparent", height=PLAYLIST_ROW_HEIGHT)
+        row.pack_propagate(False)
         
-        # 1. Thumbnail Placeholder (100x50)
+        # 1. Thumbnail Placeholder (100x56)
         thumb_label = ctk.CTkLabel(row, text="", width=100, height=56, fg_color="black") # 16:9 approx
-        thumb_label.pack(side="left", padx=(0, 10))
+        thumb_label.pack(side="left", padx=(5, 10), pady=5)
         
         # 2. Text Info
         text_frame = ctk.CTkFrame(row, fg_color="transparent")
-        text_frame.pack(side="left", fill="both", expand=True)
-        
-        # Title
-        t = entry.get('title', 'Unknown Title')
-        if len(t) > 65: t = t[:62] + "..."
-        ctk.CTkLabel(text_frame, text=f"{index+1}. {t}", font=("Comfortaa", 13, "bold"), anchor="w", text_color=self.text_color).pack(fill="x")
+        text_frame.pack(side="left", fill="both", expand=True, pady=5)
         
-        # Uploader
-        uploader = entry.get('uploader') or entry.get('channel') or "Unknown Uploader"
-        ctk.CTkLabel(text_frame, text=uploader, font=("Comfortaa", 11), text_color="gray60", anchor="w").pack(fill="x")
+        title_label = ctk.CTkLabel(text_frame, text="", font=("Comfortaa", 13, "bold"), anchor="w", text_color=self.text_color)
+        title_label.pack(fill="x")
+        uploader_label = ctk.CTkLabel(text_frame, text="", font=("Comfortaa", 11), text_color="gray60", anchor="w")
+        uploader_label.pack(fill="x")
 
         # 3. Status Column (Progress + Icon)
         status_frame = ctk.CTkFrame(row, fg_color="transparent", width=250)
         status_frame.pack(side="right", padx=10)
         
-        # Progress Bar (Hidden initially or 0)
         p_bar = ctk.CTkProgressBar(status_frame, width=100, height=8, progress_color=self.accent_color)
         p_bar.set(0)
         p_bar.pack(pady=(5, 2), anchor="e")
         
-        # Status Text
         s_label = ctk.CTkLabel(status_frame, text="Pending", font=("Comfortaa", 11), text_color="gray60")
         s_label.pack(anchor="e")
         
-        # Store refs
-        self.playlist_widgets.append({
-            "progress": p_bar,
-            "status": s_label,
-            "row": row
-        })
-
-        # Trigger Async Thumbnail Load
-        thumbnails = entry.get('thumbnails')
-        if thumbnails:
-            thumb_url = thumbnails[0].get('url') if isinstance(thumbnails, list) and thumbnails else None
+        # Store refs on the row itself
+        row.widgets = {"thumb": thumb_label, "title": title_label, "uploader": uploader_label,
+                       "progress": p_bar, "status": s_label}
+        row.thumb_url = None
+        return row
+
+    def _bind_playlist_row(self, row, index):
+        """Show model state for index in a (possibly recycled) row widget."""
+        data = self.playlist_rows.row(index)
+        w = row.widgets
+        t = data["title"]
+        if len(t) > 65: t = t[:62] + "..."
+        w["title"].configure(text=f"{index+1}. {t}")
+        w["uploader"].configure(text=data["uploader"])
+        w["progress"].set(data["progress"])
+        w["status"].configure(text=data["status"], text_color=self._playlist_state_color(data["state"]))
+
+        # Thumbnail: only reload when the row now shows a different entry
+        thumb_url = data["thumbnail"]
+        if thumb_url != row.thumb_url:
+            row.thumb_url = thumb_url
+            w["thumb"].configure(image=None, fg_color="black")
+            w["thumb"].image = None
             if thumb_url:
-                self.executor.submit(self._async_load_playlist_thumb, thumb_url, thumb_label)
-        
-        # Recursive bind scroll
-        self._bind_scroll_recursive(row)
+                img = thumbnail_cache.peek(thumb_url, (100, 56))
+                if img is not None:
+                    self._apply_thumb(w["thumb"], img, (100, 56))
+                else:
+                    self.executor.submit(self._load_row_thumb, row, thumb_url)
 
-    def _render_playlist_batch(self, start_index, remaining, batch_offset):
-        """Render remaining playlist items in small batches for smooth UI."""
-        batch_size = 10
-        batch = remaining[batch_offset:batch_offset + batch_size]
-        
-        for i, entry in enumerate(batch):
-            self._render_playlist_row(start_index + batch_offset + i, entry)
-        
-        new_offset = batch_offset + batch_size
-        if new_offset < len(remaining):
-            # Schedule next batch
-            self.after(50, lambda: self._render_playlist_batch(start_index, remaining, new_offset))
-        else:
-            # All done, remove loader
-            if hasattr(self, '_load_more_label') and self._load_more_label.winfo_exists():
-                self._load_more_label.destroy()
+    def _playlist_state_color(self, state):
+        return {"active": self.accent_color, "done": "green", "failed": "red", "cancelled": "orange",
+                "warning": "orange"}.get(state, "gray60")
 
-        # STRICTLY DISABLE TRIM for Playlists
-        self.trim_var.set(False)
-        self.toggle_trim()
-        self.trim_btn.configure(state="disabled", text="Trim (Video Only)")
+    def _load_row_thumb(self, row, url):
+        # Skip rows scrolled away before this task started
+        if row.thumb_url != url:
+            return
+        img = thumbnail_cache.get(url, (100, 56))
+        if img is not None:
+            # Apply only if the row still shows the same entry
+            self.after(0, lambda: row.thumb_url == url and self._apply_thumb(row.widgets["thumb"], img, (100, 56)))
 
     def _async_load_playlist_thumb(self, url, label_widget, size=(100, 56)):
-        try:
-            response = requests.get(url, timeout=5)
-            img = Image.open(BytesIO(response.content))
-            img = img.resize(size, Image.Resampling.LANCZOS) # Flexible size
-            
-            def update():
-                if not label_widget.winfo_exists(): return
-                # Use CTkImage to avoid warnings and handle DPI
-                photo = ctk.CTkImage(light_image=img, dark_image=img, size=size)
-                label_widget.configure(image=photo, fg_color="transparent") # Remove black placeholder
-                label_widget.image = photo # Keep ref
-            
-            self.after(0, update)
-        except:
-            pass
+        # Worker thread: memory -> disk -> network (shared with any in-flight fetch of the same URL)
+        img = thumbnail_cache.get(url, size)
+        if img is not None:
+            self.after(0, lambda: self._apply_thumb(label_widget, img, size))
+
+    def _load_card_thumb(self, url, label_widget, size):
+        """Show a cached thumbnail immediately, or fetch it off the UI thread."""
+        img = thumbnail_cache.peek(url, size)
+        if img is not None:
+            self._apply_thumb(label_widget, img, size)
+        else:
+            self.executor.submit(self._async_load_playlist_thumb, url, label_widget, size)
+
+    def _apply_thumb(self, label_widget, img, size):
+        if not label_widget.winfo_exists(): return
+        # Use CTkImage to avoid warnings and handle DPI
+        photo = ctk.CTkImage(light_image=img, dark_image=img, size=size)
+        label_widget.configure(image=photo, fg_color="transparent") # Remove black placeholder
+        label_widget.image = photo # Keep ref
     
     def _on_mouse_wheel(self, event):
         # Linux Touchpad / Mouse Wheel Support
@@ -1324,7 +1407,8 @@ class YikesApp(ctk.CTk):
         current = getattr(self, "current_frame", "")
         
         if current == "Download" and getattr(self, "is_playlist", False):
-            target = self.playlist_scroll
+            # VirtualList binds its own wheel handlers
+            return
         elif current == "History":
             target = self.history_frame
         elif current == "Queue":
@@ -1399,14 +1483,19 @@ class YikesApp(ctk.CTk):
             self.fetch_thumbnail(thumb_url)
 
     def fetch_thumbnail(self, url):
-        try:
-            response = requests.get(url, timeout=5)
-            img = Image.open(BytesIO(response.content))
-            img = img.resize((550, 309), Image.Resampling.LANCZOS) # 550px width, 16:9 approx
-            # Pass PIL Image to main thread, create PhotoImage there
-            self.after(0, lambda: self.update_thumbnail(img))
-        except:
-            pass
+        size = (550, 309) # 550px width, 16:9 approx
+        img = thumbnail_cache.peek(url, size)
+        if img is not None:
+            self.update_thumbnail(img)
+            return
+
+        def load():
+            img = thumbnail_cache.get(url, size)
+            # Pass PIL Image to main thread, create CTkImage there
+            if img is not None:
+                self.after(0, lambda: self.update_thumbnail(img))
+
+        self.executor.submit(load)
             
     def update_thumbnail(self, img_obj):
         try:
@@ -1427,28 +1516,71 @@ class YikesApp(ctk.CTk):
         """Check if selected quality is available for the given video."""
         if not info: return True, ""
         
+        # Audio/GIF keys have no requested height, so they never warn
+        warning = availability_warning(self._selected_format_key(), get_max_resolution(info))
+        return (False, warning) if warning else (True, "")
+
+    def _selected_format_key(self):
+        """Map the format dropdown text to a build_ydl_opts format key."""
         sel = self.format_var.get()
-        # Skip check for audio/gif
-        if "Audio" in sel or "GIF" in sel:
-            return True, ""
-            
-        requested_h = 0
-        if "4K" in sel: requested_h = 2160
-        elif "1440p" in sel: requested_h = 1440
-        elif "1080p" in sel: requested_h = 1080
-        elif "720p" in sel: requested_h = 720
-        elif "480p" in sel: requested_h = 480
-        else: return True, "" # Best Quality if it still existed
-        
-        max_h = get_max_resolution(info)
-        
-        if max_h > 0 and requested_h > max_h:
-            # Map height to readable name
-            res_names = {2160: "4K", 1440: "2K", 1080: "1080p", 720: "720p", 480: "480p"}
-            max_name = res_names.get(max_h, f"{max_h}p")
-            return False, f"Notice: This video only supports up to {max_name}. Downloading at the highest available quality instead."
-            
-        return True, ""
+        fmt_key = "1080p" # New default
+        if "4K" in sel: fmt_key = "4k"
+        elif "1440p" in sel: fmt_key = "1440p"
+        elif "1080p" in sel: fmt_key = "1080p"
+        elif "720p" in sel: fmt_key = "720p"
+        elif "480p" in sel: fmt_key = "480p"
+        elif "MP3 - 320" in sel: fmt_key = "mp3_320"
+        elif "MP3 - 192" in sel: fmt_key = "mp3_192"
+        elif "MP3 - 128" in sel: fmt_key = "mp3_128"
+        elif "WAV" in sel: fmt_key = "wav"
+        elif "M4A" in sel: fmt_key = "m4a"
+        elif "GIF" in sel: fmt_key = "gif"
+        return fmt_key
+
+    def on_format_changed(self, choice=None):
+        # Re-estimate a checked playlist for the new format (format tables are cached, so this is quick)
+        if self.is_playlist and self.playlist_entries and not self.download_in_progress:
+            self.start_playlist_probe()
+
+    def start_playlist_probe(self):
+        """Resolve max resolution and size of every playlist entry in the background, for row notes and a total."""
+        self.probe_generation = getattr(self, "probe_generation", 0) + 1
+        generation = self.probe_generation
+        fmt_key = self._selected_format_key()
+        urls = [entry_url(e) if e else None for e in self.playlist_entries]
+        title = (self.current_playlist_info or {}).get('title', 'Unknown Playlist')
+        self.probe_report = None
+
+        def current():
+            return generation == self.probe_generation and not self.download_in_progress
+
+        def on_result(index, result):
+            if not current():
+                return
+            if result.get('error'):
+                note, state = "Unavailable?", "warning"
+            elif result.get('warning'):
+                note, state = f"Max {RES_NAMES.get(result['max_height'], str(result['max_height']) + 'p')}", "warning"
+            else:
+                note, state = "Pending", "pending"
+            if result.get('size'):
+                note += f" • ≈{format_bytes(result['size'])}"
+            self.progress_agg.submit(("row_status", index), (note, state))
+
+        def run():
+            report = format_prober.probe(urls, fmt_key, on_result, cancel_callback=lambda: not current())
+            if not current():
+                return
+            self.probe_report = report
+            text = f"Playlist Found: {title} ({len(urls)} videos)"
+            total = report.total_size()
+            if total:
+                text += f" • ≈{format_bytes(total)} total"
+            if report.warnings:
+                text += f" • {report.warnings} below {RES_NAMES.get(FORMAT_HEIGHTS.get(fmt_key), fmt_key)}"
+            self.after(0, lambda: current() and self.status_label.configure(text=text, text_color=self.text_color))
+
+        threading.Thread(target=run, daemon=True).start()
 
     def start_download(self):
         url = self.url_entry.get()
@@ -1464,6 +1596,7 @@ class YikesApp(ctk.CTk):
         
         self.download_in_progress = True
         self.is_cancelled = False
+        self.current_job = None
         
         # Configure Cancel Button
         self.download_btn.configure(state="normal", text="Cancel Download", fg_color="red", hover_color="darkred", command=self.cancel_download_action)
@@ -1485,19 +1618,7 @@ class YikesApp(ctk.CTk):
                 return
         
         # Helper Map
-        sel = self.format_var.get()
-        fmt_key = "1080p" # New default
-        if "4K" in sel: fmt_key = "4k"
-        elif "1440p" in sel: fmt_key = "1440p"
-        elif "1080p" in sel: fmt_key = "1080p"
-        elif "720p" in sel: fmt_key = "720p"
-        elif "480p" in sel: fmt_key = "480p"
-        elif "MP3 - 320" in sel: fmt_key = "mp3_320"
-        elif "MP3 - 192" in sel: fmt_key = "mp3_192"
-        elif "MP3 - 128" in sel: fmt_key = "mp3_128"
-        elif "WAV" in sel: fmt_key = "wav"
-        elif "M4A" in sel: fmt_key = "m4a"
-        elif "GIF" in sel: fmt_key = "gif"
+        fmt_key = self._selected_format_key()
         
         # Availability Validation
         if not self.is_playlist and self.current_video_info:
@@ -1511,11 +1632,7 @@ class YikesApp(ctk.CTk):
             # Create playlist folder inside downloads folder
             playlist_title = getattr(self, "current_playlist_info", {}).get("title", "Playlist")
             # Sanitize folder name (remove invalid filesystem characters + Windows reserved names)
-            safe_title = re.sub(r'[<>:"/\\|?*]', '_', playlist_title)[:100].strip()
-            # Handle Windows reserved names (CON, PRN, AUX, NUL, COM1-9, LPT1-9)
-            reserved_names = {'CON', 'PRN', 'AUX', 'NUL'} | {f'COM{i}' for i in range(1, 10)} | {f'LPT{i}' for i in range(1, 10)}
-            if safe_title.upper() in reserved_names or not safe_title:
-                safe_title = "Playlist"
+            safe_title = safe_folder_name(playlist_title)
             playlist_path = os.path.join(current_settings["download_path"], safe_title)
             os.makedirs(playlist_path, exist_ok=True)
             
@@ -1523,8 +1640,13 @@ class YikesApp(ctk.CTk):
             self.current_playlist_folder = playlist_path
             
             opts = build_ydl_opts(playlist_path, fmt_key, trim_range=trim_range)
+            recorder = self._journal_job("playlist", url, fmt_key, playlist_path, playlist_title,
+                                         [{"url": entry_url(e), "title": e.get('title')} for e in self.playlist_entries if e])
             # Start Playlist Thread
-            threading.Thread(target=self.playlist_download_worker, args=(opts,), daemon=True).start()
+            report = getattr(self, "probe_report", None)
+            size_estimate = report.total_size() if report and report.format_key == fmt_key else None
+            threading.Thread(target=self.playlist_download_worker, args=(opts, recorder, archive_scope(fmt_key), size_estimate),
+                             daemon=True).start()
         else:
             # Single Download: Use default path
             self.current_playlist_folder = None
@@ -1544,23 +1666,198 @@ class YikesApp(ctk.CTk):
             self.status_label.configure(text="Initializing Download...", text_color=self.text_color)
             
             # Reset Stats
-            self.last_progress_info = {}
+            self.last_progress_raw = None
+            self.last_transfer.reset()
+            self.trim_report = None
+            self.gif_report = None
             
             # SHOW Progress Bar ONLY when downloading
             self.progress_bar.pack(fill="x", pady=(5, 5), padx=0, anchor="w")
             self.progress_text.pack(pady=(0, 10), anchor="w", padx=0)
             
-            start_download_thread(url, opts, self.on_progress, self.on_complete, self.on_error, lambda: self.is_cancelled)
+            title = (self.current_video_info or {}).get('title')
+            # Looking for the service reads service.json and asks it over HTTP: off the Tk thread
+            threading.Thread(target=self._dispatch_download,
+                             args=(url, opts, fmt_key, download_path, title, trim_range, self.current_video_info),
+                             daemon=True).start()
+
+    def _dispatch_download(self, url, opts, fmt_key, path, title, trim_range, info):
+        """Download thread: hand the download to the service if one is running, else download in-process."""
+        service = self._download_service()
+        if service:
+            # The service owns the download from here; it keeps going if this window closes
+            self._service_download_worker(service, url, fmt_key, path, title, trim_range)
+            return
+        self.current_job = self._journal_job("video", url, fmt_key, path, title, [{"url": url, "title": title}],
+                                             trim_range=trim_range)
+        phase_cb = (lambda phase, filename, job=self.current_job: job.item_phase(0, phase, filename)) if self.current_job else None
+
+        # Hand over the info from Check so the download skips a second extraction
+        start_download_thread(url, opts, self.on_progress, self.on_complete, self.on_error, lambda: self.is_cancelled,
+                              info=info, phase_callback=phase_cb,
+                              archive=archive_scope(fmt_key, trimmed=bool(trim_range)), worker=selected_worker())
+
+    def _download_service(self):
+        """Client of a running download service (python -m logic.service), or None to download in-process."""
+        if not current_settings.get("use_download_service", True):
+            return None
+        return ServiceClient.discover()
+
+    def _service_download_worker(self, service, url, fmt_key, path, title, trim_range):
+        """Follow a download handed to the download service, feeding its events to the usual callbacks."""
+        finished = False
+        followed = threading.Event()
+
+        def watch_cancel(job_id):
+            # Not from the event loop: a job still queued or extracting sends nothing but pings
+            while not followed.wait(SERVICE_CANCEL_POLL):
+                if self.is_cancelled and not self.is_closing:  # Closing sets is_closing first; read it last
+                    try:
+                        service.cancel(job_id)
+                    except Exception as e:
+                        logging.warning(f"Cannot cancel service job {job_id}: {e}")
+                    return
+                if self.is_closing:
+                    return  # Left to the service
 
-    def playlist_download_worker(self, opts):
-        """Sequential download manager for playlists with per-item progress and failure tracking"""
+        try:
+            job_id = service.enqueue(url, fmt_key, path=path, title=title, trim=trim_range)
+            threading.Thread(target=watch_cancel, args=(job_id,), daemon=True).start()
+            for event in service.events(job=job_id):
+                if self.is_closing:
+                    return  # Left to the service
+                kind = event.get("event")
+                if kind == "progress":
+                    self.on_progress(progress_info(event))
+                elif kind in ("done", "skipped"):
+                    finished = True
+                    if event.get("cut"):
+                        self.trim_report = {"mode": event.get("trim_mode"), "requested": list(trim_range),
+                                            "achieved": event["cut"]}
+                    if event.get("gif_bytes") is not None:
+                        self.gif_report = {"bytes": event["gif_bytes"], "seconds": event.get("gif_seconds")}
+                    if kind == "skipped":
+                        self.last_progress_raw = {'status': 'skipped', 'filename': event.get('path'),
+                                                  'total_bytes': event.get('bytes')}
+                        self.last_transfer.observe(self.last_progress_raw)
+                    self.on_complete()
+                elif kind in ("failed", "cancelled"):
+                    finished = True
+                    self.on_error(event.get("error") or "Cancelled")
+        except Exception as e:
+            logging.error(f"Download service failed for {url}: {e}")
+        finally:
+            followed.set()
+        if not finished and not self.is_closing:
+            self.on_error("Lost connection to the download service")
+
+    def _journal_job(self, kind, url, fmt_key, path, title, items, trim_range=None):
+        """Record a new download in the crash-safe journal; returns its JobRecorder (None if the journal is unavailable)."""
+        try:
+            job_id = job_journal.create_job(kind, url, fmt_key, path, items, title=title,
+                                            options={"trim_range": list(trim_range) if trim_range else None})
+            return job_journal.recorder(job_id)
+        except Exception as e:
+            logging.warning(f"Job journal unavailable: {e}")
+            return None
+
+    def _close_job(self, recorder):
+        # User cancel ends the job; app exit leaves unfinished items resumable
+        cancelled = self.is_cancelled and not self.is_closing
+        recorder.finish(JOB_CANCELLED if cancelled else None)
+
+    def _check_interrupted_jobs(self):
+        """Clean up orphaned partial files, then offer to resume downloads left unfinished."""
+        self.build_frames()  # Resuming drives the Download tab
+        def scan():
+            try:
+                job_journal.prune()
+                count, size = job_journal.collect_orphans([current_settings["download_path"]])
+                if count:
+                    logging.info(f"Removed {count} orphaned partial files ({size / 1024 / 1024:.1f} MB)")
+                jobs = job_journal.unfinished_jobs()
+            except Exception as e:
+                logging.warning(f"Job journal scan failed: {e}")
+                return
+            if jobs:
+                self.after(0, lambda: self._offer_resume(jobs))
+
+        threading.Thread(target=scan, daemon=True).start()
+
+    def _offer_resume(self, jobs):
+        items = sum(len(j["items"]) for j in jobs)
+        names = ", ".join((j["title"] or j["url"])[:40] for j in jobs[:3]) + (" ..." if len(jobs) > 3 else "")
+        if self.show_blocking_confirm("Resume Downloads",
+                                      f"{items} download(s) were interrupted last time:\n{names}\n\nResume them now?",
+                                      "Resume", "Discard"):
+            self.is_cancelled = False
+            self.download_in_progress = True
+            threading.Thread(target=self._resume_worker, args=(jobs,), daemon=True).start()
+        else:
+            threading.Thread(target=lambda: [job_journal.discard_job(j["id"]) for j in jobs], daemon=True).start()
+
+    def _resume_worker(self, jobs):
+        """Re-run unfinished journal items with their original options; yt-dlp continues from the .part files."""
+        failed_total = 0
+        for job in jobs:
+            if self.is_cancelled:
+                break
+            trim = job["options"].get("trim_range")
+            opts = build_ydl_opts(job["path"], job["format_key"], trim_range=tuple(trim) if trim else None)
+            os.makedirs(job["path"], exist_ok=True)
+            title = (job["title"] or job["url"])[:40]
+            recorder = job_journal.recorder(job["id"], [item["idx"] for item in job["items"]])
+
+            def summary(done, failed, active, total, skipped=0, saved_bytes=0, title=title):
+                self.progress_agg.submit("summary", f"Resuming {title}: {done + failed}/{total} finished • {active} active"
+                                                    f"{self._skip_summary(skipped, saved_bytes)}{self._convert_depths()}")
+
+            engine = PlaylistEngine([{"url": item["url"], "title": item["title"]} for item in job["items"]], opts,
+                                    concurrency=current_settings.get("playlist_concurrency", 3),
+                                    summary_callback=summary, cancel_callback=lambda: self.is_cancelled,
+                                    journal=recorder, postprocess=postprocess_pool, prefetch=self._playlist_prefetch(),
+                                    archive=archive_scope(job["format_key"], trimmed=bool(trim)), worker=selected_worker())
+            _, failed = engine.run()
+            if engine.prefetch:
+                engine.prefetch.close()
+            failed_total += failed
+            self._close_job(recorder)
+
+        self.progress_agg.discard("summary")
+        self.download_in_progress = False
+        if self.is_closing:
+            return
+        msg = "Resumed downloads complete" + (f" ({failed_total} failed)" if failed_total else "")
+        self.after(0, lambda: self.status_label.configure(text=msg, text_color="orange" if failed_total else "green"))
+        self.after(0, lambda: self.show_notification(msg, type="warning" if failed_total else "success"))
+
+    @staticmethod
+    def _playlist_prefetch():
+        """Lookahead for one playlist run, or None when disabled in settings"""
+        lookahead = current_settings.get("prefetch_lookahead", 2)
+        return Prefetcher(lookahead) if lookahead > 0 else None
+
+    @staticmethod
+    def _skip_summary(skipped, saved_bytes):
+        """Archive skips for the playlist summary line (empty when none)"""
+        return f" • {skipped} already downloaded ({format_bytes(saved_bytes)} saved)" if skipped else ""
+
+    @staticmethod
+    def _convert_depths():
+        """Post-process stage depths for the playlist summary line (empty while idle)"""
+        d = postprocess_pool.depths()
+        if not d["running"] and not d["queued"]:
+            return ""
+        return f" • {d['running']} converting, {d['queued']} waiting"
+
+    def playlist_download_worker(self, opts, recorder=None, archive=None, size_estimate=None):
+        """Parallel download manager for playlists with per-item progress and failure tracking"""
         total_videos = len(self.playlist_entries)
-        failed_count = 0  # Track failures for accurate reporting
         
-        # Disk Space Check for playlists (estimate 500MB per video, warn if low)
+        # Disk Space Check for playlists (probed size if available, else 500MB per video; warn if low)
         download_path = current_settings["download_path"]
         free_gb = get_free_disk_space_gb(download_path)
-        estimated_need_gb = total_videos * 0.5  # 500MB per video estimate
+        estimated_need_gb = size_estimate / 1024 ** 3 if size_estimate else total_videos * 0.5
         if free_gb > 0 and free_gb < estimated_need_gb:
             self.after(0, lambda: self.show_notification(
                 f"⚠️ Low disk space! {free_gb:.1f}GB free, playlist may need ~{estimated_need_gb:.0f}GB.",
@@ -1571,74 +1868,32 @@ class YikesApp(ctk.CTk):
         self.after(0, lambda: self.progress_bar.pack_forget())
         self.after(0, lambda: self.progress_text.pack_forget())
 
-        for i, entry in enumerate(self.playlist_entries):
-            # Update UI for current video -> Active
-            title = entry.get('title', f'Video {i+1}')
-            video_url = entry.get('url') or entry.get('webpage_url') 
-            
-            # Mark Active
-            self.after(0, lambda idx=i: self.update_playlist_row_status(idx, "Downloading...", self.accent_color))
-            
-            self.after(0, lambda t=title, idx=i: self.status_label.configure(
-                text=f"Downloading {idx+1}/{total_videos}: {t[:40]}...", text_color=self.accent_color))
-            
-            try:
-                from logic.downloader import download_worker 
-                
-                # Custom callback for THIS row
-                def prog_cb(info):
-                   # Calculate percent
-                   if info.get('status') == 'downloading':
-                       total = info.get('total_bytes') or info.get('total_bytes_estimate') or 1
-                       downloaded = info.get('downloaded_bytes') or 0
-                       
-                       p = 0
-                       if total > 0:
-                           p = downloaded / total
-                       
-                       # Extract strings provided by yt-dlp or fallback
-                       speed_s = info.get('_speed_str', 'N/A').strip()
-                       total_s = info.get('_total_bytes_str', 'N/A').strip()
-                       percent_s = info.get('_percent_str', f"{p*100:.1f}%").strip()
-                       
-                       # Fallback format if needed
-                       if speed_s == 'N/A' and info.get('speed'):
-                           speed_s = f"{info['speed']/1024/1024:.1f} MB/s"
-                       # Format: "Size: 10.5MiB • Speed: 2.5MiB/s • Progress: 45.0%"
-                       details = f"Size: {total_s} • Speed: {speed_s} • Progress: {percent_s}"
-
-                       # Status Text: Downloading Video... / Downloading Audio...
-                       content_type = info.get('_content_type', 'Content')
-                       status_text = f"Downloading {content_type}..."
-
-                       # Update specific bar & label
-                       self.after(0, lambda idx=i, val=p: self.update_playlist_row_progress(idx, val))
-                       # Wait, user wants clear steps "Downloading Video". 
-                       # The current UI puts details in the 'status' label. 
-                       # Maybe prepend the step? "Downloading Video: Size... • Speed..."
-                       full_msg = f"{status_text} | {details}"
-                       self.after(0, lambda idx=i, txt=full_msg: self.update_playlist_row_status(idx, txt, self.accent_color))
-                    
-                   elif info.get('status') == 'merging':
-                       self.after(0, lambda idx=i: self.update_playlist_row_status(idx, "Merging Video & Audio...", self.accent_color))
-                       # Indeterminate progress or full?
-                       self.after(0, lambda idx=i: self.update_playlist_row_progress(idx, 1.0))
-
-                # Deep copy opts
-                download_worker(video_url, copy.deepcopy(opts), prog_cb, None, None) 
-                
-                # Mark Done
-                self.after(0, lambda idx=i: self.update_playlist_row_status(idx, "✔ Done", "green"))
-                # Learn: Do not auto-set progress to 1.0 here if we just finished merging, it might flicker.
-                self.after(0, lambda idx=i: self.update_playlist_row_progress(idx, 1.0))
+        # Parallel engine: N entries in flight, per-row updates marshalled to the Tk loop
+        # Row updates are coalesced and published by _pump_progress
+        def row_progress(idx, val):
+            self.progress_agg.submit(("row_progress", idx), val)
+
+        def row_status(idx, text, state):
+            self.progress_agg.submit(("row_status", idx), (text, state))
+
+        def summary(done, failed, active, total, skipped=0, saved_bytes=0):
+            self.progress_agg.submit("summary", f"Downloading: {done + failed}/{total} finished • {active} active"
+                                                f"{self._skip_summary(skipped, saved_bytes)}{self._convert_depths()}")
+
+        engine = PlaylistEngine(self.playlist_entries, opts,
+                                concurrency=current_settings.get("playlist_concurrency", 3),
+                                row_progress=row_progress, row_status=row_status,
+                                summary_callback=summary, cancel_callback=lambda: self.is_cancelled,
+                                journal=recorder, postprocess=postprocess_pool, prefetch=self._playlist_prefetch(),
+                                archive=archive, worker=selected_worker())
+        _, failed_count = engine.run()
+        if engine.prefetch:
+            engine.prefetch.close()
+        if recorder:
+            self._close_job(recorder)
+        self.progress_agg.discard("summary")
+        logging.debug(f"Playlist progress events: {self.progress_agg.stats()}")
 
-            except Exception as e:
-                failed_count += 1  # Increment failure counter
-                print(f"Failed to download {title}: {e}")
-                self.after(0, lambda idx=i: self.update_playlist_row_status(idx, "Failed", "red"))
-            
-            time.sleep(1)
-            
         # Accurate Completion Status
         if failed_count > 0:
             status_msg = f"✔ Playlist Complete ({total_videos - failed_count}/{total_videos} succeeded, {failed_count} failed)"
@@ -1646,6 +1901,8 @@ class YikesApp(ctk.CTk):
         else:
             status_msg = f"✔ Playlist Download Complete!"
             status_color = "green"
+        if engine.skipped:
+            status_msg += f" ({engine.skipped} already downloaded, {format_bytes(engine.saved_bytes)} saved)"
             
         self.after(0, lambda: self.status_label.configure(text=status_msg, text_color=status_color))
         self.after(0, lambda: self.download_btn.configure(state="normal", text="Open Folder", command=self.open_download_folder))
@@ -1674,21 +1931,22 @@ class YikesApp(ctk.CTk):
         if current_settings.get("notifications", True) and sys.platform.startswith('linux'):
              self.after(0, lambda: subprocess.run(['notify-send', "Yikes YTD", status_msg], check=False))
         
+        self._finish_queue_item(failed_count == 0, status_msg if failed_count else None)
+
         # Auto-Process Next (Thread)
         if getattr(self, "is_processing_queue", False):
              self.after(1500, self.process_queue)
              
         # No messagebox
 
-    def update_playlist_row_status(self, index, text, color):
-        if index < len(self.playlist_widgets):
-             w = self.playlist_widgets[index]
-             w["status"].configure(text=text, text_color=color)
+    def update_playlist_row_status(self, index, text, state):
+        # Update the model; the widget (if the row is on screen) re-reads it
+        self.playlist_rows.update(index, status=text, state=state)
+        self.playlist_scroll.refresh_row(index)
 
     def update_playlist_row_progress(self, index, val):
-        if index < len(self.playlist_widgets):
-             w = self.playlist_widgets[index]
-             w["progress"].set(val)
+        self.playlist_rows.update(index, progress=val)
+        self.playlist_scroll.refresh_row(index)
 
     def on_complete_playlist(self):
         self.download_in_progress = False
@@ -1719,6 +1977,8 @@ class YikesApp(ctk.CTk):
         if current_settings.get("notifications", True) and sys.platform.startswith('linux'):
              self.after(0, lambda: subprocess.run(['notify-send', "Yikes YTD", "Playlist Download Complete!"], check=False))
         
+        self._finish_queue_item(True)
+
         # Auto-Process Next (GUI Callback)
         if getattr(self, "is_processing_queue", False):
              self.after(1500, self.process_queue)
@@ -1726,50 +1986,96 @@ class YikesApp(ctk.CTk):
 
 
     def on_progress(self, info):
-        # Handle Merge Status
-        if info.get('status') == 'merging':
-            self.after(0, lambda: self.status_label.configure(text="Merging Video & Audio...", text_color=self.accent_color))
-            self.after(0, lambda: self.progress_text.configure(text="Processing..."))
+        # Called on the download thread for every yt-dlp tick: only record, never touch Tk here.
+        # _pump_progress publishes the latest state at PROGRESS_HZ.
+        self.last_transfer.observe(info)
+        if info.get('status') == 'trimmed':
+            self.trim_report = info['trim']  # Shown by on_complete
             return
+        if info.get('status') == 'converted':
+            self.gif_report = info.get('gif')
+            return
+        self.last_progress_raw = info
+        self.progress_agg.submit("single", info)
 
-        # Update UI safely - use 'or' to handle explicit None values from yt-dlp
+    def _pump_progress(self):
+        """Apply coalesced progress events at a fixed UI rate."""
+        for job, event in self.progress_agg.drain().items():
+            try:
+                if job == "single":
+                    self._apply_progress(event)
+                elif job == "summary":
+                    self.status_label.configure(text=event, text_color=self.accent_color)
+                elif job[0] == "row_progress":
+                    self.update_playlist_row_progress(job[1], event)
+                elif job[0] == "row_status":
+                    self.update_playlist_row_status(job[1], *event)
+            except Exception as e:
+                logging.debug(f"Progress update failed for {job}: {e}")
+        self.after(int(1000 / PROGRESS_HZ), self._pump_progress)
+
+    def _progress_stats(self, info):
         total = info.get('total_bytes') or info.get('total_bytes_estimate') or 1
         if total <= 0: total = 1
         downloaded = info.get('downloaded_bytes') or 0
         p = downloaded / total
-        
-        self.after(0, lambda: self.progress_bar.set(p))
-        eta = format_eta(info.get('eta') or 0)
-        speed = (info.get('speed') or 0) / 1024
-        
+
         # Extract Strings
-        speed_s = info.get('_speed_str', 'N/A').strip()
+        speed_s = (info.get('_speed_str') or 'N/A').strip()
         if speed_s == 'N/A' and info.get('speed'):
              speed_s = f"{info['speed']/1024/1024:.1f} MB/s"
-             
-        total_s = info.get('_total_bytes_str', 'N/A').strip()
-        percent_s = info.get('_percent_str', f"{p*100:.1f}%").strip()
+        total_s = (info.get('_total_bytes_str') or 'N/A').strip()
+        percent_s = (info.get('_percent_str') or f"{p*100:.1f}%").strip()
+        return p, {"speed": speed_s, "total_str": total_s, "percent": percent_s}
+
+    def _apply_progress(self, info):
+        # Runs on the Tk loop (via _pump_progress)
+        if info.get('status') == 'skipped':
+            self.status_label.configure(text="Already downloaded, skipping...", text_color=self.accent_color)
+            return
+        if info.get('status') == 'trimming':
+            self.status_label.configure(text="Trimming Clip...", text_color=self.accent_color)
+            self.progress_text.configure(text="Processing...")
+            return
+        if info.get('status') == 'converting':
+            self.status_label.configure(text="Converting to GIF...", text_color=self.accent_color)
+            self.progress_text.configure(text="Processing...")
+            return
+        # Handle Merge Status
+        if info.get('status') == 'merging':
+            self.status_label.configure(text="Merging Video & Audio...", text_color=self.accent_color)
+            self.progress_text.configure(text="Processing...")
+            return
+
+        p, stats = self._progress_stats(info)
+        self.progress_bar.set(p)
+        eta = format_eta(info.get('eta') or 0)
         
         content_type = info.get('_content_type', 'Content')
         status_msg = f"Downloading {content_type}..."
         
         # Stats Line: Step | Speed | Size
-        stats = f"{status_msg}  |  Speed: {speed_s}  |  Size: {total_s}"
-        
-        # Capture for history
-        self.last_progress_info = {
-            "speed": speed_s,
-            "total_str": total_s,
-            "percent": percent_s
-        }
-        
-        self.after(0, lambda: self.status_label.configure(text=stats, text_color=self.accent_color))
-        self.after(0, lambda: self.progress_text.configure(text=f"{int(p*100)}%  •  ETA: {eta}"))
+        self.status_label.configure(text=f"{status_msg}  |  Speed: {stats['speed']}  |  Size: {stats['total_str']}", text_color=self.accent_color)
+        self.progress_text.configure(text=f"{int(p*100)}%  •  ETA: {eta}")
 
     def on_complete(self):
         self.download_in_progress = False
+        if self.current_job:
+            self.current_job.item_finished(0, True)
+            self._close_job(self.current_job)
+            self.current_job = None
+        self.progress_agg.discard("single")
         # Success State - Green & Actions
-        self.after(0, lambda: self.status_label.configure(text="✔ Download Complete!", text_color="green"))
+        last = getattr(self, "last_progress_raw", None)
+        if last and last.get('status') == 'skipped':
+            done_msg = f"✔ Already downloaded ({format_bytes(last.get('total_bytes') or 0)} saved)"
+        elif self.gif_report:
+            done_msg = self._gif_message(self.gif_report)
+        elif self.trim_report:
+            done_msg = self._trim_message(self.trim_report)
+        else:
+            done_msg = "✔ Download Complete!"
+        self.after(0, lambda: self.status_label.configure(text=done_msg, text_color="green"))
         self.after(0, lambda: self.download_btn.configure(state="normal", text="Open Folder", command=self.open_download_folder, fg_color=self.accent_color, hover_color=self.hover_color))
         # Enable "Play Now"
         self.after(0, lambda: self.play_btn.configure(state="normal", text="Play Now"))
@@ -1787,7 +2093,6 @@ class YikesApp(ctk.CTk):
         
         # Add to history (RICH DATA)
         info = getattr(self, "current_video_info", {}) or {}
-        stats = getattr(self, "last_progress_info", {}) or {}
         
         entry = {
             "title": info.get("title", "Unknown Video"),
@@ -1795,7 +2100,7 @@ class YikesApp(ctk.CTk):
             "thumbnail": info.get("thumbnail"),
             "uploader": info.get("uploader", "Unknown"),
             "duration": info.get("duration"),
-            "size": stats.get("total_str", "Unknown"),
+            "size": self.last_transfer.size_str(),
             "resolution": self.format_var.get(),
             "date": time.strftime("%Y-%m-%d %H:%M"),
             "type": "video"
@@ -1807,10 +2112,30 @@ class YikesApp(ctk.CTk):
         if current_settings.get("notifications", True) and sys.platform.startswith('linux'):
              self.after(0, lambda: subprocess.run(['notify-send', "Yikes YTD", "Download Complete!"], check=False))
         
+        self._finish_queue_item(True)
+
         # Auto-Process Next
         if getattr(self, "is_processing_queue", False):
              self.after(1500, self.process_queue)
         
+    def _trim_message(self, report):
+        """Where the clip's cuts landed, e.g. '✔ Clip saved: 0:58.34 - 1:30.00 (1.66s early, at a keyframe)'."""
+        start, end = report["achieved"]
+        msg = f"✔ Clip saved: {format_timestamp(start)} - {format_timestamp(end)}"
+        early = report["requested"][0] - start
+        if report.get("mode") == TRIM_FAST and early >= 0.01:
+            msg += f" ({early:.2f}s early, at a keyframe)"
+        return msg
+
+    def _gif_message(self, report):
+        """The GIF's size and how long converting took, e.g. '✔ GIF saved: 3.2 MB (converted in 4.1s)'."""
+        msg = f"✔ GIF saved: {format_bytes(report['bytes'])}"
+        if report.get("seconds") is not None:
+            msg += f" (converted in {report['seconds']:.1f}s)"
+        if report.get("within_budget") is False:
+            msg += " - over the size limit"
+        return msg
+
     def open_download_folder(self):
         path = getattr(self, "current_playlist_folder", None)
         if not path or not os.path.exists(path):
@@ -1826,6 +2151,12 @@ class YikesApp(ctk.CTk):
 
     def on_error(self, err_msg):
         self.download_in_progress = False
+        if self.current_job:
+            self.current_job.item_finished(0, False, err_msg)
+            self._close_job(self.current_job)
+            self.current_job = None
+        self._finish_queue_item(False, err_msg)
+        self.progress_agg.discard("single")
         self.after(0, lambda: self.status_label.configure(text=f"Error: {err_msg}", text_color="red"))
         self.after(0, lambda: self.download_btn.configure(state="normal", text="Download Now", command=self.start_download, fg_color=self.accent_color, hover_color=self.hover_color))
         
@@ -1907,7 +2238,7 @@ class YikesApp(ctk.CTk):
             thumb_label = ctk.CTkLabel(c, text="", width=100, height=50, fg_color="black")
             thumb_label.pack(side="left", padx=10, pady=8)
             if thumb_url:
-                self._async_load_playlist_thumb(thumb_url, thumb_label, size=(100, 50))
+                self._load_card_thumb(thumb_url, thumb_label, (100, 50))
             
             # Info Column
             info_frame = ctk.CTkFrame(c, fg_color="transparent")
@@ -1932,14 +2263,25 @@ class YikesApp(ctk.CTk):
             # Remove Button
             ctk.CTkButton(c, text="Remove", width=80, height=25, fg_color="transparent", border_width=1, 
                           border_color=self.accent_color, text_color=self.accent_color, hover_color=("gray90", "gray20"),
-                          command=lambda idx=i: self.remove_queue_action(idx)).pack(side="right", padx=10)
+                          command=lambda item_id=item['id']: self.remove_queue_action(item_id)).pack(side="right", padx=10)
         
         # Bind Scroll
         self._bind_scroll_recursive(self.queue_frame)
 
-    def remove_queue_action(self, index):
-        remove_from_queue(index)
+    def remove_queue_action(self, item_id):
+        remove_from_queue(item_id)
         self.update_queue_ui()
+
+    def _finish_queue_item(self, ok, error=None):
+        """Record the outcome of the queue item currently downloading, if any."""
+        item_id = getattr(self, "current_queue_id", None)
+        if item_id is None:
+            return
+        self.current_queue_id = None
+        try:
+            finish_queue_item(item_id, ok, error)
+        except Exception as e:
+            logging.error(f"Failed to update queue item {item_id}: {e}")
         
     def clear_queue_action(self):
         if self.show_blocking_confirm("Clear Queue", "Clear all pending downloads?", "Clear All", "Cancel", "danger"):
@@ -1949,33 +2291,60 @@ class YikesApp(ctk.CTk):
     def update_history_ui(self):
         # 1. Clear current items and show loader
         for w in self.history_frame.winfo_children(): w.destroy()
+        self.history_more_btn = None
         
         self.history_loader = ctk.CTkLabel(self.history_frame, text="Loading History...", font=("Comfortaa", 14), text_color="gray60")
         self.history_loader.pack(pady=40)
         
-        # 2. Threaded Load
-        threading.Thread(target=self._load_history_async, daemon=True).start()
-
-    def _load_history_async(self):
-        data = load_history()
+        # 2. Threaded Load (first page)
+        query = self.history_search.get().strip() if hasattr(self, "history_search") else ""
+        threading.Thread(target=self._load_history_async, args=(query, None), daemon=True).start()
+
+    def _on_history_search(self, event=None):
+        # Debounce: search once typing pauses
+        if self._history_search_job:
+            self.after_cancel(self._history_search_job)
+        self._history_search_job = self.after(300, self.update_history_ui)
+
+    def _load_more_history(self):
+        if self.history_more_btn:
+            self.history_more_btn.configure(state="disabled", text="Loading...")
+        query = self.history_search.get().strip()
+        threading.Thread(target=self._load_history_async, args=(query, self.history_cursor), daemon=True).start()
+
+    def _load_history_async(self, query, before_id):
+        # Keyset pagination: each page is an index range scan, however large the history grows
+        data = load_history(HISTORY_PAGE_SIZE, before_id, query)
         # Trigger render on main thread
-        self.after(0, lambda: self._start_history_render(data))
+        self.after(0, lambda: self._start_history_render(data, query, append=before_id is not None))
 
-    def _start_history_render(self, data):
-        # Remove loader
+    def _start_history_render(self, data, query="", append=False):
+        # Remove loader / previous "Load More"
         if hasattr(self, 'history_loader') and self.history_loader.winfo_exists():
             self.history_loader.destroy()
+        if getattr(self, "history_more_btn", None) and self.history_more_btn.winfo_exists():
+            self.history_more_btn.destroy()
+        self.history_more_btn = None
             
-        if not data:
-            ctk.CTkLabel(self.history_frame, text="No download history yet.", font=("Comfortaa", 14), text_color="gray60").pack(pady=40)
+        if not data and not append:
+            text = f"No history matches \"{query}\"." if query else "No download history yet."
+            ctk.CTkLabel(self.history_frame, text=text, font=("Comfortaa", 14), text_color="gray60").pack(pady=40)
             return
 
+        if data:
+            self.history_cursor = data[-1]["id"]
         # Start cascading render
-        self._render_history_batch(data, 0)
+        self._render_history_batch(data, 0, has_more=len(data) == HISTORY_PAGE_SIZE)
 
-    def _render_history_batch(self, data, index):
+    def _render_history_batch(self, data, index, has_more=False):
         # Render items one by one for smooth cascading effect
         if index >= len(data):
+            if has_more:
+                self.history_more_btn = ctk.CTkButton(self.history_frame, text="Load More", width=140, height=32,
+                                                      fg_color="transparent", border_width=1, border_color=self.accent_color,
+                                                      text_color=self.text_color, hover_color=self.hover_color,
+                                                      command=self._load_more_history)
+                self.history_more_btn.pack(pady=10)
             # Bind scroll events after all items are rendered
             self._bind_scroll_recursive(self.history_frame)
             return
@@ -1984,7 +2353,7 @@ class YikesApp(ctk.CTk):
         self._render_single_history_card(item)
         
         # Schedule next item with tiny delay (5ms) for smooth visual
-        self.after(5, lambda: self._render_history_batch(data, index + 1))
+        self.after(5, lambda: self._render_history_batch(data, index + 1, has_more))
         
     def _render_single_history_card(self, item):
         # Card Container
@@ -1996,7 +2365,7 @@ class YikesApp(ctk.CTk):
         thumb_label = ctk.CTkLabel(c, text="", width=100, height=50, fg_color="black")
         thumb_label.pack(side="left", padx=10, pady=8)
         if thumb_url:
-            self._async_load_playlist_thumb(thumb_url, thumb_label, size=(100, 50))
+            self._load_card_thumb(thumb_url, thumb_label, (100, 50))
         
         # 2. Info Column
         info_frame = ctk.CTkFrame(c, fg_color="transparent")
@@ -2039,7 +2408,7 @@ class YikesApp(ctk.CTk):
         # Open Link
         ctk.CTkButton(btns, text="Open", width=60, height=25, fg_color="transparent", border_width=1, border_color=self.accent_color,
                       text_color=self.text_color, hover_color=self.hover_color,
-                      command=lambda u=item.get('url'): webbrowser.open(u)).pack(side="left", padx=(0, 5))
+                      command=lambda u=item.get('url'): open_url(u)).pack(side="left", padx=(0, 5))
                       
         # Redownload
         ctk.CTkButton(btns, text="Redownload", width=90, height=25, fg_color=self.accent_color, text_color="white", hover_color=self.hover_color,
@@ -2047,7 +2416,7 @@ class YikesApp(ctk.CTk):
 
     def clear_history_action(self):
         if self.show_blocking_confirm("Clear History", "Clear all download history?", "Clear All", "Cancel", "danger"):
-            os.remove("history.json") if os.path.exists("history.json") else None
+            clear_history()
             self.update_history_ui()
             
     def redownload_action(self, url):
@@ -2065,6 +2434,7 @@ class YikesApp(ctk.CTk):
         item = pop_queue()
         if item:
             self.is_processing_queue = True # Flag
+            self.current_queue_id = item['id']
             self.url_entry.delete(0, tk.END)
             self.url_entry.insert(0, item['url'])
             self.select_frame("Download")
@@ -2083,7 +2453,8 @@ class YikesApp(ctk.CTk):
                  self.current_video_info = None
             else:
                  self.is_playlist = False
-                 self.current_video_info = {
+                 # Full info resolved while the previous item downloaded, if it's ready
+                 self.current_video_info = self.queue_prefetch.take(item['url'], timeout=0) or {
                      'title': item.get('title'),
                      'thumbnail': item.get('thumbnail'),
                      'uploader': item.get('uploader'),
@@ -2092,6 +2463,9 @@ class YikesApp(ctk.CTk):
                  }
                  self.current_playlist_info = None
 
+            self.queue_prefetch.ahead(i['url'] for i in get_queue(limit=self.queue_prefetch.lookahead)
+                                      if i.get('type') != 'playlist')
+
             self.start_download()
         else:
             if getattr(self, "is_processing_queue", False):
@@ -2127,6 +2501,15 @@ class YikesApp(ctk.CTk):
             self.meta_var.set(current_settings["embed_metadata"])
             self.clip_var.set(current_settings["clipboard_monitor"])
             self.notif_var.set(current_settings.get("notifications", True))
+            self.skip_downloaded_var.set(current_settings.get("skip_downloaded", True))
+            self.use_service_var.set(current_settings.get("use_download_service", True))
+            self.process_workers_var.set(current_settings.get("process_workers", False))
+            self.concurrency_var.set(str(current_settings.get("playlist_concurrency", 3)))
+            self.trim_mode_var.set(current_settings.get("trim_mode", TRIM_EXACT).title())
+            self.gif_max_mb_var.set(str(current_settings.get("gif_max_mb", GIF_MAX_MB)))
+            self.speed_limit_entry.delete(0, tk.END)
+            self.speed_limit_entry.insert(0, current_settings.get("speed_limit", ""))
+            bandwidth_scheduler.set_cap(0)
             self.cookies_entry.delete(0, tk.END)
             self.cookies_entry.insert(0, "")
             
@@ -2141,7 +2524,20 @@ class YikesApp(ctk.CTk):
         current_settings["embed_metadata"] = self.meta_var.get()
         current_settings["clipboard_monitor"] = self.clip_var.get()
         current_settings["notifications"] = self.notif_var.get()
+        current_settings["skip_downloaded"] = self.skip_downloaded_var.get()
+        current_settings["use_download_service"] = self.use_service_var.get()
+        current_settings["process_workers"] = self.process_workers_var.get()
+        current_settings["playlist_concurrency"] = int(self.concurrency_var.get())
+        current_settings["trim_mode"] = self.trim_mode_var.get().lower()
+        current_settings["gif_max_mb"] = int(float(self.gif_max_mb_var.get()))
+        speed_limit = self.speed_limit_entry.get().strip()
+        if speed_limit and parse_bytes(speed_limit) is None:
+            self.show_notification(f"Invalid speed limit: {speed_limit}", type="error")
+            return
+        current_settings["speed_limit"] = speed_limit
         save_settings(current_settings)
+        # Applies to running downloads too
+        bandwidth_scheduler.set_cap(parse_bytes(speed_limit) or 0)
         
         # Apply Theme Instantly
         self.apply_theme_instant()
@@ -2238,8 +2634,12 @@ class YikesApp(ctk.CTk):
 
     def on_closing(self):
         """Graceful shutdown with orphaned process cleanup"""
+        if self.is_closing:
+            return  # Already shutting down (the window manager may ask twice)
         try:
             # Force cancel any in-progress downloads to stop yt-dlp gracefully
+            # (is_closing keeps their journal entries resumable)
+            self.is_closing = True
             self.is_cancelled = True
             
             # Kill any orphaned yt-dlp or ffmpeg child processes
@@ -2267,12 +2667,23 @@ class YikesApp(ctk.CTk):
             if hasattr(self, 'executor'):
                 self.executor.shutdown(wait=False, cancel_futures=True)
             
-            # Fade out animation
+            # Close warm yt-dlp instances (persists cookies)
+            ydl_pool.close_all()
+            postprocess_pool.shutdown(wait=False)
+            self.queue_prefetch.close()
+            logging.debug(f"Thumbnail cache: {thumbnail_cache.stats()}")
+        except Exception as e:
+            logging.warning(f"Shutdown cleanup failed: {e}")
+        self._fade_out()
+
+    def _fade_out(self):
+        """Fade the window out, then exit. Only this step repeats; the cleanup in on_closing runs once."""
+        try:
             alpha = self.attributes("-alpha")
             if alpha > 0:
                 alpha -= 0.15 # Fast fade
                 self.attributes("-alpha", alpha)
-                self.after(20, self.on_closing)
+                self.after(20, self._fade_out)
             else:
                 self.destroy()
                 sys.exit(0)
@@ -0,0 +1,141 @@
+import sys
+import math
+import customtkinter as ctk
+
+from logic.playlist import visible_window
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Fixed-height list that only materializes the rows in view.
+
+    A pool of row widgets (about viewport / row_height + overscan) is created by
+    make_row(parent) - which must return a frame of exactly row_height pixels -
+    and positioned with place(); scrolling moves a virtual pixel
+    offset and rebinds pooled rows to new indices through bind_row(row, index).
+    Row state therefore has to live in a model that bind_row reads from - the
+    widgets carry nothing between bindings. Memory and render cost stay constant
+    whatever the item count.
+    """
+
+    def __init__(self, master, row_height, make_row, bind_row, overscan=2, wheel_step=20, **kwargs):
+        super().__init__(master, **kwargs)
+        self.row_height = row_height
+        self.make_row = make_row
+        self.bind_row = bind_row
+        self.overscan = overscan
+        self.wheel_step = wheel_step
+
+        self.count = 0
+        self.offset = 0.0
+        self._pool = []
+        self._scrollbar_visible = False
+
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+
+        self.body.bind("<Configure>", lambda e: self.refresh())
+        self._bind_wheel(self.body)
+
+    # --- Public API ---
+    def set_count(self, count):
+        """Point the list at a new model size and scroll back to the top."""
+        self.count = count
+        self.offset = 0.0
+        for row in self._pool:
+            row.index = None
+        self.refresh()
+
+    def refresh_row(self, index):
+        """Re-read one index from the model if it is currently bound."""
+        for row in self._pool:
+            if row.index == index:
+                self.bind_row(row, index)
+                return
+
+    def scroll_by(self, pixels):
+        self._scroll_to(self.offset + pixels)
+
+    def refresh(self):
+        viewport = self.body.winfo_height()
+        if viewport <= 1:
+            return
+        max_offset = max(0, self.count * self.row_height - viewport)
+        self.offset = min(max(self.offset, 0), max_offset)
+
+        first, last = visible_window(self.offset, viewport, self.row_height, self.count, self.overscan)
+        self._ensure_pool(math.ceil(viewport / self.row_height) + 1 + 2 * self.overscan)
+
+        # Keep rows already bound to an index in range where they are; rebind the rest
+        wanted = set(range(first, last))
+        free = []
+        for row in self._pool:
+            if row.index in wanted:
+                wanted.discard(row.index)
+            else:
+                free.append(row)
+        for index in sorted(wanted):
+            row = free.pop()
+            row.index = index
+            self.bind_row(row, index)
+        for row in free:
+            row.index = None
+            row.place_forget()
+
+        for row in self._pool:
+            if row.index is not None:
+                row.place(x=0, y=int(row.index * self.row_height - self.offset), relwidth=1)
+
+        self._update_scrollbar(viewport)
+
+    # --- Internals ---
+    def _ensure_pool(self, size):
+        while len(self._pool) < size:
+            row = self.make_row(self.body)
+            row.index = None
+            self._bind_wheel(row)
+            self._pool.append(row)
+
+    def _scroll_to(self, offset):
+        self.offset = offset
+        self.refresh()
+
+    def _update_scrollbar(self, viewport):
+        content = self.count * self.row_height
+        needed = content > viewport
+        if needed != self._scrollbar_visible:
+            self._scrollbar_visible = needed
+            if needed:
+                self.scrollbar.pack(side="right", fill="y", before=self.body)
+            else:
+                self.scrollbar.pack_forget()
+        if needed:
+            self.scrollbar.set(self.offset / content, (self.offset + viewport) / content)
+
+    def _on_scrollbar(self, *args):
+        viewport = self.body.winfo_height()
+        content = self.count * self.row_height
+        if args[0] == "moveto":
+            self._scroll_to(float(args[1]) * content)
+        elif args[0] == "scroll":
+            step = viewport if args[2] == "pages" else self.wheel_step
+            self.scroll_by(int(args[1]) * step)
+
+    def _on_wheel(self, event):
+        if event.num == 4:
+            self.scroll_by(-self.wheel_step)
+        elif event.num == 5:
+            self.scroll_by(self.wheel_step)
+        elif event.delta:
+            # Windows reports multiples of 120, macOS small raw deltas
+            delta = event.delta / 120 if sys.platform == "win32" else event.delta
+            self.scroll_by(-delta * self.wheel_step)
+        return "break"
+
+    def _bind_wheel(self, widget):
+        widget.bind("<Button-4>", self._on_wheel)
+        widget.bind("<Button-5>", self._on_wheel)
+        widget.bind("<MouseWheel>", self._on_wheel)
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
@@ -0,0 +1,142 @@
+import logging
+import os
+import sqlite3
+import time
+from typing import Optional, Dict, Any, List, Tuple
+
+from .cache import canonical_id
+from .db import Database
+from .settings import DB_FILE, current_settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive (
+    extractor   TEXT NOT NULL,
+    video_id    TEXT NOT NULL,
+    format_key  TEXT NOT NULL,
+    path        TEXT NOT NULL,
+    bytes       INTEGER NOT NULL DEFAULT 0,
+    title       TEXT,
+    ts          REAL NOT NULL,
+    PRIMARY KEY (extractor, video_id, format_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS archive_path ON archive (path);
+"""
+
+
+def archive_keys(url: Optional[str], info: Optional[Dict[str, Any]] = None) -> List[Tuple[str, str]]:
+    """
+    (extractor, video id) pairs identifying a video, best first.
+
+    With an info dict this is yt-dlp's own identity (extractor_key, id). The URL
+    alone gives one too, without extraction: 'youtube'/<id> for YouTube links
+    (the same pair yt-dlp reports), the normalized URL for anything else.
+    """
+    keys = []
+    if info and info.get('extractor_key') and info.get('id'):
+        keys.append((str(info['extractor_key']).lower(), str(info['id'])))
+    if url:
+        extractor, _, video_id = canonical_id(url).partition(':')
+        if video_id and not video_id.startswith('playlist:') and (extractor, video_id) not in keys:
+            keys.append((extractor, video_id))
+    return keys
+
+
+class DownloadArchive:
+    """
+    Persistent record of finished downloads, shared by every playlist and the queue.
+
+    Rows are keyed by (extractor, video id, format key), so the same video in two
+    playlists, or a history item downloaded again, is found before any
+    extraction or network access. A row only counts while its file is still on
+    disk; stale rows are dropped on lookup. Downloads are recorded under every
+    key they are known by (see archive_keys), so a generic URL hits without
+    extraction next time too.
+    """
+
+    def __init__(self, path: str = DB_FILE):
+        self.db = Database(path, schema=lambda conn: conn.executescript(SCHEMA))
+
+    def lookup(self, url: Optional[str], format_key: str, info: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """The archived download of url in format_key ({path, bytes, title}), or None."""
+        keys = archive_keys(url, info)
+        row = None
+        try:
+            conn = self.db.connection()
+            for extractor, video_id in keys:
+                row = conn.execute("SELECT path, bytes, title FROM archive WHERE extractor = ? AND video_id = ? AND format_key = ?",
+                                   (extractor, video_id, format_key)).fetchone()
+                if row:
+                    break
+            if row and not os.path.isfile(row["path"]):
+                # Deleted or moved since: forget it and download again
+                conn.execute("DELETE FROM archive WHERE path = ?", (row["path"],))
+                row = None
+        except sqlite3.Error as e:
+            logging.warning(f"Download archive lookup failed: {e}")
+            row = None
+        return dict(row) if row else None
+
+    def add(self, url: Optional[str], format_key: str, path: str, info: Optional[Dict[str, Any]] = None):
+        keys = archive_keys(url, info)
+        if not keys:
+            return
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return  # Nothing on disk to skip to
+        title = (info or {}).get('title')
+        try:
+            with self.db.transaction() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO archive (extractor, video_id, format_key, path, bytes, title, ts) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(extractor, video_id, format_key, path, size, title, time.time()) for extractor, video_id in keys])
+        except sqlite3.Error as e:
+            logging.warning(f"Could not record {path} in the download archive: {e}")
+
+    def forget(self, url: Optional[str], format_key: Optional[str] = None, info: Optional[Dict[str, Any]] = None):
+        """Drop url from the archive (every format unless format_key is given)."""
+        with self.db.transaction() as conn:
+            for extractor, video_id in archive_keys(url, info):
+                if format_key is None:
+                    conn.execute("DELETE FROM archive WHERE extractor = ? AND video_id = ?", (extractor, video_id))
+                else:
+                    conn.execute("DELETE FROM archive WHERE extractor = ? AND video_id = ? AND format_key = ?",
+                                 (extractor, video_id, format_key))
+
+    def count(self) -> int:
+        return self.db.connection().execute("SELECT COUNT(*) FROM archive").fetchone()[0]
+
+    def clear(self):
+        self.db.connection().execute("DELETE FROM archive")
+
+    def scope(self, format_key: str) -> "ArchiveScope":
+        return ArchiveScope(self, format_key)
+
+    def close(self):
+        self.db.close()
+
+
+class ArchiveScope:
+    """A DownloadArchive bound to one format key: what download_worker is handed."""
+
+    def __init__(self, archive: DownloadArchive, format_key: str):
+        self.archive = archive
+        self.format_key = format_key
+
+    def lookup(self, url: Optional[str], info: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        return self.archive.lookup(url, self.format_key, info)
+
+    def add(self, url: Optional[str], path: str, info: Optional[Dict[str, Any]] = None):
+        self.archive.add(url, self.format_key, path, info)
+
+
+# Shared by all downloads in the process (connects on first use)
+download_archive = DownloadArchive()
+
+
+def archive_scope(format_key: str, trimmed: bool = False) -> Optional[ArchiveScope]:
+    """Scope for a download in format_key, or None if skipping is switched off ("skip_downloaded") or it's a trim."""
+    if trimmed or not current_settings.get("skip_downloaded", True):
+        return None
+    return download_archive.scope(format_key)
@@ -0,0 +1,245 @@
+import threading
+import time
+from typing import Optional, Dict, Any, List, Callable, Hashable
+
+from .settings import current_settings
+from .utils import parse_bytes
+
+# Seconds between re-allocations of the global cap
+REBALANCE = 1.0
+# Bucket depth in seconds of the cap (how far a job can burst after idling)
+BURST = 0.5
+# Never allocate a job less than this (bytes/s), so a starved job can show demand again
+MIN_RATE = 16 * 1024
+# A job using less than this fraction of its allocation is limited elsewhere (origin, disk)
+SATISFIED = 0.8
+# Headroom given on top of a satisfied job's achieved rate
+HEADROOM = 1.25
+# Longest single sleep while waiting for tokens, so cancels and cap changes are noticed
+MAX_WAIT_SLICE = 0.2
+
+PRIORITY_LOW = 0.5
+PRIORITY_NORMAL = 1.0
+PRIORITY_HIGH = 2.0
+
+
+def fair_shares(cap: float, jobs: List[Dict[str, Any]]) -> Dict[Hashable, float]:
+    """
+    Weighted max-min fair split of cap.
+
+    jobs: [{"key", "weight", "demand"}] where demand is None for a job that
+    would use more than it gets. Jobs whose demand is below their weighted
+    share get exactly their demand; the remainder is re-split among the rest.
+    """
+    shares = {}
+    remaining = float(cap)
+    active = [j for j in jobs if j["weight"] > 0]
+    while active:
+        unit = remaining / sum(j["weight"] for j in active)
+        satisfied = [j for j in active if j["demand"] is not None and j["demand"] < unit * j["weight"]]
+        if not satisfied:
+            for j in active:
+                shares[j["key"]] = unit * j["weight"]
+            break
+        for j in satisfied:
+            shares[j["key"]] = j["demand"]
+            remaining -= j["demand"]
+        active = [j for j in active if j not in satisfied]
+    for j in jobs:
+        shares.setdefault(j["key"], 0.0)
+    return shares
+
+
+class BandwidthLease:
+    """One job's handle on the scheduler. Feed it progress and it throttles and reports."""
+
+    def __init__(self, scheduler: 'BandwidthScheduler', label: str, priority: float):
+        self.scheduler = scheduler
+        self.label = label
+        self.priority = priority
+        self.allocated: Optional[float] = None  # bytes/s, None while uncapped
+        self.achieved: Optional[float] = None
+        self.closed = False
+        self._window_bytes = 0
+        self._params: List[Dict[str, Any]] = []
+        self._file_progress: Dict[str, int] = {}
+
+    def attach(self, params: Dict[str, Any]):
+        """Let the scheduler write this job's allocation into a (live) yt-dlp params dict."""
+        with self.scheduler._lock:
+            self._params.append(params)
+            self._write_params()
+
+    def observe(self, d: Dict[str, Any], cancelled: Optional[Callable[[], bool]] = None, wait: bool = True):
+        """yt-dlp progress hook: account new bytes (blocking while over the global cap, unless not wait)."""
+        if self.allocated:
+            d['_allocated_rate'] = self.allocated
+        key = d.get('tmpfilename') or d.get('filename') or ''
+        if d.get('status') == 'finished':
+            self._file_progress.pop(key, None)
+            return
+        if d.get('status') != 'downloading':
+            return
+        current = d.get('downloaded_bytes') or 0
+        previous = self._file_progress.get(key, 0)
+        self._file_progress[key] = current
+        if current > previous:
+            self.consume(current - previous, cancelled, wait)
+
+    def consume(self, n: int, cancelled: Optional[Callable[[], bool]] = None, wait: bool = True):
+        self.scheduler._consume(self, n, cancelled, wait)
+
+    def set_priority(self, priority: float):
+        with self.scheduler._lock:
+            self.priority = priority
+            self.scheduler._rebalance(time.monotonic())
+
+    def close(self):
+        self.scheduler._release(self)
+
+    def _write_params(self):
+        # yt-dlp re-reads 'ratelimit' for every block it paces, so this applies immediately
+        for params in self._params:
+            params['ratelimit'] = int(self.allocated) if self.allocated else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class BandwidthScheduler:
+    """
+    Process-wide bandwidth cap shared by all running downloads.
+
+    Two layers:
+    - a token bucket refilled at the cap; every job's bytes are taken from it,
+      so the combined rate can't exceed the cap whatever yt-dlp does per
+      connection (fragments each pace themselves separately)
+    - every REBALANCE seconds the cap is split by fair_shares() using each
+      job's priority and achieved rate, and written into its live 'ratelimit'
+      so jobs pace smoothly and one greedy job can't starve the others
+
+    set_cap() takes effect immediately for running jobs; 0 removes the cap.
+    """
+
+    def __init__(self, cap: int = 0, interval: float = REBALANCE, burst: float = BURST):
+        self.interval = interval
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._leases: List[BandwidthLease] = []
+        self._cap = 0
+        self._tokens = 0.0
+        self._refilled = time.monotonic()
+        self._last_rebalance = self._refilled
+        self.waited = 0.0  # Total seconds jobs spent blocked on the bucket
+        self.set_cap(cap)
+
+    @property
+    def cap(self) -> int:
+        return self._cap
+
+    def set_cap(self, cap: Optional[int]):
+        with self._lock:
+            self._cap = max(0, int(cap or 0))
+            self._tokens = min(self._tokens, self._cap * self.burst)
+            self._rebalance(time.monotonic())
+
+    def register(self, label: str = "", priority: float = PRIORITY_NORMAL) -> BandwidthLease:
+        lease = BandwidthLease(self, label, priority)
+        with self._lock:
+            self._leases.append(lease)
+            self._rebalance(time.monotonic())
+        return lease
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cap": self._cap,
+                "waited": round(self.waited, 3),
+                "jobs": [{"label": l.label, "priority": l.priority,
+                          "allocated": l.allocated, "achieved": l.achieved} for l in self._leases],
+            }
+
+    # --- Internals ---
+    def _release(self, lease: BandwidthLease):
+        with self._lock:
+            if lease.closed:
+                return
+            lease.closed = True
+            lease._params.clear()
+            self._leases.remove(lease)
+            self._rebalance(time.monotonic())
+
+    def _consume(self, lease: BandwidthLease, n: int, cancelled: Optional[Callable[[], bool]], wait: bool = True):
+        with self._lock:
+            lease._window_bytes += n
+            now = time.monotonic()
+            if now - self._last_rebalance >= self.interval:
+                self._rebalance(now)
+            if not self._cap:
+                return
+            self._refill(now)
+            # Take the bytes now (they have already arrived) and wait off any debt
+            self._tokens -= n
+            debt = -self._tokens
+        if not wait:
+            return  # Paced elsewhere (a child process capped at its allocation); the debt still slows the others
+
+        began = time.monotonic()
+        while debt > 0 and not lease.closed:
+            if cancelled and cancelled():
+                break
+            time.sleep(min(MAX_WAIT_SLICE, debt / self._cap if self._cap else 0))
+            with self._lock:
+                if not self._cap:
+                    break
+                self._refill(time.monotonic())
+                debt = -self._tokens
+        with self._lock:
+            self.waited += time.monotonic() - began
+
+    def _refill(self, now: float):
+        elapsed = now - self._refilled
+        self._refilled = now
+        self._tokens = min(self._cap * self.burst, self._tokens + elapsed * self._cap)
+
+    def _rebalance(self, now: float):
+        """Recompute achieved rates and allocations. Caller holds the lock."""
+        elapsed = now - self._last_rebalance
+        if elapsed >= self.interval * 0.5:
+            for lease in self._leases:
+                rate = lease._window_bytes / elapsed
+                lease.achieved = rate if lease.achieved is None else 0.5 * lease.achieved + 0.5 * rate
+                lease._window_bytes = 0
+            self._last_rebalance = now
+
+        if not self._cap:
+            for lease in self._leases:
+                lease.allocated = None
+                lease._write_params()
+            return
+
+        jobs = []
+        for lease in self._leases:
+            demand = None  # New jobs compete for a full share
+            if lease.allocated and lease.achieved is not None:
+                if lease.achieved < lease.allocated * SATISFIED:
+                    demand = max(MIN_RATE, lease.achieved * HEADROOM)
+                else:
+                    # Using what it got: let it double towards its fair share
+                    demand = lease.allocated * 2
+            jobs.append({"key": id(lease), "weight": lease.priority, "demand": demand})
+        shares = fair_shares(self._cap, jobs)
+        for lease in self._leases:
+            lease.allocated = max(MIN_RATE, shares[id(lease)])
+            lease._write_params()
+
+
+def _settings_cap() -> int:
+    return parse_bytes(current_settings.get("speed_limit")) or 0
+
+
+# Shared by every download in the process; the cap is the "speed_limit" setting
+bandwidth_scheduler = BandwidthScheduler(_settings_cap())
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+from urllib.parse import urlparse, parse_qs
+
+from .settings import CACHE_DIR
+
+# Freshness rules: flat listings change when uploads are added, full info dicts
+# carry signed format URLs that the site expires after a few hours.
+KIND_FULL = "full"
+KIND_FLAT = "flat"
+DEFAULT_TTLS = {
+    KIND_FULL: 3 * 3600,
+    KIND_FLAT: 30 * 60,
+}
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 2000
+
+_YT_ID = re.compile(r'^[A-Za-z0-9_-]{11}$')
+_YT_HOSTS = ('youtube.com', 'youtu.be', 'youtube-nocookie.com')
+
+
+def canonical_id(url: str, playlist: bool = False) -> str:
+    """
+    Canonical cache key for a URL without running an extractor.
+
+    YouTube videos map to 'youtube:<id>', playlists to 'youtube:playlist:<id>'.
+    Anything else falls back to the normalized URL.
+    """
+    url = (url or '').strip()
+    parsed = urlparse(url)
+    host = (parsed.hostname or '').lower()
+    if host.startswith('www.') or host.startswith('m.') or host.startswith('music.'):
+        host = host.split('.', 1)[1]
+
+    if any(host == h or host.endswith('.' + h) for h in _YT_HOSTS):
+        query = parse_qs(parsed.query)
+        list_id = (query.get('list') or [None])[0]
+        if playlist and list_id:
+            return f"youtube:playlist:{list_id}"
+
+        video_id = None
+        if host == 'youtu.be':
+            video_id = parsed.path.strip('/').split('/')[0]
+        elif query.get('v'):
+            video_id = query['v'][0]
+        else:
+            parts = parsed.path.strip('/').split('/')
+            if len(parts) >= 2 and parts[0] in ('shorts', 'embed', 'live', 'v'):
+                video_id = parts[1]
+        if video_id and _YT_ID.match(video_id):
+            return f"youtube:{video_id}"
+        if list_id:
+            return f"youtube:playlist:{list_id}"
+
+    # Generic: drop fragment, keep the rest
+    return "url:" + parsed._replace(fragment='').geturl()
+
+
+class MetadataCache:
+    """
+    On-disk cache of yt-dlp info dicts with TTL, LRU eviction and hit/miss stats.
+
+    One JSON file per entry under <directory>/<kind>/. Recency is tracked in an
+    in-memory index and persisted through the file mtime, so LRU order survives
+    restarts. Safe to share between threads.
+    """
+
+    def __init__(self, directory: str = os.path.join(CACHE_DIR, "metadata"),
+                 max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttls: Optional[Dict[str, int]] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+
+        self._lock = threading.RLock()
+        self._index = None  # OrderedDict path -> size, oldest first
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    # --- Index ---
+    def _path(self, key: str, kind: str) -> str:
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, kind, digest + ".json")
+
+    def _load_index(self):
+        if self._index is not None:
+            return
+        found = []
+        for kind in self.ttls:
+            kind_dir = os.path.join(self.directory, kind)
+            if not os.path.isdir(kind_dir):
+                continue
+            for name in os.listdir(kind_dir):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(kind_dir, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                found.append((st.st_mtime, path, st.st_size))
+        found.sort()
+        self._index = OrderedDict((path, size) for _, path, size in found)
+        self._bytes = sum(self._index.values())
+
+    def _drop(self, path: str):
+        size = self._index.pop(path, 0)
+        self._bytes -= size
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self._index and (self._bytes > self.max_bytes or len(self._index) > self.max_entries):
+            oldest = next(iter(self._index))
+            self._drop(oldest)
+            self.evictions += 1
+
+    # --- Public API ---
+    def get(self, key: str, kind: str = KIND_FULL) -> Optional[Dict[str, Any]]:
+        path = self._path(key, kind)
+        with self._lock:
+            self._load_index()
+            if path not in self._index:
+                self.misses += 1
+                return None
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                self._drop(path)
+                self.misses += 1
+                return None
+
+            if time.time() - record.get("stored", 0) > self.ttls.get(kind, 0):
+                self._drop(path)
+                self.expired += 1
+                self.misses += 1
+                logging.debug(f"Metadata cache expired: {key} ({kind})")
+                return None
+
+            # Mark as most recently used (in memory and on disk)
+            self._index.move_to_end(path)
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            self.hits += 1
+            logging.debug(f"Metadata cache hit: {key} ({kind})")
+            return record.get("info")
+
+    def put(self, key: str, kind: str, info: Dict[str, Any]):
+        path = self._path(key, kind)
+        record = {"key": key, "kind": kind, "stored": time.time(), "info": info}
+        data = json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+
+        with self._lock:
+            self._load_index()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                logging.warning(f"Metadata cache write failed for {key}: {e}")
+                return
+
+            self._bytes -= self._index.pop(path, 0)
+            self._index[path] = len(data)
+            self._bytes += len(data)
+            self._evict()
+
+    def invalidate(self, key: str, kind: str = KIND_FULL):
+        with self._lock:
+            self._load_index()
+            self._drop(self._path(key, kind))
+
+    def clear(self):
+        with self._lock:
+            self._load_index()
+            for path in list(self._index):
+                self._drop(path)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load_index()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._index),
+                "bytes": self._bytes,
+            }
+
+
+# Shared process-wide cache
+metadata_cache = MetadataCache()
@@ -0,0 +1,280 @@
+"""
+Headless batch downloader: python -m logic [URL ...] [-a FILE] [-f KEY] [-j N] [-r RATE] [--prefetch N] [--no-archive]
+
+Never imports Tk/customtkinter/PIL. Progress is written to stdout as one JSON
+object per line; human-oriented diagnostics go to stderr.
+
+Exit status: 0 = every job succeeded, 1 = at least one job failed,
+2 = usage error, 130 = interrupted.
+"""
+import argparse
+import concurrent.futures
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Optional, Dict, List, Any
+
+from .settings import current_settings
+from .downloader import FORMAT_KEYS, build_ydl_opts, download_worker, fetch_playlist_info
+from .playlist import entry_url
+from .progress import ProgressAggregator
+from .bandwidth import bandwidth_scheduler
+from .prefetch import Prefetcher
+from .archive import download_archive, ArchiveScope
+from .utils import safe_folder_name, parse_bytes
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+class EventWriter:
+    """Thread-safe JSON-lines writer for machine-readable progress."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, **fields):
+        record = {"event": event, "ts": round(time.time(), 3), **fields}
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+def read_batch_file(path: str) -> List[str]:
+    """Read URLs from a file (or '-' for stdin), skipping blanks and # comments."""
+    handle = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+    try:
+        urls = []
+        for line in handle:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                urls.append(line)
+        return urls
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def expand_jobs(urls: List[str], output: str, expand_playlists: bool, writer: EventWriter) -> List[Dict[str, Any]]:
+    """Turn input URLs into jobs, expanding playlist URLs into one job per entry."""
+    jobs = []
+    for url in urls:
+        if expand_playlists and "list=" in url:
+            try:
+                info = fetch_playlist_info(url) or {}
+            except Exception as e:
+                jobs.append({"url": url, "path": output, "error": f"Playlist fetch failed: {e}"})
+                continue
+            folder = os.path.join(output, safe_folder_name(info.get('title', 'Playlist')))
+            entries = [e for e in (info.get('entries') or []) if e]
+            writer.emit("playlist", url=url, title=info.get('title'), count=len(entries), path=folder)
+            for entry in entries:
+                jobs.append({"url": entry_url(entry), "path": folder, "title": entry.get('title'), "playlist": url})
+        else:
+            jobs.append({"url": url, "path": output})
+
+    for job_id, job in enumerate(jobs):
+        job["id"] = job_id
+    return jobs
+
+
+def prefetchable(job: Dict[str, Any], archive: Optional[ArchiveScope] = None) -> Optional[str]:
+    """
+    URL worth extracting ahead of time: not failed already, not a whole playlist
+    (--no-expand-playlists) and not one the archive will skip anyway.
+    """
+    url = job.get("url")
+    if job.get("error") or not url or "list=" in url:
+        return None
+    if archive and archive.lookup(url):
+        return None
+    return url
+
+
+class JobProgress:
+    """Publishes coalesced per-job progress; no progress is emitted after a job's final event."""
+
+    def __init__(self, writer: EventWriter, interval: float):
+        self.writer = writer
+        self.interval = max(interval, 0.01)
+        self.skipped = 0
+        self.saved_bytes = 0
+        self.aggregator = ProgressAggregator()
+        self._lock = threading.Lock()
+        self._finished = set()
+
+    def start(self):
+        self.aggregator.start(self._publish, hz=1.0 / self.interval)
+
+    def stop(self):
+        self.aggregator.stop()
+
+    def submit(self, job_id, info):
+        self.aggregator.submit(job_id, info)
+
+    def finish(self, job_id, event: str, **fields):
+        with self._lock:
+            self._finished.add(job_id)
+            self.aggregator.discard(job_id)
+            if event == "skipped":
+                self.skipped += 1
+                self.saved_bytes += fields.get("bytes") or 0
+            self.writer.emit(event, job=job_id, **fields)
+
+    def _publish(self, job_id, info):
+        with self._lock:
+            if job_id in self._finished:
+                return
+            if info.get('status') in ('merging', 'trimming', 'converting'):
+                self.writer.emit("progress", job=job_id, stage=info['status'])
+                return
+            total = info.get('total_bytes') or info.get('total_bytes_estimate')
+            downloaded = info.get('downloaded_bytes') or 0
+            self.writer.emit("progress", job=job_id, stage=info.get('_content_type', 'Content').lower(),
+                             downloaded=downloaded, total=total,
+                             percent=round(downloaded / total * 100, 1) if total else None,
+                             speed=info.get('speed'), eta=info.get('eta'), allocated=info.get('_allocated_rate'))
+
+
+def run_job(job: Dict[str, Any], format_key: str, progress: JobProgress, cancel_event: threading.Event,
+            prefetch: Optional[Prefetcher] = None, upcoming: List[Optional[str]] = (),
+            archive: Optional[ArchiveScope] = None) -> int:
+    job_id = job["id"]
+    if job.get("error") or not job.get("url"):
+        progress.finish(job_id, "failed", url=job.get("url"), error=job.get("error", "No URL"), exit_code=EXIT_FAILED)
+        return EXIT_FAILED
+
+    progress.writer.emit("start", job=job_id, url=job["url"], title=job.get("title"), format=format_key)
+    os.makedirs(job["path"], exist_ok=True)
+    opts = build_ydl_opts(job["path"], format_key, trim_range=job.get("trim_range"))
+    # Keep stdout reserved for JSON events
+    opts.update({'quiet': True, 'no_warnings': True, 'noprogress': True})
+
+    extra = {}
+    if archive and not job.get("trim_range"):  # A clip is not the archived full video
+        extra["archive"] = archive
+    if prefetch:
+        prefetch.ahead(upcoming)
+        info = prefetch.take(job["url"])
+        if info:
+            extra["info"] = info
+
+    errors, skipped, trimmed, gifs = [], [], [], []
+
+    def on_progress(info):
+        if info.get('status') == 'skipped':
+            skipped.append(info)
+        elif info.get('status') == 'trimmed':
+            trimmed.append(info['trim'])
+        elif info.get('status') == 'converted':
+            gifs.append(info['gif'])
+        else:
+            progress.submit(job_id, info)
+
+    download_worker(job["url"], opts, on_progress, None, errors.append, cancel_event.is_set, **extra)
+
+    if errors:
+        code = EXIT_INTERRUPTED if errors[0] == "Cancelled" else EXIT_FAILED
+        progress.finish(job_id, "failed", url=job["url"], error=errors[0], exit_code=code)
+        return code
+
+    if skipped:
+        progress.finish(job_id, "skipped", url=job["url"], path=skipped[0].get('filename'),
+                        bytes=skipped[0].get('total_bytes'), exit_code=EXIT_OK)
+        return EXIT_OK
+    # A clip's done event says where its cuts actually landed (see logic/trim.py)
+    cut = {"cut": trimmed[0]["achieved"], "trim_mode": trimmed[0]["mode"]} if trimmed else {}
+    # and a GIF's how big it came out and how long converting took (see logic/gif.py)
+    gif = {"gif_bytes": gifs[0]["bytes"], "gif_seconds": gifs[0]["seconds"]} if gifs else {}
+    progress.finish(job_id, "done", url=job["url"], exit_code=EXIT_OK, **cut, **gif)
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m logic", description="Yikes YTD headless downloader")
+    parser.add_argument("urls", nargs="*", metavar="URL", help="video or playlist URLs")
+    parser.add_argument("-a", "--batch-file", action="append", default=[], metavar="FILE",
+                        help="file with one URL per line ('-' for stdin); may be repeated")
+    parser.add_argument("-f", "--format", default="1080p", choices=FORMAT_KEYS, help="format key (default: 1080p)")
+    parser.add_argument("-j", "--concurrency", type=int, default=current_settings.get("playlist_concurrency", 3),
+                        help="parallel downloads")
+    parser.add_argument("-o", "--output", default=current_settings["download_path"], help="download directory")
+    parser.add_argument("-r", "--limit-rate", default=current_settings.get("speed_limit") or "", metavar="RATE",
+                        help="total download rate shared by all jobs, e.g. 5M (default: speed_limit setting)")
+    parser.add_argument("--prefetch", type=int, default=current_settings.get("prefetch_lookahead", 2), metavar="N",
+                        help="upcoming jobs to extract in the background (0 disables)")
+    parser.add_argument("--no-archive", dest="archive", action="store_false",
+                        default=current_settings.get("skip_downloaded", True),
+                        help="download even videos already in the download archive")
+    parser.add_argument("--no-expand-playlists", dest="expand_playlists", action="store_false",
+                        help="pass playlist URLs to yt-dlp as single jobs")
+    parser.add_argument("--progress-interval", type=float, default=0.5,
+                        help="seconds between coalesced progress events per job")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr, format='%(levelname)s: %(message)s')
+
+    urls = list(args.urls)
+    try:
+        for path in args.batch_file:
+            urls.extend(read_batch_file(path))
+    except OSError as e:
+        parser.error(f"cannot read batch file: {e}")
+    if not urls:
+        parser.error("no URLs given")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    limit = parse_bytes(args.limit_rate) if args.limit_rate else 0
+    if limit is None:
+        parser.error(f"invalid --limit-rate: {args.limit_rate}")
+    bandwidth_scheduler.set_cap(limit)
+
+    writer = EventWriter()
+    cancel_event = threading.Event()
+    jobs = expand_jobs(urls, args.output, args.expand_playlists, writer)
+    results = {}
+
+    progress = JobProgress(writer, args.progress_interval)
+    progress.start()
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix="job")
+    prefetch = Prefetcher(args.prefetch) if args.prefetch > 0 else None
+    archive = download_archive.scope(args.format) if args.archive else None
+    futures = {pool.submit(run_job, job, args.format, progress, cancel_event, prefetch,
+                           [prefetchable(j, archive) for j in jobs[i + 1:i + 1 + args.prefetch]], archive): job["id"]
+               for i, job in enumerate(jobs)}
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            results[futures[future]] = future.result()
+    except KeyboardInterrupt:
+        # Running downloads stop at their next progress tick
+        cancel_event.set()
+        if prefetch:
+            prefetch.close()
+        pool.shutdown(wait=True, cancel_futures=True)
+        progress.stop()
+        writer.emit("summary", total=len(jobs), succeeded=sum(1 for c in results.values() if c == EXIT_OK),
+                    failed=sum(1 for c in results.values() if c != EXIT_OK), skipped=progress.skipped,
+                    saved_bytes=progress.saved_bytes, interrupted=True)
+        return EXIT_INTERRUPTED
+    pool.shutdown(wait=True)
+    if prefetch:
+        prefetch.close()
+    progress.stop()
+
+    failed = sum(1 for c in results.values() if c != EXIT_OK)
+    writer.emit("summary", total=len(jobs), succeeded=len(jobs) - failed, failed=failed,
+                skipped=progress.skipped, saved_bytes=progress.saved_bytes,
+                exit_codes={str(job_id): code for job_id, code in sorted(results.items())},
+                progress=progress.aggregator.stats())
+    return EXIT_FAILED if failed else EXIT_OK
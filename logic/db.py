@@ -0,0 +1,76 @@
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from .settings import DB_FILE
+
+
+def connect(path: str = DB_FILE) -> sqlite3.Connection:
+    """Open a connection tuned for a small local app database (WAL, autocommit)."""
+    # Each thread keeps its own connection; check_same_thread is off only so close() can run anywhere
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL + NORMAL only fsyncs at checkpoints; a crash can lose the last commit, never corrupt the file
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
+
+
+class Database:
+    """
+    One SQLite file shared by several stores.
+
+    Connections are per thread (sqlite3 objects must not cross threads); WAL lets
+    readers run alongside the single writer. The schema callback runs once, on
+    the first connection.
+    """
+
+    def __init__(self, path: str = DB_FILE, schema: Optional[Callable[[sqlite3.Connection], None]] = None):
+        self.path = path
+        self._schema = schema
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._connections = []
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = connect(self.path)
+            self._local.conn = conn
+            with self._init_lock:
+                self._connections.append(conn)
+                if not self._initialized:
+                    if self._schema:
+                        self._schema(conn)
+                    self._initialized = True
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT; takes the write lock up front so read-modify-write is atomic."""
+        conn = self.connection()
+        if conn.in_transaction:
+            # Nested use joins the outer transaction
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self):
+        with self._init_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception as e:
+                    logging.debug(f"Database close failed: {e}")
+            self._connections = []
+        self._local = threading.local()
@@ -1,111 +1,220 @@
 import threading
+import contextlib
 import os
+import re
+import json
+import time
 import shutil
-import subprocess
+import logging
+import tempfile
+from urllib.parse import urlparse, parse_qs
 from typing import Optional, Dict, List, Any, Callable
 from .settings import current_settings
+from .cache import metadata_cache, canonical_id, KIND_FULL, KIND_FLAT
+from .tuner import transfer_tuner, TunerLogger
+from .bandwidth import bandwidth_scheduler, PRIORITY_NORMAL
+from .postprocess import split_postprocessors, run_postprocessors, PostProcessError, GIF_POSTPROCESSOR
+from .trim import finish_section, TRIM_EXACT, TRIM_FAST
+from .gif import gif_postprocessor, source_format, GIF_WIDTH, GIF_FPS, GIF_MAX_MB
+from .metrics import job_metrics, SPAN_POSTPROCESS
+from .ffmpeg import ffmpeg_locator, FFmpeg
 
 def get_ffmpeg_location():
-    """Find FFmpeg binary, with high priority for bundled version to ensure zero-install."""
-    # 1. Check for bundled binary FIRST (Portable mode)
-    try:
-        from gui.main_window import resource_path
-        bundled_ffmpeg = resource_path(os.path.join("bin", "ffmpeg"))
-        if os.path.isfile(bundled_ffmpeg) and os.access(bundled_ffmpeg, os.X_OK):
-            import logging
-            logging.info(f"Using BUNDLED FFmpeg: {bundled_ffmpeg}")
-            return bundled_ffmpeg
-    except Exception:
-        # Fallback if resource_path/main_window isn't available during early imports
-        local_path = os.path.join(os.getcwd(), "bin", "ffmpeg")
-        if os.path.isfile(local_path) and os.access(local_path, os.X_OK):
-            return local_path
-
-    # 2. Check system PATH
-    ffmpeg_path = shutil.which('ffmpeg')
-    if ffmpeg_path:
-        return ffmpeg_path
-    
-    # 3. Check common Linux paths (e.g. for some distros where which fails)
-    common_paths = ['/usr/bin/ffmpeg', '/usr/local/bin/ffmpeg', '/snap/bin/ffmpeg']
-    for path in common_paths:
-        if os.path.isfile(path) and os.access(path, os.X_OK):
-            import logging
-            logging.info(f"Using FFmpeg from common path: {path}")
-            return path
-    
-    import logging
-    logging.error("FFmpeg NOT FOUND on system or bundle.")
-    return None
+    """Path of the FFmpeg binary (bundled first, for zero-install), resolved once per settings change."""
+    return ffmpeg_locator.get().path
 
 def verify_ffmpeg_executable():
     """
     Verify that FFmpeg can actually be executed. Handles noexec partitions gracefully.
     Returns (ffmpeg_path, warning_message or None).
     """
-    import logging
-    
-    ffmpeg_path = get_ffmpeg_location()
-    if not ffmpeg_path:
+    found = ffmpeg_locator.get()
+    if not found.path:
         return None, "FFmpeg not found. Video merging will fail."
-    
-    # Test actual execution (handles noexec partition scenario)
-    try:
-        result = subprocess.run(
-            [ffmpeg_path, '-version'],
-            capture_output=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            return ffmpeg_path, None  # All good
-    except PermissionError:
-        logging.warning(f"FFmpeg at {ffmpeg_path} cannot execute (noexec partition?)")
+    caps = found.capabilities()  # Probed once, then cached (see logic/ffmpeg.py)
+    if caps["runnable"]:
+        return found.path, None
+    if caps.get("denied"):
         # Try to fall back to system FFmpeg
         system_ffmpeg = shutil.which('ffmpeg')
-        if system_ffmpeg and system_ffmpeg != ffmpeg_path:
-            try:
-                result = subprocess.run([system_ffmpeg, '-version'], capture_output=True, timeout=5)
-                if result.returncode == 0:
-                    return system_ffmpeg, "Bundled FFmpeg not executable. Using system FFmpeg instead."
-            except:
-                pass
+        if system_ffmpeg and system_ffmpeg != found.path and FFmpeg(system_ffmpeg).runnable:
+            return system_ffmpeg, "Bundled FFmpeg not executable. Using system FFmpeg instead."
         return None, "FFmpeg found but cannot execute (partition may have noexec flag)."
-    except Exception as e:
-        logging.error(f"FFmpeg verification failed: {e}")
-        return ffmpeg_path, f"FFmpeg verification warning: {str(e)[:50]}"
-    
-    return ffmpeg_path, None
+    return found.path, f"FFmpeg verification warning: {caps.get('error', '')[:50]}"
 
 
-def fetch_video_info(url: str) -> Dict[str, Any]:
-    from yt_dlp import YoutubeDL
-    ydl_opts = {
-        'quiet': True, 
-        'skip_download': True,
-        'js_runtimes': {'node': {}},
-        'retries': 3
-    }
-    with YoutubeDL(ydl_opts) as ydl:
+# --- Warm YoutubeDL instances ---
+# Per-call option keys that must not be baked into a pooled instance
+_HOOK_KEYS = ('progress_hooks', 'postprocessor_hooks')
+
+class _PooledYDL:
+    """A YoutubeDL whose hooks dispatch to whoever currently holds it."""
+
+    def __init__(self, key, opts):
+        from yt_dlp import YoutubeDL
+        self.key = key
+        self.progress_hook = None
+        self.postprocessor_hook = None
+        self.ydl = YoutubeDL({**opts,
+                              'progress_hooks': [self._on_progress],
+                              'postprocessor_hooks': [self._on_postprocess]})
+        # Snapshot so per-job tweaks to ydl.params don't leak into the next checkout
+        self.base_params = dict(self.ydl.params)
+
+    def _on_progress(self, d):
+        if self.progress_hook:
+            self.progress_hook(d)
+
+    def _on_postprocess(self, d):
+        if self.postprocessor_hook:
+            self.postprocessor_hook(d)
+
+    def reset(self):
+        self.progress_hook = None
+        self.postprocessor_hook = None
+        self.ydl.params.clear()
+        self.ydl.params.update(self.base_params)
+
+    def close(self):
+        try:
+            self.ydl.close()  # Persists cookies and closes HTTP handlers
+        except Exception as e:
+            logging.debug(f"Closing pooled YoutubeDL failed: {e}")
+
+
+class YDLPool:
+    """
+    Pool of warmed YoutubeDL instances keyed by option profile.
+
+    Building a YoutubeDL re-initializes extractors, the cookie jar, JS runtime
+    setup and HTTP handlers; checking one out of the pool skips all of that.
+    Each instance is used by one thread at a time. Instances that raised while
+    checked out are closed instead of being returned.
+    """
+
+    def __init__(self, max_idle: int = 8):
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle = []  # Oldest first
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    @staticmethod
+    def profile_key(opts: Dict[str, Any]) -> Optional[str]:
+        """Stable key for an option profile, or None if it can't be pooled (e.g. holds callables)."""
+        params = {k: v for k, v in opts.items() if k not in _HOOK_KEYS}
+        if any(callable(v) for v in params.values()):
+            return None  # e.g. download_ranges closures for trims
+        try:
+            return json.dumps(params, sort_keys=True, default=lambda o: sorted(o) if isinstance(o, (set, frozenset)) else repr(o))
+        except (TypeError, ValueError):
+            return None
+
+    def _acquire(self, key, opts) -> _PooledYDL:
+        if key is not None:
+            with self._lock:
+                for i in range(len(self._idle) - 1, -1, -1):
+                    if self._idle[i].key == key:
+                        self.reused += 1
+                        return self._idle.pop(i)
+        slot = _PooledYDL(key, {k: v for k, v in opts.items() if k not in _HOOK_KEYS})
+        with self._lock:
+            self.created += 1
+        return slot
+
+    def _release(self, slot: _PooledYDL):
+        if slot.key is None:
+            slot.close()
+            return
+        slot.reset()
+        evicted = None
+        with self._lock:
+            self._idle.append(slot)
+            if len(self._idle) > self.max_idle:
+                evicted = self._idle.pop(0)
+        if evicted:
+            evicted.close()
+
+    @contextlib.contextmanager
+    def checkout(self, opts: Dict[str, Any], progress_hook: Optional[Callable] = None,
+                 postprocessor_hook: Optional[Callable] = None):
+        slot = self._acquire(self.profile_key(opts), opts)
+        slot.progress_hook = progress_hook
+        slot.postprocessor_hook = postprocessor_hook
+        try:
+            yield slot.ydl
+        except BaseException:
+            # State after a failed/cancelled run is unknown; don't hand it out again
+            with self._lock:
+                self.discarded += 1
+            slot.close()
+            raise
+        self._release(slot)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for slot in idle:
+            slot.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"created": self.created, "reused": self.reused,
+                    "discarded": self.discarded, "idle": len(self._idle)}
+
+
+# Shared process-wide pool
+ydl_pool = YDLPool()
+
+# Option profiles for metadata lookups
+INFO_OPTS = {
+    'quiet': True, 
+    'skip_download': True,
+    'js_runtimes': {'node': {}},
+    'retries': 3
+}
+FLAT_INFO_OPTS = {**INFO_OPTS, 'extract_flat': True}
+FORMATS_OPTS = {'quiet': True, 'skip_download': True}
+
+
+def _cache_enabled(use_cache):
+    return use_cache and current_settings.get("cache_metadata", True)
+
+def fetch_video_info(url: str, use_cache: bool = True) -> Dict[str, Any]:
+    key = canonical_id(url)
+    if _cache_enabled(use_cache):
+        cached = metadata_cache.get(key, KIND_FULL)
+        if cached is not None:
+            return cached
+
+    with ydl_pool.checkout(INFO_OPTS) as ydl:
         info = ydl.extract_info(url, download=False)
+        if info and _cache_enabled(use_cache):
+            metadata_cache.put(key, KIND_FULL, ydl.sanitize_info(info))
         return info
 
-def fetch_playlist_info(url: str) -> Dict[str, Any]:
-    from yt_dlp import YoutubeDL
-    ydl_opts = {
-        'quiet': True, 
-        'extract_flat': True, 
-        'skip_download': True,
-        'js_runtimes': {'node': {}},
-        'retries': 3
-    }
-    with YoutubeDL(ydl_opts) as ydl:
+def fetch_playlist_info(url: str, use_cache: bool = True) -> Dict[str, Any]:
+    key = canonical_id(url, playlist=True)
+    if _cache_enabled(use_cache):
+        cached = metadata_cache.get(key, KIND_FLAT)
+        if cached is not None:
+            return cached
+
+    with ydl_pool.checkout(FLAT_INFO_OPTS) as ydl:
         info = ydl.extract_info(url, download=False)
+        if info and _cache_enabled(use_cache):
+            # Flat entries may be a lazy generator; materialize before caching
+            info = ydl.sanitize_info(info)
+            metadata_cache.put(key, KIND_FLAT, info)
         return info
 
 def on_progress_hook(d, callback, cancel_callback=None):
     # Check Cancel
     if cancel_callback and cancel_callback():
-        raise Exception("Download Cancelled by User")
+        # DownloadCancelled is re-raised by yt-dlp; with 'ignoreerrors' a plain exception would only set the return code
+        from yt_dlp.utils import DownloadCancelled
+        raise DownloadCancelled("Download Cancelled by User")
 
     if d['status'] == 'downloading':
         # Enrich with inferred content type (Video vs Audio)
@@ -142,17 +251,314 @@ def on_postprocessor_hook(d, callback):
 
 
 
-def download_worker(url: str, opts: Dict[str, Any], progress_callback: Callable, complete_callback: Callable, error_callback: Callable, cancel_callback: Optional[Callable] = None):
-    from yt_dlp import YoutubeDL
+# Signed format URLs must outlive the download; re-extract when closer than this to expiry
+SIGNED_URL_MARGIN = 10 * 60
+# Formats without an expiry stamp are trusted for this long after extraction
+UNSIGNED_INFO_MAX_AGE = 30 * 60
+
+_EXPIRE_PATH = re.compile(r'/expire/(\d+)')
+
+def formats_expire_at(info: Dict[str, Any]) -> Optional[float]:
+    """Earliest expiry timestamp among the signed format URLs of an info dict, if any."""
+    expiries = []
+    for fmt in (info.get('formats') or []) + (info.get('requested_formats') or []):
+        url = fmt.get('url') or fmt.get('manifest_url') or ''
+        expire = parse_qs(urlparse(url).query).get('expire')
+        if expire and expire[0].isdigit():
+            expiries.append(int(expire[0]))
+            continue
+        m = _EXPIRE_PATH.search(url)  # Manifest style: .../expire/1700000000/...
+        if m:
+            expiries.append(int(m.group(1)))
+    return min(expiries) if expiries else None
+
+def info_is_fresh(info: Optional[Dict[str, Any]], margin: int = SIGNED_URL_MARGIN) -> bool:
+    """True if an already-extracted info dict can be downloaded without re-extraction."""
+    if not info or not info.get('formats'):
+        return False  # Flat entries and reconstructed queue items carry no formats
+    expires = formats_expire_at(info)
+    if expires is None:
+        epoch = info.get('epoch')
+        return bool(epoch) and time.time() - epoch < UNSIGNED_INFO_MAX_AGE
+    return expires - time.time() > margin
+
+def _info_matches(info: Dict[str, Any], url: str) -> bool:
+    info_url = info.get('webpage_url') or info.get('original_url') or ''
+    return bool(info_url) and canonical_id(info_url) == canonical_id(url)
+
+def _download_from_info(ydl, info: Dict[str, Any]) -> int:
+    """Download from an extracted info dict. Returns yt-dlp's return code (non-zero if it failed)."""
+    fd, info_path = tempfile.mkstemp(suffix='.info.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(ydl.sanitize_info(info), f)
+        return ydl.download_with_info_file(info_path)
+    finally:
+        os.remove(info_path)
+
+def _phase_hooks(phase_callback: Callable):
+    """Wrap hooks so phase_callback(phase, filename) sees file-level milestones (for the job journal)."""
+    seen = set()
+
+    def progress(d):
+        filename = d.get('tmpfilename') or d.get('filename')
+        if d['status'] == 'downloading' and filename not in seen:
+            seen.add(filename)
+            phase_callback("downloading", filename)
+        elif d['status'] == 'finished':
+            phase_callback("downloaded", d.get('filename'))
+
+    def postprocessor(d):
+        if d['status'] == 'finished':
+            phase_callback("postprocessed", (d.get('info_dict') or {}).get('filepath'))
+
+    return progress, postprocessor
+
+
+def _chain(*hooks: Callable) -> Callable:
+    def hook(d):
+        for h in hooks:
+            h(d)
+    return hook
+
+
+def _tuner_hooks(tuner):
+    """Returns (progress hook, attach(ydl)): feeds transfer stats to the tuner and pushes its settings into live params."""
+    live = {}
+
+    def attach(ydl):
+        # yt-dlp reads these per format/fragment batch, so later changes apply mid-download
+        tuner.apply(ydl.params)
+        ydl.params['logger'] = TunerLogger(tuner)  # Retry notices (429/403/timeouts) arrive here
+        live['params'] = ydl.params
+
+    def progress(d):
+        tuner.observe(d)
+        if 'params' in live:
+            tuner.apply(live['params'])
+
+    return progress, attach
+
+
+def _final_files_hook(files: List[str], infos: Optional[List[Dict[str, Any]]] = None) -> Callable:
+    """
+    Postprocessor hook collecting the final path of every downloaded file (after
+    yt-dlp's MoveFiles), and the identity of the video it came from into infos.
+    """
+    def hook(d):
+        if d['status'] == 'finished' and d.get('postprocessor') == 'MoveFiles':
+            info = d.get('info_dict') or {}
+            path = info.get('filepath')
+            if path and path not in files:
+                files.append(path)
+                if infos is not None:
+                    infos.append({k: info.get(k) for k in ('extractor_key', 'id', 'title')})
+    return hook
+
+
+def _record_archive(archive, url: str, paths: List[str], infos: List[Dict[str, Any]]):
+    for path, info in zip(paths, infos):
+        archive.add(url, path, info)
+
+
+def _finish_trim(trim, files, progress_callback, cancel_callback, trace=None):
+    """Finish stream-copied clips in place, reporting the achieved cut points."""
     from yt_dlp.utils import DownloadError
+    if progress_callback:
+        progress_callback({'status': 'trimming', 'msg': 'Trimming...'})
+    for path in files:
+        if trace:
+            trace.begin(("pp", "trim", path), SPAN_POSTPROCESS, postprocessor=f"Trim:{trim.mode}")
+        try:
+            report = finish_section(ffmpeg_locator.get(), path, trim.start_sec, trim.end_sec, trim.mode, cancel_callback)
+        except PostProcessError as e:
+            if trace:
+                trace.end(("pp", "trim", path), error=str(e))
+            if str(e) == "Cancelled":
+                raise RuntimeError("Download Cancelled")
+            raise DownloadError(f"Trim failed: {e}")
+        if trace:
+            trace.end(("pp", "trim", path))
+        logging.info(f"Trimmed {path} ({report['mode']}): requested {report['requested']}, got {report['achieved']}")
+        if progress_callback:
+            progress_callback({'status': 'trimmed', 'filename': path, 'trim': report})
+
+
+def _gif_reporter(progress_callback) -> Optional[Callable]:
+    """run_postprocessors on_report: a 'converted' event carrying the GIF's size and conversion time."""
+    if not progress_callback:
+        return None
+    return lambda path, report: progress_callback({'status': 'converted', 'filename': path, 'gif': report})
+
+
+def _convert(files, pps, opts, progress_callback, cancel_callback, phase_callback, trace=None):
+    """Run postprocessors yt-dlp must not see (the GIF pipeline) on this thread. Returns the output paths."""
+    from yt_dlp.utils import DownloadError
+    if not files:
+        raise DownloadError("Downloaded file not found for conversion")
+    if progress_callback:
+        progress_callback({'status': 'converting', 'msg': 'Converting...'})
+    if trace:
+        trace.begin(("pp", "inline"), SPAN_POSTPROCESS, postprocessor="+".join(pp['key'] for pp in pps))
     try:
-        # Inject progress hook & postprocessor hook with cancel check
-        opts['progress_hooks'] = [lambda d: on_progress_hook(d, progress_callback, cancel_callback)]
-        opts['postprocessor_hooks'] = [lambda d: on_postprocessor_hook(d, progress_callback)]
-        
-        with YoutubeDL(opts) as ydl:
-            ydl.download([url])
+        outputs = run_postprocessors(opts.get('ffmpeg_location'), files, pps, bool(opts.get('keepvideo')),
+                                     cancel_callback, _gif_reporter(progress_callback))
+    except PostProcessError as e:
+        if trace:
+            trace.end(("pp", "inline"), error=str(e))
+        if str(e) == "Cancelled":
+            raise RuntimeError("Download Cancelled")
+        raise DownloadError(f"Conversion failed: {e}")
+    if trace:
+        trace.end(("pp", "inline"))
+    if phase_callback:
+        for path in outputs:
+            phase_callback("postprocessed", path)
+    return outputs
+
+
+def _hand_off(pool, files, pps, opts, progress_callback, complete_callback, error_callback, cancel_callback, phase_callback,
+              on_converted=None, trace=None):
+    """Queue the deferred postprocessors; callbacks fire from the pool once they finish."""
+    def on_start():
+        if trace:
+            trace.begin(("pp", "deferred"), SPAN_POSTPROCESS, postprocessor="+".join(pp['key'] for pp in pps))
+        if progress_callback:
+            progress_callback({'status': 'converting', 'msg': 'Converting...'})
+
+    def on_done(future):
+        exc = future.exception()
+        if trace:
+            trace.end(("pp", "deferred"), error=str(exc) if exc else None)
+        if exc is None:
+            if phase_callback:
+                for path in future.result():
+                    phase_callback("postprocessed", path)
+            if on_converted:
+                on_converted(future.result())
+            if complete_callback:
+                complete_callback()
+        elif error_callback:
+            error_callback("Cancelled" if str(exc) == "Cancelled" else f"Conversion Failed: {exc}")
+
+    future = pool.submit(opts.get('ffmpeg_location'), files, pps, keep_source=bool(opts.get('keepvideo')),
+                         cancel_callback=cancel_callback, on_start=on_start, on_report=_gif_reporter(progress_callback))
+    future.add_done_callback(on_done)
+    return future
+
+
+def download_worker(url: str, opts: Dict[str, Any], progress_callback: Callable, complete_callback: Callable, error_callback: Callable, cancel_callback: Optional[Callable] = None, info: Optional[Dict[str, Any]] = None, phase_callback: Optional[Callable] = None, priority: float = PRIORITY_NORMAL, postprocess_pool=None, archive=None):
+    """
+    Download url with yt-dlp, reporting through the callbacks.
+
+    With a postprocess_pool, transcoding postprocessors (audio extraction, GIF)
+    are taken out of the yt-dlp run and queued on the pool instead: this returns
+    the pool's Future as soon as the network stage is done, and the
+    complete/error callbacks fire when the conversion finishes.
+
+    With an archive (an ArchiveScope, see logic/archive.py) a video already
+    downloaded in this format and still on disk is skipped before extraction:
+    progress_callback gets a 'skipped' event and complete_callback fires.
+    Finished downloads are recorded in it.
+
+    A clip trimmed in "fast" or "precise" mode (see logic/trim.py) is finished
+    here once downloaded; progress_callback gets a 'trimmed' event whose
+    'trim' report holds the achieved cut points.
+
+    GIFs are made by logic/gif.py, on the pool if there is one and here
+    otherwise; progress_callback gets a 'converted' event whose 'gif' report
+    holds the output size and conversion time.
+
+    Unless "export_metrics" is off, each download is traced (extract, transfer,
+    merge, post-process and move spans) and exported by logic/metrics.py.
+    """
+    if archive:
+        hit = archive.lookup(url, info)
+        if hit:
+            logging.info(f"Already downloaded, skipping: {url} -> {hit['path']}")
+            if progress_callback:
+                progress_callback({'status': 'skipped', 'filename': hit['path'], 'total_bytes': hit['bytes']})
+            if complete_callback:
+                complete_callback()
+            return None
+
+    from yt_dlp.utils import DownloadError
+    trace = job_metrics.trace(url) if current_settings.get("export_metrics", True) else None
+    if trace:
+        complete_callback, error_callback = trace.wrap(complete_callback, error_callback)
+    lease = bandwidth_scheduler.register(label=url, priority=priority)
+    deferred, converts, final_files, final_infos = [], [], [], []
+    trim = opts.get('download_ranges')
+    if not isinstance(trim, TrimRange) or trim.mode == TRIM_EXACT:
+        trim = None
+    if postprocess_pool:
+        opts, deferred = split_postprocessors(opts)
+    else:
+        opts, converts = split_postprocessors(opts, (GIF_POSTPROCESSOR,))
+    if trim and any(pp['key'] == GIF_POSTPROCESSOR for pp in deferred + converts):
+        trim = None  # The GIF is cut to the range while it is converted
+    try:
+        # Progress hook & postprocessor hook with cancel check, routed through the pooled instance
+        progress_hook = lambda d: on_progress_hook(d, progress_callback, cancel_callback)
+        postprocessor_hook = lambda d: on_postprocessor_hook(d, progress_callback)
+        if phase_callback:
+            phase_progress, phase_pp = _phase_hooks(phase_callback)
+            progress_hook = _chain(phase_progress, progress_hook)
+            postprocessor_hook = _chain(phase_pp, postprocessor_hook)
+        attach_tuner = None
+        if current_settings.get("adaptive_transfer", True):
+            tuner_progress, attach_tuner = _tuner_hooks(transfer_tuner)
+            progress_hook = _chain(tuner_progress, progress_hook)
+        # Global speed cap: may block here until the job's bytes fit (see logic/bandwidth.py)
+        progress_hook = _chain(lambda d: lease.observe(d, cancel_callback), progress_hook)
+        if deferred or converts or archive or trim:
+            postprocessor_hook = _chain(_final_files_hook(final_files, final_infos), postprocessor_hook)
+        if trace:
+            progress_hook = _chain(trace.progress_hook, progress_hook)
+            postprocessor_hook = _chain(trace.postprocessor_hook, postprocessor_hook)
         
+        def run(download: Callable) -> None:
+            with ydl_pool.checkout(opts, progress_hook, postprocessor_hook) as ydl:
+                if attach_tuner:
+                    attach_tuner(ydl)
+                if trace:
+                    trace.attach(ydl.params)  # After the tuner, so its logger keeps receiving messages
+                lease.attach(ydl.params)
+                retcode = download(ydl)
+
+                # 'ignoreerrors' keeps yt-dlp from raising, so surface failures via the return code
+                # (raised inside the checkout so the instance isn't reused)
+                if retcode:
+                    if cancel_callback and cancel_callback():
+                        raise RuntimeError("Download Cancelled")  # Cancelled where yt-dlp swallowed it
+                    raise DownloadError("yt-dlp reported an error for this download")
+
+        # Reuse the info from the Check step unless its signed URLs are about to expire
+        if info and _info_matches(info, url) and info_is_fresh(info):
+            logging.debug(f"Downloading from pre-extracted info: {url}")
+            try:
+                run(lambda ydl: _download_from_info(ydl, info))
+            except DownloadError:
+                # Its format URLs may have been refused or gone; yt-dlp's own fallback never runs under 'ignoreerrors'
+                logging.info(f"Download from pre-extracted info failed, re-extracting: {url}")
+                run(lambda ydl: ydl.download([url]))
+        else:
+            if info:
+                logging.debug(f"Pre-extracted info unusable (stale or mismatched), re-extracting: {url}")
+            run(lambda ydl: ydl.download([url]))
+
+        if trim:
+            _finish_trim(trim, final_files, progress_callback, cancel_callback, trace)
+        if converts:
+            final_files = _convert(final_files, converts, opts, progress_callback, cancel_callback, phase_callback, trace)
+        if deferred:
+            if not final_files:
+                raise DownloadError("Downloaded file not found for conversion")
+            on_converted = (lambda outputs: _record_archive(archive, url, outputs, final_infos)) if archive else None
+            return _hand_off(postprocess_pool, final_files, deferred, opts, progress_callback,
+                             complete_callback, error_callback, cancel_callback, phase_callback, on_converted, trace)
+        if archive:
+            _record_archive(archive, url, final_files, final_infos)
         if complete_callback:
             complete_callback()
 
@@ -167,15 +573,34 @@ def download_worker(url: str, opts: Dict[str, Any], progress_callback: Callable,
         else:
              if error_callback:
                 error_callback(f"System Error: {msg}")
+    finally:
+        lease.close()
 
-def start_download_thread(url, opts, progress_callback, complete_callback, error_callback, cancel_callback=None):
-    t = threading.Thread(target=download_worker, args=(url, opts, progress_callback, complete_callback, error_callback, cancel_callback))
+def start_download_thread(url, opts, progress_callback, complete_callback, error_callback, cancel_callback=None, info=None, phase_callback=None, priority=PRIORITY_NORMAL, archive=None, worker=None):
+    t = threading.Thread(target=worker or download_worker, args=(url, opts, progress_callback, complete_callback, error_callback, cancel_callback, info, phase_callback, priority),
+                         kwargs={'archive': archive})
     t.daemon = True
     t.start()
     return t
 
+# Format keys understood by build_ydl_opts ('best' and unknown keys use the fallback selector)
+FORMAT_KEYS = ("4k", "1440p", "1080p", "720p", "480p",
+               "mp3_320", "mp3_192", "mp3_128", "wav", "m4a", "gif", "best")
+
+class TrimRange:
+    """yt-dlp download_ranges callback for one clip (a class, not a closure, so opts stay picklable for process workers)."""
+
+    def __init__(self, start_sec, end_sec, mode=TRIM_EXACT):
+        self.start_sec = start_sec
+        self.end_sec = end_sec
+        self.mode = mode  # See logic/trim.py; download_worker finishes fast/precise clips
+
+    def __call__(self, info_dict, ydl):
+        return [{'start_time': self.start_sec, 'end_time': self.end_sec}]
+
+
 # Function to construct yt-dlp options based on settings and user choices
-def build_ydl_opts(path, format_key, noplaylist=True, trim_range=None):
+def build_ydl_opts(path, format_key, noplaylist=True, trim_range=None, trim_mode=None):
     opts = {
         'outtmpl': os.path.join(path, f"%(title)s.%(ext)s"),
         'noplaylist': noplaylist,
@@ -185,7 +610,7 @@ def build_ydl_opts(path, format_key, noplaylist=True, trim_range=None):
         'fragment_retries': 15,
         'socket_timeout': 15, # Force timeout on stalled connections
         'http_chunk_size': 10485760, # 10MB chunks to prevent small-chunk overhead
-        # 'concurrent_fragment_downloads': 4, # Removed for stability
+        # 'concurrent_fragment_downloads': 4, # Removed for stability; tuned live instead (logic/tuner.py, "adaptive_transfer")
         # Explicitly enable Node.js for signature extraction to avoid throttling
         'js_runtimes': {'node': {}}, 
         # Merging
@@ -216,12 +641,11 @@ def build_ydl_opts(path, format_key, noplaylist=True, trim_range=None):
             'preferredcodec': 'wav',
         }]
     elif base_fmt == 'gif':
-        # GIF conversion: Video only
-        opts['format'] = 'bestvideo[height<=720]/bestvideo' # Limit calc for GIF size
-        opts['postprocessors'] = [{
-            'key': 'FFmpegVideoConvertor',
-            'preferedformat': 'gif',
-        }]
+        # GIF conversion: Video only, no larger than the GIF needs; converted by logic/gif.py, not yt-dlp
+        width = int(current_settings.get("gif_width") or GIF_WIDTH)
+        opts['format'] = source_format(width)
+        opts['postprocessors'] = [gif_postprocessor(width, current_settings.get("gif_fps") or GIF_FPS,
+                                                    current_settings.get("gif_max_mb", GIF_MAX_MB), trim_range)]
     elif format_key == 'm4a':
         opts['format'] = 'bestaudio[ext=m4a]/best'
     elif format_key == '4k':
@@ -242,12 +666,14 @@ def build_ydl_opts(path, format_key, noplaylist=True, trim_range=None):
     opts['restrictfilenames'] = True 
 
     if trim_range:
-        start_sec, end_sec = trim_range
-        def ranges_callback(info_dict, ydl):
-            return [{'start_time': start_sec, 'end_time': end_sec}]
-        opts['download_ranges'] = ranges_callback
-        # Force re-encoding if trimming to ensure accuracy
-        opts['force_keyframes_at_cuts'] = True
+        mode = trim_mode or current_settings.get("trim_mode", TRIM_EXACT)
+        if base_fmt == 'gif':
+            mode = TRIM_FAST  # Only the section is downloaded; the GIF pipeline cuts it exactly while decoding anyway
+        opts['download_ranges'] = TrimRange(*trim_range, mode=mode)
+        if mode == TRIM_EXACT:
+            # Force re-encoding if trimming to ensure accuracy
+            opts['force_keyframes_at_cuts'] = True
+        # Otherwise the section is stream-copied and download_worker finishes the cut (see logic/trim.py)
 
     # Modern settings
     settings = current_settings
@@ -255,7 +681,7 @@ def build_ydl_opts(path, format_key, noplaylist=True, trim_range=None):
     if settings.get("embed_metadata"): opts['addmetadata'] = True
     if settings.get("download_subtitles"): opts['writesubtitles'] = True
     if settings.get("proxy_url"): opts['proxy'] = settings["proxy_url"]
-    if settings.get("speed_limit"): opts['ratelimit'] = settings["speed_limit"]
+    # "speed_limit" is a global cap enforced across jobs by logic/bandwidth.py, not a per-job ratelimit
     if settings.get("cookies_path") and os.path.exists(settings["cookies_path"]): 
         opts['cookiefile'] = settings["cookies_path"]
 
@@ -284,9 +710,7 @@ def get_max_resolution(info):
 def check_formats(url):
     """Helper to check available formats for a URL before downloading."""
     try:
-        from yt_dlp import YoutubeDL
-        ydl_opts = {'quiet': True, 'skip_download': True}
-        with YoutubeDL(ydl_opts) as ydl:
+        with ydl_pool.checkout(FORMATS_OPTS) as ydl:
             info = ydl.extract_info(url, download=False)
             return info.get('formats', [])
     except:
@@ -0,0 +1,232 @@
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Optional, Dict, List, Any, FrozenSet
+
+from .settings import current_settings, CACHE_DIR, on_settings_saved
+from .utils import resource_path
+
+# Capabilities of probed binaries, keyed by path + size + mtime
+CAPS_FILE = os.path.join(CACHE_DIR, "ffmpeg.json")
+PROBE_TIMEOUT = 10
+COMMON_PATHS = ('/usr/bin/ffmpeg', '/usr/local/bin/ffmpeg', '/snap/bin/ffmpeg')
+
+SOURCE_SETTINGS = "settings"
+SOURCE_BUNDLED = "bundled"
+SOURCE_SYSTEM = "system"
+SOURCE_COMMON = "common"
+
+
+def _runnable(path: Optional[str]) -> bool:
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _sibling(ffmpeg: str, name: str) -> Optional[str]:
+    """ffprobe next to ffmpeg (same directory and extension), else on PATH."""
+    base, ext = os.path.splitext(os.path.basename(ffmpeg))
+    candidate = os.path.join(os.path.dirname(ffmpeg), name + ext)
+    return candidate if _runnable(candidate) else shutil.which(name)
+
+
+def _table_names(output: str) -> List[str]:
+    """Names from an '-encoders' / '-muxers' listing: the column after the flags, below the ' ---' rule."""
+    names, started = [], False
+    for line in output.splitlines():
+        if not started:
+            started = line.strip().startswith('--')
+            continue
+        parts = line.split()
+        if len(parts) >= 2:
+            names.extend(parts[1].split(','))
+    return names
+
+
+def _filter_names(output: str) -> List[str]:
+    """Names from '-filters': rows look like ' TSC afade   A->A   Fade in/out input audio.'"""
+    names = []
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) >= 3 and '->' in parts[2]:
+            names.append(parts[1])
+    return names
+
+
+class FFmpeg:
+    """
+    A resolved FFmpeg (path, ffprobe, where it was found) and its capabilities.
+
+    Capabilities (version, encoders, muxers, filters) are probed on first use,
+    once: the answer is stored in CAPS_FILE and reused by later processes as
+    long as the binary is unchanged, so callers can check has_encoder() and
+    friends on hot paths without spawning anything.
+    """
+
+    def __init__(self, path: Optional[str], source: Optional[str] = None, caps_file: Optional[str] = CAPS_FILE):
+        self.path = path
+        self.source = source
+        self.ffprobe = _sibling(path, "ffprobe") if path else None
+        self.caps_file = caps_file
+        self._lock = threading.Lock()
+        self._caps: Optional[Dict[str, Any]] = None
+
+    def __bool__(self):
+        return bool(self.path)
+
+    # --- Capabilities ---
+    def _fingerprint(self) -> Optional[Dict[str, Any]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return {"path": os.path.abspath(self.path), "size": st.st_size, "mtime": int(st.st_mtime)}
+
+    def _run(self, *args) -> str:
+        out = subprocess.run([self.path, "-hide_banner", *args], capture_output=True, text=True,
+                             timeout=PROBE_TIMEOUT, errors='replace')
+        if out.returncode != 0:
+            raise RuntimeError(f"ffmpeg {args[0]} exited with {out.returncode}")
+        return out.stdout
+
+    def _probe(self) -> Dict[str, Any]:
+        try:
+            version = self._run("-version").split()
+            return {
+                "runnable": True,
+                "version": version[2] if len(version) > 2 else None,
+                "encoders": sorted(set(_table_names(self._run("-encoders")))),
+                "muxers": sorted(set(_table_names(self._run("-muxers")))),
+                "filters": sorted(set(_filter_names(self._run("-filters")))),
+            }
+        except PermissionError:
+            logging.warning(f"FFmpeg at {self.path} cannot execute (noexec partition?)")
+            return {"runnable": False, "denied": True, "error": "permission denied"}
+        except (OSError, RuntimeError, subprocess.SubprocessError) as e:
+            logging.error(f"FFmpeg probe failed for {self.path}: {e}")
+            return {"runnable": False, "error": str(e)[:200]}
+
+    def _load_cached(self, fingerprint) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.caps_file, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return cached.get("caps") if cached.get("binary") == fingerprint else None
+
+    def _store(self, fingerprint, caps):
+        try:
+            directory = os.path.dirname(self.caps_file) or '.'
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=directory)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"binary": fingerprint, "caps": caps}, f)
+            os.replace(tmp_path, self.caps_file)
+        except OSError as e:
+            logging.debug(f"Could not store FFmpeg capabilities: {e}")
+
+    def capabilities(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._caps is None:
+                if not self.path:
+                    self._caps = {"runnable": False, "error": "not found"}
+                    return self._caps
+                fingerprint = self._fingerprint()
+                caps = self._load_cached(fingerprint) if self.caps_file and fingerprint else None
+                if caps is None:
+                    caps = self._probe()
+                    if self.caps_file and fingerprint and caps.get("runnable"):
+                        self._store(fingerprint, caps)
+                caps = {**caps, **{k: frozenset(caps.get(k, ())) for k in ("encoders", "muxers", "filters")}}
+                self._caps = caps
+            return self._caps
+
+    @property
+    def runnable(self) -> bool:
+        return self.capabilities()["runnable"]
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.capabilities().get("version")
+
+    @property
+    def encoders(self) -> FrozenSet[str]:
+        return self.capabilities()["encoders"]
+
+    @property
+    def muxers(self) -> FrozenSet[str]:
+        return self.capabilities()["muxers"]
+
+    @property
+    def filters(self) -> FrozenSet[str]:
+        return self.capabilities()["filters"]
+
+    def has_encoder(self, name: str) -> bool:
+        return name in self.encoders
+
+    def has_muxer(self, name: str) -> bool:
+        return name in self.muxers
+
+    def has_filter(self, name: str) -> bool:
+        return name in self.filters
+
+
+def find_ffmpeg() -> FFmpeg:
+    """
+    Locate FFmpeg: the "ffmpeg_path" setting, then the bundled binary
+    (portable mode), then PATH, then common Linux locations.
+    """
+    configured = current_settings.get("ffmpeg_path")
+    if configured:
+        if _runnable(configured):
+            return FFmpeg(configured, SOURCE_SETTINGS)
+        logging.warning(f"ffmpeg_path setting is not an executable file: {configured}")
+
+    bundled = resource_path(os.path.join("bin", "ffmpeg"))
+    if _runnable(bundled):
+        logging.info(f"Using BUNDLED FFmpeg: {bundled}")
+        return FFmpeg(bundled, SOURCE_BUNDLED)
+
+    system = shutil.which('ffmpeg')
+    if system:
+        return FFmpeg(system, SOURCE_SYSTEM)
+
+    for path in COMMON_PATHS:
+        if _runnable(path):
+            logging.info(f"Using FFmpeg from common path: {path}")
+            return FFmpeg(path, SOURCE_COMMON)
+
+    logging.error("FFmpeg NOT FOUND on system or bundle.")
+    return FFmpeg(None)
+
+
+class FFmpegLocator:
+    """Resolves FFmpeg once per process; invalidate() (run whenever settings are saved) forgets the answer."""
+
+    def __init__(self, find=find_ffmpeg):
+        self.find = find
+        self._lock = threading.Lock()
+        self._current: Optional[FFmpeg] = None
+        self.resolved = 0  # How many times find ran
+
+    def get(self) -> FFmpeg:
+        with self._lock:
+            if self._current is None:
+                self._current = self.find()
+                self.resolved += 1
+            return self._current
+
+    def invalidate(self, *_):
+        with self._lock:
+            self._current = None
+
+
+# Shared by every stage that runs FFmpeg
+ffmpeg_locator = FFmpegLocator()
+on_settings_saved(ffmpeg_locator.invalidate)
+
+
+def ffmpeg() -> FFmpeg:
+    return ffmpeg_locator.get()
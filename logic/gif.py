@@ -0,0 +1,147 @@
+import logging
+import os
+import struct
+import time
+from typing import Optional, Dict, List, Any, Callable, Tuple
+
+from .ffmpeg import ffmpeg_locator, FFmpeg
+from .postprocess import PostProcessError, run_ffmpeg, GIF_POSTPROCESSOR
+from .trim import probe_media, section_offset, SEEK_EPSILON
+
+# Defaults for the "gif_width", "gif_fps" and "gif_max_mb" settings
+GIF_WIDTH = 480
+GIF_FPS = 12
+GIF_MAX_MB = 8
+# Source heights build_ydl_opts may fetch; the smallest whose 16:9 width covers the GIF's is picked
+SOURCE_HEIGHTS = (240, 360, 480, 720, 1080)
+# Over the size budget, each retry shrinks the pixel rate by the overshoot: width first, then frame rate
+MAX_ATTEMPTS = 4
+MIN_WIDTH = 160
+MIN_FPS = 6
+BUDGET_MARGIN = 0.9  # GIF size isn't exactly proportional to pixels per second; aim a little under
+
+
+def source_height(width: int) -> int:
+    """Smallest SOURCE_HEIGHTS entry whose 16:9 frame is at least width pixels wide."""
+    return next((h for h in SOURCE_HEIGHTS if h * 16 // 9 >= width), SOURCE_HEIGHTS[-1])
+
+
+def source_format(width: int) -> str:
+    """yt-dlp format selector for a GIF `width` pixels wide: video only, no larger than needed, H.264 first (cheapest to decode)."""
+    height = source_height(width)
+    return f"bestvideo[height<={height}][vcodec^=avc1]/bestvideo[height<={height}]/bestvideo[height<=720]/bestvideo"
+
+
+def gif_postprocessor(width: int = GIF_WIDTH, fps: int = GIF_FPS, max_mb: float = GIF_MAX_MB,
+                      section: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+    """opts['postprocessors'] entry for the GIF pipeline. section is the trim range the download was limited to."""
+    return {'key': GIF_POSTPROCESSOR, 'width': int(width), 'fps': int(fps),
+            'max_bytes': int(max_mb * 1024 * 1024) if max_mb else None,
+            'section': [float(section[0]), float(section[1])] if section else None}
+
+
+def gif_command(ffmpeg: str, source: str, output: str, width: int, fps: int, seek: float = 0.0,
+                duration: Optional[float] = None, palette: bool = True) -> List[str]:
+    """
+    One ffmpeg run: decode only [seek, seek + duration], drop to fps and scale
+    down before anything else, then build the clip's palette and map it in the
+    same graph (split feeds both palettegen and paletteuse).
+    """
+    cmd = [ffmpeg, "-y", "-loglevel", "error", "-nostdin"]
+    if seek > SEEK_EPSILON:
+        cmd += ["-ss", f"{seek:.6f}"]
+    if duration:
+        cmd += ["-t", f"{duration:.6f}"]
+    graph = f"fps={fps},scale='min({width},iw)':-1:flags=lanczos"
+    if palette:
+        # stats_mode=diff and diff_mode=rectangle favour what moves; static pixels stay identical frame to frame and compress away
+        graph += (",split[frames][stats];[stats]palettegen=stats_mode=diff[palette];"
+                  "[frames][palette]paletteuse=dither=bayer:bayer_scale=4:diff_mode=rectangle")
+    return cmd + ["-i", source, "-an", "-sn", "-vf", graph, "-loop", "0", "-f", "gif", output]
+
+
+def gif_width(path: str) -> Optional[int]:
+    """Logical screen width from a GIF's header."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(10)
+    except OSError:
+        return None
+    if len(header) < 10 or header[:3] != b"GIF":
+        return None
+    return struct.unpack("<H", header[6:8])[0]
+
+
+def _shrink(size: int, budget: int, width: int, fps: int) -> Tuple[int, int]:
+    """Width and fps for the next attempt, cutting pixels per second by the overshoot."""
+    factor = budget * BUDGET_MARGIN / size
+    new_width = max(MIN_WIDTH, int(width * factor ** 0.5))
+    left = factor * (width / new_width) ** 2  # What the width floor couldn't take
+    new_fps = max(MIN_FPS, int(fps * left)) if left < 0.95 else fps
+    return new_width, new_fps
+
+
+def make_gif(ff, source: str, output: str, width: int = GIF_WIDTH, fps: int = GIF_FPS,
+             max_bytes: Optional[int] = None, section: Optional[Tuple[float, float]] = None,
+             cancel_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    """
+    Convert source to an animated GIF at output.
+
+    section is the [start, end] a download was limited to (source times): the
+    GIF is cut exactly to it while decoding, whatever keyframe the stream-copied
+    section began at. Over max_bytes, the GIF is redone smaller (see _shrink) up
+    to MAX_ATTEMPTS times. Returns the report: bytes, seconds spent converting,
+    final width and fps, attempts, and whether it fits the budget.
+    """
+    if not ff.path:
+        raise PostProcessError("FFmpeg not found")
+    began = time.perf_counter()
+    seek, duration = 0.0, None
+    if section:
+        start, end = section
+        try:
+            offset, placed = section_offset(probe_media(ff.ffprobe, source), start, end)
+        except PostProcessError as e:
+            # yt-dlp's sections are mp4 with the pre-roll behind an edit list, so file time 0 is most likely start
+            logging.warning(f"Cannot probe {source} ({e}); converting the whole section")
+            offset, placed = start, False
+        if not placed:
+            logging.debug(f"GIF cut points in {source} are estimated")
+        seek, duration = max(0.0, start - offset), end - start
+    palette = ff.has_filter("palettegen") and ff.has_filter("paletteuse")
+    if not palette:
+        logging.warning("FFmpeg has no palettegen/paletteuse filters; the GIF uses the generic 256-colour palette")
+
+    work = f"{output}.part"
+    attempts = 0
+    while True:
+        attempts += 1
+        run_ffmpeg(gif_command(ff.path, source, work, width, fps, seek, duration, palette), work, cancel_callback)
+        size = os.path.getsize(work)
+        width = min(width, gif_width(work) or width)  # Never wider than the source
+        if not max_bytes or size <= max_bytes or attempts >= MAX_ATTEMPTS:
+            break
+        smaller = _shrink(size, max_bytes, width, fps)
+        if smaller == (width, fps):
+            break  # At the floors
+        logging.info(f"GIF is {size} bytes, over the {max_bytes} budget; retrying at {smaller[0]}px, {smaller[1]} fps")
+        width, fps = smaller
+    os.replace(work, output)
+
+    within = not max_bytes or size <= max_bytes
+    if not within:
+        logging.warning(f"{output} is {size} bytes, still over the {max_bytes} byte budget at {width}px, {fps} fps")
+    return {"bytes": size, "seconds": round(time.perf_counter() - began, 2), "width": width, "fps": fps,
+            "attempts": attempts, "budget": max_bytes, "within_budget": within,
+            "section": [round(t, 3) for t in section] if section else None}
+
+
+def run_gif_postprocessor(ffmpeg: Optional[str], source: str, pp: Dict[str, Any],
+                          cancel_callback: Optional[Callable] = None) -> Tuple[str, Dict[str, Any]]:
+    """Run a gif_postprocessor() entry on source with the FFmpeg at path ffmpeg: (output path, report)."""
+    found = ffmpeg_locator.get()
+    ff = found if found.path == ffmpeg else FFmpeg(ffmpeg)
+    output = f"{os.path.splitext(source)[0]}.gif"
+    report = make_gif(ff, source, output, pp.get('width') or GIF_WIDTH, pp.get('fps') or GIF_FPS,
+                      pp.get('max_bytes'), pp.get('section'), cancel_callback)
+    return output, report
@@ -0,0 +1,198 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from typing import Optional, Dict, Any, Iterable, List
+
+from .cache import canonical_id
+from .db import Database
+from .settings import DB_FILE, HISTORY_FILE
+
+PAGE_SIZE = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts        REAL NOT NULL,
+    url       TEXT,
+    video_id  TEXT,
+    type      TEXT,
+    title     TEXT,
+    uploader  TEXT,
+    payload   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_ts ON history (ts);
+CREATE INDEX IF NOT EXISTS history_url ON history (url);
+CREATE INDEX IF NOT EXISTS history_video_id ON history (video_id);
+"""
+
+# External-content FTS index over title/uploader, kept in step by trigger
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+    title, uploader, content='history', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS history_ai AFTER INSERT ON history BEGIN
+    INSERT INTO history_fts (rowid, title, uploader) VALUES (new.id, new.title, new.uploader);
+END;
+"""
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def _entry_ts(entry: Dict[str, Any]) -> float:
+    """Timestamp for an entry; legacy entries only carry a 'YYYY-MM-DD HH:MM' date."""
+    if isinstance(entry.get("ts"), (int, float)):
+        return float(entry["ts"])
+    try:
+        return time.mktime(time.strptime(entry.get("date", ""), "%Y-%m-%d %H:%M"))
+    except (TypeError, ValueError):
+        return time.time()
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word must match, last one as a prefix."""
+    words = _WORD.findall(text or "")
+    if not words:
+        return ""
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+class HistoryStore:
+    """
+    Append-only download history in SQLite.
+
+    Reads are keyset-paginated newest-first (WHERE id < ? ORDER BY id DESC), so
+    fetching any page is an index range scan regardless of how many records
+    exist. Title/uploader search goes through an FTS5 index; builds of SQLite
+    without FTS5 fall back to LIKE.
+    """
+
+    def __init__(self, path: str = DB_FILE, legacy_file: Optional[str] = HISTORY_FILE):
+        self.legacy_file = legacy_file
+        self.has_fts = False
+        self.db = Database(path, schema=self._create_schema)
+
+    def _create_schema(self, conn):
+        conn.executescript(SCHEMA)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            logging.warning(f"FTS5 unavailable, history search will use LIKE: {e}")
+        with self.db.transaction():
+            self._migrate_legacy(conn)
+
+    def _migrate_legacy(self, conn):
+        """Import the old capped history.json once, oldest first, then move it aside."""
+        path = self.legacy_file
+        if not path or not os.path.exists(path):
+            return
+        try:
+            with open(path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not migrate {path}: {e}")
+            return
+        if isinstance(entries, list):
+            # history.json was stored newest-first
+            self._insert(conn, [e for e in reversed(entries) if isinstance(e, dict)])
+            logging.info(f"Migrated {len(entries)} history entries from {path}")
+        try:
+            os.replace(path, path + ".migrated")
+        except OSError as e:
+            logging.warning(f"Could not rename {path}: {e}")
+
+    @staticmethod
+    def _insert(conn, entries: Iterable[Dict[str, Any]]) -> List[int]:
+        ids = []
+        for entry in entries:
+            entry = {k: v for k, v in entry.items() if k != "id"}
+            url = entry.get("url")
+            video_id = canonical_id(url, playlist=entry.get("type") == "playlist") if url else None
+            cur = conn.execute(
+                "INSERT INTO history (ts, url, video_id, type, title, uploader, payload) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (_entry_ts(entry), url, video_id, entry.get("type"), entry.get("title"), entry.get("uploader"),
+                 json.dumps(entry, ensure_ascii=False)))
+            ids.append(cur.lastrowid)
+        return ids
+
+    @staticmethod
+    def _rows_to_entries(rows) -> List[Dict[str, Any]]:
+        entries = []
+        for row in rows:
+            entry = json.loads(row["payload"])
+            entry["id"] = row["id"]
+            entries.append(entry)
+        return entries
+
+    # --- Writes ---
+    def append(self, entry: Dict[str, Any]) -> int:
+        return self.append_many([entry])[0]
+
+    def append_many(self, entries: Iterable[Dict[str, Any]]) -> List[int]:
+        with self.db.transaction() as conn:
+            return self._insert(conn, entries)
+
+    def clear(self):
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM history")
+            if self.has_fts:
+                conn.execute("INSERT INTO history_fts (history_fts) VALUES ('delete-all')")
+
+    # --- Reads (newest first, keyset pagination via before_id) ---
+    def page(self, limit: int = PAGE_SIZE, before_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        conn = self.db.connection()
+        if before_id is None:
+            rows = conn.execute("SELECT id, payload FROM history ORDER BY id DESC LIMIT ?", (limit,))
+        else:
+            rows = conn.execute("SELECT id, payload FROM history WHERE id < ? ORDER BY id DESC LIMIT ?",
+                                (before_id, limit))
+        return self._rows_to_entries(rows)
+
+    def search(self, text: str, limit: int = PAGE_SIZE, before_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Entries whose title or uploader match every word of text."""
+        conn = self.db.connection()
+        cursor = before_id if before_id is not None else -1
+        if self.has_fts:
+            query = fts_query(text)
+            if not query:
+                return self.page(limit, before_id)
+            rows = conn.execute(
+                "SELECT h.id, h.payload FROM history_fts f JOIN history h ON h.id = f.rowid "
+                "WHERE history_fts MATCH ? AND (? < 0 OR f.rowid < ?) ORDER BY f.rowid DESC LIMIT ?",
+                (query, cursor, cursor, limit))
+        else:
+            words = _WORD.findall(text or "")
+            where = " AND ".join("(title LIKE ? OR uploader LIKE ?)" for _ in words) or "1"
+            params = [p for w in words for p in (f"%{w}%", f"%{w}%")]
+            rows = conn.execute(
+                f"SELECT id, payload FROM history WHERE {where} AND (? < 0 OR id < ?) ORDER BY id DESC LIMIT ?",
+                (*params, cursor, cursor, limit))
+        return self._rows_to_entries(rows)
+
+    def by_url(self, url: str, limit: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+        rows = self.db.connection().execute(
+            "SELECT id, payload FROM history WHERE url = ? ORDER BY id DESC LIMIT ?", (url, limit))
+        return self._rows_to_entries(rows)
+
+    def by_video_id(self, video_id: str, limit: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+        """Lookup by canonical id (see logic.cache.canonical_id), e.g. 'youtube:dQw4w9WgXcQ'."""
+        rows = self.db.connection().execute(
+            "SELECT id, payload FROM history WHERE video_id = ? ORDER BY id DESC LIMIT ?", (video_id, limit))
+        return self._rows_to_entries(rows)
+
+    def between(self, start_ts: float, end_ts: float, limit: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+        rows = self.db.connection().execute(
+            "SELECT id, payload FROM history WHERE ts >= ? AND ts < ? ORDER BY ts DESC, id DESC LIMIT ?",
+            (start_ts, end_ts, limit))
+        return self._rows_to_entries(rows)
+
+    def count(self) -> int:
+        return self.db.connection().execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,306 @@
+import json
+import logging
+import os
+import re
+import time
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+
+from .db import Database
+from .settings import DB_FILE
+
+# Job states
+ACTIVE = "active"
+DONE = "done"
+CANCELLED = "cancelled"
+
+# Item states
+PENDING = "pending"
+RUNNING = "running"
+ITEM_DONE = "done"
+FAILED = "failed"
+
+# Phases recorded per item, in the order yt-dlp reaches them
+PHASE_DOWNLOADING = "downloading"
+PHASE_DOWNLOADED = "downloaded"
+PHASE_POSTPROCESSED = "postprocessed"
+
+# yt-dlp scratch files: partial downloads, fragment state, fragments, merge temporaries
+PARTIAL_FILE = re.compile(r'(\.part|\.ytdl|\.part-Frag\d+(\.part)?|\.temp\.\w+)$')
+# Of those, the ones only yt-dlp writes (browsers also leave .part files around)
+YTDLP_ONLY_FILE = re.compile(r'(\.ytdl|\.part-Frag\d+(\.part)?)$')
+# Leave files younger than this alone; another process may still be writing them
+ORPHAN_GRACE = 10 * 60
+# Closed jobs are kept this long for orphan detection, then pruned
+JOB_RETENTION = 30 * 86400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind        TEXT NOT NULL,
+    url         TEXT NOT NULL,
+    format_key  TEXT NOT NULL,
+    path        TEXT NOT NULL,
+    title       TEXT,
+    options     TEXT NOT NULL DEFAULT '{}',
+    status      TEXT NOT NULL DEFAULT 'active',
+    created     REAL NOT NULL,
+    updated     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id   INTEGER NOT NULL,
+    idx      INTEGER NOT NULL,
+    url      TEXT,
+    title    TEXT,
+    status   TEXT NOT NULL DEFAULT 'pending',
+    phases   TEXT NOT NULL DEFAULT '[]',
+    files    TEXT NOT NULL DEFAULT '[]',
+    error    TEXT,
+    updated  REAL NOT NULL,
+    PRIMARY KEY (job_id, idx)
+);
+"""
+
+
+def _matches(path: str, prefixes: List[str]) -> bool:
+    return any(path.startswith(p) for p in prefixes)
+
+
+def _claim_prefix(filename: str) -> str:
+    """Scratch files of a download share the prefix of its temp name (X.mp4.part -> X.mp4)."""
+    return filename[:-len(".part")] if filename.endswith(".part") else filename
+
+
+class JobJournal:
+    """
+    Crash-safe record of what each download job was asked to do and how far it got.
+
+    A job is one Download click (a video or a playlist) and stores everything
+    needed to rebuild its yt-dlp options: URL, format key, output path and extra
+    options such as a trim range. Each item records its status, the phases it
+    completed and the files yt-dlp was writing. Items interrupted by a crash or
+    app exit stay pending; on the next launch they are downloaded again with the
+    same options, so yt-dlp continues from the .part files (continuedl).
+    """
+
+    def __init__(self, path: str = DB_FILE):
+        self.db = Database(path, schema=lambda conn: conn.executescript(SCHEMA))
+
+    # --- Recording ---
+    def create_job(self, kind: str, url: str, format_key: str, path: str, items: Iterable[Dict[str, Any]],
+                   title: Optional[str] = None, options: Optional[Dict[str, Any]] = None) -> int:
+        now = time.time()
+        with self.db.transaction() as conn:
+            job_id = conn.execute(
+                "INSERT INTO jobs (kind, url, format_key, path, title, options, status, created, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, url, format_key, path, title, json.dumps(options or {}), ACTIVE, now, now)).lastrowid
+            conn.executemany(
+                "INSERT INTO job_items (job_id, idx, url, title, status, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                ((job_id, i, item.get("url"), item.get("title"), PENDING, now) for i, item in enumerate(items)))
+        return job_id
+
+    def item_started(self, job_id: int, idx: int):
+        self._set_item(job_id, idx, status=RUNNING)
+
+    def item_phase(self, job_id: int, idx: int, phase: str, filename: Optional[str] = None):
+        with self.db.transaction() as conn:
+            row = conn.execute("SELECT phases, files FROM job_items WHERE job_id = ? AND idx = ?",
+                               (job_id, idx)).fetchone()
+            if row is None:
+                return
+            phases, files = json.loads(row["phases"]), json.loads(row["files"])
+            if phase not in phases:
+                phases.append(phase)
+            if filename and filename not in files:
+                files.append(filename)
+            conn.execute("UPDATE job_items SET phases = ?, files = ?, updated = ? WHERE job_id = ? AND idx = ?",
+                         (json.dumps(phases), json.dumps(files), time.time(), job_id, idx))
+
+    def item_finished(self, job_id: int, idx: int, ok: bool, error: Optional[str] = None):
+        """Record an item outcome. A cancelled item goes back to pending so it can be resumed."""
+        if ok:
+            self._set_item(job_id, idx, status=ITEM_DONE, error=None)
+        elif error == "Cancelled":
+            self._set_item(job_id, idx, status=PENDING)
+        else:
+            self._set_item(job_id, idx, status=FAILED, error=error)
+
+    def finish_job(self, job_id: int, status: Optional[str] = None):
+        """Close a job explicitly (e.g. CANCELLED by the user) or, by default, once nothing is left to resume."""
+        with self.db.transaction() as conn:
+            if status is None:
+                left = conn.execute("SELECT COUNT(*) FROM job_items WHERE job_id = ? AND status IN (?, ?)",
+                                    (job_id, PENDING, RUNNING)).fetchone()[0]
+                if left:
+                    return
+                status = DONE
+            conn.execute("UPDATE jobs SET status = ?, updated = ? WHERE id = ?", (status, time.time(), job_id))
+
+    def recorder(self, job_id: int, indices: Optional[List[int]] = None) -> "JobRecorder":
+        return JobRecorder(self, job_id, indices)
+
+    def _set_item(self, job_id: int, idx: int, **fields):
+        fields["updated"] = time.time()
+        assignments = ", ".join(f"{k} = ?" for k in fields)
+        self.db.connection().execute(f"UPDATE job_items SET {assignments} WHERE job_id = ? AND idx = ?",
+                                     (*fields.values(), job_id, idx))
+
+    # --- Resume ---
+    def unfinished_jobs(self) -> List[Dict[str, Any]]:
+        """Active jobs with their resumable (pending/running) items; completed items are left out."""
+        conn = self.db.connection()
+        jobs = []
+        for row in conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id", (ACTIVE,)).fetchall():
+            items = [dict(r) for r in conn.execute(
+                "SELECT idx, url, title, status, phases, files FROM job_items "
+                "WHERE job_id = ? AND status IN (?, ?) ORDER BY idx", (row["id"], PENDING, RUNNING))]
+            if not items:
+                # Everything finished but the job was never closed (crash between the two writes)
+                self.finish_job(row["id"])
+                continue
+            for item in items:
+                item["phases"] = json.loads(item["phases"])
+                item["files"] = json.loads(item["files"])
+            job = dict(row)
+            job["options"] = json.loads(job["options"] or "{}")
+            job["items"] = items
+            jobs.append(job)
+        return jobs
+
+    def discard_job(self, job_id: int, delete_partials: bool = True) -> Tuple[int, int]:
+        """Give up on a job; optionally delete its scratch files. Returns (files, bytes) removed."""
+        removed = (0, 0)
+        if delete_partials:
+            prefixes = [_claim_prefix(f) for f in self._files((PENDING, RUNNING), job_id=job_id)]
+            removed = self._remove_partials(self._job_dirs([job_id]), lambda path, name: _matches(path, prefixes),
+                                            grace=0)
+        self.finish_job(job_id, CANCELLED)
+        return removed
+
+    def prune(self, older_than: float = JOB_RETENTION) -> int:
+        """Forget closed jobs last touched more than older_than seconds ago."""
+        cutoff = time.time() - older_than
+        with self.db.transaction() as conn:
+            ids = [r["id"] for r in conn.execute("SELECT id FROM jobs WHERE status != ? AND updated < ?",
+                                                 (ACTIVE, cutoff))]
+            for job_id in ids:
+                conn.execute("DELETE FROM job_items WHERE job_id = ?", (job_id,))
+                conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        return len(ids)
+
+    def _files(self, statuses, job_id: Optional[int] = None, active_only: bool = False) -> List[str]:
+        placeholders = ",".join("?" * len(statuses))
+        query = f"SELECT i.files FROM job_items i JOIN jobs j ON j.id = i.job_id WHERE i.status IN ({placeholders})"
+        params = list(statuses)
+        if active_only:
+            query += " AND j.status = ?"
+            params.append(ACTIVE)
+        if job_id is not None:
+            query += " AND i.job_id = ?"
+            params.append(job_id)
+        return [f for row in self.db.connection().execute(query, params) for f in json.loads(row["files"])]
+
+    def _job_dirs(self, job_ids: Optional[List[int]] = None) -> List[str]:
+        conn = self.db.connection()
+        if job_ids is None:
+            rows = conn.execute("SELECT DISTINCT path FROM jobs")
+        else:
+            rows = conn.execute(f"SELECT DISTINCT path FROM jobs WHERE id IN ({','.join('?' * len(job_ids))})",
+                                job_ids)
+        return [r["path"] for r in rows]
+
+    # --- Garbage collection ---
+    def collect_orphans(self, directories: Iterable[str] = (), grace: float = ORPHAN_GRACE,
+                        dry_run: bool = False) -> Tuple[int, int]:
+        """
+        Delete yt-dlp scratch files that no resumable item claims.
+
+        Scans the given directories plus every directory a job wrote to. A file
+        is an orphan if it is not claimed by a pending item of an active job and
+        either belongs to a download the journal knows about or is a yt-dlp-only
+        fragment file. Unknown plain .part files (e.g. from a browser) are kept.
+        Returns (files, bytes) removed (or that would be removed with dry_run).
+        """
+        dirs = set(directories) | set(self._job_dirs())
+        claimed = [_claim_prefix(f) for f in self._files((PENDING, RUNNING), active_only=True)]
+        known = [_claim_prefix(f) for f in self._files((PENDING, RUNNING, ITEM_DONE, FAILED))]
+
+        def is_orphan(path, name):
+            if _matches(path, claimed):
+                return False
+            return bool(YTDLP_ONLY_FILE.search(name)) or _matches(path, known)
+
+        return self._remove_partials(dirs, is_orphan, grace, dry_run)
+
+    @staticmethod
+    def _remove_partials(directories: Iterable[str], should_remove, grace: float,
+                         dry_run: bool = False) -> Tuple[int, int]:
+        now = time.time()
+        count = size = 0
+        for directory in set(directories):
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            for name in names:
+                path = os.path.join(directory, name)
+                if not PARTIAL_FILE.search(name) or not should_remove(path, name):
+                    continue
+                try:
+                    st = os.stat(path)
+                    if not os.path.isfile(path) or now - st.st_mtime < grace:
+                        continue
+                    if not dry_run:
+                        os.remove(path)
+                except OSError as e:
+                    logging.debug(f"Could not remove {path}: {e}")
+                    continue
+                count += 1
+                size += st.st_size
+        if count:
+            logging.info(f"{'Would remove' if dry_run else 'Removed'} {count} partial files ({size} bytes)")
+        return count, size
+
+    def close(self):
+        self.db.close()
+
+
+class JobRecorder:
+    """
+    Journal callbacks bound to one job, in the shape PlaylistEngine expects.
+
+    indices maps engine positions to item indices, for resuming a subset of a job.
+    """
+
+    def __init__(self, journal: JobJournal, job_id: int, indices: Optional[List[int]] = None):
+        self.journal = journal
+        self.job_id = job_id
+        self.indices = indices
+
+    def _idx(self, position: int) -> int:
+        return self.indices[position] if self.indices is not None else position
+
+    def item_started(self, position: int):
+        self._safe(self.journal.item_started, self.job_id, self._idx(position))
+
+    def item_phase(self, position: int, phase: str, filename: Optional[str] = None):
+        self._safe(self.journal.item_phase, self.job_id, self._idx(position), phase, filename)
+
+    def item_finished(self, position: int, ok: bool, error: Optional[str] = None):
+        self._safe(self.journal.item_finished, self.job_id, self._idx(position), ok, error)
+
+    def finish(self, status: Optional[str] = None):
+        self._safe(self.journal.finish_job, self.job_id, status)
+
+    @staticmethod
+    def _safe(fn, *args):
+        # Journal trouble must never fail a download
+        try:
+            fn(*args)
+        except Exception as e:
+            logging.warning(f"Job journal update failed: {e}")
+
+
+# Shared process-wide journal
+job_journal = JobJournal()
@@ -0,0 +1,317 @@
+import itertools
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Optional, Dict, List, Any, Callable, Tuple
+
+from .tuner import classify_error
+
+METRICS_DIR = "metrics"
+JSONL_FILE = "jobs.jsonl"
+PROM_FILE = "yikes.prom"
+# jobs.jsonl is rotated to jobs.jsonl.1 beyond this size
+JSONL_MAX_BYTES = 20 * 1024 * 1024
+
+SPAN_EXTRACT = "extract"
+SPAN_MERGE = "merge"
+SPAN_POSTPROCESS = "postprocess"
+SPAN_MOVE = "move"
+_PP_SPANS = {"Merger": SPAN_MERGE, "FFmpegMerger": SPAN_MERGE, "MoveFiles": SPAN_MOVE}
+
+# yt-dlp retry notices: "Retrying (1/15)...", "Retrying fragment 3 (2/15)..."
+_RETRY = re.compile(r'\bRetrying\b', re.I)
+
+
+def stream_kind(info: Dict[str, Any]) -> str:
+    """'video', 'audio' or 'av' for the format being downloaded (same heuristic as the progress UI)."""
+    vcodec = info.get('vcodec') or 'none'
+    acodec = info.get('acodec') or 'none'
+    if vcodec != 'none' and acodec == 'none':
+        return "video"
+    if acodec != 'none' and vcodec == 'none':
+        return "audio"
+    return "av"
+
+
+class JobTrace:
+    """
+    Timing spans of one download job, fed by yt-dlp hooks.
+
+    Spans: 'extract' (from start to the first transfer), 'download.video' /
+    'download.audio' / 'download.av' per file with bytes and average/peak
+    throughput, 'merge', 'postprocess' and 'move' per postprocessor run. Retry
+    notices and transport errors are counted from yt-dlp's log output (see
+    attach). finish() closes whatever is still open and hands the record to
+    the sink; it runs once, from whichever of complete/error fires.
+    """
+
+    def __init__(self, job_id: int, label: str, sink: Optional["MetricsSink"] = None):
+        self.job_id = job_id
+        self.label = label
+        self.sink = sink
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans: List[Dict[str, Any]] = []
+        self._open: Dict[Any, Dict[str, Any]] = {}
+        self.retries = 0
+        self.errors: Dict[str, int] = {}
+        self.record = None
+        self.begin(SPAN_EXTRACT, SPAN_EXTRACT)
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._t0
+
+    def begin(self, key, name: str, **fields) -> Dict[str, Any]:
+        with self._lock:
+            span = self._open.get(key)
+            if span is None:
+                span = {"name": name, "start": round(self._now(), 4), **fields}
+                self._open[key] = span
+            return span
+
+    def end(self, key, error: Optional[str] = None, **fields):
+        with self._lock:
+            span = self._open.pop(key, None)
+            if span is None:
+                return
+            span.update(fields)
+            span["seconds"] = round(self._now() - span["start"], 4)
+            if span.get("bytes") and span["seconds"] > 0:
+                span["avg_bps"] = round(span["bytes"] / span["seconds"])
+            if error:
+                span["error"] = error
+            self.spans.append(span)
+
+    # --- yt-dlp hooks ---
+    def progress_hook(self, d):
+        status = d.get('status')
+        key = ("download", d.get('filename'))
+        if status == 'downloading':
+            self.end(SPAN_EXTRACT)
+            span = self.begin(key, "download." + stream_kind(d.get('info_dict') or {}), peak_bps=0)
+            with self._lock:
+                span["bytes"] = d.get('downloaded_bytes') or 0
+                if d.get('speed'):
+                    span["peak_bps"] = max(span.get("peak_bps", 0), round(d['speed']))
+        elif status == 'finished':
+            self.end(SPAN_EXTRACT)
+            self.begin(key, "download." + stream_kind(d.get('info_dict') or {}), peak_bps=0)  # Already on disk: 0s span
+            self.end(key, bytes=d.get('total_bytes') or d.get('downloaded_bytes') or 0)
+        elif status == 'error':
+            self.end(key, error="download error")
+
+    def postprocessor_hook(self, d):
+        pp = d.get('postprocessor')
+        key = ("pp", pp)
+        if d.get('status') == 'started':
+            self.end(SPAN_EXTRACT)
+            self.begin(key, _PP_SPANS.get(pp, SPAN_POSTPROCESS), postprocessor=pp)
+        elif d.get('status') == 'finished':
+            self.end(key)
+
+    def log(self, msg: str):
+        kind = classify_error(msg)
+        with self._lock:
+            if _RETRY.search(msg or ''):
+                self.retries += 1
+            if kind:
+                self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def attach(self, params: Dict[str, Any]):
+        """Route yt-dlp's log output through this trace (keeping any logger already installed)."""
+        params['logger'] = TraceLogger(self, params.get('logger'))
+
+    def wrap(self, complete_callback: Optional[Callable], error_callback: Optional[Callable]) -> Tuple[Callable, Callable]:
+        """complete/error callbacks that finish the trace before calling the originals."""
+        def complete():
+            self.finish()
+            if complete_callback:
+                complete_callback()
+
+        def error(msg):
+            self.finish(msg)
+            if error_callback:
+                error_callback(msg)
+
+        return complete, error
+
+    def finish(self, error: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if self.record is not None:
+                return None
+            open_keys = list(self._open)
+        for key in open_keys:
+            self.end(key, error=error or "unfinished")
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start"])
+            downloads = [s for s in spans if s["name"].startswith("download.")]
+            self.record = {
+                "job": self.job_id,
+                "url": self.label,
+                "ts": round(self.started, 3),
+                "seconds": round(self._now(), 4),
+                "result": "ok" if not error else ("cancelled" if error == "Cancelled" else "failed"),
+                "error": error,
+                "bytes": sum(s.get("bytes", 0) for s in downloads),
+                "peak_bps": max([s.get("peak_bps", 0) for s in downloads] or [0]),
+                "retries": self.retries,
+                "errors": dict(self.errors),
+                "spans": spans,
+            }
+            record = self.record
+        if self.sink:
+            self.sink.record(record)
+        return record
+
+
+class TraceLogger:
+    """yt-dlp 'logger' that counts retries/errors for a trace, then forwards to the previous logger (or logging)."""
+
+    def __init__(self, trace: JobTrace, inner=None):
+        self.trace = trace
+        self.inner = inner
+
+    def debug(self, msg):
+        self.trace.log(msg)
+        (self.inner or logging).debug(msg)
+
+    def info(self, msg):
+        (self.inner or logging).info(msg)
+
+    def warning(self, msg):
+        self.trace.log(msg)
+        (self.inner or logging).warning(msg)
+
+    def error(self, msg):
+        self.trace.log(msg)
+        (self.inner or logging).error(msg)
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(labels.items())) + "}"
+
+
+class MetricsSink:
+    """
+    Exports finished job records to local files.
+
+    Every record is appended to <directory>/jobs.jsonl (rotated at
+    JSONL_MAX_BYTES). Totals since process start are rewritten atomically to
+    <directory>/yikes.prom in the Prometheus text format, ready for
+    node_exporter's textfile collector. Safe to share between threads.
+    """
+
+    def __init__(self, directory: str = METRICS_DIR, max_bytes: int = JSONL_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.jobs: Dict[str, int] = {}
+        self.job_seconds = 0.0
+        self.span_seconds: Dict[str, float] = {}
+        self.span_count: Dict[str, int] = {}
+        self.span_bytes: Dict[str, int] = {}
+        self.span_errors: Dict[str, int] = {}
+        self.peak_bps: Dict[str, int] = {}
+        self.retries = 0
+        self.errors: Dict[str, int] = {}
+        # Set in download processes: records go to the parent's sink instead of these files
+        self.forward: Optional[Callable] = None
+
+    @property
+    def jsonl_path(self) -> str:
+        return os.path.join(self.directory, JSONL_FILE)
+
+    @property
+    def prom_path(self) -> str:
+        return os.path.join(self.directory, PROM_FILE)
+
+    def trace(self, label: str) -> JobTrace:
+        return JobTrace(next(self._ids), label, self)
+
+    def record(self, record: Dict[str, Any]):
+        if self.forward:
+            self.forward(record)
+            return
+        with self._lock:
+            self._aggregate(record)
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                self._append(record)
+                self._write_prom()
+            except OSError as e:
+                logging.warning(f"Could not export job metrics to {self.directory}: {e}")
+
+    def _aggregate(self, record):
+        self.jobs[record["result"]] = self.jobs.get(record["result"], 0) + 1
+        self.job_seconds += record["seconds"]
+        self.retries += record["retries"]
+        for kind, n in record["errors"].items():
+            self.errors[kind] = self.errors.get(kind, 0) + n
+        for span in record["spans"]:
+            name = span["name"]
+            self.span_seconds[name] = self.span_seconds.get(name, 0.0) + span["seconds"]
+            self.span_count[name] = self.span_count.get(name, 0) + 1
+            self.span_bytes[name] = self.span_bytes.get(name, 0) + span.get("bytes", 0)
+            if span.get("error"):
+                self.span_errors[name] = self.span_errors.get(name, 0) + 1
+            self.peak_bps[name] = max(self.peak_bps.get(name, 0), span.get("peak_bps", 0))
+
+    def _append(self, record):
+        path = self.jsonl_path
+        try:
+            if os.path.getsize(path) > self.max_bytes:
+                os.replace(path, path + ".1")
+        except OSError:
+            pass
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n")
+
+    def prometheus_text(self) -> str:
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(**labels)} {value}")
+
+        metric("yikes_jobs_total", "counter", "Finished download jobs by result.",
+               [({"result": r}, n) for r, n in sorted(self.jobs.items())])
+        metric("yikes_job_seconds_total", "counter", "Wall time of finished jobs.", [({}, round(self.job_seconds, 4))])
+        metric("yikes_span_seconds_total", "counter", "Time spent per job phase.",
+               [({"span": s}, round(v, 4)) for s, v in sorted(self.span_seconds.items())])
+        metric("yikes_spans_total", "counter", "Phase runs.", [({"span": s}, n) for s, n in sorted(self.span_count.items())])
+        metric("yikes_span_bytes_total", "counter", "Bytes transferred per download phase.",
+               [({"span": s}, n) for s, n in sorted(self.span_bytes.items()) if s.startswith("download.")])
+        metric("yikes_span_failures_total", "counter", "Phase runs that ended in an error.",
+               [({"span": s}, n) for s, n in sorted(self.span_errors.items())])
+        metric("yikes_span_peak_bytes_per_second", "gauge", "Highest throughput seen per download phase.",
+               [({"span": s}, n) for s, n in sorted(self.peak_bps.items()) if s.startswith("download.")])
+        metric("yikes_retries_total", "counter", "Retries reported by yt-dlp.", [({}, self.retries)])
+        metric("yikes_transport_errors_total", "counter", "Transport errors by kind.",
+               [({"kind": k}, n) for k, n in sorted(self.errors.items())])
+        return "\n".join(lines) + "\n"
+
+    def _write_prom(self):
+        # Atomic replace: the textfile collector must never read a half-written file
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus_text())
+            os.replace(tmp_path, self.prom_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+# Shared by every download in the process
+job_metrics = MetricsSink()
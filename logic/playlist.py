@@ -0,0 +1,296 @@
+import concurrent.futures
+import copy
+import logging
+import threading
+from typing import Optional, Dict, List, Any, Callable, Tuple
+
+from .downloader import download_worker
+
+DEFAULT_CONCURRENCY = 3
+MAX_CONCURRENCY = 8
+
+
+def entry_url(entry: Dict[str, Any]) -> Optional[str]:
+    """Resolve the downloadable URL of a (flat) playlist entry."""
+    return entry.get('url') or entry.get('webpage_url')
+
+
+def format_row_progress(info: Dict[str, Any]) -> Tuple[float, str]:
+    """Turn a yt-dlp progress dict into (fraction, status text) for a playlist row."""
+    total = info.get('total_bytes') or info.get('total_bytes_estimate') or 1
+    downloaded = info.get('downloaded_bytes') or 0
+    p = downloaded / total if total > 0 else 0
+
+    # Extract strings provided by yt-dlp or fallback
+    speed_s = (info.get('_speed_str') or 'N/A').strip()
+    total_s = (info.get('_total_bytes_str') or 'N/A').strip()
+    percent_s = (info.get('_percent_str') or f"{p*100:.1f}%").strip()
+    if speed_s == 'N/A' and info.get('speed'):
+        speed_s = f"{info['speed']/1024/1024:.1f} MB/s"
+
+    # Format: "Downloading Video... | Size: 10.5MiB • Speed: 2.5MiB/s • Progress: 45.0%"
+    content_type = info.get('_content_type', 'Content')
+    details = f"Size: {total_s} • Speed: {speed_s} • Progress: {percent_s}"
+    return p, f"Downloading {content_type}... | {details}"
+
+
+def entry_thumbnail(entry: Dict[str, Any]) -> Optional[str]:
+    thumbnails = entry.get('thumbnails')
+    if isinstance(thumbnails, list) and thumbnails:
+        return thumbnails[0].get('url')
+    return entry.get('thumbnail')
+
+
+class PlaylistRows:
+    """
+    Display state of playlist rows, kept apart from any widgets.
+
+    Progress and status are stored per index only once a row has been touched,
+    so a 5,000-entry playlist costs one small dict per started download rather
+    than one widget tree per entry. A virtual list reads row(i) whenever it
+    binds a recycled widget to index i.
+    """
+
+    DEFAULT_STATE = {"progress": 0.0, "status": "Pending", "state": "pending"}
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.entries = entries
+        self._state: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        entry = self.entries[index] or {}
+        return {
+            "index": index,
+            "title": entry.get('title', 'Unknown Title'),
+            "uploader": entry.get('uploader') or entry.get('channel') or "Unknown Uploader",
+            "thumbnail": entry_thumbnail(entry),
+            **self.DEFAULT_STATE,
+            **self._state.get(index, {}),
+        }
+
+    def update(self, index: int, **changes):
+        if 0 <= index < len(self.entries):
+            self._state.setdefault(index, {}).update(changes)
+
+    def counts(self) -> Dict[str, int]:
+        counts = {}
+        for state in self._state.values():
+            counts[state.get("state", "pending")] = counts.get(state.get("state", "pending"), 0) + 1
+        counts["pending"] = len(self.entries) - sum(c for k, c in counts.items() if k != "pending")
+        return counts
+
+
+def visible_window(offset: float, viewport: float, row_height: int, count: int, overscan: int = 1) -> Tuple[int, int]:
+    """Half-open index range [first, last) of rows intersecting the viewport, plus overscan."""
+    if count <= 0 or row_height <= 0:
+        return 0, 0
+    first = max(0, int(offset // row_height) - overscan)
+    last = min(count, int((offset + viewport) // row_height) + 1 + overscan)
+    return first, max(first, last)
+
+
+class PlaylistEngine:
+    """
+    Runs playlist entries through download_worker with a bounded pool of workers.
+
+    Row updates are reported by index through row_progress(index, fraction) and
+    row_status(index, text, state), where state is one of 'active', 'done',
+    'failed' or 'cancelled'. Callbacks run on worker threads; GUI callers must
+    marshal them onto the Tk loop themselves.
+
+    With a postprocess pool (see logic/postprocess.py) an entry frees its
+    download slot as soon as its file is on disk and finishes when the pool has
+    converted it, so the next entries download while earlier ones transcode.
+
+    With a Prefetcher (see logic/prefetch.py) each entry that starts announces
+    the next ones, whose full info is extracted in the background and handed to
+    the worker, so entries after the first don't begin with a cold extraction.
+
+    With an archive scope (see logic/archive.py) entries already on disk in this
+    format are skipped; summary_callback also gets how many were skipped and the
+    bytes that saved.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]], opts: Dict[str, Any],
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 row_progress: Optional[Callable] = None,
+                 row_status: Optional[Callable] = None,
+                 summary_callback: Optional[Callable] = None,
+                 cancel_callback: Optional[Callable] = None,
+                 worker: Callable = download_worker,
+                 journal=None,
+                 postprocess=None,
+                 prefetch=None,
+                 archive=None):
+        self.entries = list(entries)
+        self.opts = opts
+        self.concurrency = max(1, min(int(concurrency or 1), MAX_CONCURRENCY))
+        self.row_progress = row_progress
+        self.row_status = row_status
+        self.summary_callback = summary_callback
+        self.cancel_callback = cancel_callback
+        # Optional JobRecorder-like object: item_started/item_phase/item_finished by index
+        self.journal = journal
+        self.worker = worker
+        self.postprocess = postprocess
+        self.prefetch = prefetch
+        self.archive = archive
+
+        self._lock = threading.Lock()
+        self.succeeded = 0
+        self.failed = 0
+        self.active = 0
+        self.converting = 0  # Entries handed to the postprocess pool and not finished yet
+        self.skipped = 0  # Entries found in the download archive
+        self.saved_bytes = 0
+
+    def _cancelled(self) -> bool:
+        return bool(self.cancel_callback and self.cancel_callback())
+
+    def _report_row(self, index, text, state):
+        if self.row_status:
+            self.row_status(index, text, state)
+
+    def _report_summary(self):
+        if self.summary_callback:
+            with self._lock:
+                done, failed, active = self.succeeded, self.failed, self.active
+                skipped, saved = self.skipped, self.saved_bytes
+            self.summary_callback(done, failed, active, len(self.entries), skipped=skipped, saved_bytes=saved)
+
+    def _run_entry(self, index: int, entry: Dict[str, Any]) -> bool:
+        if self._cancelled():
+            self._report_row(index, "Cancelled", 'cancelled')
+            return False
+
+        url = entry_url(entry)
+        if not url:
+            self._report_row(index, "Failed", 'failed')
+            if self.journal:
+                self.journal.item_finished(index, False, "No URL")
+            return False
+
+        with self._lock:
+            self.active += 1
+        self._report_row(index, "Downloading...", 'active')
+        self._report_summary()
+
+        errors = []
+        skipped = []
+
+        def prog_cb(info):
+            status = info.get('status')
+            if status == 'downloading':
+                p, text = format_row_progress(info)
+                if self.row_progress:
+                    self.row_progress(index, p)
+                self._report_row(index, text, 'active')
+            elif status == 'merging':
+                self._report_row(index, "Merging Video & Audio...", 'active')
+                if self.row_progress:
+                    self.row_progress(index, 1.0)
+            elif status == 'converting':
+                self._report_row(index, "Converting...", 'active')
+            elif status == 'skipped':
+                skipped.append(info)
+                with self._lock:
+                    self.skipped += 1
+                    self.saved_bytes += info.get('total_bytes') or 0
+
+        extra = {}
+        if self.journal:
+            self.journal.item_started(index)
+            extra["phase_callback"] = lambda phase, filename: self.journal.item_phase(index, phase, filename)
+        if self.postprocess:
+            extra["postprocess_pool"] = self.postprocess
+        if self.archive:
+            extra["archive"] = self.archive
+        if self.prefetch:
+            # Announce what's next before (possibly) waiting on this entry's own prefetch
+            self.prefetch.ahead(self._prefetchable(e) for e in self.entries[index + 1:index + 1 + self.prefetch.lookahead])
+            info = self.prefetch.take(url)
+            if info:
+                extra["info"] = info
+
+        handoff = None
+        try:
+            # Each worker gets its own copy; yt-dlp mutates the dict (hooks etc.)
+            handoff = self.worker(url, copy.deepcopy(self.opts), prog_cb, None, errors.append, self.cancel_callback, **extra)
+        except Exception as e:
+            errors.append(str(e))
+        finally:
+            with self._lock:
+                self.active -= 1
+
+        if isinstance(handoff, concurrent.futures.Future):
+            # Download done, conversion queued: settle the entry when the pool finishes
+            with self._lock:
+                self.converting += 1
+            self._report_row(index, "Waiting to convert...", 'active')
+            self._report_summary()
+            result = concurrent.futures.Future()
+
+            def settle(_):
+                with self._lock:
+                    self.converting -= 1
+                ok = self._finish_entry(index, errors)
+                self._count(ok)  # Before resolving, so run() sees the final tally
+                result.set_result(ok)
+
+            handoff.add_done_callback(settle)
+            return result
+        return self._finish_entry(index, errors, done_text="✔ Already downloaded" if skipped else "✔ Done")
+
+    def _prefetchable(self, entry: Dict[str, Any]) -> Optional[str]:
+        """URL of an upcoming entry worth extracting ahead: not one the archive will skip anyway."""
+        url = entry_url(entry)
+        if url and self.archive and self.archive.lookup(url, entry):
+            return None
+        return url
+
+    def _finish_entry(self, index: int, errors: List[str], done_text: str = "✔ Done") -> bool:
+        if self.journal:
+            self.journal.item_finished(index, not errors, errors[0] if errors else None)
+
+        if errors:
+            logging.warning(f"Playlist entry {index + 1} failed: {errors[0]}")
+            state = 'cancelled' if errors[0] == "Cancelled" else 'failed'
+            self._report_row(index, "Cancelled" if state == 'cancelled' else "Failed", state)
+            return False
+
+        self._report_row(index, done_text, 'done')
+        if self.row_progress:
+            self.row_progress(index, 1.0)
+        return True
+
+    def _count(self, ok: bool):
+        with self._lock:
+            if ok:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+        self._report_summary()
+
+    def run(self) -> Tuple[int, int]:
+        """Download all entries, blocking until done (including conversions). Returns (succeeded, failed)."""
+        converting = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency,
+                                                   thread_name_prefix="playlist") as pool:
+            futures = [pool.submit(self._run_entry, i, entry) for i, entry in enumerate(self.entries)]
+            for future in concurrent.futures.as_completed(futures):
+                outcome = future.result()
+                if isinstance(outcome, concurrent.futures.Future):
+                    converting.append(outcome)  # Counted when it settles
+                else:
+                    self._count(outcome)
+        concurrent.futures.wait(converting)
+
+        return self.succeeded, self.failed
+
+
+def run_playlist(entries, opts, concurrency=DEFAULT_CONCURRENCY, **kwargs) -> Tuple[int, int]:
+    """Convenience wrapper around PlaylistEngine(...).run()."""
+    return PlaylistEngine(entries, opts, concurrency=concurrency, **kwargs).run()
@@ -0,0 +1,197 @@
+import concurrent.futures
+import copy
+import logging
+import os
+import subprocess
+import threading
+from typing import Optional, Dict, List, Any, Callable, Tuple
+
+# The GIF pipeline (logic/gif.py): listed in opts['postprocessors'] like yt-dlp's, but always run here, never by yt-dlp
+GIF_POSTPROCESSOR = "YikesGif"
+# yt-dlp postprocessors that transcode (CPU-bound) and can run after the download thread is freed.
+# Merging stays inline: yt-dlp schedules it inside process_info, and it is a stream copy.
+DEFERRABLE = ("FFmpegExtractAudio", "FFmpegVideoConvertor", GIF_POSTPROCESSOR)
+
+# Codec arguments per target extension (matching what yt-dlp would pick)
+AUDIO_CODECS = {
+    "mp3": ["-c:a", "libmp3lame"],
+    "wav": ["-c:a", "pcm_s16le"],
+    "m4a": ["-c:a", "aac", "-f", "ipod"],
+    "aac": ["-c:a", "aac"],
+    "opus": ["-c:a", "libopus"],
+    "flac": ["-c:a", "flac"],
+}
+# Seconds between cancel checks while ffmpeg runs
+POLL_INTERVAL = 0.5
+
+
+class PostProcessError(Exception):
+    pass
+
+
+def split_postprocessors(opts: Dict[str, Any], keys: Tuple[str, ...] = DEFERRABLE
+                         ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Copy of opts without the postprocessors named in keys (default: the deferrable ones), and those in order."""
+    pps = opts.get('postprocessors') or []
+    deferred = [pp for pp in pps if pp.get('key') in keys]
+    if not deferred:
+        return opts, []
+    inline = dict(opts)
+    inline['postprocessors'] = [pp for pp in pps if pp.get('key') not in keys]
+    return inline, copy.deepcopy(deferred)
+
+
+def ffmpeg_command(ffmpeg: str, source: str, pp: Dict[str, Any]) -> Tuple[List[str], str]:
+    """(argv, output path) equivalent to running yt-dlp postprocessor pp on source."""
+    stem = os.path.splitext(source)[0]
+    base = [ffmpeg, "-y", "-loglevel", "error", "-nostdin", "-i", source]
+    if pp['key'] == "FFmpegExtractAudio":
+        codec = pp.get('preferredcodec') or 'mp3'
+        if codec not in AUDIO_CODECS:
+            raise PostProcessError(f"Unsupported audio codec: {codec}")
+        args = ["-vn"] + AUDIO_CODECS[codec]
+        quality = str(pp.get('preferredquality') or '')
+        if quality.isdigit() and codec not in ("wav", "flac"):
+            # yt-dlp semantics: 0-10 is a VBR quality level, anything larger a bitrate in kbit/s
+            args += ["-q:a", quality] if int(quality) <= 10 else ["-b:a", f"{quality}k"]
+        output = f"{stem}.{codec}"
+    elif pp['key'] == "FFmpegVideoConvertor":
+        target = pp.get('preferedformat') or 'mp4'
+        args = ["-an"] if target == "gif" else []
+        output = f"{stem}.{target}"
+    else:
+        raise PostProcessError(f"Cannot defer postprocessor {pp['key']}")
+    if os.path.abspath(output) == os.path.abspath(source):
+        output = f"{stem}.converted{os.path.splitext(source)[1]}"
+    return base + args + [output], output
+
+
+def run_postprocessors(ffmpeg: Optional[str], files: List[str], pps: List[Dict[str, Any]],
+                       keep_source: bool = False, cancel_callback: Optional[Callable] = None,
+                       on_report: Optional[Callable] = None) -> List[str]:
+    """
+    Run pps over each file in turn (blocking). Returns the final output paths.
+    on_report(output, report) gets the report of every GIF made (see logic/gif.py).
+    """
+    if not ffmpeg:
+        raise PostProcessError("FFmpeg not found")
+    outputs = []
+    for path in files:
+        current = path
+        for pp in pps:
+            if pp['key'] == GIF_POSTPROCESSOR:
+                from .gif import run_gif_postprocessor  # gif.py builds on this module
+                output, report = run_gif_postprocessor(ffmpeg, current, pp, cancel_callback)
+                logging.info(f"GIF {output}: {report['bytes']} bytes in {report['seconds']}s "
+                             f"({report['width']}px, {report['fps']} fps, {report['attempts']} attempt(s))")
+                if on_report:
+                    on_report(output, report)
+            else:
+                cmd, output = ffmpeg_command(ffmpeg, current, pp)
+                run_ffmpeg(cmd, output, cancel_callback)
+            if not keep_source and current != output:
+                try:
+                    os.remove(current)
+                except OSError as e:
+                    logging.warning(f"Could not remove {current} after conversion: {e}")
+            current = output
+        outputs.append(current)
+    return outputs
+
+
+def run_ffmpeg(cmd: List[str], output: str, cancel_callback: Optional[Callable]):
+    """Run one ffmpeg command, killed if cancel_callback fires. output is removed unless it succeeds."""
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    while True:
+        try:
+            _, stderr = proc.communicate(timeout=POLL_INTERVAL)
+            break
+        except subprocess.TimeoutExpired:
+            if cancel_callback and cancel_callback():
+                proc.kill()
+                proc.communicate()
+                _discard(output)
+                raise PostProcessError("Cancelled")
+    if proc.returncode != 0:
+        _discard(output)
+        message = (stderr or b"").decode('utf-8', 'replace').strip().splitlines()
+        raise PostProcessError(message[-1] if message else f"ffmpeg exited with {proc.returncode}")
+
+
+def _discard(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class PostProcessPool:
+    """
+    Bounded CPU stage for transcodes, fed by download threads.
+
+    Each task runs ffmpeg as a child process; at most `workers` (default: CPU
+    count) run at once, the rest queue. Download threads hand a finished file
+    over with submit() and move straight on to their next item, so the network
+    stage of one item overlaps the CPU stage of the previous ones.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self._lock = threading.Lock()
+        self._executor = None
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+
+    def submit(self, ffmpeg: Optional[str], files: List[str], pps: List[Dict[str, Any]],
+               keep_source: bool = False, cancel_callback: Optional[Callable] = None,
+               on_start: Optional[Callable] = None, on_report: Optional[Callable] = None) -> concurrent.futures.Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers,
+                                                                       thread_name_prefix="postprocess")
+            self.queued += 1
+        self._log_depths("queued")
+        return self._executor.submit(self._task, ffmpeg, files, pps, keep_source, cancel_callback, on_start, on_report)
+
+    def _task(self, ffmpeg, files, pps, keep_source, cancel_callback, on_start, on_report):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        ok = False
+        try:
+            if cancel_callback and cancel_callback():
+                raise PostProcessError("Cancelled")
+            if on_start:
+                on_start()
+            outputs = run_postprocessors(ffmpeg, files, pps, keep_source, cancel_callback, on_report)
+            ok = True
+            return outputs
+        finally:
+            with self._lock:
+                self.running -= 1
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+            self._log_depths("finished")
+
+    def depths(self) -> Dict[str, int]:
+        with self._lock:
+            return {"queued": self.queued, "running": self.running, "workers": self.workers,
+                    "completed": self.completed, "failed": self.failed}
+
+    def _log_depths(self, event):
+        d = self.depths()
+        logging.debug(f"Post-process {event}: {d['running']}/{d['workers']} running, {d['queued']} queued")
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+
+
+# Shared by all downloads in the process
+postprocess_pool = PostProcessPool()
@@ -0,0 +1,131 @@
+import concurrent.futures
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, Iterable
+
+from .cache import canonical_id
+
+# Entries resolved ahead of the one currently downloading
+DEFAULT_LOOKAHEAD = 2
+# Extractions run in parallel with the downloads; keep this small to stay clear of rate limits
+PREFETCH_WORKERS = 2
+
+
+def _default_fetch(url: str) -> Dict[str, Any]:
+    from .downloader import fetch_video_info
+    return fetch_video_info(url)
+
+
+class Prefetcher:
+    """
+    Resolves full info dicts for upcoming items while the current one downloads.
+
+    Flat playlist entries and queue items carry no formats, so handing them to
+    download_worker as-is means a cold extraction before the first byte. Callers
+    announce what comes next with ahead(urls) and claim an item's info with
+    take(url) right before downloading it; an extraction still in flight is
+    waited for rather than repeated. Items are keyed by canonical_id, and a
+    claimed item is never fetched again, so a window that overlaps items
+    already started is harmless. Failed extractions yield None and the
+    downloader falls back to extracting on its own.
+    """
+
+    def __init__(self, lookahead: int = DEFAULT_LOOKAHEAD, fetch: Optional[Callable] = None,
+                 workers: int = PREFETCH_WORKERS):
+        self.lookahead = max(0, int(lookahead or 0))
+        self.fetch = fetch or _default_fetch
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending: "OrderedDict[str, concurrent.futures.Future]" = OrderedDict()
+        self._claimed = set()
+        self.scheduled = 0
+        self.hits = 0
+        self.waited = 0
+        self.misses = 0
+        self.failed = 0
+
+    def ahead(self, urls: Iterable[Optional[str]]) -> int:
+        """Start resolving the first `lookahead` of urls that aren't known yet. Returns how many were scheduled."""
+        if not self.lookahead:
+            return 0
+        scheduled = 0
+        with self._lock:
+            for i, url in enumerate(urls):
+                if i >= self.lookahead:
+                    break
+                if not url:
+                    continue
+                key = canonical_id(url)
+                if key in self._claimed or key in self._pending:
+                    continue
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers,
+                                                                           thread_name_prefix="prefetch")
+                self._pending[key] = self._executor.submit(self._resolve, url)
+                scheduled += 1
+            self.scheduled += scheduled
+            self._trim()
+        return scheduled
+
+    def _resolve(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.fetch(url)
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            logging.debug(f"Prefetch failed for {url}: {e}")
+            return None
+
+    def _trim(self):
+        # Results nobody claimed (e.g. items removed from the queue) must not pile up
+        limit = 2 * self.lookahead + self.workers
+        for key in list(self._pending):
+            if len(self._pending) <= limit:
+                break
+            if self._pending[key].done():
+                del self._pending[key]
+
+    def take(self, url: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Claim the prefetched info for url, waiting up to timeout (None: as long as
+        it takes, 0: not at all) if it is still being extracted. None if it was
+        never scheduled, failed or isn't ready in time.
+        """
+        key = canonical_id(url)
+        with self._lock:
+            self._claimed.add(key)
+            future = self._pending.pop(key, None)
+        if future is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        if not future.done():
+            with self._lock:
+                self.waited += 1
+        try:
+            info = future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            if info:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return info
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"scheduled": self.scheduled, "hits": self.hits, "waited": self.waited,
+                    "misses": self.misses, "failed": self.failed, "pending": len(self._pending)}
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._pending.clear()
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+        logging.debug(f"Prefetch: {self.stats()}")
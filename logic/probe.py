@@ -0,0 +1,217 @@
+import concurrent.futures
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, List, Any, Callable
+
+from .cache import canonical_id
+
+# Requested height per video format key (see build_ydl_opts)
+FORMAT_HEIGHTS = {"4k": 2160, "1440p": 1440, "1080p": 1080, "720p": 720, "480p": 480}
+# Output bitrate (kbit/s) of the transcoded audio formats
+AUDIO_BITRATES = {"mp3_320": 320, "mp3_192": 192, "mp3_128": 128, "wav": 1411}
+RES_NAMES = {2160: "4K", 1440: "2K", 1080: "1080p", 720: "720p", 480: "480p"}
+
+DEFAULT_WORKERS = 4
+# Compact format tables kept in memory (full info dicts stay in the metadata cache)
+MAX_TABLES = 5000
+
+
+def _default_fetch(url: str) -> Dict[str, Any]:
+    from .downloader import fetch_video_info
+    return fetch_video_info(url)
+
+
+def format_table(info: Dict[str, Any]) -> Dict[str, Any]:
+    """The few fields of an info dict that probing needs (a full one can be hundreds of KB)."""
+    formats = []
+    for fmt in info.get('formats') or []:
+        formats.append({
+            'height': fmt.get('height'),
+            'vcodec': fmt.get('vcodec') or 'none',
+            'acodec': fmt.get('acodec') or 'none',
+            'ext': fmt.get('ext'),
+            'filesize': fmt.get('filesize') or fmt.get('filesize_approx'),
+            'tbr': fmt.get('tbr'),
+        })
+    return {'height': info.get('height'), 'duration': info.get('duration'), 'formats': formats}
+
+
+def max_height(table: Dict[str, Any]) -> int:
+    heights = [f['height'] for f in table.get('formats', []) if isinstance(f.get('height'), (int, float))]
+    if isinstance(table.get('height'), (int, float)):
+        heights.append(table['height'])
+    return int(max(heights)) if heights else 0
+
+
+def _size(fmt: Optional[Dict[str, Any]], duration: Optional[float]) -> Optional[int]:
+    if not fmt:
+        return None
+    if fmt.get('filesize'):
+        return int(fmt['filesize'])
+    if fmt.get('tbr') and duration:
+        return int(fmt['tbr'] * 1000 / 8 * duration)
+    return None
+
+
+def _best(formats: List[Dict[str, Any]], *conditions: Callable) -> Optional[Dict[str, Any]]:
+    """Last (yt-dlp lists worst to best) format matching all conditions."""
+    for fmt in reversed(formats):
+        if all(c(fmt) for c in conditions):
+            return fmt
+    return None
+
+
+def _video_only(f):
+    return f['vcodec'] != 'none' and f['acodec'] == 'none'
+
+
+def _audio_only(f):
+    return f['acodec'] != 'none' and f['vcodec'] == 'none'
+
+
+def _avc(f):
+    return f['vcodec'].startswith('avc1')
+
+
+def estimate_size(table: Dict[str, Any], format_key: str) -> Optional[int]:
+    """
+    Expected output size in bytes for format_key, following the same preference
+    order as the format selectors in build_ydl_opts. None when it can't be told
+    (GIFs, or formats without size or bitrate).
+    """
+    formats = table.get('formats') or []
+    duration = table.get('duration')
+    if format_key in AUDIO_BITRATES:
+        return int(AUDIO_BITRATES[format_key] * 1000 / 8 * duration) if duration else None
+    if format_key == 'gif':
+        return None
+    if format_key == 'm4a':
+        return _size(_best(formats, _audio_only, lambda f: f['ext'] == 'm4a') or _best(formats), duration)
+
+    h = FORMAT_HEIGHTS.get(format_key)
+    if h:
+        candidates = [
+            (lambda f: f['height'] == h and _avc(f), lambda f: f['acodec'].startswith('mp4a')),
+            (lambda f: f['height'] == h, None),
+            (lambda f: (f['height'] or 0) <= h and _avc(f), None),
+        ]
+    else:
+        candidates = [
+            (_avc, lambda f: f['acodec'].startswith('mp4a')),
+            (lambda f: (f['height'] or 0) <= 1080 and _avc(f), None),
+            (lambda f: True, None),
+        ]
+    for video_cond, audio_cond in candidates:
+        video = _best(formats, _video_only, video_cond)
+        audio = _best(formats, _audio_only, audio_cond) if audio_cond else _best(formats, _audio_only)
+        if video and audio:
+            sizes = [_size(video, duration), _size(audio, duration)]
+            return sum(sizes) if None not in sizes else None
+    # '/best': a single pre-merged format
+    return _size(_best(formats, lambda f: f['vcodec'] != 'none' and f['acodec'] != 'none'), duration)
+
+
+def availability_warning(format_key: str, available_height: int) -> Optional[str]:
+    """Notice for a video that can't deliver the requested resolution, or None."""
+    requested = FORMAT_HEIGHTS.get(format_key)
+    if requested and 0 < available_height < requested:
+        name = RES_NAMES.get(available_height, f"{available_height}p")
+        return f"Notice: This video only supports up to {name}. Downloading at the highest available quality instead."
+    return None
+
+
+class ProbeReport:
+    """Per-entry probe results and the totals the UI shows before a download is started."""
+
+    def __init__(self, count: int, format_key: str):
+        self.format_key = format_key
+        self.results: List[Optional[Dict[str, Any]]] = [None] * count
+
+    @property
+    def probed(self) -> int:
+        return sum(1 for r in self.results if r is not None)
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for r in self.results if r is not None and r.get('error'))
+
+    @property
+    def warnings(self) -> int:
+        return sum(1 for r in self.results if r is not None and r.get('warning'))
+
+    def total_size(self) -> Optional[int]:
+        """Known sizes summed, with entries of unknown size counted at the mean of the known ones."""
+        sizes = [r['size'] for r in self.results if r is not None and r.get('size')]
+        if not sizes:
+            return None
+        return int(sum(sizes) + (len(self.results) - len(sizes)) * (sum(sizes) / len(sizes)))
+
+
+class FormatProber:
+    """
+    Resolves available resolution and expected size for many entries at once.
+
+    Infos are fetched through fetch_video_info (so they land in the metadata
+    cache and later downloads or prefetches reuse them) on a bounded pool of
+    workers. What probing needs is kept here as a compact format table per
+    video, so probing the same playlist again for another format is instant.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, fetch: Optional[Callable] = None, max_tables: int = MAX_TABLES):
+        self.workers = max(1, workers)
+        self.fetch = fetch or _default_fetch
+        self.max_tables = max_tables
+        self._lock = threading.Lock()
+        self._tables: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def _table(self, url: str) -> Dict[str, Any]:
+        key = canonical_id(url)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                return table
+        table = format_table(self.fetch(url) or {})
+        with self._lock:
+            self._tables[key] = table
+            while len(self._tables) > self.max_tables:
+                self._tables.popitem(last=False)
+        return table
+
+    def probe_one(self, url: str, format_key: str) -> Dict[str, Any]:
+        try:
+            table = self._table(url)
+        except Exception as e:
+            logging.debug(f"Probe failed for {url}: {e}")
+            return {'error': str(e), 'max_height': 0, 'size': None, 'warning': None}
+        height = max_height(table)
+        return {'max_height': height, 'size': estimate_size(table, format_key),
+                'warning': availability_warning(format_key, height)}
+
+    def probe(self, urls: List[Optional[str]], format_key: str, on_result: Optional[Callable] = None,
+              cancel_callback: Optional[Callable] = None) -> ProbeReport:
+        """
+        Probe every url (blocking). on_result(index, result) fires as each one
+        resolves, from worker threads. Entries not reached before cancel_callback
+        returns True stay None in the report.
+        """
+        report = ProbeReport(len(urls), format_key)
+
+        def run(index, url):
+            if cancel_callback and cancel_callback():
+                return
+            result = self.probe_one(url, format_key) if url else {'error': "No URL", 'max_height': 0,
+                                                                  'size': None, 'warning': None}
+            report.results[index] = result
+            if on_result:
+                on_result(index, result)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="probe") as pool:
+            for future in [pool.submit(run, i, url) for i, url in enumerate(urls)]:
+                future.result()
+        return report
+
+
+# Shared so format tables survive between checks of the same playlist
+format_prober = FormatProber()
@@ -0,0 +1,220 @@
+"""
+Downloads in child processes.
+
+download_worker runs yt-dlp on a thread of the calling process, where its
+extraction, hashing and progress formatting compete with the Tk loop for the
+GIL. process_download_worker takes the same arguments but runs the download
+in a spawned child: only small progress dicts come back over a pipe (at most
+every PROGRESS_INTERVAL while transferring), so the GUI process does little
+more than draw. Enabled by the "process_workers" setting.
+
+Compared with thread mode:
+- Each child starts cold (imports, no warm yt-dlp instances from ydl_pool).
+- Conversions run inside the child instead of on the parent's postprocess pool.
+- The global speed cap is still shared: the parent holds each child's
+  bandwidth lease, counts its bytes from the relayed progress, and sends the
+  child its allocation whenever a rebalance or a new cap changes it; the
+  child caps itself to that.
+- Metrics records are sent to the parent and exported there.
+
+Options that can't be pickled (e.g. hooks added by a caller) make the job fall
+back to running in-process.
+"""
+import logging
+import multiprocessing
+import pickle
+import threading
+import time
+from typing import Optional, Dict, Any, Callable
+
+from .settings import current_settings
+from .downloader import download_worker, ydl_pool
+from .bandwidth import bandwidth_scheduler, PRIORITY_NORMAL
+from .metrics import job_metrics
+from .archive import DownloadArchive
+
+# Coalescing of 'downloading' ticks in the child; status changes are always sent
+PROGRESS_INTERVAL = 0.1
+# How often the parent checks the cancel callback while waiting for messages
+POLL_INTERVAL = 0.1
+# Grace period for a finished child to exit before it is terminated
+JOIN_TIMEOUT = 5.0
+
+# Scalar fields of a yt-dlp progress dict that the UI and engines read (info_dict alone can be hundreds of KB)
+PROGRESS_FIELDS = ('status', 'filename', 'tmpfilename', 'downloaded_bytes', 'total_bytes', 'total_bytes_estimate',
+                   'speed', 'eta', 'elapsed', 'fragment_index', 'fragment_count', '_content_type', '_speed_str',
+                   '_percent_str', '_total_bytes_str', '_eta_str', '_allocated_rate', 'trim', 'gif')
+
+# Spawn, never fork: the parent has Tk and worker threads that a forked child would inherit half-locked
+_context = multiprocessing.get_context("spawn")
+
+
+def slim_progress(d: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: d[k] for k in PROGRESS_FIELDS if d.get(k) is not None}
+
+
+def selected_worker() -> Callable:
+    """The download worker to use per the "process_workers" setting."""
+    return process_download_worker if current_settings.get("process_workers", False) else download_worker
+
+
+def _log_file() -> Optional[str]:
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.FileHandler):
+            return handler.baseFilename
+    return None
+
+
+def _receive_caps(conn):
+    """Child: apply the allocations the parent sends until the pipe closes."""
+    while True:
+        try:
+            kind, *args = conn.recv()
+        except (EOFError, OSError):
+            return
+        if kind == "cap":
+            bandwidth_scheduler.set_cap(args[0])
+
+
+class _Sender:
+    """Child side of the pipe: thread-safe sends, coalesced progress."""
+
+    def __init__(self, conn, interval: float = PROGRESS_INTERVAL):
+        self.conn = conn
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._last = 0.0
+
+    def send(self, *message):
+        with self._lock:
+            try:
+                self.conn.send(message)
+            except (OSError, ValueError):
+                pass  # Parent gone; the download finishes (or is terminated) on its own
+
+    def progress(self, d: Dict[str, Any]):
+        now = time.monotonic()
+        if d.get('status') == 'downloading':
+            if now - self._last < self.interval:
+                return
+            self._last = now
+        self.send("progress", slim_progress(d))
+
+
+def _child_main(target, url, opts, conn, cancel_event, info, priority, archive_spec, cap, settings, log_file, log_level,
+                with_phases):
+    if log_file:
+        logging.basicConfig(filename=log_file, level=log_level,
+                            format='%(asctime)s - %(levelname)s - [pid %(process)d] %(message)s')
+    current_settings.update(settings)  # Unsaved edits in the parent apply here too
+    bandwidth_scheduler.set_cap(cap)
+    threading.Thread(target=_receive_caps, args=(conn,), name="yikes-caps", daemon=True).start()
+    sender = _Sender(conn)
+    job_metrics.forward = lambda record: sender.send("metrics", record)
+    archive = DownloadArchive(archive_spec[0]).scope(archive_spec[1]) if archive_spec else None
+    extra = {"phase_callback": lambda phase, filename: sender.send("phase", phase, filename)} if with_phases else {}
+    try:
+        target(url, opts, sender.progress, lambda: sender.send("complete"), lambda msg: sender.send("error", msg),
+               cancel_event.is_set, info=info, priority=priority, archive=archive, **extra)
+    except Exception as e:
+        sender.send("error", f"System Error: {e}")
+    finally:
+        ydl_pool.close_all()
+        conn.close()
+
+
+def process_download_worker(url: str, opts: Dict[str, Any], progress_callback: Callable, complete_callback: Callable,
+                            error_callback: Callable, cancel_callback: Optional[Callable] = None,
+                            info: Optional[Dict[str, Any]] = None, phase_callback: Optional[Callable] = None,
+                            priority: float = PRIORITY_NORMAL, postprocess_pool=None, archive=None,
+                            target: Callable = download_worker):
+    """
+    download_worker in a child process; blocks like download_worker and calls the
+    callbacks on this thread. target is the worker run in the child (any
+    picklable function with download_worker's signature).
+    """
+    # The child's share of the global cap, rebalanced against every other download of this process
+    lease = bandwidth_scheduler.register(label=url, priority=priority)
+    parent_conn, child_conn = _context.Pipe()
+    cancel_event = _context.Event()
+    archive_spec = (archive.archive.db.path, archive.format_key) if archive else None
+    process = _context.Process(
+        target=_child_main, name="yikes-download", daemon=True,
+        args=(target, url, opts, child_conn, cancel_event, info, priority, archive_spec, int(lease.allocated or 0),
+              dict(current_settings), _log_file(), logging.getLogger().level, phase_callback is not None))
+    try:
+        try:
+            process.start()
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            parent_conn.close()
+            child_conn.close()
+            lease.close()  # The in-process download registers its own
+            logging.warning(f"Cannot run {url} in a child process ({e}); downloading in-process")
+            return target(url, opts, progress_callback, complete_callback, error_callback, cancel_callback,
+                          info=info, phase_callback=phase_callback, priority=priority,
+                          postprocess_pool=postprocess_pool, archive=archive)
+        child_conn.close()  # Ours is closed so the child exiting ends the stream
+        outcome = _relay(process, parent_conn, cancel_event, cancel_callback, progress_callback, phase_callback, lease)
+    finally:
+        lease.close()
+
+    if outcome is None:
+        if cancel_event.is_set():
+            # Killed after the cancel (e.g. by the shutdown cleanup): still resumable, not a failure
+            if error_callback:
+                error_callback("Cancelled")
+        elif error_callback:
+            error_callback(f"System Error: download process exited with code {process.exitcode}")
+    elif outcome[0] == "complete":
+        if complete_callback:
+            complete_callback()
+    elif error_callback:
+        error_callback(outcome[1])
+    return None
+
+
+def _relay(process, conn, cancel_event, cancel_callback, progress_callback, phase_callback, lease):
+    """
+    Forward the child's messages until it closes the pipe, and its lease's
+    allocation to it; returns ('complete',) / ('error', msg) / None.
+    """
+    outcome = None
+    sent = int(lease.allocated or 0)
+    try:
+        while True:
+            if cancel_callback and not cancel_event.is_set() and cancel_callback():
+                cancel_event.set()
+            allocated = int(lease.allocated or 0)
+            if allocated != sent:
+                sent = allocated
+                try:
+                    conn.send(("cap", allocated))
+                except (OSError, ValueError):
+                    pass  # Child already gone
+            if not conn.poll(POLL_INTERVAL):
+                if not process.is_alive() and not conn.poll():
+                    break
+                continue
+            try:
+                kind, *args = conn.recv()
+            except EOFError:
+                break
+            if kind == "progress":
+                lease.observe(args[0], wait=False)  # The child paces itself; this counts it against the global cap
+                if progress_callback:
+                    progress_callback(args[0])
+            elif kind == "phase":
+                if phase_callback:
+                    phase_callback(*args)
+            elif kind == "metrics":
+                job_metrics.record(args[0])
+            elif kind in ("complete", "error"):
+                outcome = (kind, *args)
+    finally:
+        conn.close()
+        process.join(JOIN_TIMEOUT)
+        if process.is_alive():
+            logging.warning(f"Download process {process.pid} did not exit; terminating it")
+            process.terminate()
+            process.join()
+    return outcome
@@ -0,0 +1,119 @@
+import contextlib
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional, Dict, Any, List, Iterable
+
+# Cold start budget: process start (profiler import) to first paint of the main window
+STARTUP_BUDGET = 3.0
+# Budget for importing gui.main_window alone (Tk, customtkinter, logic modules)
+IMPORT_BUDGET = 1.5
+PROFILE_FILE = "startup_profile.json"
+
+# Modules the GUI only needs once the user acts; imported after first paint
+DEFERRED_MODULES = ("yt_dlp", "requests")
+
+
+class StartupProfiler:
+    """
+    Records how long startup takes, phase by phase.
+
+    phase(name) times a block, mark(name) notes an instant (e.g. first paint),
+    both relative to when the profiler was created - so create it before the
+    heavy imports. report() summarizes against a budget; log() and save() write
+    it out. Phases can be recorded from any thread (background preloads).
+    """
+
+    def __init__(self, budget: float = STARTUP_BUDGET):
+        self.budget = budget
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.phases: List[Dict[str, Any]] = []
+        self.marks: Dict[str, float] = {}
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.origin
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        start = self.elapsed()
+        try:
+            yield
+        finally:
+            end = self.elapsed()
+            with self._lock:
+                self.phases.append({"name": name, "start": round(start, 4), "seconds": round(end - start, 4),
+                                    "thread": threading.current_thread().name})
+
+    def mark(self, name: str) -> float:
+        at = self.elapsed()
+        with self._lock:
+            self.marks.setdefault(name, round(at, 4))
+        return at
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.marks.get("first_paint")
+            return {
+                "first_paint": total,
+                "budget": self.budget,
+                "over_budget": total is not None and total > self.budget,
+                "phases": list(self.phases),
+                "marks": dict(self.marks),
+            }
+
+    def log(self, logger=logging):
+        report = self.report()
+        for p in report["phases"]:
+            logger.info(f"Startup phase {p['name']}: {p['seconds'] * 1000:.0f} ms (at {p['start']:.3f}s, {p['thread']})")
+        if report["first_paint"] is not None:
+            level = logging.WARNING if report["over_budget"] else logging.INFO
+            logger.log(level, f"First paint after {report['first_paint']:.3f}s (budget {self.budget:.1f}s)")
+
+    def save(self, path: str = PROFILE_FILE):
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.report(), f, indent=2)
+        except OSError as e:
+            logging.warning(f"Could not write startup profile {path}: {e}")
+
+
+def timed_import(name: str, profiler: Optional[StartupProfiler] = None):
+    """Import a module, recording it as an 'import <name>' phase."""
+    profiler = profiler or startup_profiler
+    with profiler.phase(f"import {name}"):
+        return importlib.import_module(name)
+
+
+def preload(names: Iterable[str] = DEFERRED_MODULES, profiler: Optional[StartupProfiler] = None) -> threading.Thread:
+    """Warm deferred imports on a background thread so the first real use doesn't pay for them."""
+    def run():
+        for name in names:
+            try:
+                timed_import(name, profiler)
+            except ImportError as e:
+                logging.warning(f"Preload of {name} failed: {e}")
+
+    t = threading.Thread(target=run, daemon=True, name="preload")
+    t.start()
+    return t
+
+
+def check_budget(report: Dict[str, Any], budget: Optional[float] = None) -> List[str]:
+    """Budget violations in a saved report (empty when within budget)."""
+    budget = report.get("budget") if budget is None else budget
+    first_paint = report.get("first_paint")
+    if first_paint is None:
+        return ["first paint was never reached"]
+    if first_paint > budget:
+        slowest = sorted(report.get("phases", []), key=lambda p: p["seconds"], reverse=True)[:3]
+        detail = ", ".join(f"{p['name']} {p['seconds']:.3f}s" for p in slowest)
+        return [f"first paint after {first_paint:.3f}s exceeds budget {budget:.1f}s (slowest: {detail})"]
+    return []
+
+
+# Created on first import; main.py imports this module before anything heavy
+startup_profiler = StartupProfiler(float(os.environ.get("YIKES_STARTUP_BUDGET", STARTUP_BUDGET)))
@@ -0,0 +1,122 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, Hashable
+
+from .utils import format_bytes
+
+# Default UI publish rate
+PROGRESS_HZ = 10
+# Progress statuses that carry the download's byte counts (merging, trimming and converting notices don't)
+TRANSFER_STATUSES = ('downloading', 'finished', 'skipped')
+
+
+class ProgressAggregator:
+    """
+    Collapses progress events per job to the latest state.
+
+    Producers (yt-dlp hooks on worker threads) call submit() as often as they
+    like; a consumer calls drain() at a fixed rate and gets at most one event
+    per job. The consumer's cost therefore depends on the publish rate and the
+    number of jobs, not on how fast yt-dlp ticks.
+
+    GUI code drives drain() from a Tk after() loop; headless callers can use
+    start()/stop() to publish from a background thread instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()
+        self.submitted = 0
+        self.published = 0
+        self.coalesced = 0
+        self.discarded = 0
+        self._thread = None
+        self._stop = threading.Event()
+
+    def submit(self, job: Hashable, event: Any):
+        with self._lock:
+            self.submitted += 1
+            if job in self._pending:
+                self.coalesced += 1
+            self._pending[job] = event
+
+    def discard(self, job: Hashable):
+        """Drop any unpublished event for a job (e.g. once it has completed)."""
+        with self._lock:
+            if self._pending.pop(job, None) is not None:
+                self.discarded += 1
+
+    def drain(self) -> Dict[Hashable, Any]:
+        with self._lock:
+            pending, self._pending = self._pending, OrderedDict()
+            self.published += len(pending)
+        return pending
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "published": self.published,
+                "coalesced": self.coalesced,
+                "discarded": self.discarded,
+                "pending": len(self._pending),
+            }
+
+    # --- Background publisher (headless consumers) ---
+    def start(self, publish: Callable[[Hashable, Any], None], hz: float = PROGRESS_HZ):
+        if self._thread:
+            return
+        interval = 1.0 / hz
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(interval):
+                self._publish(publish)
+
+        self._thread = threading.Thread(target=loop, daemon=True, name="progress-publisher")
+        self._thread.start()
+
+    def stop(self, publish: Optional[Callable[[Hashable, Any], None]] = None):
+        """Stop the publisher thread, flushing remaining events to publish if given."""
+        if self._thread:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        if publish:
+            self._publish(publish)
+
+    def _publish(self, publish):
+        for job, event in self.drain().items():
+            try:
+                publish(job, event)
+            except Exception as e:
+                logging.warning(f"Progress publish failed for {job}: {e}")
+
+
+class TransferStats:
+    """
+    The last progress event of a download that carries its byte counts.
+
+    History records a download's size from here: the events after the
+    transfer (merging, trimming, converting) come last but have no sizes.
+    """
+
+    def __init__(self):
+        self.info: Optional[Dict[str, Any]] = None
+
+    def observe(self, info: Dict[str, Any]):
+        if info.get('status') in TRANSFER_STATUSES:
+            self.info = info
+
+    def reset(self):
+        self.info = None
+
+    def size_str(self) -> str:
+        """Total size as yt-dlp printed it, else formatted from the byte count; "Unknown" without either."""
+        info = self.info or {}
+        text = (info.get('_total_bytes_str') or '').strip()
+        if text and text != 'N/A':
+            return text
+        total = info.get('total_bytes') or info.get('total_bytes_estimate')
+        return format_bytes(total) if total else "Unknown"
@@ -0,0 +1,150 @@
+import json
+import logging
+import os
+import time
+from typing import Optional, Dict, Any, Iterable, List
+
+from .db import Database
+from .settings import DB_FILE, QUEUE_FILE
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+STATUSES = (PENDING, RUNNING, DONE, FAILED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    url      TEXT NOT NULL,
+    status   TEXT NOT NULL DEFAULT 'pending',
+    payload  TEXT NOT NULL,
+    error    TEXT,
+    created  REAL NOT NULL,
+    updated  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS queue_status_id ON queue (status, id);
+"""
+
+
+class QueueStore:
+    """
+    Persistent download queue in SQLite (WAL).
+
+    Items keep a stable integer id for their lifetime, so callers remove or
+    update by id rather than by list position. Every operation is a single
+    indexed statement or one short IMMEDIATE transaction, so cost does not grow
+    with queue length and concurrent threads cannot lose each other's writes.
+    """
+
+    def __init__(self, path: str = DB_FILE, legacy_file: Optional[str] = QUEUE_FILE):
+        self.legacy_file = legacy_file
+        self.db = Database(path, schema=self._create_schema)
+
+    def _create_schema(self, conn):
+        conn.executescript(SCHEMA)
+        with self.db.transaction():
+            # Items claimed by a session that never finished go back in line
+            conn.execute("UPDATE queue SET status = ?, updated = ? WHERE status = ?", (PENDING, time.time(), RUNNING))
+            self._migrate_legacy(conn)
+
+    def _migrate_legacy(self, conn):
+        """Import items from the old queue.json once, then move the file aside."""
+        path = self.legacy_file
+        if not path or not os.path.exists(path):
+            return
+        try:
+            with open(path, "r") as f:
+                items = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not migrate {path}: {e}")
+            return
+        if isinstance(items, list):
+            self._insert(conn, [i for i in items if isinstance(i, dict) and i.get("url")])
+            logging.info(f"Migrated {len(items)} queue items from {path}")
+        try:
+            os.replace(path, path + ".migrated")
+        except OSError as e:
+            logging.warning(f"Could not rename {path}: {e}")
+
+    @staticmethod
+    def _insert(conn, items: Iterable[Dict[str, Any]]) -> List[int]:
+        now = time.time()
+        ids = []
+        for item in items:
+            payload = {k: v for k, v in item.items() if k != "id"}
+            cur = conn.execute(
+                "INSERT INTO queue (url, status, payload, created, updated) VALUES (?, ?, ?, ?, ?)",
+                (payload.get("url", ""), PENDING, json.dumps(payload, ensure_ascii=False), now, now))
+            ids.append(cur.lastrowid)
+        return ids
+
+    @staticmethod
+    def _row_to_item(row) -> Dict[str, Any]:
+        item = json.loads(row["payload"])
+        item.update({"id": row["id"], "status": row["status"]})
+        if row["error"]:
+            item["error"] = row["error"]
+        return item
+
+    # --- Public API ---
+    def enqueue(self, item: Dict[str, Any]) -> int:
+        return self.enqueue_many([item])[0]
+
+    def enqueue_many(self, items: Iterable[Dict[str, Any]]) -> List[int]:
+        """Insert many items in one transaction; returns their ids in order."""
+        with self.db.transaction() as conn:
+            return self._insert(conn, items)
+
+    def dequeue(self) -> Optional[Dict[str, Any]]:
+        """Claim the oldest pending item and mark it running. None when empty."""
+        with self.db.transaction() as conn:
+            row = conn.execute("SELECT * FROM queue WHERE status = ? ORDER BY id LIMIT 1", (PENDING,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE queue SET status = ?, updated = ? WHERE id = ?", (RUNNING, time.time(), row["id"]))
+        item = self._row_to_item(row)
+        item["status"] = RUNNING
+        return item
+
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        row = self.db.connection().execute("SELECT * FROM queue WHERE id = ?", (item_id,)).fetchone()
+        return self._row_to_item(row) if row else None
+
+    def set_status(self, item_id: int, status: str, error: Optional[str] = None):
+        if status not in STATUSES:
+            raise ValueError(f"Unknown queue status: {status}")
+        self.db.connection().execute("UPDATE queue SET status = ?, error = ?, updated = ? WHERE id = ?",
+                                     (status, error, time.time(), item_id))
+
+    def mark_done(self, item_id: int):
+        self.set_status(item_id, DONE)
+
+    def mark_failed(self, item_id: int, error: Optional[str] = None):
+        self.set_status(item_id, FAILED, error)
+
+    def requeue(self, item_id: int):
+        self.set_status(item_id, PENDING)
+
+    def remove(self, item_id: int):
+        self.db.connection().execute("DELETE FROM queue WHERE id = ?", (item_id,))
+
+    def items(self, status: str = PENDING, limit: int = -1) -> List[Dict[str, Any]]:
+        rows = self.db.connection().execute(
+            "SELECT * FROM queue WHERE status = ? ORDER BY id LIMIT ?", (status, limit)).fetchall()
+        return [self._row_to_item(r) for r in rows]
+
+    def count(self, status: Optional[str] = PENDING) -> int:
+        conn = self.db.connection()
+        if status is None:
+            return conn.execute("SELECT COUNT(*) FROM queue").fetchone()[0]
+        return conn.execute("SELECT COUNT(*) FROM queue WHERE status = ?", (status,)).fetchone()[0]
+
+    def clear(self, statuses: Iterable[str] = (PENDING,)):
+        """Delete items in the given states (pending only by default; running items are left alone)."""
+        statuses = tuple(statuses)
+        placeholders = ",".join("?" * len(statuses))
+        self.db.connection().execute(f"DELETE FROM queue WHERE status IN ({placeholders})", statuses)
+
+    def close(self):
+        self.db.close()
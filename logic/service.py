@@ -0,0 +1,499 @@
+"""
+Background download service: python -m logic.service [-p PORT] [-j N] [-o DIR] [-r RATE] [--prefetch N] [--no-archive]
+
+One scheduler owns the downloads and keeps running whatever its frontends do;
+the GUI, scripts and curl are all clients of it. The API is plain HTTP + JSON
+on 127.0.0.1, and every request must carry 'Authorization: Bearer <token>':
+
+    GET  /jobs                 all jobs
+    GET  /jobs/<id>            one job
+    POST /jobs                 {"url", "format", "path", "title", "trim": [start, end]} -> {"id"}
+    POST /jobs/<id>/cancel     -> {"cancelled": true|false}
+    GET  /events[?job=<id>]    progress stream, one JSON object per line
+
+The event stream carries the CLI's events (queued, start, progress, done,
+skipped, failed, cancelled) plus a 'ping' when idle. A stream for one job
+starts with that job's current state and ends after its final event.
+
+The port and a fresh token are written to SERVICE_FILE (readable by the
+owner only) for clients to find; ServiceClient.discover() reads it.
+"""
+import argparse
+import collections
+import hmac
+import itertools
+import json
+import logging
+import os
+import queue
+import secrets
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, List, Any, Iterator
+from urllib.parse import parse_qs
+
+from .settings import current_settings, SERVICE_FILE
+from .downloader import FORMAT_KEYS
+from .cli import JobProgress, run_job, prefetchable, EXIT_INTERRUPTED
+from .bandwidth import bandwidth_scheduler
+from .prefetch import Prefetcher
+from .archive import download_archive
+from .utils import parse_bytes
+
+HOST = "127.0.0.1"
+# Seconds between pings on an idle event stream (also how fast dead clients are noticed)
+HEARTBEAT = 10.0
+# Finished jobs kept for status queries
+MAX_FINISHED = 500
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+SKIPPED = "skipped"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINAL = (DONE, SKIPPED, FAILED, CANCELLED)
+
+
+class ServiceError(Exception):
+    """Raised by ServiceClient when the service rejects a request."""
+
+
+class EventStream:
+    """One subscriber's events (all jobs, or a single job's)."""
+
+    def __init__(self, service: "DownloadService", job: Optional[int] = None):
+        self.service = service
+        self.job = job
+        self._queue = queue.Queue()
+
+    def put(self, record: Dict[str, Any]):
+        if self.job is None or record.get("job") == self.job:
+            self._queue.put(record)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.service.unsubscribe(self)
+
+
+class DownloadService:
+    """
+    Scheduler shared by every frontend.
+
+    Jobs run on `concurrency` worker threads in arrival order, through the same
+    run_job as the headless CLI (archive skips, prefetch, coalesced progress,
+    the global bandwidth cap). Every event updates the job table and is fanned
+    out to the subscribed streams.
+    """
+
+    def __init__(self, concurrency: int = 3, output: Optional[str] = None, prefetch: int = 2,
+                 archive: bool = True, progress_interval: float = 0.5):
+        self.concurrency = max(1, concurrency)
+        self.output = output or current_settings["download_path"]
+        self.lookahead = max(0, prefetch)
+        self.use_archive = archive
+        self.prefetch = Prefetcher(self.lookahead) if self.lookahead else None
+        self.progress = JobProgress(self, progress_interval)
+        self._lock = threading.Condition()
+        self._ids = itertools.count(1)
+        self.jobs: "collections.OrderedDict[int, Dict[str, Any]]" = collections.OrderedDict()
+        self._pending = collections.deque()
+        self._cancel: Dict[int, threading.Event] = {}
+        self._subscribers: List[EventStream] = []
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+
+    # --- Lifecycle ---
+    def start(self):
+        self.progress.start()
+        for i in range(self.concurrency):
+            t = threading.Thread(target=self._worker, name=f"service-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 5.0):
+        """Cancel running jobs and stop the workers; queued jobs are dropped."""
+        with self._lock:
+            self._stopping = True
+            for event in self._cancel.values():
+                event.set()
+            self._lock.notify_all()
+        for t in self._threads:
+            t.join(timeout)
+        self.progress.stop()
+        if self.prefetch:
+            self.prefetch.close()
+
+    # --- API ---
+    def enqueue(self, url: str, format: str = "1080p", path: Optional[str] = None, title: Optional[str] = None,
+                trim: Optional[List[float]] = None) -> int:
+        if not url or not isinstance(url, str):
+            raise ValueError("url is required")
+        if format not in FORMAT_KEYS:
+            raise ValueError(f"Unknown format: {format}")
+        if trim is not None:
+            start, end = (float(t) for t in trim)
+            if end <= start:
+                raise ValueError("trim end must be after its start")
+            trim = [start, end]
+        with self._lock:
+            job_id = next(self._ids)
+            self.jobs[job_id] = {"id": job_id, "url": url, "format": format, "path": path or self.output,
+                                 "title": title, "trim": trim, "status": QUEUED, "created": round(time.time(), 3)}
+            self._pending.append(job_id)
+            self._lock.notify()
+        self.emit("queued", job=job_id, url=url, format=format, title=title)
+        return job_id
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a queued or running job. False if it is unknown or already finished."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job["status"] in FINAL:
+                return False
+            if job_id in self._pending:
+                self._pending.remove(job_id)
+            else:
+                # Claimed by a worker: the download stops at its next progress tick and reports "Cancelled"
+                self._cancel[job_id].set()
+                return True
+        self.emit("failed", job=job_id, url=job["url"], error="Cancelled", exit_code=EXIT_INTERRUPTED)
+        return True
+
+    def status(self, job_id: Optional[int] = None):
+        """A copy of one job (None if unknown), or of every job when job_id is None."""
+        with self._lock:
+            if job_id is not None:
+                job = self.jobs.get(job_id)
+                return dict(job) if job else None
+            return [dict(job) for job in self.jobs.values()]
+
+    def subscribe(self, job: Optional[int] = None) -> EventStream:
+        stream = EventStream(self, job)
+        with self._lock:
+            self._subscribers.append(stream)
+            if job is not None and job in self.jobs:
+                # Registered and snapshotted under one lock: no event can fall in between
+                current = self.jobs[job]
+                stream.put({**current, "event": current["status"] if current["status"] in FINAL else "status",
+                            "job": job, "ts": round(time.time(), 3)})
+        return stream
+
+    def unsubscribe(self, stream: EventStream):
+        with self._lock:
+            if stream in self._subscribers:
+                self._subscribers.remove(stream)
+
+    # --- Events (also the writer of self.progress) ---
+    def emit(self, event: str, **fields):
+        if event == "failed" and fields.get("exit_code") == EXIT_INTERRUPTED:
+            event = CANCELLED
+        record = {"event": event, "ts": round(time.time(), 3), **fields}
+        with self._lock:
+            job = self.jobs.get(fields.get("job"))
+            if job is not None:
+                self._apply(job, record)
+            subscribers = list(self._subscribers)
+        for stream in subscribers:
+            stream.put(record)
+
+    @staticmethod
+    def _apply(job: Dict[str, Any], record: Dict[str, Any]):
+        event = record["event"]
+        if event == "start":
+            job.update(status=RUNNING, started=record["ts"])
+        elif event == "progress":
+            job["progress"] = {k: v for k, v in record.items() if k not in ("event", "ts", "job")}
+        elif event in FINAL:
+            job.update(status=event, finished=record["ts"])
+            job.pop("progress", None)
+            for key in ("error", "path", "bytes"):
+                if record.get(key) is not None:
+                    job[key] = record[key]
+
+    # --- Workers ---
+    def _worker(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._stopping:
+                    self._lock.wait()
+                if self._stopping:
+                    return
+                job_id = self._pending.popleft()
+                job = dict(self.jobs[job_id])
+                upcoming = [self.jobs[i]["url"] for i in itertools.islice(self._pending, self.lookahead)]
+                cancel_event = self._cancel[job_id] = threading.Event()
+            try:
+                archive = download_archive.scope(job["format"]) if self.use_archive else None
+                run_job({"id": job_id, "url": job["url"], "path": job["path"], "title": job["title"],
+                         "trim_range": tuple(job["trim"]) if job["trim"] else None},
+                        job["format"], self.progress, cancel_event, self.prefetch,
+                        [prefetchable({"url": u}, archive) for u in upcoming], archive)
+            except Exception as e:
+                logging.error(f"Service job {job_id} crashed: {e}", exc_info=True)
+                self.progress.finish(job_id, "failed", url=job["url"], error=str(e), exit_code=1)
+            finally:
+                with self._lock:
+                    self._cancel.pop(job_id, None)
+                    self._forget_finished()
+
+    def _forget_finished(self):
+        finished = [i for i, job in self.jobs.items() if job["status"] in FINAL]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED)]:
+            del self.jobs[job_id]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "YikesService/1"
+
+    def log_message(self, format, *args):
+        logging.debug(f"service: {self.address_string()} {format % args}")
+
+    def _send(self, code: int, body: Any):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self) -> bool:
+        expected = f"Bearer {self.server.token}"
+        if hmac.compare_digest(self.headers.get("Authorization", ""), expected):
+            return True
+        self._send(401, {"error": "unauthorized"})
+        return False
+
+    def _route(self):
+        path, _, query = self.path.partition("?")
+        return [p for p in path.split("/") if p], parse_qs(query)
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        parts, query = self._route()
+        service = self.server.service
+        try:
+            if parts == ["jobs"]:
+                self._send(200, {"jobs": service.status()})
+            elif len(parts) == 2 and parts[0] == "jobs":
+                job = service.status(int(parts[1]))
+                if job:
+                    self._send(200, job)
+                else:
+                    self._send(404, {"error": "no such job"})
+            elif parts == ["events"]:
+                self._stream(int(query["job"][0]) if "job" in query else None)
+            else:
+                self._send(404, {"error": "not found"})
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        parts, _ = self._route()
+        service = self.server.service
+        try:
+            if parts == ["jobs"]:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(body, dict):
+                    raise ValueError("expected a JSON object")
+                job_id = service.enqueue(body.get("url"), body.get("format", "1080p"), body.get("path"),
+                                         body.get("title"), body.get("trim"))
+                self._send(201, {"id": job_id})
+            elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+                self._send(200, {"cancelled": service.cancel(int(parts[1]))})
+            else:
+                self._send(404, {"error": "not found"})
+        except (ValueError, TypeError) as e:
+            self._send(400, {"error": str(e)})
+
+    def _stream(self, job: Optional[int]):
+        stream = self.server.service.subscribe(job)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()  # HTTP/1.0: the body ends when the connection closes
+        try:
+            while True:
+                record = stream.get(timeout=HEARTBEAT) or {"event": "ping", "ts": round(time.time(), 3)}
+                self.wfile.write((json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8'))
+                self.wfile.flush()
+                if job is not None and record["event"] in FINAL:
+                    return
+        except OSError:
+            pass  # Client went away
+        finally:
+            stream.close()
+
+
+class ServiceServer(ThreadingHTTPServer):
+    """The HTTP front of a DownloadService, bound to localhost."""
+
+    daemon_threads = True
+
+    def __init__(self, service: DownloadService, port: int = 0, token: Optional[str] = None, host: str = HOST):
+        super().__init__((host, port), _Handler)
+        self.service = service
+        self.token = token or secrets.token_urlsafe(24)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def write_discovery(self, path: str = SERVICE_FILE):
+        """Publish port and token for local clients (atomically, owner-only)."""
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"host": HOST, "port": self.port, "token": self.token, "pid": os.getpid()}, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class ServiceClient:
+    """Talks to a DownloadService over its HTTP API; same calls as the service itself."""
+
+    def __init__(self, port: int, token: str, host: str = HOST, timeout: float = 5.0):
+        self.base = f"http://{host}:{port}"
+        self.token = token
+        self.timeout = timeout
+        # Never route localhost through a configured proxy
+        self._opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+    @classmethod
+    def discover(cls, path: str = SERVICE_FILE, timeout: float = 1.0) -> Optional["ServiceClient"]:
+        """Client of the service announced in path, or None if none is running."""
+        try:
+            with open(path, 'r') as f:
+                found = json.load(f)
+            client = cls(found["port"], found["token"], found.get("host", HOST), timeout)
+            client.status()
+            return client
+        except (OSError, ValueError, KeyError, TypeError, ServiceError):
+            return None
+
+    def _open(self, method: str, path: str, body: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = urllib.request.Request(self.base + path, data=data, method=method,
+                                         headers={"Authorization": f"Bearer {self.token}",
+                                                  "Content-Type": "application/json"})
+        try:
+            return self._opener.open(request, timeout=timeout or self.timeout)
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.load(e).get("error", e.reason)
+            except ValueError:
+                message = e.reason
+            raise ServiceError(f"{e.code}: {message}") from None
+
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None):
+        with self._open(method, path, body) as response:
+            return json.load(response)
+
+    def enqueue(self, url: str, format: str = "1080p", path: Optional[str] = None, title: Optional[str] = None,
+                trim: Optional[List[float]] = None) -> int:
+        body = {"url": url, "format": format, "path": path, "title": title, "trim": list(trim) if trim else None}
+        return self._request("POST", "/jobs", body)["id"]
+
+    def cancel(self, job_id: int) -> bool:
+        return self._request("POST", f"/jobs/{job_id}/cancel")["cancelled"]
+
+    def status(self, job_id: Optional[int] = None):
+        if job_id is None:
+            return self._request("GET", "/jobs")["jobs"]
+        try:
+            return self._request("GET", f"/jobs/{job_id}")
+        except ServiceError as e:
+            if str(e).startswith("404"):
+                return None
+            raise
+
+    def events(self, job: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield events as they happen (pings included, so callers can check their
+        own state at least every HEARTBEAT seconds). A single job's stream ends
+        after its final event.
+        """
+        with self._open("GET", "/events" + (f"?job={job}" if job is not None else ""), timeout=HEARTBEAT * 3) as response:
+            for line in response:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def progress_info(event: Dict[str, Any]) -> Dict[str, Any]:
+    """A 'progress' event turned back into the yt-dlp-style dict the GUI's progress handlers expect."""
+    if event.get("stage") in ("merging", "trimming", "converting"):
+        return {'status': event["stage"]}
+    return {'status': 'downloading', 'downloaded_bytes': event.get('downloaded'), 'total_bytes': event.get('total'),
+            'speed': event.get('speed'), 'eta': event.get('eta'), '_content_type': (event.get('stage') or 'content').title()}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m logic.service", description="Yikes YTD download service")
+    parser.add_argument("-p", "--port", type=int, default=0, help="port on 127.0.0.1 (default: any free port)")
+    parser.add_argument("-j", "--concurrency", type=int, default=current_settings.get("playlist_concurrency", 3),
+                        help="parallel downloads")
+    parser.add_argument("-o", "--output", default=current_settings["download_path"], help="default download directory")
+    parser.add_argument("-r", "--limit-rate", default=current_settings.get("speed_limit") or "", metavar="RATE",
+                        help="total download rate shared by all jobs, e.g. 5M (default: speed_limit setting)")
+    parser.add_argument("--prefetch", type=int, default=current_settings.get("prefetch_lookahead", 2), metavar="N",
+                        help="queued jobs to extract in the background (0 disables)")
+    parser.add_argument("--no-archive", dest="archive", action="store_false",
+                        default=current_settings.get("skip_downloaded", True),
+                        help="download even videos already in the download archive")
+    parser.add_argument("--service-file", default=SERVICE_FILE, help="where to publish port and token")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr, format='%(levelname)s: %(message)s')
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    limit = parse_bytes(args.limit_rate) if args.limit_rate else 0
+    if limit is None:
+        parser.error(f"invalid --limit-rate: {args.limit_rate}")
+    bandwidth_scheduler.set_cap(limit)
+
+    service = DownloadService(args.concurrency, args.output, args.prefetch, args.archive)
+    try:
+        server = ServiceServer(service, args.port)
+    except OSError as e:
+        parser.error(f"cannot listen on port {args.port}: {e}")
+    service.start()
+    server.write_discovery(args.service_file)
+    print(f"Yikes YTD service listening on {HOST}:{server.port} ({args.service_file})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+        try:
+            os.remove(args.service_file)
+        except OSError:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import os
 import json
+import logging
 import tempfile
 import shutil
 
@@ -14,12 +15,28 @@ DEFAULT_SETTINGS = {
     "proxy_url": "",
     "speed_limit": "", # e.g. 5M
     "notifications": True,
-    "clipboard_monitor": False
+    "clipboard_monitor": False,
+    "playlist_concurrency": 3, # Parallel playlist downloads
+    "cache_metadata": True, # Reuse fetched video/playlist info (see logic/cache.py)
+    "adaptive_transfer": True, # Tune fragment concurrency/chunk size from throughput (see logic/tuner.py)
+    "prefetch_lookahead": 2, # Upcoming playlist/queue items resolved in the background (see logic/prefetch.py)
+    "skip_downloaded": True, # Skip videos already downloaded in the same format (see logic/archive.py)
+    "export_metrics": True, # Per-job timing spans to metrics/jobs.jsonl and metrics/yikes.prom (see logic/metrics.py)
+    "use_download_service": True, # Hand downloads to a running download service, if any (see logic/service.py)
+    "process_workers": False, # Run each download in its own child process (see logic/process_worker.py)
+    "ffmpeg_path": "", # Use this FFmpeg binary instead of the bundled/system one (see logic/ffmpeg.py)
+    "trim_mode": "exact", # How clips are cut: "fast", "precise" or "exact" (see logic/trim.py)
+    "gif_width": 480, # GIF width in pixels (see logic/gif.py)
+    "gif_fps": 12,
+    "gif_max_mb": 8 # GIF size budget; bigger GIFs are redone smaller (0 = no limit)
 }
 
 SETTINGS_FILE = "settings.json"
-HISTORY_FILE = "history.json"
-QUEUE_FILE = "queue.json"
+HISTORY_FILE = "history.json" # Legacy, migrated into DB_FILE
+QUEUE_FILE = "queue.json" # Legacy, migrated into DB_FILE
+DB_FILE = "yikes.db"
+SERVICE_FILE = "service.json" # Port and token of the running download service
+CACHE_DIR = "cache"
 
 def _atomic_write_json(filepath, data):
     """Write JSON atomically using tempfile + rename to prevent corruption."""
@@ -51,62 +68,76 @@ def load_settings():
             return DEFAULT_SETTINGS
     return DEFAULT_SETTINGS
 
+# Called with the settings after every save (e.g. to drop state derived from them)
+_save_listeners = []
+
+def on_settings_saved(callback):
+    _save_listeners.append(callback)
+
 def save_settings(settings):
     _atomic_write_json(SETTINGS_FILE, settings)
-
-def load_history():
-    if os.path.exists(HISTORY_FILE):
+    for callback in list(_save_listeners):
         try:
-            with open(HISTORY_FILE, "r") as f:
-                return json.load(f)
-        except:
-            return []
-    return []
+            callback(settings)
+        except Exception as e:
+            logging.error(f"Settings listener failed: {e}")
+
+# --- History (SQLite, see logic/history_store.py) ---
+_history_store = None
+
+def history_store():
+    global _history_store
+    if _history_store is None:
+        from .history_store import HistoryStore
+        _history_store = HistoryStore()
+    return _history_store
+
+def load_history(limit=50, before_id=None, query=None):
+    """One page of history, newest first. Pass the last entry's 'id' as before_id for the next page."""
+    if query:
+        return history_store().search(query, limit, before_id)
+    return history_store().page(limit, before_id)
 
 def save_history(entry):
-    history = load_history()
-    history.insert(0, entry) # Add to top
-    # Limit to last 50
-    history = history[:50]
-    _atomic_write_json(HISTORY_FILE, history)
-
-# --- Queue Management (Now Persistent) ---
-def _load_queue():
-    if os.path.exists(QUEUE_FILE):
-        try:
-            with open(QUEUE_FILE, "r") as f:
-                return json.load(f)
-        except:
-            return []
-    return []
+    return history_store().append(entry)
 
-def _save_queue(queue):
-    _atomic_write_json(QUEUE_FILE, queue)
+def clear_history():
+    history_store().clear()
+
+# --- Queue Management (SQLite, see logic/queue_store.py) ---
+_queue_store = None
+
+def queue_store():
+    global _queue_store
+    if _queue_store is None:
+        from .queue_store import QueueStore
+        _queue_store = QueueStore()
+    return _queue_store
 
 def add_to_queue(item):
-    queue = _load_queue()
-    queue.append(item)
-    _save_queue(queue)
+    """Append an item; returns its stable id."""
+    return queue_store().enqueue(item)
 
-def remove_from_queue(index):
-    queue = _load_queue()
-    if 0 <= index < len(queue):
-        del queue[index]
-        _save_queue(queue)
+def remove_from_queue(item_id):
+    queue_store().remove(item_id)
 
-def get_queue():
-    return _load_queue()
+def get_queue(limit=-1):
+    """Pending items in order, each with its 'id' (the first `limit` only, if given)."""
+    return queue_store().items(limit=limit)
 
 def pop_queue():
-    queue = _load_queue()
-    if queue:
-        item = queue.pop(0)
-        _save_queue(queue)
-        return item
-    return None
+    """Atomically claim the next pending item (marked running), or None."""
+    return queue_store().dequeue()
+
+def finish_queue_item(item_id, ok=True, error=None):
+    store = queue_store()
+    if ok:
+        store.mark_done(item_id)
+    else:
+        store.mark_failed(item_id, error)
 
 def clear_queue():
-    _save_queue([])
+    queue_store().clear()
 
 # Initialize settings
 current_settings = load_settings()
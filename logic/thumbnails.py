@@ -0,0 +1,264 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from io import BytesIO
+from typing import Optional, Dict, Any, Tuple, Callable
+
+from .settings import CACHE_DIR
+
+DEFAULT_MEMORY_BYTES = 48 * 1024 * 1024
+DEFAULT_DISK_BYTES = 128 * 1024 * 1024
+FETCH_TIMEOUT = 5
+JPEG_QUALITY = 90
+
+Size = Tuple[int, int]
+
+
+def _http_fetch(url: str) -> bytes:
+    import requests  # Lazy: keeps the logic package importable without it
+    response = requests.get(url, timeout=FETCH_TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+
+class ThumbnailCache:
+    """
+    Resized thumbnails keyed by (URL, target size).
+
+    Tier 1 is an in-memory LRU of decoded, already-resized PIL images bounded by
+    pixel bytes. Tier 2 is a size-capped directory of resized JPEGs with LRU
+    eviction by mtime (same scheme as MetadataCache). Concurrent requests for a
+    URL share one download; each target size is resized once.
+
+    get() blocks on I/O and must run off the Tk thread; peek() is memory-only
+    and safe anywhere.
+    """
+
+    def __init__(self, directory: str = os.path.join(CACHE_DIR, "thumbnails"),
+                 max_memory_bytes: int = DEFAULT_MEMORY_BYTES, max_disk_bytes: int = DEFAULT_DISK_BYTES,
+                 fetcher: Callable[[str], bytes] = _http_fetch):
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.fetcher = fetcher
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # (url, size) -> (image, nbytes)
+        self._memory_bytes = 0
+        self._disk = None  # OrderedDict path -> size, oldest first
+        self._disk_bytes = 0
+        self._inflight: Dict[str, Future] = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.downloads = 0
+        self.deduped = 0
+        self.errors = 0
+
+    # --- Image hooks (PIL imported lazily) ---
+    @staticmethod
+    def _decode(data: bytes, size: Size):
+        from PIL import Image
+        img = Image.open(BytesIO(data))
+        img.load()
+        return img.resize(size, Image.Resampling.LANCZOS)
+
+    @staticmethod
+    def _open(data: bytes):
+        from PIL import Image
+        img = Image.open(BytesIO(data))
+        img.load()
+        return img
+
+    @staticmethod
+    def _encode(img) -> bytes:
+        buf = BytesIO()
+        img.convert("RGB").save(buf, format="JPEG", quality=JPEG_QUALITY)
+        return buf.getvalue()
+
+    @staticmethod
+    def _image_bytes(img) -> int:
+        return img.width * img.height * len(img.getbands())
+
+    # --- Memory tier ---
+    def peek(self, url: str, size: Size):
+        """Memory-only lookup; never blocks on I/O."""
+        key = (url, tuple(size))
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is None:
+                return None
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return hit[0]
+
+    def _remember(self, key, img):
+        nbytes = self._image_bytes(img)
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old:
+                self._memory_bytes -= old[1]
+            self._memory[key] = (img, nbytes)
+            self._memory_bytes += nbytes
+            while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+                _, (_, evicted) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted
+
+    # --- Disk tier ---
+    def _path(self, url: str, size: Size) -> str:
+        digest = hashlib.sha1(f"{url}|{size[0]}x{size[1]}".encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + ".jpg")
+
+    def _load_disk_index(self):
+        if self._disk is not None:
+            return
+        found = []
+        if os.path.isdir(self.directory):
+            for root, _, names in os.walk(self.directory):
+                for name in names:
+                    if name.endswith(".jpg"):
+                        path = os.path.join(root, name)
+                        try:
+                            st = os.stat(path)
+                        except OSError:
+                            continue
+                        found.append((st.st_mtime, path, st.st_size))
+        found.sort()
+        self._disk = OrderedDict((path, size) for _, path, size in found)
+        self._disk_bytes = sum(self._disk.values())
+
+    def _disk_get(self, path: str) -> Optional[bytes]:
+        with self._lock:
+            self._load_disk_index()
+            if path not in self._disk:
+                return None
+            self._disk.move_to_end(path)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except OSError:
+            with self._lock:
+                self._disk_bytes -= self._disk.pop(path, 0)
+            return None
+
+    def _disk_put(self, path: str, data: bytes):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.debug(f"Thumbnail cache write failed: {e}")
+            return
+        with self._lock:
+            self._load_disk_index()
+            self._disk_bytes -= self._disk.pop(path, 0)
+            self._disk[path] = len(data)
+            self._disk_bytes += len(data)
+            while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+                oldest, nbytes = self._disk.popitem(last=False)
+                self._disk_bytes -= nbytes
+                try:
+                    os.remove(oldest)
+                except OSError:
+                    pass
+
+    # --- Network (deduplicated per URL) ---
+    def _download(self, url: str) -> bytes:
+        with self._lock:
+            future = self._inflight.get(url)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[url] = future
+                self.downloads += 1
+            else:
+                self.deduped += 1
+        if not leader:
+            return future.result()
+        try:
+            data = self.fetcher(url)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(url, None)
+
+    # --- Public API ---
+    def get(self, url: str, size: Size):
+        """Resized image for url, or None if it cannot be fetched/decoded. Blocking."""
+        size = tuple(size)
+        key = (url, size)
+        img = self.peek(url, size)
+        if img is not None:
+            return img
+
+        path = self._path(url, size)
+        data = self._disk_get(path)
+        if data is not None:
+            try:
+                img = self._open(data)
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, img)
+                return img
+            except Exception as e:
+                logging.debug(f"Corrupt cached thumbnail {path}: {e}")
+
+        with self._lock:
+            self.misses += 1
+        try:
+            img = self._decode(self._download(url), size)
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            logging.debug(f"Thumbnail fetch failed for {url}: {e}")
+            return None
+        self._remember(key, img)
+        self._disk_put(path, self._encode(img))
+        return img
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._load_disk_index()
+            for path in self._disk:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._disk.clear()
+            self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load_disk_index()
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "downloads": self.downloads,
+                "deduped": self.deduped,
+                "errors": self.errors,
+                "memory_items": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_items": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
+
+
+# Shared process-wide cache
+thumbnail_cache = ThumbnailCache()
@@ -0,0 +1,310 @@
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Optional, Dict, List, Any, Callable, Tuple
+
+from .postprocess import PostProcessError, run_ffmpeg
+
+# "trim_mode" setting: how a clip's cut points are made
+TRIM_EXACT = "exact"      # yt-dlp re-encodes the whole clip (force_keyframes_at_cuts): frame-accurate, CPU-bound
+TRIM_FAST = "fast"        # Stream copy: the clip starts at the keyframe at or before the requested start
+TRIM_PRECISE = "precise"  # Stream copy, then only the partial GOPs at either end are re-encoded
+TRIM_MODES = (TRIM_FAST, TRIM_PRECISE, TRIM_EXACT)
+
+COPY = "copy"
+ENCODE = "encode"
+
+# Encoders that can re-encode boundary GOPs so they join the copied middle, per source codec (first available wins)
+SMART_CUT_ENCODERS = {
+    "h264": ("libx264",),
+    "hevc": ("libx265",),
+    "vp9": ("libvpx-vp9",),
+    "av1": ("libsvtav1", "libaom-av1"),
+    "mpeg4": ("mpeg4",),
+}
+# Near-transparent quality at a fast preset: boundary GOPs are a few seconds at most
+ENCODER_ARGS = {
+    "libx264": ["-preset", "veryfast", "-crf", "16"],
+    "libx265": ["-preset", "veryfast", "-crf", "18"],
+    "libvpx-vp9": ["-deadline", "realtime", "-cpu-used", "8", "-crf", "20", "-b:v", "0"],
+    "libsvtav1": ["-preset", "10", "-crf", "24"],
+    "libaom-av1": ["-cpu-used", "8", "-crf", "24"],
+    "mpeg4": ["-q:v", "2"],
+}
+# The join keeps only the first part's codec headers: each part repeats its own parameter sets before every
+# keyframe, so the copied GOPs and the re-encoded ones (whose SPS/PPS differ) each decode against their own
+PARAMETER_SET_BSF = {
+    "h264": "h264_mp4toannexb,dump_extra",
+    "hevc": "hevc_mp4toannexb,dump_extra",
+    "mpeg4": "dump_extra",
+}
+X264_PROFILES = {"Constrained Baseline": "baseline", "Baseline": "baseline", "Main": "main", "High": "high"}
+MP4_EXTS = (".mp4", ".m4v", ".mov")
+
+# Stream-copy seeks aim this far past a keyframe, so rounding in ffprobe's timestamps can't land on the one before
+SEEK_EPSILON = 0.001
+# Audio is cut by dropping packets after a seek this far ahead (exact to the packet, unlike a copy from a video keyframe)
+AUDIO_PREROLL = 5.0
+PROBE_TIMEOUT = 60
+
+
+def probe_media(ffprobe: Optional[str], path: str) -> Dict[str, Any]:
+    """Video codec details, frame and keyframe times, audio presence and timeline (start, duration) of a local file."""
+    if not ffprobe:
+        raise PostProcessError("ffprobe not found")
+    cmd = [ffprobe, "-v", "error",
+           "-show_entries", "stream=index,codec_type,codec_name,profile,pix_fmt,time_base,width,height"
+                            ":format=start_time,duration:packet=stream_index,pts_time,flags",
+           "-of", "json", path]
+    try:
+        out = subprocess.run(cmd, capture_output=True, text=True, timeout=PROBE_TIMEOUT, errors='replace')
+    except (OSError, subprocess.SubprocessError) as e:
+        raise PostProcessError(f"ffprobe failed: {e}")
+    if out.returncode != 0:
+        message = out.stderr.strip().splitlines()
+        raise PostProcessError(message[-1] if message else f"ffprobe exited with {out.returncode}")
+    try:
+        return parse_probe(json.loads(out.stdout or "{}"))
+    except ValueError as e:
+        raise PostProcessError(f"Unreadable ffprobe output: {e}")
+
+
+def _number(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):  # ffprobe prints "N/A" for unknown values
+        return None
+
+
+def parse_probe(data: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields of ffprobe's JSON that trimming needs. codec is None for files without video."""
+    streams = data.get("streams") or []
+    video = next((s for s in streams if s.get("codec_type") == "video"), {})
+    fmt = data.get("format") or {}
+    time_base = str(video.get("time_base") or "")
+    frames, keyframes = [], []
+    for packet in data.get("packets") or []:
+        t = _number(packet.get("pts_time"))
+        if not video or packet.get("stream_index") != video.get("index") or t is None:
+            continue
+        frames.append(t)
+        if "K" in (packet.get("flags") or ""):
+            keyframes.append(t)
+    return {
+        "codec": video.get("codec_name"),
+        "profile": video.get("profile"),
+        "pix_fmt": video.get("pix_fmt"),
+        "width": video.get("width"),
+        "height": video.get("height"),
+        "timescale": int(time_base.split("/")[1]) if time_base.startswith("1/") and time_base[2:].isdigit() else None,
+        "audio": any(s.get("codec_type") == "audio" for s in streams),
+        "start": _number(fmt.get("start_time")) or 0.0,
+        "duration": _number(fmt.get("duration")) or 0.0,
+        "frames": sorted(frames),
+        "keyframes": sorted(keyframes),
+    }
+
+
+def plan_cut(keyframes: List[float], start: float, end: float, mode: str = TRIM_PRECISE
+             ) -> Tuple[List[Tuple[str, float, float]], Tuple[float, float]]:
+    """
+    How to cut [start, end] out of a video with keyframes at the given times:
+    ([(COPY | ENCODE, from, to), ...], achieved (start, end)).
+
+    fast copies from the last keyframe at or before start. precise copies
+    whole GOPs and re-encodes the partial ones at the head (start up to the
+    first keyframe inside the range) and at the tail (last keyframe to end).
+    exact re-encodes everything.
+    """
+    if mode == TRIM_EXACT:
+        return [(ENCODE, start, end)], (start, end)
+    if mode == TRIM_FAST:
+        before = [k for k in keyframes if k <= start + SEEK_EPSILON]
+        cut = before[-1] if before else start
+        return [(COPY, cut, end)], (cut, end)
+
+    inside = [k for k in keyframes if start - SEEK_EPSILON <= k < end - SEEK_EPSILON]
+    if not inside:  # No keyframe in range: it is all one partial GOP
+        return [(ENCODE, start, end)], (start, end)
+    first, last = inside[0], inside[-1]
+    segments = []
+    if first > start + SEEK_EPSILON:
+        segments.append((ENCODE, start, first))
+    if last > first:
+        segments.append((COPY, first, last))
+    segments.append((ENCODE, last, end))
+    return segments, (start, end)
+
+
+def pick_encoder(ff, codec: Optional[str]) -> Optional[str]:
+    """An available encoder for codec (so re-encoded GOPs can be joined to copied ones), or None."""
+    for name in SMART_CUT_ENCODERS.get(codec or "", ()):
+        if ff.has_encoder(name):
+            return name
+    return None
+
+
+def _base(ffmpeg: str, seek: float, source: str) -> List[str]:
+    return [ffmpeg, "-y", "-loglevel", "error", "-nostdin", "-ss", f"{max(0.0, seek):.6f}", "-i", source]
+
+
+def _duration(seconds: float) -> List[str]:
+    return ["-t", f"{seconds:.6f}"]
+
+
+def _timescale(media: Dict[str, Any], output: str) -> List[str]:
+    # The same track timescale in every part, so their timestamps join without rounding
+    if media.get("timescale") and os.path.splitext(output)[1].lower() in MP4_EXTS:
+        return ["-video_track_timescale", str(media["timescale"])]
+    return []
+
+
+def copy_command(ffmpeg: str, source: str, output: str, begin: float, finish: float,
+                 media: Dict[str, Any]) -> List[str]:
+    """ffmpeg argv stream-copying [begin, finish] of source, all of its audio and video, from the keyframe at begin."""
+    return (_base(ffmpeg, begin + SEEK_EPSILON, source) + _duration(finish - begin)
+            + ["-map", "0:v:0?", "-map", "0:a?", "-c", "copy", "-avoid_negative_ts", "make_zero"]
+            + _timescale(media, output) + [output])
+
+
+def video_command(ffmpeg: str, source: str, output: str, action: str, begin: float, finish: float,
+                  media: Dict[str, Any], encoder: Optional[str] = None, frames: Optional[int] = None) -> List[str]:
+    """
+    ffmpeg argv writing the video of [begin, finish] to output, stream-copied
+    (begin must be a keyframe; frames, if known, is exact where the time limit
+    would let reordered frames of the next GOP through) or re-encoded.
+    """
+    if action == COPY:
+        cmd = _base(ffmpeg, begin + SEEK_EPSILON, source) + _duration(finish - begin) + ["-map", "0:v:0", "-an", "-c:v", "copy"]
+        if frames:
+            cmd += ["-frames:v", str(frames)]
+        cmd += ["-avoid_negative_ts", "make_zero"]
+    else:
+        cmd = _base(ffmpeg, begin, source) + _duration(finish - begin) + ["-map", "0:v:0", "-an"]
+        if encoder:
+            # Match the copied stream, so the parts concatenate without re-encoding
+            cmd += ["-c:v", encoder] + ENCODER_ARGS.get(encoder, [])
+            if media.get("pix_fmt"):
+                cmd += ["-pix_fmt", media["pix_fmt"]]
+            if encoder == "libx264" and media.get("profile") in X264_PROFILES:
+                cmd += ["-profile:v", X264_PROFILES[media["profile"]]]
+    if (action == COPY or encoder) and media.get("codec") in PARAMETER_SET_BSF:
+        cmd += ["-bsf:v", PARAMETER_SET_BSF[media["codec"]]]
+    return cmd + _timescale(media, output) + [output]
+
+
+def audio_command(ffmpeg: str, source: str, output: str, begin: float, finish: float) -> List[str]:
+    """ffmpeg argv stream-copying the audio of [begin, finish] to output."""
+    preroll = min(begin, AUDIO_PREROLL)
+    return (_base(ffmpeg, begin - preroll, source) + ["-ss", f"{preroll:.6f}"] + _duration(finish - begin)
+            + ["-map", "0:a", "-vn", "-c:a", "copy", output])
+
+
+def join_command(ffmpeg: str, list_file: str, audio: Optional[str], output: str) -> List[str]:
+    """ffmpeg argv concatenating the video parts in list_file, muxed with the audio part (if any)."""
+    cmd = [ffmpeg, "-y", "-loglevel", "error", "-nostdin", "-f", "concat", "-safe", "0", "-i", list_file]
+    if audio:
+        cmd += ["-i", audio, "-map", "0:v", "-map", "1:a"]
+    return cmd + ["-c", "copy", output]
+
+
+def _report(mode: str, requested, achieved, segments=()) -> Dict[str, Any]:
+    return {
+        "mode": mode,
+        "requested": [round(t, 3) for t in requested],
+        "achieved": [round(t, 3) for t in achieved],
+        "encoded": round(sum(b - a for action, a, b in segments if action == ENCODE), 3),
+        "copied": round(sum(b - a for action, a, b in segments if action == COPY), 3),
+    }
+
+
+def cut_file(ff, source: str, output: str, start: float, end: float, mode: str = TRIM_PRECISE,
+             cancel_callback: Optional[Callable] = None, media: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Cut [start, end] (seconds on source's timeline) out of source into output
+    (which may be source itself). Returns the report: mode, requested and
+    achieved cut points, and seconds re-encoded vs copied.
+    """
+    if not ff.path:
+        raise PostProcessError("FFmpeg not found")
+    media = media or probe_media(ff.ffprobe, source)
+    encoder = pick_encoder(ff, media["codec"])
+    if not media["codec"]:
+        segments, achieved = [(COPY, start, end)], (start, end)  # Audio only: every packet is a keyframe
+    else:
+        if mode == TRIM_PRECISE and not encoder:
+            logging.warning(f"No encoder for {media['codec']} to re-encode partial GOPs with; re-encoding the whole clip")
+            mode = TRIM_EXACT
+        segments, achieved = plan_cut(media["keyframes"], start, end, mode)
+
+    ext = os.path.splitext(output)[1]
+    work = tempfile.mkdtemp(prefix=".trim-", dir=os.path.dirname(os.path.abspath(output)))
+    try:
+        result = os.path.join(work, f"clip{ext}")
+        if len(segments) == 1 and segments[0][0] == COPY:
+            run_ffmpeg(copy_command(ff.path, source, result, segments[0][1], segments[0][2], media), result, cancel_callback)
+        else:
+            # Video parts joined by the concat demuxer; the audio is cut once, separately
+            parts = []
+            for i, (action, begin, finish) in enumerate(segments):
+                part = os.path.join(work, f"part{i}{ext}")
+                frames = sum(1 for t in media["frames"] if begin - SEEK_EPSILON <= t < finish - SEEK_EPSILON) \
+                    if action == COPY else None
+                cmd = video_command(ff.path, source, part, action, begin, finish, media, encoder, frames)
+                run_ffmpeg(cmd, part, cancel_callback)
+                parts.append(part)
+            audio = None
+            if media["audio"]:
+                audio = os.path.join(work, f"audio{ext}")
+                run_ffmpeg(audio_command(ff.path, source, audio, start, end), audio, cancel_callback)
+            list_file = os.path.join(work, "parts.txt")
+            with open(list_file, "w", encoding="utf-8") as f:
+                for part in parts:
+                    f.write("file '{}'\n".format(part.replace("'", "'\\''")))
+            run_ffmpeg(join_command(ff.path, list_file, audio, result), result, cancel_callback)
+        os.replace(result, output)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return _report(mode, (start, end), achieved, segments)
+
+
+def section_offset(media: Dict[str, Any], start: float, end: float) -> Tuple[float, bool]:
+    """
+    Source time at file time 0 of a section yt-dlp stream-copied for [start, end],
+    and whether that is exact (False: estimated from the section's duration).
+    """
+    frames = media["frames"]
+    if frames and frames[0] < media["start"] - SEEK_EPSILON:
+        # mp4: the pre-roll from the keyframe sits at negative times behind an edit list, file time 0 is start
+        return start, True
+    # Timestamps shifted to begin at the keyframe (e.g. webm): only an estimate from the duration is possible
+    return end - (media["start"] + media["duration"]), False
+
+
+def finish_section(ff, path: str, start: float, end: float, mode: str,
+                   cancel_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    """
+    Complete a clip yt-dlp stream-copied (download_ranges without
+    force_keyframes_at_cuts), in place.
+
+    Such a section holds the video from the keyframe at or before start up to
+    end. fast keeps the file as downloaded; precise re-encodes its partial
+    GOPs so it starts exactly at start. Returns cut_file's report, in source times.
+    """
+    media = probe_media(ff.ffprobe, path)
+    frames = media["frames"]
+    first = (media["keyframes"] or frames or [media["start"]])[0]
+    offset, placed = section_offset(media, start, end)
+    if not placed and mode == TRIM_PRECISE and media["codec"]:
+        logging.warning(f"Cannot place the cut points in {path}; keeping the stream-copied clip")
+        mode = TRIM_FAST
+    if mode == TRIM_FAST or not media["codec"]:
+        begin = max(0.0, first + offset)
+        return _report(mode, (start, end), (begin, end), [(COPY, begin, end)])
+    report = cut_file(ff, path, path, max(first, start - offset), end - offset, mode, cancel_callback, media)
+    report["requested"] = [round(start, 3), round(end, 3)]
+    report["achieved"] = [round(t + offset, 3) for t in report["achieved"]]
+    return report
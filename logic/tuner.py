@@ -0,0 +1,250 @@
+import logging
+import re
+import threading
+import time
+from typing import Optional, Dict, Any, List
+
+# Safe bounds: more fragments than this tends to trip per-IP limits; chunks
+# below 1 MB waste round trips, above 64 MB defeat throttling avoidance
+MIN_FRAGMENTS = 1
+MAX_FRAGMENTS = 8
+MIN_CHUNK = 1024 * 1024
+MAX_CHUNK = 64 * 1024 * 1024
+DEFAULT_FRAGMENTS = 1
+DEFAULT_CHUNK = 10 * 1024 * 1024
+
+# Seconds of transfer per decision
+WINDOW = 2.0
+# Relative throughput gain that justifies one more connection
+GAIN = 0.10
+# Windows to wait after an error before probing upwards again
+COOLDOWN = 5
+# Windows at a stable level before re-probing (links change)
+REPROBE = 15
+
+ERROR_THROTTLED = "throttled"  # 429
+ERROR_FORBIDDEN = "forbidden"  # 403 (also how expiring/over-used signed URLs fail)
+ERROR_TIMEOUT = "timeout"
+
+_ERROR_PATTERNS = [
+    (re.compile(r'HTTP Error 429|Too Many Requests', re.I), ERROR_THROTTLED),
+    (re.compile(r'HTTP Error 403|Forbidden', re.I), ERROR_FORBIDDEN),
+    (re.compile(r'timed out|timeout|Connection reset', re.I), ERROR_TIMEOUT),
+]
+
+
+def classify_error(message: str) -> Optional[str]:
+    for pattern, kind in _ERROR_PATTERNS:
+        if pattern.search(message or ''):
+            return kind
+    return None
+
+
+class TransferTuner:
+    """
+    AIMD controller for yt-dlp fragment concurrency and HTTP chunk size.
+
+    Callers report transferred bytes and transport errors; every WINDOW seconds
+    the tuner compares throughput with the previous level:
+
+    - any 403/429/timeout halves concurrency (and chunk size) and holds for
+      COOLDOWN windows, remembering the failing level as a ceiling that is
+      lifted again after REPROBE clean windows
+    - otherwise it probes one more fragment connection, keeping it only if
+      throughput rose by at least GAIN; a flat result reverts and holds
+    - clean windows at a held level double the chunk size towards MAX_CHUNK
+
+    One tuner is shared by all jobs on a link, so it measures aggregate
+    throughput. Safe to use from several threads.
+    """
+
+    def __init__(self, fragments: int = DEFAULT_FRAGMENTS, chunk_size: int = DEFAULT_CHUNK,
+                 min_fragments: int = MIN_FRAGMENTS, max_fragments: int = MAX_FRAGMENTS,
+                 min_chunk: int = MIN_CHUNK, max_chunk: int = MAX_CHUNK,
+                 window: float = WINDOW, gain: float = GAIN, cooldown: int = COOLDOWN, reprobe: int = REPROBE):
+        self.min_fragments, self.max_fragments = min_fragments, max_fragments
+        self.min_chunk, self.max_chunk = min_chunk, max_chunk
+        self.window, self.gain = window, gain
+        self.cooldown_windows, self.reprobe_windows = cooldown, reprobe
+
+        self.fragments = max(min_fragments, min(fragments, max_fragments))
+        self.chunk_size = max(min_chunk, min(chunk_size, max_chunk))
+
+        self._lock = threading.Lock()
+        self._window_start = None
+        self._bytes = 0
+        self._errors: Dict[str, int] = {}
+        self._last_level_rate = None  # Throughput at the level before the current probe
+        self._probing = False
+        self._hold = 0
+        self._stable = 0
+        self._ceiling = max_fragments
+        self._clean = 0  # Windows without errors since the ceiling was set
+        self._last_backoff = float('-inf')
+        self._file_progress: Dict[str, int] = {}
+        self.history: List[Dict[str, Any]] = []
+        self.total_errors = 0
+
+    # --- Inputs ---
+    def record_bytes(self, n: int, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._window_start is None:
+                self._window_start = now
+            self._bytes += max(0, n)
+        self.tick(now)
+
+    def record_error(self, kind: str, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.total_errors += 1
+            if now - self._last_backoff < self.window:
+                # Requests started before the last backoff are still failing; already handled
+                return
+            self._errors[kind] = self._errors.get(kind, 0) + 1
+        self.tick(now)
+
+    def observe(self, d: Dict[str, Any]):
+        """Feed a yt-dlp progress dict (cumulative downloaded_bytes per file)."""
+        key = d.get('tmpfilename') or d.get('filename') or ''
+        if d.get('status') == 'finished':
+            with self._lock:
+                self._file_progress.pop(key, None)
+            return
+        if d.get('status') != 'downloading':
+            return
+        current = d.get('downloaded_bytes') or 0
+        with self._lock:
+            previous = self._file_progress.get(key, 0)
+            self._file_progress[key] = current
+        if current > previous:
+            self.record_bytes(current - previous)
+
+    # --- Outputs ---
+    def settings(self) -> Dict[str, int]:
+        with self._lock:
+            return {"concurrent_fragment_downloads": self.fragments, "http_chunk_size": self.chunk_size}
+
+    def apply(self, params: Dict[str, Any]):
+        """Write current settings into a (live) yt-dlp params dict."""
+        params.update(self.settings())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "fragments": self.fragments,
+                "chunk_size": self.chunk_size,
+                "ceiling": self._ceiling,
+                "errors": self.total_errors,
+                "decisions": len(self.history),
+                "last_rate": self.history[-1]["rate"] if self.history else None,
+            }
+
+    # --- Control loop ---
+    def tick(self, now: Optional[float] = None) -> bool:
+        """Close the window if it has run long enough; returns True when settings changed."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._window_start is None:
+                if not self._errors:
+                    return False
+                self._window_start = now
+            elapsed = now - self._window_start
+            if self._errors:
+                # Back off immediately, don't wait for the window to end
+                return self._decide(self._bytes / elapsed if elapsed > 0 else 0.0, now)
+            if elapsed < self.window:
+                return False
+            return self._decide(self._bytes / elapsed, now)
+
+    def _decide(self, rate: float, now: float) -> bool:
+        before = (self.fragments, self.chunk_size)
+        errors, self._errors = self._errors, {}
+        self._bytes = 0
+        self._window_start = now
+        action = "hold"
+
+        if not errors:
+            self._clean += 1
+            if self._ceiling < self.max_fragments and self._clean >= self.reprobe_windows:
+                # Links change: allow probing past the old failure point again
+                self._ceiling += 1
+                self._clean = 0
+
+        if errors:
+            # Multiplicative decrease; the failing level becomes the ceiling for a while
+            self._ceiling = max(self.min_fragments, self.fragments - 1)
+            self.fragments = max(self.min_fragments, self.fragments // 2)
+            self.chunk_size = max(self.min_chunk, self.chunk_size // 2)
+            self._hold = self.cooldown_windows
+            self._last_backoff = now
+            self._probing = False
+            self._last_level_rate = None
+            self._stable = 0
+            self._clean = 0
+            action = "backoff"
+        elif self._probing:
+            self._probing = False
+            if self._last_level_rate is not None and rate < self._last_level_rate * (1 + self.gain):
+                # Extra connection didn't pay off: go back and stay there
+                self.fragments -= 1
+                self._hold = self.reprobe_windows
+                action = "revert"
+            else:
+                self._last_level_rate = rate
+                action = "keep"
+        elif self._hold > 0:
+            self._hold -= 1
+            self._stable += 1
+            if self._stable % 2 == 0 and self.chunk_size < self.max_chunk:
+                self.chunk_size = min(self.max_chunk, self.chunk_size * 2)
+                action = "grow_chunk"
+        else:
+            self._stable = 0
+            if self.fragments < min(self._ceiling, self.max_fragments):
+                self._last_level_rate = rate
+                self.fragments += 1
+                self._probing = True
+                action = "probe"
+            else:
+                self._hold = self.reprobe_windows
+
+        self.history.append({"rate": rate, "fragments": self.fragments, "chunk_size": self.chunk_size,
+                             "action": action, "errors": errors})
+        changed = (self.fragments, self.chunk_size) != before
+        if changed:
+            logging.debug(f"Transfer tuner: {action} -> {self.fragments} fragments, "
+                          f"{self.chunk_size // (1024 * 1024)} MB chunks ({rate / 1024 / 1024:.2f} MB/s)")
+        return changed
+
+
+class TunerLogger:
+    """yt-dlp 'logger' that forwards to logging and reports transport errors to a tuner."""
+
+    def __init__(self, tuner: TransferTuner):
+        self.tuner = tuner
+
+    def _check(self, msg):
+        kind = classify_error(msg)
+        if kind:
+            self.tuner.record_error(kind)
+
+    def debug(self, msg):
+        # yt-dlp routes retry notices ("Got error: HTTP Error 429 ... Retrying") through to_screen -> debug
+        self._check(msg)
+        logging.debug(msg)
+
+    def info(self, msg):
+        logging.info(msg)
+
+    def warning(self, msg):
+        self._check(msg)
+        logging.warning(msg)
+
+    def error(self, msg):
+        self._check(msg)
+        logging.error(msg)
+
+
+# Shared by every download in the process (they share the same link)
+transfer_tuner = TransferTuner()
@@ -2,6 +2,27 @@
 from typing import Optional
 import shutil
 import os
+import re
+import sys
+
+def resource_path(relative_path):
+    """ Get absolute path to resource, works for dev and for PyInstaller bundle """
+    try:
+        # PyInstaller creates a temp folder and stores path in _MEIPASS
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.abspath(".")
+
+    return os.path.join(base_path, relative_path)
+
+def safe_folder_name(title: str, default: str = "Playlist") -> str:
+    """Sanitize a title into a folder name (invalid filesystem characters + Windows reserved names)."""
+    safe_title = re.sub(r'[<>:"/\\|?*]', '_', title or '')[:100].strip()
+    # Handle Windows reserved names (CON, PRN, AUX, NUL, COM1-9, LPT1-9)
+    reserved_names = {'CON', 'PRN', 'AUX', 'NUL'} | {f'COM{i}' for i in range(1, 10)} | {f'LPT{i}' for i in range(1, 10)}
+    if safe_title.upper() in reserved_names or not safe_title:
+        return default
+    return safe_title
 
 def parse_time_to_seconds(time_str: str) -> Optional[int]:
     """Parse time string (HH:MM:SS, MM:SS, or SS) to seconds. Returns None on invalid input."""
@@ -27,6 +48,14 @@ def format_eta(seconds: Optional[int]) -> str:
     hours, minutes = divmod(minutes, 60)
     return "{:02}:{:02}:{:02}".format(int(hours), int(minutes), int(seconds))
 
+def format_timestamp(seconds: float) -> str:
+    """Position in a video with hundredths, e.g. 1:02.48 or 1:00:05.00 (for cut points)."""
+    minutes, seconds = divmod(max(0.0, round(seconds, 2)), 60)
+    hours, minutes = divmod(int(minutes), 60)
+    if hours:
+        return "{}:{:02}:{:05.2f}".format(hours, minutes, seconds)
+    return "{}:{:05.2f}".format(minutes, seconds)
+
 def get_free_disk_space_gb(path: str) -> float:
     """Get free disk space in GB for the given path."""
     try:
@@ -47,3 +76,14 @@ def format_bytes(size_bytes: int) -> str:
         return f"{size_bytes / (1024 ** 2):.1f} MB"
     else:
         return f"{size_bytes / (1024 ** 3):.2f} GB"
+
+_BYTE_UNITS = {'': 1, 'B': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+def parse_bytes(text) -> Optional[int]:
+    """Parse a size/rate like '500K', '5M', '1.5MiB' or '2097152' (binary units). Returns None on invalid or empty input."""
+    if isinstance(text, (int, float)):
+        return int(text) if text >= 0 else None
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([kmgtb]?)(?:i?b)?(?:/s)?\s*', text or '', re.I)
+    if not match:
+        return None
+    return int(float(match.group(1)) * _BYTE_UNITS[match.group(2).upper()])
@@ -1,6 +1,15 @@
-from gui.main_window import YikesApp
-import customtkinter as ctk
+import multiprocessing
+
+from logic.profiling import startup_profiler  # First: its creation time is the start of the startup profile
 
 if __name__ == "__main__":
-    app = YikesApp()
+    # Download processes (logic/process_worker.py) are spawned: they must not import the GUI,
+    # and frozen builds route them through here
+    multiprocessing.freeze_support()
+    with startup_profiler.phase("import gui"):
+        from gui.main_window import YikesApp
+        import customtkinter as ctk
+
+    with startup_profiler.phase("window"):
+        app = YikesApp()
     app.mainloop()
@@ -0,0 +1,98 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.archive import DownloadArchive, archive_keys
+from logic.downloader import download_worker
+from logic.playlist import PlaylistEngine
+
+
+class TestDownloadArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.archive = DownloadArchive(os.path.join(self.tmp, "test.db"))
+
+    def tearDown(self):
+        self.archive.close()
+        shutil.rmtree(self.tmp)
+
+    def make_file(self, name, size=1000):
+        path = os.path.join(self.tmp, name)
+        with open(path, "wb") as f:
+            f.write(b"\0" * size)
+        return path
+
+    def test_keys_from_url_and_info(self):
+        self.assertEqual(archive_keys("https://youtu.be/abcdefghijk"), [("youtube", "abcdefghijk")])
+        # yt-dlp's identity comes first; the YouTube URL maps to the same pair
+        self.assertEqual(archive_keys("https://www.youtube.com/watch?v=abcdefghijk",
+                                      {"extractor_key": "Youtube", "id": "abcdefghijk"}), [("youtube", "abcdefghijk")])
+        self.assertEqual(archive_keys("https://example.com/v.mp4#t=3", {"extractor_key": "Generic", "id": "v"}),
+                         [("generic", "v"), ("url", "https://example.com/v.mp4")])
+        self.assertEqual(archive_keys("https://www.youtube.com/playlist?list=PL123"), [])
+
+    def test_lookup_across_urls_and_formats(self):
+        path = self.make_file("a.mp4", 4096)
+        self.archive.add("https://www.youtube.com/watch?v=abcdefghijk&list=PL1", "1080p", path, {"title": "A"})
+
+        hit = self.archive.lookup("https://youtu.be/abcdefghijk", "1080p")
+        self.assertEqual((hit["path"], hit["bytes"], hit["title"]), (path, 4096, "A"))
+        self.assertIsNone(self.archive.lookup("https://youtu.be/abcdefghijk", "mp3_320"))
+        self.assertIsNone(self.archive.lookup("https://youtu.be/zzzzzzzzzzz", "1080p"))
+
+    def test_generic_download_hits_by_url_before_extraction(self):
+        path = self.make_file("v.mp4")
+        self.archive.add("https://example.com/v.mp4", "best", path, {"extractor_key": "Generic", "id": "v"})
+        self.assertIsNotNone(self.archive.lookup("https://example.com/v.mp4", "best"))
+
+    def test_missing_file_is_forgotten(self):
+        path = self.make_file("gone.mp4")
+        self.archive.add("https://youtu.be/abcdefghijk", "720p", path)
+        os.remove(path)
+        self.assertIsNone(self.archive.lookup("https://youtu.be/abcdefghijk", "720p"))
+        self.assertEqual(self.archive.count(), 0)
+
+    def test_forget(self):
+        path = self.make_file("a.mp4")
+        self.archive.add("https://youtu.be/abcdefghijk", "720p", path)
+        self.archive.add("https://youtu.be/abcdefghijk", "480p", path)
+        self.archive.forget("https://youtu.be/abcdefghijk", "720p")
+        self.assertEqual(self.archive.count(), 1)
+        self.archive.forget("https://youtu.be/abcdefghijk")
+        self.assertEqual(self.archive.count(), 0)
+
+    def test_worker_skips_archived_video_without_extraction(self):
+        path = self.make_file("a.mp4", 2048)
+        scope = self.archive.scope("720p")
+        scope.add("https://youtu.be/abcdefghijk", path)
+        events, done, errors = [], [], []
+        download_worker("https://www.youtube.com/watch?v=abcdefghijk", {}, events.append, lambda: done.append(True),
+                        errors.append, archive=scope)
+        self.assertEqual(events, [{'status': 'skipped', 'filename': path, 'total_bytes': 2048}])
+        self.assertEqual((done, errors), ([True], []))
+
+    def test_playlist_counts_skips_and_saved_bytes(self):
+        scope = self.archive.scope("720p")
+        entries = []
+        for i in range(3):
+            url = f"https://youtu.be/video{i:06d}"
+            scope.add(url, self.make_file(f"{i}.mp4", 1000))
+            entries.append({"url": url, "title": f"Video {i}"})
+        summaries, statuses = [], {}
+
+        engine = PlaylistEngine(entries, {}, concurrency=2, archive=scope,
+                                row_status=lambda i, text, state: statuses.__setitem__(i, text),
+                                summary_callback=lambda *args, **kwargs: summaries.append(kwargs))
+        self.assertEqual(engine.run(), (3, 0))
+        self.assertEqual((engine.skipped, engine.saved_bytes), (3, 3000))
+        self.assertEqual(summaries[-1], {"skipped": 3, "saved_bytes": 3000})
+        self.assertEqual(set(statuses.values()), {"✔ Already downloaded"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.bandwidth import BandwidthScheduler, fair_shares, MIN_RATE, PRIORITY_HIGH
+
+MB = 1024 * 1024
+
+
+class TestFairShares(unittest.TestCase):
+    def test_equal_and_weighted(self):
+        jobs = [{"key": "a", "weight": 1, "demand": None}, {"key": "b", "weight": 1, "demand": None}]
+        self.assertEqual(fair_shares(100, jobs), {"a": 50, "b": 50})
+        jobs[0]["weight"] = 3
+        self.assertEqual(fair_shares(100, jobs), {"a": 75, "b": 25})
+
+    def test_unused_share_is_redistributed(self):
+        jobs = [{"key": "slow", "weight": 1, "demand": 10},
+                {"key": "a", "weight": 1, "demand": None},
+                {"key": "b", "weight": 1, "demand": None}]
+        self.assertEqual(fair_shares(100, jobs), {"slow": 10, "a": 45, "b": 45})
+
+
+class TestBandwidthScheduler(unittest.TestCase):
+    def run_jobs(self, scheduler, leases, seconds, block=16 * 1024, delays=None):
+        received = [0] * len(leases)
+        stop = time.monotonic() + seconds
+
+        def pump(i):
+            while time.monotonic() < stop:
+                leases[i].consume(block)
+                received[i] += block
+                if delays and delays[i]:
+                    time.sleep(delays[i])
+
+        threads = [threading.Thread(target=pump, args=(i,)) for i in range(len(leases))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return received
+
+    def test_global_cap_holds_across_jobs(self):
+        scheduler = BandwidthScheduler(cap=1 * MB, interval=0.2)
+        leases = [scheduler.register(f"job{i}") for i in range(3)]
+        began = time.monotonic()
+        received = self.run_jobs(scheduler, leases, seconds=1.5)
+        elapsed = time.monotonic() - began
+        # Cap for the duration plus the initial burst and one block per job in flight
+        self.assertLessEqual(sum(received), 1 * MB * elapsed + 0.5 * MB + 3 * 16 * 1024)
+        self.assertGreater(sum(received), 0.7 * MB * elapsed)
+        for lease in leases:
+            lease.close()
+        self.assertEqual(scheduler.stats()["jobs"], [])
+
+    def test_allocations_follow_priority_and_reach_live_params(self):
+        scheduler = BandwidthScheduler(cap=3 * MB)
+        params = [{}, {}]
+        fast = scheduler.register("fast", priority=PRIORITY_HIGH)
+        slow = scheduler.register("slow")
+        fast.attach(params[0])
+        slow.attach(params[1])
+        self.assertEqual(params[0]["ratelimit"], 2 * MB)
+        self.assertEqual(params[1]["ratelimit"], 1 * MB)
+
+        # Cap changes apply to running jobs; 0 lifts the limit
+        scheduler.set_cap(6 * MB)
+        self.assertEqual(params[1]["ratelimit"], 2 * MB)
+        scheduler.set_cap(0)
+        self.assertIsNone(params[0]["ratelimit"])
+        began = time.monotonic()
+        slow.consume(100 * MB)
+        self.assertLess(time.monotonic() - began, 0.1)
+
+        slow.close()
+        scheduler.set_cap(6 * MB)
+        self.assertEqual(params[0]["ratelimit"], 6 * MB)
+        self.assertEqual(params[1], {"ratelimit": None})  # Closed leases no longer touch params
+
+    def test_source_limited_job_does_not_hold_back_others(self):
+        scheduler = BandwidthScheduler(cap=2 * MB, interval=0.2)
+        leases = [scheduler.register("trickle"), scheduler.register("a"), scheduler.register("b")]
+        # The first job can only pull ~160 KB/s from its origin
+        self.run_jobs(scheduler, leases, seconds=2.0, delays=[0.1, 0, 0])
+        stats = {job["label"]: job for job in scheduler.stats()["jobs"]}
+        self.assertLess(stats["trickle"]["allocated"], 0.5 * MB)
+        self.assertGreater(stats["a"]["allocated"], 0.8 * MB)
+        self.assertGreater(stats["a"]["achieved"], 0.6 * MB)
+
+    def test_observe_counts_per_file_and_reports_allocation(self):
+        scheduler = BandwidthScheduler(cap=0)
+        lease = scheduler.register("job")
+        lease.observe({'status': 'downloading', 'tmpfilename': 'v.part', 'downloaded_bytes': 1000})
+        lease.observe({'status': 'downloading', 'tmpfilename': 'v.part', 'downloaded_bytes': 1500})
+        lease.observe({'status': 'downloading', 'tmpfilename': 'a.part', 'downloaded_bytes': 200})
+        self.assertEqual(lease._window_bytes, 1700)
+
+        scheduler.set_cap(1 * MB)
+        d = {'status': 'downloading', 'tmpfilename': 'a.part', 'downloaded_bytes': 200}
+        lease.observe(d)
+        self.assertEqual(d['_allocated_rate'], 1 * MB)
+        lease.close()
+        lease.close()
+
+    def test_cancel_stops_waiting(self):
+        scheduler = BandwidthScheduler(cap=MIN_RATE)
+        lease = scheduler.register("job")
+        began = time.monotonic()
+        lease.consume(10 * MB, cancelled=lambda: time.monotonic() - began > 0.3)
+        self.assertLess(time.monotonic() - began, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import sys
+import os
+import http.client
+import unittest
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.media_server import MediaServer, HLS, DASH, synthetic_bytes
+from benchmarks.compare import compare
+
+
+def fetch(url):
+    with urllib.request.urlopen(url, timeout=5) as resp:
+        return resp.read()
+
+
+class TestMediaServer(unittest.TestCase):
+    def test_hls_segments_add_up_to_media(self):
+        size = 100_003
+        with MediaServer() as server:
+            url = server.url("clip", size, kind=HLS, segments=7)
+            playlist = fetch(url).decode()
+            segments = [line for line in playlist.splitlines() if line and not line.startswith('#')]
+            self.assertEqual(len(segments), 7)
+            self.assertIn("#EXT-X-ENDLIST", playlist)
+            base = url.rsplit('/', 1)[0]
+            body = b"".join(fetch(f"{base}/{s}") for s in segments)
+        self.assertEqual(body, synthetic_bytes(0, size))
+
+    def test_dash_manifest(self):
+        with MediaServer() as server:
+            url = server.url("clip", 64 * 1024, kind=DASH, segments=4)
+            root = ET.fromstring(fetch(url))
+            ns = {"mpd": "urn:mpeg:dash:schema:mpd:2011"}
+            media = [s.get("media") for s in root.iterfind(".//mpd:SegmentURL", ns)]
+            self.assertEqual(media, [f"seg{i}.m4s" for i in range(4)])
+            base = url.rsplit('/', 1)[0]
+            self.assertEqual(len(fetch(f"{base}/init.mp4")), 1024)
+            self.assertEqual(len(fetch(f"{base}/seg3.m4s")), 16 * 1024)
+            with self.assertRaises(urllib.error.HTTPError):
+                fetch(f"{base}/seg4.m4s")
+
+    def test_failure_injection_is_reproducible(self):
+        def outcomes(seed):
+            results = []
+            with MediaServer(fail_rate=0.3, drop_rate=0.3, seed=seed) as server:
+                for i in range(30):
+                    try:
+                        results.append(len(fetch(server.url(f"v{i}", 4096))))
+                    except urllib.error.HTTPError as e:
+                        results.append(e.code)
+                    except http.client.IncompleteRead:
+                        results.append("dropped")
+                stats = server.stats()
+            return results, stats
+
+        first, stats = outcomes(seed=1)
+        self.assertEqual(outcomes(seed=1)[0], first)
+        self.assertEqual(first.count(503), stats["failed"])
+        self.assertEqual(first.count("dropped"), stats["dropped"])
+        self.assertGreater(stats["failed"], 0)
+        self.assertGreater(stats["dropped"], 0)
+        self.assertIn(4096, first)
+
+
+class TestCompare(unittest.TestCase):
+    def test_regressions_follow_metric_direction(self):
+        base = {"opts": {"value": 100, "better": "lower"}, "speed": {"value": 10, "better": "higher"},
+                "gone": {"value": 1, "better": "lower"}}
+        head = {"opts": {"value": 105, "better": "lower"}, "speed": {"value": 8, "better": "higher"}}
+        rows = {name: regressed for name, _, _, _, regressed in compare(base, head, 0.10)}
+        self.assertEqual(rows, {"opts": False, "speed": True})
+
+
+if __name__ == '__main__':
+    unittest.main()
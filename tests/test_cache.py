@@ -0,0 +1,92 @@
+import sys
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.cache import MetadataCache, canonical_id, KIND_FULL, KIND_FLAT
+from logic import downloader
+
+
+class TestCanonicalId(unittest.TestCase):
+    def test_youtube_variants_share_a_key(self):
+        urls = [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42",
+            "https://youtu.be/dQw4w9WgXcQ?si=abc",
+            "https://m.youtube.com/shorts/dQw4w9WgXcQ",
+            "https://youtube.com/embed/dQw4w9WgXcQ",
+        ]
+        self.assertEqual({canonical_id(u) for u in urls}, {"youtube:dQw4w9WgXcQ"})
+
+    def test_playlist_key(self):
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PL123"
+        self.assertEqual(canonical_id(url, playlist=True), "youtube:playlist:PL123")
+        self.assertEqual(canonical_id(url), "youtube:dQw4w9WgXcQ")
+        self.assertEqual(canonical_id("https://www.youtube.com/playlist?list=PL123"), "youtube:playlist:PL123")
+
+    def test_generic_url(self):
+        self.assertEqual(canonical_id("https://vimeo.com/123#x"), "url:https://vimeo.com/123")
+
+
+class TestMetadataCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hit_and_miss_counters(self):
+        cache = MetadataCache(self.tmp.name)
+        self.assertIsNone(cache.get("youtube:a"))
+        cache.put("youtube:a", KIND_FULL, {"id": "a", "formats": []})
+        self.assertEqual(cache.get("youtube:a"), {"id": "a", "formats": []})
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_separate_ttl_per_kind(self):
+        cache = MetadataCache(self.tmp.name, ttls={KIND_FULL: 100, KIND_FLAT: 10})
+        cache.put("k", KIND_FULL, {"kind": "full"})
+        cache.put("k", KIND_FLAT, {"kind": "flat"})
+        later = time.time() + 50
+        with patch("logic.cache.time.time", return_value=later):
+            self.assertIsNone(cache.get("k", KIND_FLAT))
+            self.assertEqual(cache.get("k", KIND_FULL), {"kind": "full"})
+        self.assertEqual(cache.stats()["expired"], 1)
+
+    def test_lru_eviction_by_entries(self):
+        cache = MetadataCache(self.tmp.name, max_entries=2)
+        cache.put("a", KIND_FULL, {"v": 1})
+        cache.put("b", KIND_FULL, {"v": 2})
+        cache.get("a")  # 'b' is now least recently used
+        cache.put("c", KIND_FULL, {"v": 3})
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_size_cap(self):
+        cache = MetadataCache(self.tmp.name, max_bytes=1000)
+        for i in range(10):
+            cache.put(f"k{i}", KIND_FULL, {"blob": "x" * 300})
+        self.assertLessEqual(cache.stats()["bytes"], 1000)
+        self.assertIsNotNone(cache.get("k9"))
+
+    def test_persists_across_instances(self):
+        MetadataCache(self.tmp.name).put("youtube:a", KIND_FULL, {"id": "a"})
+        self.assertEqual(MetadataCache(self.tmp.name).get("youtube:a"), {"id": "a"})
+
+    def test_fetch_video_info_served_from_cache(self):
+        cache = MetadataCache(self.tmp.name)
+        cache.put("youtube:dQw4w9WgXcQ", KIND_FULL, {"id": "dQw4w9WgXcQ", "title": "Cached"})
+        with patch("logic.downloader.metadata_cache", cache), \
+             patch("logic.downloader.current_settings", {"cache_metadata": True}):
+            info = downloader.fetch_video_info("https://youtu.be/dQw4w9WgXcQ")
+        self.assertEqual(info["title"], "Cached")
+
+
+if __name__ == '__main__':
+    unittest.main()
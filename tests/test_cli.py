@@ -0,0 +1,95 @@
+import sys
+import os
+import io
+import json
+import subprocess
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import cli
+from logic.archive import DownloadArchive
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def fake_worker(url, opts, progress_cb, complete_cb, error_cb, cancel_cb=None, **kwargs):
+    for i in range(1, 11):
+        progress_cb({'status': 'downloading', 'downloaded_bytes': i, 'total_bytes': 10, '_content_type': 'Video'})
+    time.sleep(0.1)
+    if "bad" in url:
+        error_cb("Download Failed: not available")
+
+
+class TestHeadlessCli(unittest.TestCase):
+    def test_import_never_pulls_gui_stack(self):
+        code = ("import sys, logic.cli, logic.downloader; "
+                "print(sorted(m for m in ('tkinter', 'customtkinter', 'PIL', 'requests', 'yt_dlp', 'gui.main_window') "
+                "if m in sys.modules))")
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "[]")
+
+    def test_read_batch_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("# comment\nhttps://a\n\n  https://b  \n")
+        try:
+            self.assertEqual(cli.read_batch_file(f.name), ["https://a", "https://b"])
+        finally:
+            os.remove(f.name)
+
+    @patch("logic.cli.download_worker", fake_worker)
+    @patch("logic.cli.build_ydl_opts", lambda path, key, trim_range=None: {})
+    def test_json_events_and_exit_codes(self):
+        out = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp, patch("sys.stdout", out):
+            archive = DownloadArchive(os.path.join(tmp, "archive.db"))
+            with patch("logic.cli.download_archive", archive):
+                code = cli.main(["https://good", "https://bad", "-o", tmp, "-j", "2", "--progress-interval", "0.02"])
+            archive.close()
+        events = [json.loads(line) for line in out.getvalue().splitlines()]
+
+        self.assertEqual(code, cli.EXIT_FAILED)
+        summary = events[-1]
+        self.assertEqual(summary["event"], "summary")
+        self.assertEqual((summary["succeeded"], summary["failed"]), (1, 1))
+        self.assertEqual(summary["exit_codes"], {"0": 0, "1": 1})
+        progress = [e for e in events if e["event"] == "progress"]
+        self.assertTrue(progress)
+        # 20 ticks were coalesced into far fewer events
+        self.assertLess(len(progress), 20)
+        self.assertGreater(summary["progress"]["coalesced"], 0)
+        failed = [e for e in events if e["event"] == "failed"]
+        self.assertEqual(failed[0]["url"], "https://bad")
+        self.assertEqual((summary["skipped"], summary["saved_bytes"]), (0, 0))
+
+    @patch("logic.cli.build_ydl_opts", lambda path, key, trim_range=None: {})
+    def test_archived_jobs_are_skipped(self):
+        out = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp, patch("sys.stdout", out):
+            archive = DownloadArchive(os.path.join(tmp, "archive.db"))
+            have = os.path.join(tmp, "have.mp4")
+            with open(have, "wb") as f:
+                f.write(b"x" * 2048)
+            archive.add("https://www.youtube.com/watch?v=aaaaaaaaaaa", "720p", have)
+            with patch("logic.cli.download_archive", archive):
+                code = cli.main(["https://youtu.be/aaaaaaaaaaa", "-f", "720p", "-o", tmp])
+            archive.close()
+        events = [json.loads(line) for line in out.getvalue().splitlines()]
+
+        self.assertEqual(code, cli.EXIT_OK)
+        self.assertEqual([e["event"] for e in events], ["start", "skipped", "summary"])
+        self.assertEqual((events[-1]["skipped"], events[-1]["saved_bytes"]), (1, 2048))
+
+    def test_usage_error_without_urls(self):
+        with patch("sys.stderr", io.StringIO()):
+            with self.assertRaises(SystemExit) as ctx:
+                cli.main([])
+        self.assertEqual(ctx.exception.code, cli.EXIT_USAGE)
+
+
+if __name__ == '__main__':
+    unittest.main()
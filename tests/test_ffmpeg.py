@@ -0,0 +1,102 @@
+import sys
+import os
+import stat
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import settings
+from logic.ffmpeg import FFmpeg, FFmpegLocator, find_ffmpeg, SOURCE_SETTINGS
+
+# Stand-in for ffmpeg: logs each call, answers the listing options with real-format excerpts
+FAKE_FFMPEG = r"""#!/bin/sh
+echo "$@" >> "$(dirname "$0")/calls.log"
+case "$2" in
+  -version) echo "ffmpeg version 6.1.1-fake Copyright (c) 2000-2023" ;;
+  -encoders) printf 'Encoders:\n V..... = Video\n ------\n V....D libx264              libx264 H.264\n A....D aac                  AAC\n A....D libmp3lame           MP3\n' ;;
+  -muxers) printf 'File formats:\n D. = Demuxing supported\n .E = Muxing supported\n ---\n  E gif             CompuServe GIF\n  E mp4             MP4\n' ;;
+  -filters) printf 'Filters:\n  T.. = Timeline support\n  ... palettegen         V->V       Find the optimal palette.\n  T.. paletteuse        VV->V      Use a palette.\n' ;;
+  *) exit 1 ;;
+esac
+"""
+
+
+@unittest.skipUnless(os.name == "posix", "shell stand-in for ffmpeg")
+class TestFFmpeg(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = self.make_binary("ffmpeg")
+        self.caps_file = os.path.join(self.tmp.name, "cache", "ffmpeg.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_binary(self, name):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write(FAKE_FFMPEG)
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+        return path
+
+    def calls(self):
+        log = os.path.join(self.tmp.name, "calls.log")
+        if not os.path.exists(log):
+            return 0
+        with open(log) as f:
+            return len(f.readlines())
+
+    def test_capabilities_are_probed_once_and_cached_on_disk(self):
+        found = FFmpeg(self.path, caps_file=self.caps_file)
+        self.assertTrue(found.runnable)
+        self.assertEqual(found.version, "6.1.1-fake")
+        self.assertEqual(found.encoders, {"libx264", "aac", "libmp3lame"})
+        self.assertEqual(found.muxers, {"gif", "mp4"})
+        self.assertTrue(found.has_filter("palettegen") and found.has_filter("paletteuse"))
+        self.assertFalse(found.has_encoder("h264_nvenc"))
+        self.assertEqual(self.calls(), 4)
+
+        # Another process (a new descriptor) reads the cache instead of spawning
+        self.assertTrue(FFmpeg(self.path, caps_file=self.caps_file).has_muxer("mp4"))
+        self.assertEqual(self.calls(), 4)
+
+        # A changed binary is probed again
+        os.utime(self.path, (1, 1))
+        self.assertTrue(FFmpeg(self.path, caps_file=self.caps_file).runnable)
+        self.assertEqual(self.calls(), 8)
+
+    def test_ffprobe_next_to_ffmpeg(self):
+        probe = self.make_binary("ffprobe")
+        self.assertEqual(FFmpeg(self.path, caps_file=None).ffprobe, probe)
+
+    def test_broken_binary_is_not_runnable(self):
+        with open(self.path, "w") as f:
+            f.write("#!/bin/sh\nexit 3\n")
+        found = FFmpeg(self.path, caps_file=self.caps_file)
+        self.assertFalse(found.runnable)
+        self.assertEqual(found.encoders, frozenset())
+        self.assertFalse(os.path.exists(self.caps_file))  # Failures are not cached
+
+    def test_setting_wins_and_locator_memoizes_until_settings_saved(self):
+        with patch.dict(settings.current_settings, {"ffmpeg_path": self.path}):
+            self.assertEqual((find_ffmpeg().path, find_ffmpeg().source), (self.path, SOURCE_SETTINGS))
+
+        locator = FFmpegLocator(find=lambda: FFmpeg(self.path, caps_file=None))
+        first = locator.get()
+        self.assertIs(locator.get(), first)
+        self.assertEqual(locator.resolved, 1)
+
+        settings.on_settings_saved(locator.invalidate)
+        try:
+            with patch("logic.settings.SETTINGS_FILE", os.path.join(self.tmp.name, "settings.json")):
+                settings.save_settings({"ffmpeg_path": self.path})
+            self.assertIsNot(locator.get(), first)
+            self.assertEqual(locator.resolved, 2)
+        finally:
+            settings._save_listeners.remove(locator.invalidate)
+
+
+if __name__ == '__main__':
+    unittest.main()
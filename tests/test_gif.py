@@ -0,0 +1,140 @@
+import sys
+import os
+import json
+import stat
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.ffmpeg import FFmpeg
+from logic.gif import gif_command, make_gif, gif_postprocessor, source_format
+from logic.postprocess import run_postprocessors, GIF_POSTPROCESSOR
+from logic.downloader import build_ydl_opts, TrimRange
+from logic.trim import TRIM_FAST
+
+# Stand-in for ffmpeg: logs its arguments and writes a GIF header sized like the real thing would scale,
+# width (capped at a 640 px source) squared times fps
+FAKE_FFMPEG = f"""#!{sys.executable}
+import os, re, struct, sys
+args = sys.argv[1:]
+with open(os.path.join(os.path.dirname(sys.argv[0]), "calls.log"), "a") as f:
+    f.write(" ".join(args) + "\\n")
+graph = args[args.index("-vf") + 1]
+width = min(int(re.search(r"min\\((\\d+),iw\\)", graph).group(1)), 640)
+fps = int(re.search(r"fps=(\\d+)", graph).group(1))
+with open(args[-1], "wb") as f:
+    f.write(b"GIF89a" + struct.pack("<HH", width, width * 9 // 16) + bytes(width * width * fps // 10))
+"""
+FAKE_FFPROBE = "#!/bin/sh\ncat \"$(dirname \"$0\")/probe.json\"\n"
+
+# A section yt-dlp stream-copied for 101.5..107.3 s into mp4: the pre-roll from the keyframe at 100 s is at negative times
+SECTION_PROBE = {
+    "streams": [{"index": 0, "codec_type": "video", "codec_name": "h264", "time_base": "1/15360"}],
+    "format": {"start_time": "0.000000", "duration": "5.800000"},
+    "packets": [{"stream_index": 0, "pts_time": f"{i / 10 - 1.5:.6f}", "flags": "K__" if i == 0 else "___"}
+                for i in range(73)],
+}
+
+
+class TestGifCommand(unittest.TestCase):
+    def test_range_fps_and_scale_come_first(self):
+        cmd = gif_command("ffmpeg", "in.mp4", "out.gif", 480, 12, seek=3.25, duration=5.5)
+        self.assertLess(cmd.index("-ss"), cmd.index("-i"))
+        self.assertLess(cmd.index("-t"), cmd.index("-i"))
+        self.assertEqual(cmd[cmd.index("-t") + 1], "5.500000")
+        graph = cmd[cmd.index("-vf") + 1]
+        self.assertTrue(graph.startswith("fps=12,scale='min(480,iw)':-1"))
+        self.assertLess(graph.index("palettegen"), graph.index("paletteuse"))
+        self.assertIn("-an", cmd)
+
+        cmd = gif_command("ffmpeg", "in.mp4", "out.gif", 320, 10, palette=False)
+        self.assertNotIn("-ss", cmd)
+        self.assertNotIn("-t", cmd)
+        self.assertNotIn("palettegen", cmd[cmd.index("-vf") + 1])
+
+    def test_build_ydl_opts(self):
+        with patch.dict("logic.downloader.current_settings", {"gif_width": 720, "gif_fps": 15, "gif_max_mb": 5}):
+            opts = build_ydl_opts(".", "gif", trim_range=(10, 20))
+        pp = opts['postprocessors'][0]
+        self.assertEqual((pp['key'], pp['width'], pp['fps'], pp['max_bytes'], pp['section']),
+                         (GIF_POSTPROCESSOR, 720, 15, 5 * 1024 * 1024, [10.0, 20.0]))
+        # Only the range is fetched, stream-copied: the GIF is cut exactly while it is converted
+        self.assertIsInstance(opts['download_ranges'], TrimRange)
+        self.assertEqual(opts['download_ranges'].mode, TRIM_FAST)
+        self.assertNotIn('force_keyframes_at_cuts', opts)
+        self.assertTrue(opts['format'].startswith("bestvideo[height<=480]"))
+        self.assertTrue(source_format(1920).startswith("bestvideo[height<=1080]"))
+        self.assertIsNone(gif_postprocessor(max_mb=0)['max_bytes'])
+
+
+@unittest.skipUnless(os.name == "posix", "script stand-ins for ffmpeg/ffprobe")
+class TestMakeGif(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        for name, script in (("ffmpeg", FAKE_FFMPEG), ("ffprobe", FAKE_FFPROBE)):
+            path = os.path.join(self.tmp.name, name)
+            with open(path, "w") as f:
+                f.write(script)
+            os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+        with open(os.path.join(self.tmp.name, "probe.json"), "w") as f:
+            json.dump(SECTION_PROBE, f)
+        self.ff = FFmpeg(os.path.join(self.tmp.name, "ffmpeg"), caps_file=None)
+        self.ff._caps = {"runnable": True, "encoders": frozenset(), "muxers": frozenset({"gif"}),
+                         "filters": frozenset({"palettegen", "paletteuse"})}
+        self.source = os.path.join(self.tmp.name, "clip.mp4")
+        with open(self.source, "w") as f:
+            f.write("video")
+        self.output = os.path.join(self.tmp.name, "clip.gif")
+
+    def calls(self):
+        with open(os.path.join(self.tmp.name, "calls.log")) as f:
+            return f.read().splitlines()
+
+    def test_fits_budget_in_one_go(self):
+        report = make_gif(self.ff, self.source, self.output, 480, 12, max_bytes=10 ** 6)
+        self.assertEqual((report["width"], report["fps"], report["attempts"]), (480, 12, 1))
+        self.assertEqual(report["bytes"], os.path.getsize(self.output))
+        self.assertTrue(report["within_budget"])
+        self.assertEqual(os.listdir(self.tmp.name).count("clip.gif.part"), 0)
+
+    def test_over_budget_is_redone_smaller(self):
+        report = make_gif(self.ff, self.source, self.output, 480, 12, max_bytes=200000)
+        self.assertEqual(report["attempts"], 2)
+        self.assertLess(report["width"], 480)
+        self.assertLessEqual(report["bytes"], 200000)
+        self.assertTrue(report["within_budget"])
+
+    def test_gives_up_at_the_floors(self):
+        report = make_gif(self.ff, self.source, self.output, 480, 12, max_bytes=1000)
+        self.assertEqual((report["width"], report["fps"]), (160, 6))
+        self.assertFalse(report["within_budget"])
+        self.assertTrue(os.path.exists(self.output))  # Still delivered
+
+    def test_never_wider_than_the_source(self):
+        report = make_gif(self.ff, self.source, self.output, 800, 12)
+        self.assertEqual(report["width"], 640)
+
+    def test_section_is_cut_from_file_start(self):
+        # The edit list hides the pre-roll, so the clip's time 0 is the requested start: no seek, just the length
+        report = make_gif(self.ff, self.source, self.output, 480, 12, section=(101.5, 107.3))
+        call = self.calls()[0]
+        self.assertNotIn("-ss", call)
+        self.assertIn("-t 5.800000", call)
+        self.assertEqual(report["section"], [101.5, 107.3])
+
+    def test_run_postprocessors_reports(self):
+        reports = []
+        outputs = run_postprocessors(self.ff.path, [self.source], [gif_postprocessor(320, 10, 0)],
+                                     on_report=lambda path, report: reports.append((path, report)))
+        self.assertEqual(outputs, [self.output])
+        self.assertFalse(os.path.exists(self.source))
+        self.assertEqual(reports[0][0], self.output)
+        self.assertEqual((reports[0][1]["width"], reports[0][1]["fps"]), (320, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import time
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.history_store import HistoryStore, fts_query
+
+
+def entry(n, **extra):
+    return {"title": f"Video {n}", "url": f"https://www.youtube.com/watch?v=vid{n:08d}",
+            "uploader": "Channel", "type": "video", "date": "2024-01-01 12:00", **extra}
+
+
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.legacy = os.path.join(self.tmp, "history.json")
+        self.store = HistoryStore(os.path.join(self.tmp, "test.db"), legacy_file=self.legacy)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp)
+
+    def test_no_cap_and_keyset_pages(self):
+        self.store.append_many(entry(i) for i in range(120))
+        self.assertEqual(self.store.count(), 120)
+
+        first = self.store.page(50)
+        self.assertEqual(first[0]["title"], "Video 119")
+        second = self.store.page(50, before_id=first[-1]["id"])
+        third = self.store.page(50, before_id=second[-1]["id"])
+        self.assertEqual(second[0]["title"], "Video 69")
+        self.assertEqual(len(third), 20)
+        self.assertEqual(third[-1]["title"], "Video 0")
+
+    def test_full_text_search(self):
+        self.store.append(entry(1, title="Lo-fi beats to study to", uploader="Chillhop"))
+        self.store.append(entry(2, title="Café jazz", uploader="Night Owl"))
+        self.store.append(entry(3, title="Metal compilation", uploader="Studio Records"))
+
+        self.assertEqual([e["title"] for e in self.store.search("stud")],
+                         ["Metal compilation", "Lo-fi beats to study to"])
+        self.assertEqual([e["title"] for e in self.store.search("cafe")], ["Café jazz"])
+        self.assertEqual([e["title"] for e in self.store.search("night jazz")], ["Café jazz"])
+        # Query syntax characters are treated as text
+        self.assertEqual(self.store.search('"OR ('), [])
+
+    def test_lookup_by_url_video_id_and_date(self):
+        self.store.append(entry(7, ts=1000.0))
+        self.store.append(entry(7, ts=2000.0))
+        self.assertEqual(len(self.store.by_url(entry(7)["url"])), 2)
+        self.assertEqual(len(self.store.by_video_id("youtube:vid00000007")), 2)
+        self.assertEqual([e["ts"] for e in self.store.between(1500, 2500)], [2000.0])
+
+    def test_clear(self):
+        self.store.append(entry(1))
+        self.store.clear()
+        self.assertEqual(self.store.count(), 0)
+        self.assertEqual(self.store.search("video"), [])
+
+    def test_migrates_legacy_json_newest_first(self):
+        with open(self.legacy, "w") as f:
+            json.dump([entry(2), entry(1)], f)
+        self.assertEqual([e["title"] for e in self.store.page()], ["Video 2", "Video 1"])
+        self.assertTrue(os.path.exists(self.legacy + ".migrated"))
+
+    def test_fts_query_escaping(self):
+        self.assertEqual(fts_query('foo "bar'), '"foo" "bar"*')
+        self.assertEqual(fts_query("  "), "")
+
+    def test_page_cost_independent_of_size(self):
+        def timed_reads():
+            start = time.perf_counter()
+            for _ in range(20):
+                self.store.page(50)
+                self.store.search("video 5")
+            return time.perf_counter() - start
+
+        self.store.append_many(entry(i) for i in range(200))
+        small = timed_reads()
+        self.store.append_many(entry(i) for i in range(200, 30000))
+        large = timed_reads()
+        self.store.append(entry(-1))
+        self.assertEqual(self.store.count(), 30001)
+        self.assertLess(large, max(small * 5, 0.2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import sys
+import os
+import importlib.util
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.journal import JobJournal, CANCELLED, PENDING
+from logic.playlist import PlaylistEngine
+from logic.downloader import build_ydl_opts
+from benchmarks.media_server import MediaServer
+
+
+class TestJobJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.out = os.path.join(self.tmp, "out")
+        os.makedirs(self.out)
+        self.journal = JobJournal(os.path.join(self.tmp, "test.db"))
+
+    def tearDown(self):
+        self.journal.close()
+        shutil.rmtree(self.tmp)
+
+    def touch(self, name, age=3600, size=10):
+        path = os.path.join(self.out, name)
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+        os.utime(path, (time.time() - age, time.time() - age))
+        return path
+
+    def make_job(self, n=3):
+        items = [{"url": f"https://v/{i}", "title": f"T{i}"} for i in range(n)]
+        return self.journal.create_job("playlist", "https://p", "720p", self.out, items, title="P",
+                                       options={"trim_range": None})
+
+    def test_resume_skips_completed_items(self):
+        job = self.make_job()
+        self.journal.item_started(job, 0)
+        self.journal.item_finished(job, 0, True)
+        self.journal.item_started(job, 1)
+        self.journal.item_phase(job, 1, "downloading", os.path.join(self.out, "T1.mp4.part"))
+        # Crash here: item 1 left running, item 2 never started
+
+        # Next launch
+        self.journal = JobJournal(self.journal.db.path)
+        jobs = self.journal.unfinished_jobs()
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual((jobs[0]["format_key"], jobs[0]["path"]), ("720p", self.out))
+        self.assertEqual([i["idx"] for i in jobs[0]["items"]], [1, 2])
+        self.assertEqual(jobs[0]["items"][0]["phases"], ["downloading"])
+
+    def test_job_closes_when_items_finish(self):
+        job = self.make_job(2)
+        self.journal.item_finished(job, 0, True)
+        self.journal.item_finished(job, 1, False, "Download Failed: 403")
+        self.journal.finish_job(job)
+        self.assertEqual(self.journal.unfinished_jobs(), [])
+
+    def test_cancelled_items_stay_resumable_until_job_cancelled(self):
+        job = self.make_job(1)
+        self.journal.item_finished(job, 0, False, "Cancelled")
+        self.journal.finish_job(job)
+        self.assertEqual(len(self.journal.unfinished_jobs()), 1)
+        self.journal.finish_job(job, CANCELLED)
+        self.assertEqual(self.journal.unfinished_jobs(), [])
+
+    def test_collect_orphans_keeps_claimed_files(self):
+        job = self.make_job(2)
+        claimed = self.touch("T0.f137.mp4.part")
+        self.journal.item_phase(job, 0, "downloading", claimed)
+        claimed_frag = self.touch("T0.f137.mp4.part-Frag3.part")
+        done_part = self.touch("T1.mp4.part")
+        self.journal.item_phase(job, 1, "downloading", done_part)
+        self.journal.item_finished(job, 1, True)
+        stray_frag = self.touch("Other.mp4.part-Frag1")
+        browser_part = self.touch("setup.exe.part")
+        fresh_frag = self.touch("New.mp4.ytdl", age=0)
+
+        count, size = self.journal.collect_orphans()
+        self.assertEqual((count, size), (2, 20))
+        self.assertTrue(os.path.exists(claimed))
+        self.assertTrue(os.path.exists(claimed_frag))
+        self.assertTrue(os.path.exists(browser_part))
+        self.assertTrue(os.path.exists(fresh_frag))
+        self.assertFalse(os.path.exists(done_part))
+        self.assertFalse(os.path.exists(stray_frag))
+
+    def test_discard_job_removes_its_partials(self):
+        job = self.make_job(1)
+        part = self.touch("T0.mp4.part", age=0)
+        self.journal.item_phase(job, 0, "downloading", part)
+        self.assertEqual(self.journal.discard_job(job), (1, 10))
+        self.assertFalse(os.path.exists(part))
+        self.assertEqual(self.journal.unfinished_jobs(), [])
+
+    def test_prune_forgets_old_closed_jobs(self):
+        old = self.make_job(1)
+        self.journal.finish_job(old, CANCELLED)
+        self.make_job(1)
+        self.assertEqual(self.journal.prune(older_than=-1), 1)
+        self.assertEqual(len(self.journal.unfinished_jobs()), 1)
+
+    def test_engine_records_through_recorder(self):
+        job = self.make_job(3)
+        entries = [{"url": f"https://v/{i}"} for i in (1, 2)]
+
+        def worker(url, opts, progress_cb, complete_cb, error_cb, cancel_cb=None, phase_callback=None):
+            phase_callback("downloading", os.path.join(self.out, url[-1] + ".mp4.part"))
+            if url.endswith("2"):
+                error_cb("Cancelled")
+
+        # Resuming items 1 and 2 of the job
+        PlaylistEngine(entries, {}, worker=worker, journal=self.journal.recorder(job, [1, 2])).run()
+        items = {i["idx"]: i for i in self.journal.unfinished_jobs()[0]["items"]}
+        self.assertEqual(sorted(items), [0, 2])
+        self.assertEqual(items[2]["files"], [os.path.join(self.out, "2.mp4.part")])
+
+
+    @unittest.skipUnless(importlib.util.find_spec("yt_dlp"), "yt-dlp not installed")
+    @patch.dict("logic.downloader.current_settings", {"export_metrics": False})
+    def test_items_interrupted_at_close_stay_resumable(self):
+        # The real download_worker, stopped mid-transfer the way closing the window stops it
+        with MediaServer(bandwidth=512 * 1024) as server:
+            items = [{"url": server.url(f"close{i}", 8 * 1024 * 1024), "title": f"T{i}"} for i in range(2)]
+            job = self.journal.create_job("playlist", "https://p", "best", self.out, items, title="P")
+            opts = build_ydl_opts(self.out, 'best')
+            opts.update({'quiet': True, 'no_warnings': True, 'noprogress': True})
+            closing, states = threading.Event(), {}
+            PlaylistEngine(items, opts, concurrency=2, cancel_callback=closing.is_set,
+                           row_progress=lambda index, p: p > 0 and closing.set(),
+                           row_status=lambda index, text, state: states.__setitem__(index, state),
+                           journal=self.journal.recorder(job)).run()
+        self.assertEqual(states, {0: 'cancelled', 1: 'cancelled'})
+        unfinished = self.journal.unfinished_jobs()
+        self.assertEqual([j["id"] for j in unfinished], [job])
+        self.assertEqual([i["status"] for i in unfinished[0]["items"]], [PENDING, PENDING])
+
+
+if __name__ == '__main__':
+    unittest.main()
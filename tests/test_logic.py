@@ -1,14 +1,19 @@
 
 import sys
 import os
+import importlib.util
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from logic.utils import parse_time_to_seconds, format_eta
-from logic.downloader import build_ydl_opts
+from logic.utils import parse_time_to_seconds, format_eta, parse_bytes
+from logic.downloader import build_ydl_opts, formats_expire_at, info_is_fresh, YDLPool, download_worker
+from benchmarks.media_server import MediaServer
 
 class TestUtils(unittest.TestCase):
     def test_parse_seconds(self):
@@ -22,6 +27,14 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(format_eta(65), "00:01:05")
         self.assertEqual(format_eta(None), "Unknown")
 
+    def test_parse_bytes(self):
+        self.assertEqual(parse_bytes("5M"), 5 * 1024 * 1024)
+        self.assertEqual(parse_bytes("500k"), 500 * 1024)
+        self.assertEqual(parse_bytes("1.5MiB"), 1536 * 1024)
+        self.assertEqual(parse_bytes("2097152"), 2097152)
+        self.assertIsNone(parse_bytes(""))
+        self.assertIsNone(parse_bytes("fast"))
+
 class TestDownloaderOpts(unittest.TestCase):
     
     @patch("logic.downloader.current_settings", {"download_path": "/tmp"})
@@ -47,13 +60,131 @@ class TestDownloaderOpts(unittest.TestCase):
     def test_format_parsing_gif(self):
         opts = build_ydl_opts("/tmp", "gif")
         pp = opts.get('postprocessors', [])
-        self.assertTrue(any(p['key'] == 'FFmpegVideoConvertor' and p['preferedformat'] == 'gif' for p in pp))
-        self.assertIn("height<=720", opts['format'])
+        self.assertEqual([p['key'] for p in pp], ['YikesGif'])
+        self.assertEqual((pp[0]['width'], pp[0]['fps'], pp[0]['section']), (480, 12, None))
+        self.assertTrue(opts['format'].startswith("bestvideo[height<=360]"))
 
     @patch("logic.downloader.current_settings", {"download_path": "/tmp"})
     def test_format_parsing_video_1080p(self):
         opts = build_ydl_opts("/tmp", "1080p")
         self.assertIn("height=1080", opts['format'])
 
+class TestInfoFreshness(unittest.TestCase):
+    def test_expire_from_query_and_manifest_path(self):
+        info = {'formats': [
+            {'url': 'https://rr1.googlevideo.com/videoplayback?expire=2000&itag=22'},
+            {'url': 'https://manifest.googlevideo.com/api/manifest/dash/expire/1500/ei/abc'},
+        ]}
+        self.assertEqual(formats_expire_at(info), 1500)
+
+    def test_fresh_and_stale_signed_urls(self):
+        now = int(time.time())
+        fresh = {'formats': [{'url': f'https://x/videoplayback?expire={now + 3600}'}]}
+        stale = {'formats': [{'url': f'https://x/videoplayback?expire={now + 60}'}]}
+        self.assertTrue(info_is_fresh(fresh))
+        self.assertFalse(info_is_fresh(stale))
+
+    def test_info_without_formats_needs_extraction(self):
+        # Flat playlist entries / reconstructed queue items
+        self.assertFalse(info_is_fresh({'title': 'x', 'webpage_url': 'https://youtu.be/x'}))
+        self.assertFalse(info_is_fresh(None))
+
+    def test_unsigned_formats_trusted_shortly_after_extraction(self):
+        info = {'formats': [{'url': 'https://cdn.example.com/v.mp4'}], 'epoch': int(time.time())}
+        self.assertTrue(info_is_fresh(info))
+        info['epoch'] -= 3600
+        self.assertFalse(info_is_fresh(info))
+
+class _FakeSlot:
+    def __init__(self, key, opts):
+        self.key = key
+        self.ydl = object()
+        self.closed = False
+        self.progress_hook = self.postprocessor_hook = None
+
+    def reset(self):
+        self.progress_hook = self.postprocessor_hook = None
+
+    def close(self):
+        self.closed = True
+
+
+@patch("logic.downloader._PooledYDL", _FakeSlot)
+class TestYDLPool(unittest.TestCase):
+    def test_reuses_instance_per_profile(self):
+        pool = YDLPool()
+        with pool.checkout({'quiet': True}) as first:
+            pass
+        with pool.checkout({'quiet': True}, progress_hook=print) as second:
+            pass
+        with pool.checkout({'quiet': True, 'extract_flat': True}) as third:
+            pass
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+        self.assertEqual(pool.stats(), {"created": 2, "reused": 1, "discarded": 0, "idle": 2})
+
+    def test_failed_checkout_is_discarded(self):
+        pool = YDLPool()
+        with self.assertRaises(RuntimeError):
+            with pool.checkout({'quiet': True}):
+                raise RuntimeError("boom")
+        self.assertEqual(pool.stats()["idle"], 0)
+        self.assertEqual(pool.stats()["discarded"], 1)
+
+    def test_callable_options_bypass_pool(self):
+        self.assertIsNone(YDLPool.profile_key({'download_ranges': lambda info, ydl: []}))
+        self.assertEqual(YDLPool.profile_key({'a': 1, 'progress_hooks': [print]}), YDLPool.profile_key({'a': 1}))
+
+    def test_idle_cap(self):
+        pool = YDLPool(max_idle=2)
+        for i in range(4):
+            with pool.checkout({'n': i}):
+                pass
+        self.assertEqual(pool.stats()["idle"], 2)
+
+@unittest.skipUnless(importlib.util.find_spec("yt_dlp"), "yt-dlp not installed")
+class TestDownloadCancel(unittest.TestCase):
+    @patch.dict("logic.downloader.current_settings", {"export_metrics": False})
+    def test_cancel_mid_transfer_is_reported_as_cancelled(self):
+        # A fresh extraction (no pre-extracted info), where 'ignoreerrors' used to turn the cancel into a failure
+        with MediaServer(bandwidth=512 * 1024) as server, tempfile.TemporaryDirectory() as tmp:
+            opts = build_ydl_opts(tmp, 'best')
+            opts.update({'quiet': True, 'no_warnings': True, 'noprogress': True})
+            cancel = threading.Event()
+            ticks, completed, errors = [], [], []
+
+            def on_progress(d):
+                ticks.append(d)
+                if len(ticks) >= 3:
+                    cancel.set()
+
+            download_worker(server.url("cancel", 8 * 1024 * 1024), opts, on_progress, lambda: completed.append(True),
+                            errors.append, cancel.is_set)
+        self.assertEqual(errors, ["Cancelled"])
+        self.assertEqual(completed, [])
+
+@unittest.skipUnless(importlib.util.find_spec("yt_dlp"), "yt-dlp not installed")
+class TestPreExtractedInfo(unittest.TestCase):
+    @patch.dict("logic.downloader.current_settings", {"export_metrics": False})
+    def test_broken_info_falls_back_to_re_extraction(self):
+        import yt_dlp
+        with MediaServer() as server, tempfile.TemporaryDirectory() as tmp:
+            url = server.url("stale", 256 * 1024)
+            with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True}) as ydl:
+                info = ydl.extract_info(url, download=False)
+            # What a Check step left behind once its format URLs stopped working
+            for f in info['formats']:
+                f['url'] = f"{server.base_url}/gone/{f.get('format_id')}.mp4"
+            info['url'] = info['formats'][-1]['url']
+            info['epoch'] = int(time.time())
+            opts = build_ydl_opts(tmp, 'best')
+            opts.update({'quiet': True, 'no_warnings': True, 'noprogress': True})
+            completed, errors = [], []
+            download_worker(url, opts, None, lambda: completed.append(True), errors.append, info=info)
+            files = os.listdir(tmp)
+        self.assertEqual(errors, [])
+        self.assertEqual(completed, [True])
+        self.assertEqual(len(files), 1)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,121 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.metrics import MetricsSink, JobTrace, TraceLogger, stream_kind
+
+VIDEO = {'vcodec': 'avc1', 'acodec': 'none'}
+AUDIO = {'vcodec': 'none', 'acodec': 'mp4a'}
+
+
+def run_download(trace):
+    """Feed a trace the hook sequence yt-dlp produces for a merged video+audio download."""
+    for name, info, total in (("v.f137.mp4", VIDEO, 3000), ("v.f140.m4a", AUDIO, 1000)):
+        for i, speed in enumerate((500.0, 2000.0, 1000.0), 1):
+            trace.progress_hook({'status': 'downloading', 'filename': name, 'info_dict': info,
+                                 'downloaded_bytes': total * i // 3, 'speed': speed})
+        trace.progress_hook({'status': 'finished', 'filename': name, 'info_dict': info, 'total_bytes': total})
+    for pp in ("Merger", "FFmpegMetadata", "MoveFiles"):
+        trace.postprocessor_hook({'status': 'started', 'postprocessor': pp})
+        trace.postprocessor_hook({'status': 'finished', 'postprocessor': pp})
+
+
+class TestJobTrace(unittest.TestCase):
+    def test_spans_bytes_and_throughput(self):
+        trace = JobTrace(1, "https://youtu.be/x")
+        run_download(trace)
+        record = trace.finish()
+
+        self.assertEqual([s["name"] for s in record["spans"]],
+                         ["extract", "download.video", "download.audio", "merge", "postprocess", "move"])
+        video = record["spans"][1]
+        self.assertEqual((video["bytes"], video["peak_bps"]), (3000, 2000))
+        self.assertEqual(record["bytes"], 4000)
+        self.assertEqual(record["result"], "ok")
+        self.assertEqual(record["spans"][4]["postprocessor"], "FFmpegMetadata")
+        self.assertIsNone(trace.finish())  # Only once
+
+    def test_failure_closes_open_spans_and_counts_retries(self):
+        trace = JobTrace(2, "https://youtu.be/y")
+        logger = TraceLogger(trace)
+        logger.debug("[download] Got error: HTTP Error 429: Too Many Requests. Retrying (1/15)...")
+        logger.warning("Retrying fragment 3 (2/15)...")
+        trace.progress_hook({'status': 'downloading', 'filename': "y.mp4", 'info_dict': {}, 'downloaded_bytes': 10})
+        completed, errors = [], []
+        complete, error = trace.wrap(lambda: completed.append(True), errors.append)
+        error("Download Failed: HTTP Error 403")
+
+        record = trace.record
+        self.assertEqual((record["result"], record["retries"], record["errors"]), ("failed", 2, {"throttled": 1}))
+        self.assertEqual(record["spans"][-1]["error"], "Download Failed: HTTP Error 403")
+        self.assertEqual(record["spans"][-1]["name"], "download.av")
+        self.assertEqual((completed, errors), ([], ["Download Failed: HTTP Error 403"]))
+
+    def test_logger_forwards_to_inner(self):
+        seen = []
+
+        class Inner:
+            def debug(self, msg): seen.append(("debug", msg))
+            def info(self, msg): seen.append(("info", msg))
+            def warning(self, msg): seen.append(("warning", msg))
+            def error(self, msg): seen.append(("error", msg))
+
+        params = {'logger': Inner()}
+        JobTrace(3, "u").attach(params)
+        params['logger'].warning("careful")
+        params['logger'].info("hello")
+        self.assertEqual(seen, [("warning", "careful"), ("info", "hello")])
+
+    def test_stream_kind(self):
+        self.assertEqual(stream_kind(VIDEO), "video")
+        self.assertEqual(stream_kind(AUDIO), "audio")
+        self.assertEqual(stream_kind({'vcodec': 'avc1', 'acodec': 'mp4a'}), "av")
+
+
+class TestMetricsSink(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.sink = MetricsSink(os.path.join(self.tmp, "metrics"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_exports_jsonl_and_prometheus_text(self):
+        ok = self.sink.trace("https://youtu.be/a")
+        run_download(ok)
+        ok.finish()
+        self.sink.trace("https://youtu.be/b").finish("Cancelled")
+
+        with open(self.sink.jsonl_path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([(r["job"], r["result"]) for r in records], [(1, "ok"), (2, "cancelled")])
+
+        with open(self.sink.prom_path, encoding='utf-8') as f:
+            prom = f.read()
+        self.assertIn('yikes_jobs_total{result="ok"} 1', prom)
+        self.assertIn('yikes_jobs_total{result="cancelled"} 1', prom)
+        self.assertIn('yikes_spans_total{span="extract"} 2', prom)
+        self.assertIn('yikes_span_failures_total{span="extract"} 1', prom)
+        self.assertIn('yikes_span_bytes_total{span="download.video"} 3000', prom)
+        self.assertIn('yikes_span_peak_bytes_per_second{span="download.audio"} 2000', prom)
+        self.assertIn("# TYPE yikes_retries_total counter", prom)
+        # The temp file of the atomic write is gone
+        self.assertEqual(sorted(os.listdir(self.sink.directory)), ["jobs.jsonl", "yikes.prom"])
+
+    def test_jsonl_rotation(self):
+        self.sink.max_bytes = 10
+        for _ in range(3):
+            self.sink.trace("https://youtu.be/c").finish()
+        self.assertTrue(os.path.exists(self.sink.jsonl_path + ".1"))
+        with open(self.sink.jsonl_path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
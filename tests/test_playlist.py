@@ -0,0 +1,141 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.playlist import PlaylistEngine, PlaylistRows, format_row_progress, visible_window
+
+
+def make_entries(n):
+    return [{'url': f"https://example.com/v{i}", 'title': f"Video {i}"} for i in range(n)]
+
+
+class TestPlaylistEngine(unittest.TestCase):
+    def test_runs_entries_in_parallel(self):
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def worker(url, opts, progress_cb, complete_cb, error_cb, cancel_cb=None):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.05)
+            with lock:
+                state['active'] -= 1
+
+        start = time.perf_counter()
+        ok, failed = PlaylistEngine(make_entries(8), {}, concurrency=4, worker=worker).run()
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual((ok, failed), (8, 0))
+        self.assertEqual(state['peak'], 4)
+        self.assertLess(elapsed, 0.05 * 8)
+
+    def test_counts_failures_and_routes_rows(self):
+        statuses = {}
+
+        def worker(url, opts, progress_cb, complete_cb, error_cb, cancel_cb=None):
+            progress_cb({'status': 'downloading', 'downloaded_bytes': 50, 'total_bytes': 100})
+            if url.endswith("v1"):
+                error_cb("Download Failed: boom")
+
+        progress = {}
+        engine = PlaylistEngine(make_entries(3), {}, concurrency=2, worker=worker,
+                                row_progress=lambda i, v: progress.__setitem__(i, v),
+                                row_status=lambda i, text, state: statuses.__setitem__(i, state))
+        self.assertEqual(engine.run(), (2, 1))
+        self.assertEqual(statuses, {0: 'done', 1: 'failed', 2: 'done'})
+        self.assertEqual(progress[1], 0.5)
+        self.assertEqual(progress[0], 1.0)
+
+    def test_cancel_skips_remaining(self):
+        cancelled = threading.Event()
+
+        def worker(url, opts, progress_cb, complete_cb, error_cb, cancel_cb=None):
+            cancelled.set()
+
+        ok, failed = PlaylistEngine(make_entries(5), {}, concurrency=1, worker=worker,
+                                    cancel_callback=cancelled.is_set).run()
+        self.assertEqual((ok, failed), (1, 4))
+
+    def test_opts_are_copied_per_entry(self):
+        seen = []
+
+        def worker(url, opts, progress_cb, complete_cb, error_cb, cancel_cb=None):
+            opts['progress_hooks'] = [url]
+            seen.append(opts)
+
+        opts = {'format': 'best'}
+        PlaylistEngine(make_entries(2), opts, concurrency=2, worker=worker).run()
+        self.assertNotIn('progress_hooks', opts)
+        self.assertIsNot(seen[0], seen[1])
+
+
+    def test_download_and_conversion_overlap(self):
+        import concurrent.futures
+        convert = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(convert.shutdown)
+        statuses = {}
+
+        def worker(url, opts, progress_cb, complete_cb, error_cb, cancel_cb=None, postprocess_pool=None):
+            time.sleep(0.05)  # Network stage
+            def transcode():
+                time.sleep(0.2)  # CPU stage
+                if url.endswith("v2"):
+                    error_cb("Conversion Failed: bad input")
+            return postprocess_pool.submit(transcode)
+
+        start = time.perf_counter()
+        engine = PlaylistEngine(make_entries(4), {}, concurrency=1, worker=worker, postprocess=convert,
+                                row_status=lambda i, text, state: statuses.__setitem__(i, state))
+        ok, failed = engine.run()
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual((ok, failed), (3, 1))
+        self.assertEqual(statuses, {0: 'done', 1: 'done', 2: 'failed', 3: 'done'})
+        self.assertEqual(engine.converting, 0)
+        # Serial would be 4 * 0.25s; pipelined it's the downloads plus one conversion
+        self.assertLess(elapsed, 0.6)
+
+
+class TestRowProgress(unittest.TestCase):
+    def test_format_row_progress(self):
+        p, text = format_row_progress({'downloaded_bytes': 25, 'total_bytes': 100,
+                                       '_content_type': 'Video', 'speed': 2 * 1024 * 1024})
+        self.assertEqual(p, 0.25)
+        self.assertTrue(text.startswith("Downloading Video..."))
+        self.assertIn("2.0 MB/s", text)
+
+
+class TestPlaylistRows(unittest.TestCase):
+    def test_state_lives_in_model(self):
+        entries = [{"title": f"Video {i}", "thumbnails": [{"url": f"https://i/{i}.jpg"}]} for i in range(5000)]
+        rows = PlaylistRows(entries)
+        rows.update(4999, progress=0.5, status="Downloading", state="active")
+        rows.update(10, state="done", status="Done", progress=1.0)
+        rows.update(9999, state="done")  # out of range is ignored
+
+        self.assertEqual(rows.row(4999)["progress"], 0.5)
+        self.assertEqual(rows.row(0)["status"], "Pending")
+        self.assertEqual(rows.row(3)["thumbnail"], "https://i/3.jpg")
+        self.assertEqual(rows.row(3)["uploader"], "Unknown Uploader")
+        self.assertEqual(rows.counts(), {"active": 1, "done": 1, "pending": 4998})
+        # Only touched rows carry state
+        self.assertEqual(len(rows._state), 2)
+
+    def test_visible_window(self):
+        self.assertEqual(visible_window(0, 200, 66, 5000), (0, 5))
+        self.assertEqual(visible_window(66 * 100 + 10, 200, 66, 5000), (99, 105))
+        self.assertEqual(visible_window(66 * 4998, 200, 66, 5000), (4997, 5000))
+        self.assertEqual(visible_window(0, 200, 66, 0), (0, 0))
+        # Window size depends on the viewport, not the playlist length
+        sizes = {b - a for a, b in (visible_window(o, 400, 66, 100000) for o in range(0, 66 * 90000, 6601))}
+        self.assertLessEqual(max(sizes), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
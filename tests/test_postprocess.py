@@ -0,0 +1,121 @@
+import sys
+import os
+import stat
+import tempfile
+import threading
+import time
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.postprocess import (PostProcessPool, PostProcessError, split_postprocessors, ffmpeg_command,
+                               run_postprocessors)
+
+# Stand-in for ffmpeg: copies the -i input to the last argument after an optional delay;
+# an input containing "broken" fails
+FAKE_FFMPEG = f"""#!{sys.executable}
+import shutil, sys, time
+args = sys.argv[1:]
+src, dst = args[args.index("-i") + 1], args[-1]
+time.sleep(float(open(src).read().strip() or 0) if not src.endswith(".broken") else 0)
+if src.endswith(".broken"):
+    sys.stderr.write("Invalid data found when processing input\\n")
+    sys.exit(1)
+shutil.copy(src, dst)
+"""
+
+MP3 = {'key': 'FFmpegExtractAudio', 'preferredcodec': 'mp3', 'preferredquality': '320'}
+GIF = {'key': 'FFmpegVideoConvertor', 'preferedformat': 'gif'}
+
+
+class PostProcessTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.ffmpeg = os.path.join(self.tmp.name, "ffmpeg")
+        with open(self.ffmpeg, "w") as f:
+            f.write(FAKE_FFMPEG)
+        os.chmod(self.ffmpeg, os.stat(self.ffmpeg).st_mode | stat.S_IEXEC)
+
+    def media(self, name, delay=0.0):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write(str(delay))
+        return path
+
+
+class TestPostprocessors(PostProcessTestCase):
+    def test_split_keeps_inline_postprocessors(self):
+        embed = {'key': 'FFmpegMetadata'}
+        opts = {'format': 'bestaudio', 'postprocessors': [MP3, embed]}
+        inline, deferred = split_postprocessors(opts)
+        self.assertEqual(inline['postprocessors'], [embed])
+        self.assertEqual(deferred, [MP3])
+        self.assertEqual(opts['postprocessors'], [MP3, embed])  # Caller's opts untouched
+        self.assertEqual(split_postprocessors({'format': 'best'}), ({'format': 'best'}, []))
+
+    def test_commands_match_ytdlp_semantics(self):
+        cmd, out = ffmpeg_command("ffmpeg", "/d/song.webm", MP3)
+        self.assertEqual(out, "/d/song.mp3")
+        self.assertIn("-vn", cmd)
+        self.assertEqual(cmd[cmd.index("-b:a") + 1], "320k")
+        cmd, _ = ffmpeg_command("ffmpeg", "/d/song.webm", {**MP3, 'preferredquality': '2'})
+        self.assertEqual(cmd[cmd.index("-q:a") + 1], "2")
+        cmd, out = ffmpeg_command("ffmpeg", "/d/song.webm", {'key': 'FFmpegExtractAudio', 'preferredcodec': 'wav'})
+        self.assertEqual((out, "pcm_s16le" in cmd, "-b:a" in cmd), ("/d/song.wav", True, False))
+        cmd, out = ffmpeg_command("ffmpeg", "/d/clip.mp4", GIF)
+        self.assertEqual((out, "-an" in cmd), ("/d/clip.gif", True))
+        with self.assertRaises(PostProcessError):
+            ffmpeg_command("ffmpeg", "/d/clip.mp4", {'key': 'FFmpegMerger'})
+
+    def test_run_replaces_source(self):
+        src = self.media("song.webm")
+        self.assertEqual(run_postprocessors(self.ffmpeg, [src], [MP3]), [src[:-5] + ".mp3"])
+        self.assertFalse(os.path.exists(src))
+
+        src = self.media("keep.webm")
+        run_postprocessors(self.ffmpeg, [src], [MP3], keep_source=True)
+        self.assertTrue(os.path.exists(src))
+
+    def test_failure_and_cancel_leave_no_output(self):
+        src = self.media("song.broken")
+        with self.assertRaisesRegex(PostProcessError, "Invalid data"):
+            run_postprocessors(self.ffmpeg, [src], [MP3])
+        self.assertTrue(os.path.exists(src))
+
+        src = self.media("slow.webm", delay=5)
+        began = time.monotonic()
+        with self.assertRaisesRegex(PostProcessError, "Cancelled"):
+            run_postprocessors(self.ffmpeg, [src], [MP3], cancel_callback=lambda: time.monotonic() - began > 0.2)
+        self.assertLess(time.monotonic() - began, 3)
+        self.assertFalse(os.path.exists(src[:-5] + ".mp3"))
+
+        with self.assertRaisesRegex(PostProcessError, "not found"):
+            run_postprocessors(None, [src], [MP3])
+
+
+class TestPostProcessPool(PostProcessTestCase):
+    def test_bounded_and_reports_depths(self):
+        pool = PostProcessPool(workers=2)
+        self.addCleanup(pool.shutdown)
+        peak = {'running': 0, 'queued': 0}
+        lock = threading.Lock()
+
+        def on_start():
+            with lock:
+                d = pool.depths()
+                peak['running'] = max(peak['running'], d['running'])
+                peak['queued'] = max(peak['queued'], d['queued'])
+
+        futures = [pool.submit(self.ffmpeg, [self.media(f"v{i}.webm", delay=0.2)], [MP3], on_start=on_start)
+                   for i in range(5)]
+        outputs = [f.result(timeout=10) for f in futures]
+        self.assertEqual(len(outputs), 5)
+        self.assertEqual(peak['running'], 2)
+        self.assertGreater(peak['queued'], 0)
+        self.assertEqual(pool.depths(), {"queued": 0, "running": 0, "workers": 2, "completed": 5, "failed": 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
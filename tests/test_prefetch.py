@@ -0,0 +1,100 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.prefetch import Prefetcher
+from logic.playlist import PlaylistEngine
+
+
+def url(i):
+    return f"https://www.youtube.com/watch?v=video{i:06d}"
+
+
+class FakeExtractor:
+    def __init__(self, delay=0.0, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, u):
+        with self._lock:
+            self.calls.append(u)
+        time.sleep(self.delay)
+        if u in self.fail:
+            raise RuntimeError("extraction failed")
+        return {'webpage_url': u, 'formats': [{'url': u + "&fmt"}]}
+
+
+class TestPrefetcher(unittest.TestCase):
+    def test_take_returns_prefetched_info(self):
+        fetch = FakeExtractor()
+        prefetch = Prefetcher(2, fetch=fetch)
+        self.addCleanup(prefetch.close)
+        self.assertEqual(prefetch.ahead([url(1), url(2), url(3)]), 2)  # Bounded by lookahead
+
+        self.assertEqual(prefetch.take(url(1))['webpage_url'], url(1))
+        self.assertIsNone(prefetch.take(url(3)))  # Beyond the window: left to the downloader
+        self.assertEqual(sorted(fetch.calls), [url(1), url(2)])
+        self.assertEqual(prefetch.stats()['hits'], 1)
+
+    def test_in_flight_extraction_is_waited_for_not_repeated(self):
+        fetch = FakeExtractor(delay=0.1)
+        prefetch = Prefetcher(1, fetch=fetch)
+        self.addCleanup(prefetch.close)
+        prefetch.ahead([url(1)])
+        self.assertIsNotNone(prefetch.take(url(1)))
+        self.assertEqual(fetch.calls, [url(1)])
+        self.assertEqual(prefetch.stats()['waited'], 1)
+
+        # Equivalent URL spelling maps to the same key; claimed items are never fetched again
+        self.assertEqual(prefetch.ahead([f"https://youtu.be/video{1:06d}"]), 0)
+
+    def test_take_without_waiting(self):
+        prefetch = Prefetcher(1, fetch=FakeExtractor(delay=0.2))
+        self.addCleanup(prefetch.close)
+        prefetch.ahead([url(1)])
+        self.assertIsNone(prefetch.take(url(1), timeout=0))
+
+    def test_failed_extraction_yields_none(self):
+        prefetch = Prefetcher(2, fetch=FakeExtractor(fail=[url(1)]))
+        self.addCleanup(prefetch.close)
+        prefetch.ahead([url(1)])
+        self.assertIsNone(prefetch.take(url(1)))
+        self.assertEqual(prefetch.stats()['failed'], 1)
+
+    def test_disabled(self):
+        fetch = FakeExtractor()
+        prefetch = Prefetcher(0, fetch=fetch)
+        self.assertEqual(prefetch.ahead([url(1)]), 0)
+        self.assertEqual(fetch.calls, [])
+
+
+class TestPlaylistPrefetch(unittest.TestCase):
+    def test_entries_after_the_first_start_with_info(self):
+        fetch = FakeExtractor(delay=0.02)
+        prefetch = Prefetcher(2, fetch=fetch)
+        self.addCleanup(prefetch.close)
+        received = {}
+
+        def worker(u, opts, progress_cb, complete_cb, error_cb, cancel_cb=None, info=None):
+            received[u] = info
+            time.sleep(0.05)  # Downloading; the next entries resolve meanwhile
+
+        entries = [{'url': url(i), 'title': f"Video {i}"} for i in range(5)]
+        ok, failed = PlaylistEngine(entries, {}, concurrency=1, worker=worker, prefetch=prefetch).run()
+
+        self.assertEqual((ok, failed), (5, 0))
+        self.assertIsNone(received[url(0)])
+        for i in range(1, 5):
+            self.assertEqual(received[url(i)]['webpage_url'], url(i))
+        self.assertEqual(sorted(fetch.calls), [url(i) for i in range(1, 5)])  # Each extracted once
+
+
+if __name__ == '__main__':
+    unittest.main()
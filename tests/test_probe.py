@@ -0,0 +1,106 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.probe import FormatProber, ProbeReport, format_table, estimate_size, max_height, availability_warning
+
+MB = 1024 * 1024
+
+
+def make_info(heights, duration=100, avc=True):
+    formats = [
+        {'format_id': 'a1', 'vcodec': 'none', 'acodec': 'opus', 'ext': 'webm', 'filesize': 1 * MB},
+        {'format_id': 'a2', 'vcodec': 'none', 'acodec': 'mp4a.40.2', 'ext': 'm4a', 'filesize': 2 * MB},
+        {'format_id': '18', 'vcodec': 'avc1.42001E', 'acodec': 'mp4a.40.2', 'ext': 'mp4', 'height': 360, 'filesize': 5 * MB},
+    ]
+    for h in heights:
+        formats.append({'format_id': f"vp9-{h}", 'vcodec': 'vp9', 'acodec': 'none', 'ext': 'webm', 'height': h,
+                        'tbr': h})  # No filesize: estimated from bitrate
+        if avc:
+            formats.append({'format_id': f"avc-{h}", 'vcodec': 'avc1.640028', 'acodec': 'none', 'ext': 'mp4',
+                            'height': h, 'filesize': h * 10 * 1024})
+    return {'id': 'x', 'duration': duration, 'height': max(heights) if heights else None, 'formats': formats}
+
+
+class TestEstimates(unittest.TestCase):
+    def test_video_follows_selector_preference(self):
+        table = format_table(make_info([720, 1080]))
+        self.assertEqual(max_height(table), 1080)
+        # avc1 at the exact height + m4a audio
+        self.assertEqual(estimate_size(table, "1080p"), 1080 * 10 * 1024 + 2 * MB)
+        # 4K not available: best avc1 below it
+        self.assertEqual(estimate_size(table, "4k"), 1080 * 10 * 1024 + 2 * MB)
+        # Non-avc video at the exact height: size from bitrate * duration
+        vp9_only = format_table(make_info([1440], avc=False))
+        self.assertEqual(estimate_size(vp9_only, "1440p"), int(1440 * 1000 / 8 * 100) + 2 * MB)
+
+    def test_audio_and_unknown(self):
+        table = format_table(make_info([720], duration=60))
+        self.assertEqual(estimate_size(table, "mp3_320"), 320 * 1000 // 8 * 60)
+        self.assertEqual(estimate_size(table, "m4a"), 2 * MB)
+        self.assertIsNone(estimate_size(table, "gif"))
+        self.assertIsNone(estimate_size(format_table({'formats': []}), "mp3_128"))
+
+    def test_availability_warning(self):
+        self.assertIn("1080p", availability_warning("4k", 1080))
+        self.assertIsNone(availability_warning("720p", 1080))
+        self.assertIsNone(availability_warning("mp3_320", 360))
+        self.assertIsNone(availability_warning("4k", 0))  # Unknown: don't warn
+
+
+class TestFormatProber(unittest.TestCase):
+    def test_bounded_concurrency_results_and_cache(self):
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0, 'calls': 0}
+
+        def fetch(url):
+            with lock:
+                state['active'] += 1
+                state['calls'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.02)
+            with lock:
+                state['active'] -= 1
+            if url.endswith("broken"):
+                raise RuntimeError("Video unavailable")
+            return make_info([720] if url.endswith("0") else [720, 2160])
+
+        prober = FormatProber(workers=3, fetch=fetch)
+        urls = [f"https://example.com/v{i}" for i in range(10)] + ["https://example.com/broken", None]
+        seen = {}
+        report = prober.probe(urls, "4k", on_result=lambda i, r: seen.__setitem__(i, r))
+
+        self.assertEqual(state['peak'], 3)
+        self.assertEqual(len(seen), 12)
+        self.assertEqual((report.probed, report.failed, report.warnings), (12, 2, 1))
+        self.assertEqual(report.results[0]['max_height'], 720)
+        self.assertIn("720p", report.results[0]['warning'])
+        self.assertEqual(report.results[1]['max_height'], 2160)
+
+        # Another format for the same playlist reuses the format tables
+        calls = state['calls']
+        report = prober.probe(urls[:10], "mp3_128")
+        self.assertEqual(state['calls'], calls)
+        self.assertEqual(report.warnings, 0)
+        self.assertEqual(report.total_size(), 10 * 128 * 1000 // 8 * 100)
+
+    def test_cancel_leaves_remaining_unprobed(self):
+        prober = FormatProber(workers=1, fetch=lambda url: make_info([720]))
+        done = []
+        report = prober.probe([f"https://example.com/v{i}" for i in range(5)], "720p",
+                              on_result=lambda i, r: done.append(i), cancel_callback=lambda: len(done) >= 2)
+        self.assertEqual(report.probed, 2)
+
+    def test_total_extrapolates_unknown_sizes(self):
+        report = ProbeReport(4, "720p")
+        report.results = [{'size': 100}, {'size': 300}, {'size': None}, None]
+        self.assertEqual(report.total_size(), 800)
+
+
+if __name__ == '__main__':
+    unittest.main()
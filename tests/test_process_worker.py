@@ -0,0 +1,165 @@
+import sys
+import os
+import pickle
+import signal
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.process_worker import process_download_worker, slim_progress
+from logic.downloader import build_ydl_opts
+from logic.metrics import MetricsSink, job_metrics
+from logic.bandwidth import BandwidthScheduler, bandwidth_scheduler
+
+
+# Targets run in the child process, so they must be importable module-level functions
+def ok_target(url, opts, progress_cb, complete_cb, error_cb, cancel_cb=None, phase_callback=None, **kwargs):
+    for i in range(1, 4):
+        progress_cb({'status': 'downloading', 'downloaded_bytes': i, 'total_bytes': 3, 'info_dict': {'big': 'x' * 1000}})
+    progress_cb({'status': 'finished', 'filename': os.path.join(opts['dir'], f"{os.getpid()}.mp4")})
+    if phase_callback:
+        phase_callback("downloaded", "a.mp4")
+    job_metrics.trace(url).finish()
+    complete_cb()
+
+
+def failing_target(url, opts, progress_cb, complete_cb, error_cb, cancel_cb=None, **kwargs):
+    error_cb("Download Failed: not available")
+
+
+def slow_target(url, opts, progress_cb, complete_cb, error_cb, cancel_cb=None, **kwargs):
+    while not cancel_cb():
+        progress_cb({'status': 'downloading', 'downloaded_bytes': 1})
+        time.sleep(0.02)
+    error_cb("Cancelled")
+
+
+def crashing_target(url, opts, progress_cb, complete_cb, error_cb, cancel_cb=None, **kwargs):
+    os._exit(3)
+
+
+def greedy_target(url, opts, progress_cb, complete_cb, error_cb, cancel_cb=None, phase_callback=None, **kwargs):
+    # Reports more bytes than any allocation, and every cap the parent sends this process
+    start, cap = time.monotonic(), None
+    while not cancel_cb():
+        if bandwidth_scheduler.cap != cap:
+            cap = bandwidth_scheduler.cap
+            phase_callback("cap", cap)
+        progress_cb({'status': 'downloading', 'downloaded_bytes': int((time.monotonic() - start) * 50e6)})
+        time.sleep(0.02)
+    error_cb("Cancelled")
+
+
+def hung_target(url, opts, progress_cb, complete_cb, error_cb, cancel_cb=None, **kwargs):
+    with open(os.path.join(opts['dir'], "pid"), "w") as f:
+        f.write(str(os.getpid()))
+    while True:  # Ignores the cancel, like a child stuck in a blocking read
+        time.sleep(0.05)
+
+
+def run(target, opts=None, cancel=None, **kwargs):
+    events, done, errors = [], [], []
+    process_download_worker("https://example.com/v", opts or {}, events.append, lambda: done.append(True),
+                            errors.append, cancel, target=target, **kwargs)
+    return events, done, errors
+
+
+class TestProcessWorker(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_runs_in_child_and_relays_slim_progress(self):
+        sink = MetricsSink(os.path.join(self.tmp.name, "metrics"))
+        phases = []
+        with patch("logic.process_worker.job_metrics", sink):
+            events, done, errors = run(ok_target, {'dir': self.tmp.name},
+                                       phase_callback=lambda phase, name: phases.append((phase, name)))
+        self.assertEqual((done, errors), ([True], []))
+        self.assertEqual(events[0], {'status': 'downloading', 'downloaded_bytes': 1, 'total_bytes': 3})
+        self.assertEqual(events[-1]['status'], 'finished')
+        self.assertNotEqual(os.path.basename(events[-1]['filename']), f"{os.getpid()}.mp4")
+        self.assertEqual(phases, [("downloaded", "a.mp4")])
+        # The child's metrics record was exported by this process
+        self.assertEqual(sink.jobs, {"ok": 1})
+
+    def test_errors_cancel_and_crash(self):
+        self.assertEqual(run(failing_target)[1:], ([], ["Download Failed: not available"]))
+
+        start = time.monotonic()
+        events, done, errors = run(slow_target, cancel=lambda: time.monotonic() - start > 1.0)
+        self.assertEqual(errors, ["Cancelled"])
+        self.assertTrue(events)
+
+        _, done, errors = run(crashing_target)
+        self.assertEqual(done, [])
+        self.assertIn("exited with code 3", errors[0])
+
+    def test_killed_after_cancel_is_cancelled(self):
+        # The shutdown cleanup kills children still alive after the cancel; their items must stay resumable
+        pid_file = os.path.join(self.tmp.name, "pid")
+
+        def cancel():
+            if not os.path.exists(pid_file) or not os.path.getsize(pid_file):
+                return False
+            with open(pid_file) as f:
+                os.kill(int(f.read()), getattr(signal, "SIGKILL", signal.SIGTERM))
+            os.remove(pid_file)
+            return True
+
+        _, done, errors = run(hung_target, {'dir': self.tmp.name}, cancel)
+        self.assertEqual((done, errors), ([], ["Cancelled"]))
+
+    def test_children_share_the_global_cap(self):
+        scheduler = BandwidthScheduler(10_000_000, interval=0.2)
+        stop = threading.Event()
+        caps = ([], [])
+
+        def job(seen):
+            process_download_worker("https://example.com/v", {}, None, None, lambda msg: None, stop.is_set,
+                                    phase_callback=lambda phase, cap: seen.append(cap), target=greedy_target)
+
+        def wait_for(cap):
+            deadline = time.monotonic() + 30
+            while not all(seen and seen[-1] == cap for seen in caps) and time.monotonic() < deadline:
+                time.sleep(0.05)
+            return [seen[-1] if seen else None for seen in caps]
+
+        with patch("logic.process_worker.bandwidth_scheduler", scheduler):
+            threads = [threading.Thread(target=job, args=(seen,)) for seen in caps]
+            for t in threads:
+                t.start()
+            try:
+                # Split between the two children, then a new cap from Settings reaches both
+                self.assertEqual(wait_for(5_000_000), [5_000_000, 5_000_000])
+                scheduler.set_cap(4_000_000)
+                self.assertEqual(wait_for(2_000_000), [2_000_000, 2_000_000])
+            finally:
+                stop.set()
+                for t in threads:
+                    t.join()
+        self.assertEqual(scheduler.stats()["jobs"], [])
+
+    def test_unpicklable_options_fall_back_to_in_process(self):
+        _, done, errors = run(failing_target, {'hook': lambda d: None})
+        self.assertEqual(errors, ["Download Failed: not available"])
+
+    def test_trim_options_are_picklable(self):
+        opts = build_ydl_opts(self.tmp.name, "720p", trim_range=(10, 20))
+        ranges = pickle.loads(pickle.dumps(opts['download_ranges']))
+        self.assertEqual(ranges({}, None), [{'start_time': 10, 'end_time': 20}])
+
+    def test_slim_progress(self):
+        self.assertEqual(slim_progress({'status': 'downloading', 'speed': None, 'eta': 3, 'info_dict': {}}),
+                         {'status': 'downloading', 'eta': 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
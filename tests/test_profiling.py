@@ -0,0 +1,79 @@
+import sys
+import os
+import json
+import subprocess
+import tempfile
+import time
+import unittest
+import importlib.util
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.profiling import StartupProfiler, preload, check_budget, DEFERRED_MODULES, IMPORT_BUDGET
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def cold_import(module):
+    """Import a module in a fresh interpreter; returns (seconds, deferred modules that got loaded)."""
+    code = (
+        "import sys, time, json\n"
+        "t = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - t\n"
+        f"print(json.dumps([elapsed, [m for m in {list(DEFERRED_MODULES) + ['webbrowser']!r} if m in sys.modules]]))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=60, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+class TestStartupProfiler(unittest.TestCase):
+    def test_phases_marks_and_budget(self):
+        profiler = StartupProfiler(budget=1.0)
+        with profiler.phase("theme"):
+            time.sleep(0.02)
+        profiler.mark("first_paint")
+        profiler.mark("first_paint")  # Only the first occurrence counts
+
+        report = profiler.report()
+        self.assertEqual([p["name"] for p in report["phases"]], ["theme"])
+        self.assertGreaterEqual(report["phases"][0]["seconds"], 0.02)
+        self.assertFalse(report["over_budget"])
+        self.assertEqual(check_budget(report), [])
+
+        # Same run against a tighter budget fails and names the slowest phase
+        problems = check_budget(report, budget=0.001)
+        self.assertEqual(len(problems), 1)
+        self.assertIn("theme", problems[0])
+        self.assertEqual(check_budget({"phases": []}, 1.0), ["first paint was never reached"])
+
+    def test_save_and_preload(self):
+        profiler = StartupProfiler()
+        preload(["json", "no_such_module_yikes"], profiler).join()
+        self.assertIn("import json", [p["name"] for p in profiler.phases])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.json")
+            profiler.save(path)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["phases"], profiler.report()["phases"])
+
+
+class TestColdStartBudget(unittest.TestCase):
+    """Regression check: startup imports stay within budget and leave the download stack unloaded."""
+
+    def test_logic_startup_imports(self):
+        modules = "logic.settings, logic.downloader, logic.playlist, logic.thumbnails, logic.journal, logic.bandwidth"
+        elapsed, loaded = cold_import(modules)
+        self.assertEqual(loaded, [])
+        self.assertLess(elapsed, IMPORT_BUDGET / 3)
+
+    @unittest.skipUnless(importlib.util.find_spec("customtkinter"), "customtkinter not installed")
+    def test_gui_import(self):
+        elapsed, loaded = cold_import("gui.main_window")
+        self.assertEqual(loaded, [])
+        self.assertLess(elapsed, IMPORT_BUDGET)
+
+
+if __name__ == '__main__':
+    unittest.main()
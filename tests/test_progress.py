@@ -0,0 +1,77 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.progress import ProgressAggregator, TransferStats
+
+
+class TestProgressAggregator(unittest.TestCase):
+    def test_coalesces_to_latest_per_job(self):
+        agg = ProgressAggregator()
+        for i in range(100):
+            agg.submit("a", i)
+        agg.submit("b", "x")
+        self.assertEqual(agg.drain(), {"a": 99, "b": "x"})
+        self.assertEqual(agg.drain(), {})
+        stats = agg.stats()
+        self.assertEqual((stats["submitted"], stats["published"], stats["coalesced"]), (101, 2, 99))
+
+    def test_discard_drops_pending(self):
+        agg = ProgressAggregator()
+        agg.submit("a", 1)
+        agg.discard("a")
+        self.assertEqual(agg.drain(), {})
+        self.assertEqual(agg.stats()["discarded"], 1)
+
+    def test_publish_rate_independent_of_event_rate(self):
+        agg = ProgressAggregator()
+        published = []
+        agg.start(lambda job, event: published.append(event), hz=20)
+        stop = time.monotonic() + 0.3
+        producers = []
+        for job in range(4):
+            def produce(job=job):
+                n = 0
+                while time.monotonic() < stop:
+                    agg.submit(job, n)
+                    n += 1
+            producers.append(threading.Thread(target=produce))
+        for t in producers:
+            t.start()
+        for t in producers:
+            t.join()
+        agg.stop(lambda job, event: published.append(event))
+
+        stats = agg.stats()
+        # ~6 publish rounds x 4 jobs, against many thousands of submitted ticks
+        self.assertLessEqual(len(published), 4 * 10)
+        self.assertGreater(stats["submitted"], 100 * len(published))
+
+
+
+class TestTransferStats(unittest.TestCase):
+    def test_merging_after_download_keeps_size(self):
+        stats = TransferStats()
+        stats.observe({'status': 'downloading', 'downloaded_bytes': 10, 'total_bytes': 52428800,
+                       '_total_bytes_str': ' 50.00MiB'})
+        # The last events before completion carry no sizes
+        for status in ('merging', 'trimming', 'converting', 'trimmed'):
+            stats.observe({'status': status, 'msg': '...'})
+        self.assertEqual(stats.size_str(), "50.00MiB")
+
+    def test_size_from_byte_count(self):
+        stats = TransferStats()
+        self.assertEqual(stats.size_str(), "Unknown")
+        stats.observe({'status': 'skipped', 'filename': 'a.mp4', 'total_bytes': 3 * 1024 * 1024})
+        self.assertEqual(stats.size_str(), "3.0 MB")
+        stats.reset()
+        stats.observe({'status': 'downloading', 'total_bytes_estimate': 2048, '_total_bytes_str': 'N/A'})
+        self.assertEqual(stats.size_str(), "2.0 KB")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.service import DownloadService, ServiceServer, ServiceClient, ServiceError, progress_info
+
+
+def fake_worker(url, opts, progress_cb, complete_cb, error_cb, cancel_cb=None, **kwargs):
+    """Ten ticks; 'slow' URLs run until cancelled, 'bad' URLs fail."""
+    for i in range(1, 11):
+        if cancel_cb and cancel_cb():
+            error_cb("Cancelled")
+            return
+        progress_cb({'status': 'downloading', 'downloaded_bytes': i, 'total_bytes': 10, '_content_type': 'Video'})
+        time.sleep(0.5 if "slow" in url else 0.01)
+    if "bad" in url:
+        error_cb("Download Failed: not available")
+
+
+@patch("logic.cli.download_worker", fake_worker)
+@patch("logic.cli.build_ydl_opts", lambda path, key, trim_range=None: {})
+class TestDownloadService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.service = DownloadService(concurrency=1, output=self.tmp.name, prefetch=0, archive=False,
+                                       progress_interval=0.02)
+        self.service.start()
+        self.server = ServiceServer(self.service)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = ServiceClient(self.server.port, self.server.token)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.stop()
+        self.tmp.cleanup()
+
+    def test_enqueue_and_follow_job_over_http(self):
+        job_id = self.client.enqueue("https://good", "720p", title="Good")
+        events = list(self.client.events(job=job_id))
+
+        self.assertEqual(events[-1]["event"], "done")
+        progress = [progress_info(e) for e in events if e["event"] == "progress"]
+        self.assertTrue(progress)
+        self.assertEqual(progress[-1]["_content_type"], "Video")
+        job = self.client.status(job_id)
+        self.assertEqual((job["status"], job["format"], job["title"], job["path"]), ("done", "720p", "Good", self.tmp.name))
+
+    def test_failure_and_finished_job_stream(self):
+        job_id = self.client.enqueue("https://bad")
+        self.assertEqual(list(self.client.events(job=job_id))[-1]["error"], "Download Failed: not available")
+        # Subscribing after the fact still reports the outcome
+        events = list(self.client.events(job=job_id))
+        self.assertEqual([e["event"] for e in events], ["failed"])
+        self.assertEqual(self.client.status(job_id)["status"], "failed")
+
+    def test_cancel_running_and_queued_jobs(self):
+        running = self.client.enqueue("https://slow")
+        queued = self.client.enqueue("https://good")  # Waits: one worker
+        stream = self.client.events(job=running)
+        for event in stream:
+            if event["event"] == "progress":
+                break
+        self.assertTrue(self.client.cancel(queued))
+        self.assertTrue(self.client.cancel(running))
+        self.assertEqual([e["event"] for e in stream][-1], "cancelled")
+        self.assertEqual(self.client.status(queued)["status"], "cancelled")
+        self.assertFalse(self.client.cancel(queued))
+
+    def test_shared_event_stream_and_job_list(self):
+        stream = self.service.subscribe()
+        ids = [self.service.enqueue(f"https://good/{i}") for i in range(3)]
+        finished = set()
+        while len(finished) < 3:
+            event = stream.get(timeout=5)
+            self.assertIsNotNone(event)
+            if event["event"] == "done":
+                finished.add(event["job"])
+        stream.close()
+        self.assertEqual(finished, set(ids))
+        self.assertEqual([j["id"] for j in self.client.status()], ids)
+
+    def test_rejects_bad_requests_and_tokens(self):
+        with self.assertRaises(ServiceError):
+            self.client.enqueue("https://good", "8k")
+        with self.assertRaises(ServiceError):
+            self.client.enqueue("https://good", trim=[5, 1])
+        self.assertIsNone(self.client.status(999))
+        with self.assertRaises(ServiceError) as ctx:
+            ServiceClient(self.server.port, "wrong").status()
+        self.assertIn("401", str(ctx.exception))
+
+    def test_discovery_file(self):
+        path = os.path.join(self.tmp.name, "service.json")
+        self.assertIsNone(ServiceClient.discover(path))
+        self.server.write_discovery(path)
+        with open(path) as f:
+            self.assertEqual(json.load(f)["port"], self.server.port)
+        if os.name == "posix":
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+        client = ServiceClient.discover(path)
+        self.assertEqual(client.status(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.thumbnails import ThumbnailCache
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+class _FakeImage:
+    def __init__(self, data, size):
+        self.data, self.size = data, tuple(size)
+
+
+class _FakeImageCache(ThumbnailCache):
+    """Exercises the caching layers without PIL: 'images' are (bytes, size) pairs."""
+
+    @staticmethod
+    def _decode(data, size):
+        return _FakeImage(data, size)
+
+    @staticmethod
+    def _encode(img):
+        return b"%dx%d:" % img.size + img.data
+
+    @staticmethod
+    def _open(data):
+        dims, payload = data.split(b":", 1)
+        w, h = dims.split(b"x")
+        return _FakeImage(payload, (int(w), int(h)))
+
+    @staticmethod
+    def _image_bytes(img):
+        return img.size[0] * img.size[1] * 3
+
+
+class TestThumbnailCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.fetches = []
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def fetch(self, url):
+        self.fetches.append(url)
+        time.sleep(0.05)
+        if "missing" in url:
+            raise IOError("404")
+        return url.encode()
+
+    def make(self, cls=_FakeImageCache, **kw):
+        return cls(self.tmp, fetcher=self.fetch, **kw)
+
+    def test_memory_then_disk_tiers(self):
+        cache = self.make()
+        img = cache.get("https://i/1.jpg", (100, 56))
+        self.assertEqual((img.data, img.size), (b"https://i/1.jpg", (100, 56)))
+        self.assertIs(cache.get("https://i/1.jpg", (100, 56)), img)
+
+        # A new process starts with an empty memory tier but a warm disk
+        cache = self.make()
+        self.assertIsNone(cache.peek("https://i/1.jpg", (100, 56)))
+        self.assertEqual(cache.get("https://i/1.jpg", [100, 56]).data, b"https://i/1.jpg")
+        self.assertEqual(len(self.fetches), 1)
+        stats = cache.stats()
+        self.assertEqual((stats["disk_hits"], stats["misses"]), (1, 0))
+
+    def test_sizes_are_separate_entries(self):
+        cache = self.make()
+        cache.get("https://i/1.jpg", (100, 56))
+        cache.get("https://i/1.jpg", (100, 50))
+        self.assertEqual(cache.stats()["memory_items"], 2)
+
+    def test_concurrent_requests_share_one_download(self):
+        cache = self.make()
+        results = []
+        threads = [threading.Thread(target=lambda s=s: results.append(cache.get("https://i/x.jpg", s)))
+                   for s in [(100, 56)] * 4 + [(550, 309)] * 4]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(results), 8)
+        self.assertLessEqual(len(self.fetches), 2)
+        self.assertGreater(cache.stats()["deduped"] + cache.stats()["memory_hits"], 0)
+
+    def test_memory_lru_bound(self):
+        cache = self.make(max_memory_bytes=100 * 56 * 3 * 2)
+        for i in range(5):
+            cache.get(f"https://i/{i}.jpg", (100, 56))
+        stats = cache.stats()
+        self.assertEqual(stats["memory_items"], 2)
+        self.assertIsNone(cache.peek("https://i/0.jpg", (100, 56)))
+        self.assertIsNotNone(cache.peek("https://i/4.jpg", (100, 56)))
+
+    def test_disk_size_cap(self):
+        cache = self.make(max_disk_bytes=60)
+        for i in range(5):
+            cache.get(f"https://i/{i}.jpg", (10, 10))
+        stats = cache.stats()
+        self.assertLessEqual(stats["disk_bytes"], 60)
+        self.assertLess(stats["disk_items"], 5)
+
+    def test_failed_fetch_returns_none(self):
+        cache = self.make()
+        self.assertIsNone(cache.get("https://i/missing.jpg", (100, 56)))
+        self.assertEqual(cache.stats()["errors"], 1)
+
+    def test_clear(self):
+        cache = self.make()
+        cache.get("https://i/1.jpg", (100, 56))
+        cache.clear()
+        stats = cache.stats()
+        self.assertEqual((stats["memory_items"], stats["disk_items"]), (0, 0))
+
+    @unittest.skipIf(Image is None, "Pillow not installed")
+    def test_pil_roundtrip(self):
+        buf = __import__("io").BytesIO()
+        Image.new("RGB", (320, 180), "red").save(buf, format="PNG")
+        self.fetch = lambda url: buf.getvalue()
+        cache = self.make(cls=ThumbnailCache)
+        self.assertEqual(cache.get("https://i/red.png", (100, 56)).size, (100, 56))
+        self.assertEqual(self.make(cls=ThumbnailCache).get("https://i/red.png", (100, 56)).size, (100, 56))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+import sys
+import os
+import json
+import stat
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.ffmpeg import FFmpeg
+from logic.trim import plan_cut, parse_probe, video_command, cut_file, finish_section, COPY, ENCODE, TRIM_FAST, TRIM_PRECISE, TRIM_EXACT
+from logic.downloader import build_ydl_opts, TrimRange
+from logic.utils import format_timestamp
+from benchmarks.bench_trim import have_ffmpeg
+
+# ffprobe -of json for a 20 s clip: H.264 with a keyframe every 4 s (10 fps), plus audio
+PROBE = {
+    "streams": [{"index": 0, "codec_type": "video", "codec_name": "h264", "profile": "High", "pix_fmt": "yuv420p",
+                 "time_base": "1/15360"},
+                {"index": 1, "codec_type": "audio", "codec_name": "aac", "time_base": "1/44100"}],
+    "format": {"start_time": "0.000000", "duration": "20.000000"},
+    "packets": [{"stream_index": 0, "pts_time": f"{i / 10:.6f}", "flags": "K__" if i % 40 == 0 else "___"}
+                for i in range(200)] + [{"stream_index": 1, "pts_time": "0.000000", "flags": "K__"}],
+}
+
+# A section yt-dlp stream-copied for 101.5..120 s into mp4: the pre-roll from the keyframe at 100 s is at negative times
+SECTION_PROBE = dict(PROBE, format={"start_time": "0.000000", "duration": "18.500000"},
+                     packets=[{"stream_index": 0, "pts_time": f"{i / 10 - 1.5:.6f}", "flags": "K__" if i % 40 == 0 else "___"}
+                              for i in range(200)])
+
+# Stand-ins: ffprobe prints probe.json, ffmpeg logs its arguments and creates its output file (the last one)
+FAKE_FFPROBE = "#!/bin/sh\ncat \"$(dirname \"$0\")/probe.json\"\n"
+FAKE_FFMPEG = r"""#!/bin/sh
+echo "$@" >> "$(dirname "$0")/calls.log"
+for last; do :; done
+echo clip > "$last"
+"""
+
+
+class TestPlanCut(unittest.TestCase):
+    KEYFRAMES = [0.0, 4.0, 8.0, 12.0, 16.0]
+
+    def test_fast_starts_at_keyframe_before_start(self):
+        self.assertEqual(plan_cut(self.KEYFRAMES, 5.5, 13.0, TRIM_FAST), ([(COPY, 4.0, 13.0)], (4.0, 13.0)))
+        self.assertEqual(plan_cut(self.KEYFRAMES, 8.0, 13.0, TRIM_FAST)[1], (8.0, 13.0))
+
+    def test_precise_encodes_only_partial_gops(self):
+        segments, achieved = plan_cut(self.KEYFRAMES, 5.5, 13.0, TRIM_PRECISE)
+        self.assertEqual(segments, [(ENCODE, 5.5, 8.0), (COPY, 8.0, 12.0), (ENCODE, 12.0, 13.0)])
+        self.assertEqual(achieved, (5.5, 13.0))
+        # Cut on a keyframe: nothing to re-encode at the head
+        self.assertEqual(plan_cut(self.KEYFRAMES, 4.0, 13.0, TRIM_PRECISE)[0][0], (COPY, 4.0, 12.0))
+        # Inside one GOP there is nothing to copy
+        self.assertEqual(plan_cut(self.KEYFRAMES, 5.0, 7.0, TRIM_PRECISE)[0], [(ENCODE, 5.0, 7.0)])
+
+    def test_exact_encodes_everything(self):
+        self.assertEqual(plan_cut(self.KEYFRAMES, 5.5, 13.0, TRIM_EXACT)[0], [(ENCODE, 5.5, 13.0)])
+
+
+class TestTrimCommands(unittest.TestCase):
+    def test_parse_probe(self):
+        media = parse_probe(PROBE)
+        self.assertEqual((media["codec"], media["profile"], media["timescale"], media["audio"]), ("h264", "High", 15360, True))
+        self.assertEqual(media["keyframes"], [0.0, 4.0, 8.0, 12.0, 16.0])
+        self.assertEqual(len(media["frames"]), 200)
+        self.assertIsNone(parse_probe({"streams": [{"index": 0, "codec_type": "audio"}], "format": {}})["codec"])
+
+    def test_video_commands(self):
+        media = parse_probe(PROBE)
+        copy = video_command("ffmpeg", "in.mp4", "out.mp4", COPY, 8.0, 12.0, media, frames=40)
+        self.assertEqual(copy[copy.index("-ss") + 1], "8.001000")
+        self.assertIn("copy", copy)
+        self.assertEqual(copy[copy.index("-frames:v") + 1], "40")
+        self.assertEqual(copy[copy.index("-video_track_timescale") + 1], "15360")
+        self.assertEqual(copy[copy.index("-bsf:v") + 1], "h264_mp4toannexb,dump_extra")
+
+        encode = video_command("ffmpeg", "in.mp4", "out.mp4", ENCODE, 5.5, 8.0, media, "libx264")
+        self.assertEqual(encode[encode.index("-c:v") + 1], "libx264")
+        self.assertEqual(encode[encode.index("-profile:v") + 1], "high")
+        self.assertEqual(encode[encode.index("-t") + 1], "2.500000")
+        self.assertNotIn("-frames:v", encode)
+        self.assertEqual(encode[encode.index("-bsf:v") + 1], "h264_mp4toannexb,dump_extra")
+        # Whatever the container's default encoder makes needn't be the source's codec
+        self.assertNotIn("-bsf:v", video_command("ffmpeg", "in.mp4", "out.mp4", ENCODE, 5.5, 8.0, media))
+
+    def test_build_ydl_opts_modes(self):
+        exact = build_ydl_opts(".", "720p", trim_range=(10, 20))
+        self.assertTrue(exact['force_keyframes_at_cuts'])
+        self.assertEqual(exact['download_ranges'].mode, TRIM_EXACT)
+        fast = build_ydl_opts(".", "720p", trim_range=(10, 20), trim_mode=TRIM_FAST)
+        self.assertNotIn('force_keyframes_at_cuts', fast)
+        self.assertIsInstance(fast['download_ranges'], TrimRange)
+        with patch.dict("logic.downloader.current_settings", {"trim_mode": TRIM_PRECISE}):
+            self.assertEqual(build_ydl_opts(".", "720p", trim_range=(10, 20))['download_ranges'].mode, TRIM_PRECISE)
+
+    def test_format_timestamp(self):
+        self.assertEqual(format_timestamp(62.484), "1:02.48")
+        self.assertEqual(format_timestamp(3605), "1:00:05.00")
+
+
+@unittest.skipUnless(os.name == "posix", "shell stand-ins for ffmpeg/ffprobe")
+class TestFinishSection(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        for name, script in (("ffmpeg", FAKE_FFMPEG), ("ffprobe", FAKE_FFPROBE)):
+            path = os.path.join(self.tmp.name, name)
+            with open(path, "w") as f:
+                f.write(script)
+            os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+        self.write_probe(SECTION_PROBE)
+        self.clip = os.path.join(self.tmp.name, "clip.mp4")
+        with open(self.clip, "w") as f:
+            f.write("section")
+        self.ff = FFmpeg(os.path.join(self.tmp.name, "ffmpeg"), caps_file=None)
+        self.ff._caps = {"runnable": True, "encoders": frozenset({"libx264"}), "muxers": frozenset(), "filters": frozenset()}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_probe(self, probe):
+        with open(os.path.join(self.tmp.name, "probe.json"), "w") as f:
+            json.dump(probe, f)
+
+    def calls(self):
+        log = os.path.join(self.tmp.name, "calls.log")
+        if not os.path.exists(log):
+            return []
+        with open(log) as f:
+            return f.read().splitlines()
+
+    def test_fast_reports_where_the_copy_started(self):
+        report = finish_section(self.ff, self.clip, 101.5, 120.0, TRIM_FAST)
+        self.assertEqual(report["achieved"], [100.0, 120.0])
+        self.assertEqual(report["encoded"], 0)
+        self.assertEqual(self.calls(), [])  # Kept as downloaded
+
+    def test_precise_reencodes_head_and_tail_gops_in_place(self):
+        report = finish_section(self.ff, self.clip, 101.5, 120.0, TRIM_PRECISE)
+        self.assertEqual(report["achieved"], [101.5, 120.0])
+        # Head 101.5..104 and tail 116..120 re-encoded, 104..116 copied
+        self.assertEqual((report["encoded"], report["copied"]), (6.5, 12.0))
+        calls = self.calls()
+        self.assertEqual(len(calls), 5)  # Three video parts, the audio, the join
+        self.assertIn("-c:v libx264", calls[0])
+        self.assertIn("-frames:v 120", calls[1])
+        self.assertIn("-map 0:a", calls[3])
+        self.assertIn("-f concat", calls[4])
+        with open(self.clip) as f:
+            self.assertEqual(f.read().strip(), "clip")
+        self.assertFalse([n for n in os.listdir(self.tmp.name) if n.startswith(".trim-")])
+
+    def test_section_without_preroll_is_kept(self):
+        # Timestamps shifted to start at the keyframe (no edit list): the cut points can only be estimated
+        self.write_probe(dict(PROBE, format={"start_time": "0.000000", "duration": "20.000000"}))
+        report = finish_section(self.ff, self.clip, 101.5, 120.0, TRIM_PRECISE)
+        self.assertEqual((report["mode"], report["achieved"]), (TRIM_FAST, [100.0, 120.0]))
+        self.assertEqual(self.calls(), [])
+
+
+FF = have_ffmpeg()
+
+
+@unittest.skipUnless(FF and FF.has_encoder("libx264"), "ffmpeg with libx264 not found")
+class TestPreciseCutDecodes(unittest.TestCase):
+    def test_joined_clip_decodes_end_to_end(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # x264 settings the veryfast re-encode won't pick (CAVLC, 5 refs, B-frames), so the parts' SPS/PPS differ
+            source = os.path.join(tmp, "source.mp4")
+            subprocess.run([FF.path, "-y", "-loglevel", "error", "-nostdin",
+                            "-f", "lavfi", "-i", "testsrc2=size=320x180:rate=30:duration=12",
+                            "-f", "lavfi", "-i", "sine=frequency=440:duration=12",
+                            "-c:v", "libx264", "-profile:v", "high", "-pix_fmt", "yuv420p", "-g", "120",
+                            "-x264-params", "cabac=0:ref=5:bframes=3", "-c:a", "aac", "-shortest", source], check=True)
+            output = os.path.join(tmp, "clip.mp4")
+            report = cut_file(FF, source, output, 2.5, 9.3, TRIM_PRECISE)
+            self.assertGreater(report["copied"], 0)
+            self.assertGreater(report["encoded"], 0)
+            decode = subprocess.run([FF.path, "-v", "error", "-xerror", "-nostdin", "-i", output, "-f", "null", "-"],
+                                    capture_output=True, text=True)
+            self.assertEqual((decode.returncode, decode.stderr), (0, ""))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import sys
+import os
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic.tuner import TransferTuner, TunerLogger, classify_error, ERROR_THROTTLED, ERROR_FORBIDDEN, ERROR_TIMEOUT
+from benchmarks.media_server import MediaServer
+
+MB = 1024 * 1024
+
+
+def simulate(tuner, rate_for, errors_for, seconds=60.0, step=0.1):
+    """Drive a tuner with a link model: rate_for(fragments) bytes/s, errors_for(fragments) errors/step."""
+    now = 0.0
+    levels = []
+    while now < seconds:
+        now += step
+        for _ in range(errors_for(tuner.fragments)):
+            tuner.record_error(ERROR_THROTTLED, now=now)
+        tuner.record_bytes(int(rate_for(tuner.fragments) * step), now=now)
+        levels.append(tuner.fragments)
+    return levels
+
+
+class TestTransferTuner(unittest.TestCase):
+    def test_converges_to_knee_of_throughput_curve(self):
+        # Each connection gets 1 MB/s until the 4 MB/s link is full
+        tuner = TransferTuner(window=1.0)
+        levels = simulate(tuner, lambda c: min(c, 4) * MB, lambda c: 0)
+        self.assertIn(tuner.fragments, (4, 5))
+        # Spends the tail of the run at the knee; 5 only for the odd re-probe
+        tail = levels[-300:]
+        self.assertTrue(all(c in (4, 5) for c in tail))
+        self.assertGreater(tail.count(4) / len(tail), 0.8)
+        self.assertGreater(tuner.chunk_size, 10 * MB)
+
+    def test_backs_off_on_throttling_and_stays_below_limit(self):
+        # Server answers 429 above 3 connections
+        tuner = TransferTuner(fragments=8, window=1.0)
+        levels = simulate(tuner, lambda c: min(c, 6) * MB, lambda c: 2 if c > 3 else 0, seconds=120)
+        self.assertLessEqual(tuner.fragments, 3)
+        backoffs = [h for h in tuner.history if h["action"] == "backoff"]
+        self.assertEqual(backoffs[0]["fragments"], 4)
+        self.assertEqual(backoffs[0]["chunk_size"], 5 * MB)
+        # Probing past the limit is rare once it has been learned
+        self.assertLess(sum(1 for c in levels[-600:] if c > 3) / 600, 0.1)
+
+    def test_bounds(self):
+        tuner = TransferTuner(fragments=1, chunk_size=1, window=1.0, max_fragments=2, max_chunk=4 * MB)
+        self.assertEqual(tuner.chunk_size, 1 * MB)
+        simulate(tuner, lambda c: c * MB, lambda c: 0)
+        self.assertEqual(tuner.fragments, 2)
+        self.assertLessEqual(tuner.chunk_size, 4 * MB)
+        for _ in range(10):
+            tuner.record_error(ERROR_TIMEOUT, now=1e6 + _ * 10)
+        self.assertEqual((tuner.fragments, tuner.chunk_size), (1, 1 * MB))
+
+    def test_observe_uses_per_file_deltas(self):
+        tuner = TransferTuner(window=100)
+        tuner.observe({'status': 'downloading', 'tmpfilename': 'a.part', 'downloaded_bytes': 100})
+        tuner.observe({'status': 'downloading', 'tmpfilename': 'a.part', 'downloaded_bytes': 250})
+        tuner.observe({'status': 'downloading', 'tmpfilename': 'b.part', 'downloaded_bytes': 50})
+        self.assertEqual(tuner._bytes, 300)
+
+    def test_logger_classifies_errors(self):
+        self.assertEqual(classify_error("ERROR: unable to download video data: HTTP Error 403: Forbidden"), ERROR_FORBIDDEN)
+        self.assertEqual(classify_error("[download] Got error: HTTP Error 429: Too Many Requests. Retrying"), ERROR_THROTTLED)
+        self.assertEqual(classify_error("Got error: The read operation timed out. Retrying (1/15)..."), ERROR_TIMEOUT)
+        self.assertIsNone(classify_error("[download] 45.0% of 10.00MiB"))
+
+        tuner = TransferTuner(fragments=4)
+        TunerLogger(tuner).debug("[download] Got error: HTTP Error 429: Too Many Requests")
+        self.assertEqual(tuner.fragments, 2)
+
+
+class TestTunerAgainstServer(unittest.TestCase):
+    """Fragment fetches against a stand-in origin: 512 KB/s per connection, 2 MB/s link, 429 above 5."""
+
+    FRAGMENT = 64 * 1024
+
+    def run_fetchers(self, server, tuner, seconds):
+        url = server.url("clip", 64 * MB)
+        stop = time.monotonic() + seconds
+        position = [0]
+        lock = threading.Lock()
+
+        def fetcher(slot):
+            while time.monotonic() < stop:
+                if slot >= tuner.fragments:
+                    time.sleep(0.01)
+                    continue
+                with lock:
+                    start = position[0] % (64 * MB - self.FRAGMENT)
+                    position[0] += self.FRAGMENT
+                req = urllib.request.Request(url, headers={"Range": f"bytes={start}-{start + self.FRAGMENT - 1}"})
+                try:
+                    with urllib.request.urlopen(req, timeout=5) as resp:
+                        while True:
+                            data = resp.read(16 * 1024)
+                            if not data:
+                                break
+                            tuner.record_bytes(len(data))
+                except urllib.error.HTTPError as e:
+                    if e.code == 429:
+                        tuner.record_error(ERROR_THROTTLED)
+                        time.sleep(0.05)
+
+        threads = [threading.Thread(target=fetcher, args=(i,)) for i in range(tuner.max_fragments)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def test_converges_on_throttling_server(self):
+        with MediaServer(bandwidth=512 * 1024, link_bandwidth=2 * MB, max_connections=5) as server:
+            tuner = TransferTuner(window=0.4, reprobe=50)
+            self.run_fetchers(server, tuner, seconds=5)
+            rejected = server.httpd.rejected
+        # Link is full at 4 connections and a 6th gets 429s: the tuner climbs from 1,
+        # finds the limit and settles below it instead of running at max_fragments
+        levels = [h["fragments"] for h in tuner.history]
+        self.assertGreaterEqual(max(levels), 4)
+        self.assertLessEqual(max(levels), 6)
+        self.assertIn(tuner.fragments, (2, 3, 4, 5))
+        self.assertLess(rejected, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()